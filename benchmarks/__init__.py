@@ -0,0 +1,8 @@
+"""
+Benchmarks for DevDash
+
+Generates synthetic workloads (a large Git repository with a dirty tree,
+a fake /proc with thousands of sockets, a project with a big lockfile and
+virtualenv) and measures every collector against them. Run with
+`python -m benchmarks --help`.
+"""
@@ -0,0 +1,10 @@
+"""
+Allow running benchmarks as module: python -m benchmarks
+"""
+
+import sys
+
+from .run import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Synthetic workloads for the DevDash benchmarks
+
+Everything is generated from scratch so results are comparable across
+machines and commits: a Git repository built with `git fast-import`, a
+fake /proc tree for the socket scanners and a project with a large
+package-lock.json and virtualenv. Fixtures are written once per scale
+and reused until their sizes change.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import subprocess
+from typing import Dict, IO
+
+# Workload sizes; "full" is the size of the largest repositories we support
+SCALES = {
+    "tiny": {
+        "commits": 200, "files": 500, "untracked": 100, "modified": 10,
+        "stashes": 5, "branches": 20, "ahead": 5,
+        "sockets": 200, "processes": 20,
+        "distributions": 50, "lock_packages": 200,
+    },
+    "small": {
+        "commits": 10_000, "files": 20_000, "untracked": 5_000, "modified": 100,
+        "stashes": 20, "branches": 200, "ahead": 50,
+        "sockets": 1_000, "processes": 100,
+        "distributions": 500, "lock_packages": 2_000,
+    },
+    "full": {
+        "commits": 100_000, "files": 200_000, "untracked": 50_000, "modified": 1_000,
+        "stashes": 100, "branches": 1_000, "ahead": 100,
+        "sockets": 5_000, "processes": 500,
+        "distributions": 2_000, "lock_packages": 10_000,
+    },
+}
+
+# Files per directory in the generated trees
+FILES_PER_DIR = 1000
+
+# Fake /proc pids start here, above any real pid_max, so psutil never
+# finds a live process behind them
+FAKE_PID_BASE = 5_000_000
+
+FIXTURE_VERSION = 1
+
+
+def _git(repo: str, *args: str) -> str:
+    result = subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+def _tracked_path(i: int) -> str:
+    return f"src/d{i // FILES_PER_DIR:04d}/f{i}.txt"
+
+
+def _write_data(stream: IO[bytes], data: bytes) -> None:
+    stream.write(b"data %d\n" % len(data))
+    stream.write(data)
+    stream.write(b"\n")
+
+
+def make_git_repo(path: str, sizes: Dict[str, int]) -> None:
+    """Repository with a long history, many files, branches and stashes, and a dirty tree"""
+    os.makedirs(path)
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.name", "Bench")
+    _git(path, "config", "user.email", "bench@example.com")
+    
+    commits = sizes["commits"]
+    # One commit a minute, the last ones today
+    start = int(time.time()) - commits * 60
+    marks_file = os.path.join(path, ".git", "bench-marks")
+    
+    importer = subprocess.Popen(
+        ["git", "fast-import", "--quiet", f"--export-marks={marks_file}"],
+        cwd=path, stdin=subprocess.PIPE
+    )
+    stream = importer.stdin
+    
+    # Every tracked file shares one blob; only the tree size matters
+    stream.write(b"blob\nmark :1\n")
+    _write_data(stream, b"synthetic file\n")
+    
+    for n in range(commits):
+        mark = n + 2
+        stream.write(b"commit refs/heads/main\nmark :%d\n" % mark)
+        stream.write(b"committer Bench <bench@example.com> %d +0000\n" % (start + n * 60))
+        _write_data(stream, b"commit %d" % n)
+        if n == 0:
+            for i in range(sizes["files"]):
+                stream.write(b"M 100644 :1 %s\n" % _tracked_path(i).encode())
+        stream.write(b"M 100644 inline HISTORY\n")
+        _write_data(stream, b"%d\n" % n)
+        stream.write(b"\n")
+    
+    # Branches spread over the history; origin/main behind main
+    for i in range(sizes["branches"]):
+        stream.write(b"reset refs/heads/feature-%d\nfrom :%d\n\n" % (i, 2 + (i * 7919) % commits))
+    stream.write(b"reset refs/remotes/origin/main\nfrom :%d\n\n" % (2 + commits - 1 - sizes["ahead"]))
+    
+    stream.close()
+    if importer.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+    
+    _git(path, "config", "remote.origin.url", "https://example.com/bench.git")
+    _git(path, "config", "remote.origin.fetch", "+refs/heads/*:refs/remotes/origin/*")
+    _git(path, "config", "branch.main.remote", "origin")
+    _git(path, "config", "branch.main.merge", "refs/heads/main")
+    _git(path, "reset", "-q", "--hard")
+    
+    # `git stash list` walks the refs/stash reflog; point it at old commits
+    with open(marks_file) as f:
+        shas = {int(mark[1:]): sha for mark, sha in (line.split() for line in f)}
+    for i in range(sizes["stashes"]):
+        sha = shas[2 + (i * 104729) % commits]
+        _git(path, "update-ref", "--create-reflog", "-m", f"On main: stash {i}", "refs/stash", sha)
+    
+    # Dirty tree: modified files (half of them staged) and untracked files
+    modified = [_tracked_path(i) for i in range(0, sizes["files"], max(1, sizes["files"] // sizes["modified"]))]
+    for name in modified[:sizes["modified"]]:
+        with open(os.path.join(path, name), "a") as f:
+            f.write("changed\n")
+    staged = modified[:sizes["modified"] // 2]
+    for i in range(0, len(staged), 500):
+        _git(path, "add", "--", *staged[i:i + 500])
+    
+    for i in range(sizes["untracked"]):
+        directory = os.path.join(path, "scratch", f"u{i // FILES_PER_DIR:04d}")
+        if i % FILES_PER_DIR == 0:
+            os.makedirs(directory)
+        with open(os.path.join(directory, f"u{i}.tmp"), "w") as f:
+            f.write("untracked\n")
+
+
+def _encode_address(port: int) -> str:
+    # 127.0.0.1 in /proc/net byte order
+    return f"0100007F:{port:04X}"
+
+
+def make_proc(path: str, sizes: Dict[str, int]) -> None:
+    """Fake /proc: net/tcp with listening and established sockets, and fd links owning them"""
+    net = os.path.join(path, "net")
+    os.makedirs(net)
+    
+    sockets = sizes["sockets"]
+    processes = sizes["processes"]
+    listening = max(1, sockets // 10)
+    header = (
+        "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when "
+        "retrnsmt   uid  timeout inode\n"
+    )
+    owners: Dict[int, list] = {}
+    
+    with open(os.path.join(net, "tcp"), "w") as f:
+        f.write(header)
+        for i in range(sockets):
+            inode = 100_000 + i
+            if i < listening:
+                local, remote, state = _encode_address(20_000 + i), "00000000:0000", "0A"
+                owners.setdefault(i % processes, []).append(inode)
+            else:
+                local = _encode_address(20_000 + i % listening)
+                remote, state = _encode_address(40_000 + i), "01"
+            f.write(
+                f"{i:4d}: {local} {remote} {state} 00000000:00000000 00:00000000 "
+                f"00000000  1000        0 {inode} 1 0000000000000000 20 4 30 10 -1\n"
+            )
+    with open(os.path.join(net, "tcp6"), "w") as f:
+        f.write(header)
+    
+    # Every process also holds ordinary fds, which the owner scan must skip
+    for p in range(processes):
+        fd_dir = os.path.join(path, str(FAKE_PID_BASE + p), "fd")
+        os.makedirs(fd_dir)
+        targets = ["/dev/null"] * 8 + [f"socket:[{inode}]" for inode in owners.get(p, [])]
+        for fd, target in enumerate(targets):
+            os.symlink(target, os.path.join(fd_dir, str(fd)))
+
+
+def make_project(path: str, sizes: Dict[str, int]) -> None:
+    """Node project with a large package-lock.json, and an in-project virtualenv"""
+    os.makedirs(path)
+    packages = sizes["lock_packages"]
+    direct = max(1, packages // 20)
+    
+    dependencies = {f"pkg{i}": f"^{i % 9 + 1}.0.0" for i in range(direct)}
+    manifest = {
+        "name": "bench-project",
+        "version": "1.0.0",
+        "scripts": {f"task{i}": f"node scripts/task{i}.js" for i in range(20)},
+        "dependencies": dependencies,
+        "devDependencies": {"bench-dev-tool": "^1.0.0"},
+    }
+    with open(os.path.join(path, "package.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    
+    lock = {"": {"name": "bench-project", "version": "1.0.0", "dependencies": dependencies}}
+    for i in range(packages):
+        lock[f"node_modules/pkg{i}"] = {
+            "version": f"{i % 9 + 1}.0.0",
+            "dependencies": {f"pkg{(i * 31 + k) % packages}": "*" for k in range(1, 4)},
+        }
+        if i % 50 == 0:
+            # Nested copies show up as duplicate versions
+            lock[f"node_modules/pkg{i}/node_modules/pkg{(i + 1) % packages}"] = {"version": "0.1.0"}
+    with open(os.path.join(path, "package-lock.json"), "w") as f:
+        json.dump({"name": "bench-project", "lockfileVersion": 3, "packages": lock}, f, indent=2)
+    
+    env = os.path.join(path, ".venv")
+    site = os.path.join(env, "lib", f"python{sys.version_info[0]}.{sys.version_info[1]}", "site-packages")
+    os.makedirs(site)
+    with open(os.path.join(env, "pyvenv.cfg"), "w") as f:
+        f.write(f"home = {os.path.dirname(sys.executable)}\n")
+    
+    count = sizes["distributions"]
+    for i in range(count):
+        info = os.path.join(site, f"dist{i}-1.{i % 10}.0.dist-info")
+        os.makedirs(info)
+        with open(os.path.join(info, "METADATA"), "w") as f:
+            f.write(f"Metadata-Version: 2.1\nName: dist{i}\nVersion: 1.{i % 10}.0\n")
+            for k in range(1, 4):
+                f.write(f"Requires-Dist: dist{(i + k) % count}>=1.0\n")
+            f.write("\nLong description that is never read.\n")
+        with open(os.path.join(info, "RECORD"), "w") as f:
+            for k in range(10):
+                f.write(f"dist{i}/module{k}.py,sha256=abc,{1000 + k}\n")
+
+
+def ensure_fixtures(root: str, scale: str) -> Dict:
+    """Generate (or reuse) the fixtures of a scale under root; returns their paths"""
+    sizes = SCALES[scale]
+    base = os.path.join(root, scale)
+    marker = os.path.join(base, "fixtures.json")
+    expected = {"version": FIXTURE_VERSION, "sizes": sizes}
+    
+    try:
+        with open(marker) as f:
+            info = json.load(f)
+        if {"version": info.get("version"), "sizes": info.get("sizes")} == expected:
+            return info
+    except (OSError, ValueError):
+        pass
+    
+    if os.path.exists(base):
+        shutil.rmtree(base)
+    os.makedirs(base)
+    
+    started = time.perf_counter()
+    paths = {
+        "repo": os.path.join(base, "repo"),
+        "proc": os.path.join(base, "proc"),
+        "project": os.path.join(base, "project"),
+    }
+    make_git_repo(paths["repo"], sizes)
+    make_proc(paths["proc"], sizes)
+    make_project(paths["project"], sizes)
+    
+    info = dict(expected, paths=paths, seconds=round(time.perf_counter() - started, 2))
+    with open(marker, "w") as f:
+        json.dump(info, f, indent=2)
+    return info
@@ -0,0 +1,71 @@
+"""
+Measurement helpers for the DevDash benchmarks
+
+Latency is wall-clock time of each call. Subprocesses are counted by
+hooking subprocess.Popen, which subprocess.run and check_output go
+through. Peak memory is the Python heap high-water mark of one call
+(tracemalloc), measured in a separate run because tracing slows calls down.
+"""
+
+import time
+import threading
+import statistics
+import subprocess
+import tracemalloc
+from typing import Callable, Dict
+
+
+class SubprocessCounter:
+    """Count processes started through subprocess.Popen while active"""
+    
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+        self._original = None
+    
+    def __enter__(self) -> "SubprocessCounter":
+        original = self._original = subprocess.Popen.__init__
+        counter = self
+        
+        def counting_init(popen, *args, **kwargs):
+            with counter._lock:
+                counter.count += 1
+            original(popen, *args, **kwargs)
+        
+        subprocess.Popen.__init__ = counting_init
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        subprocess.Popen.__init__ = self._original
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> Dict:
+    """Time a cold call and `repeat` warm calls, count their subprocesses, trace peak memory"""
+    with SubprocessCounter() as cold_counter:
+        started = time.perf_counter()
+        func()
+        cold = time.perf_counter() - started
+    
+    timings = []
+    with SubprocessCounter() as counter:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+    
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        "cold_ms": round(cold * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+        "cold_subprocesses": cold_counter.count,
+        "subprocesses": round(counter.count / repeat, 2),
+        "peak_kib": round(peak / 1024, 1),
+    }
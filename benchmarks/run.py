@@ -0,0 +1,227 @@
+"""
+Run the DevDash benchmark suite
+
+    python -m benchmarks --scale small --output before.json
+    python -m benchmarks --scale small --compare before.json
+
+Each GitInfo, SystemInfo, PortScanner and PackageInfo method, a
+TodoScanner scan and a full DevDash.update_layout cycle are measured
+against the synthetic fixtures.
+Results are written as JSON together with the commit they were taken at;
+--compare prints the change against an earlier results file and exits
+non-zero when a benchmark slowed down by more than --threshold.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import subprocess
+import tempfile
+from typing import Callable, Dict, List, Optional
+
+from .fixtures import SCALES, ensure_fixtures
+from .measure import measure
+
+GIT_METHODS = [
+    "get_branch", "get_status", "get_state", "get_last_commit", "get_remote_status",
+    "get_uncommitted_count", "get_repo_name", "get_today_commits", "get_today_stats",
+    "get_branches", "get_stash_count",
+]
+
+SYSTEM_METHODS = [
+    "get_cpu_percent", "get_memory_info", "get_disk_info", "get_os_info", "get_uptime",
+    "get_load_average", "get_process_count", "get_network_io", "get_battery_info",
+    "get_cpu_count", "get_current_user", "get_hostname",
+]
+
+# read_socket_table and get_listening_sockets read the fake /proc; the
+# psutil-based methods see this machine
+PORT_METHODS = ["read_socket_table", "get_listening_sockets", "get_listening_ports", "get_port_summary"]
+
+# The *_outdated methods are left out: they spawn package managers that
+# talk to registries, which would measure the network
+PACKAGE_METHODS = [
+    "detect_project_type", "get_package_count", "get_dependency_inventory",
+    "get_project_scripts", "find_site_packages", "get_python_installed",
+    "get_python_environment",
+]
+
+
+def isolate(cache_dir: str) -> None:
+    """Keep runs independent of the daemon, user caches and the network"""
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.environ["DEVDASH_NO_DAEMON"] = "1"
+    os.environ["DEVDASH_CACHE_DIR"] = cache_dir
+    # Refused immediately instead of waiting on a registry
+    os.environ["DEVDASH_INDEX_URL"] = "http://127.0.0.1:9/simple/"
+    os.environ["npm_config_offline"] = "true"
+
+
+def get_cases(paths: Dict[str, str]) -> Dict[str, Callable[[], object]]:
+    """Benchmark name -> zero-argument callable"""
+    from devdash.dashboard import DevDash
+    from devdash.git_utils import GitInfo
+    from devdash.package_utils import PackageInfo
+    from devdash.port_utils import PortScanner
+    from devdash.system_utils import SystemInfo
+    from devdash.todo_utils import TodoScanner
+    
+    PortScanner.PROC_ROOT = paths["proc"]
+    PortScanner.PROC_NET = os.path.join(paths["proc"], "net")
+    
+    cases: Dict[str, Callable[[], object]] = {}
+    git = GitInfo(paths["repo"])
+    for name in GIT_METHODS:
+        cases[f"GitInfo.{name}"] = getattr(git, name)
+    for name in SYSTEM_METHODS:
+        cases[f"SystemInfo.{name}"] = getattr(SystemInfo, name)
+    for name in PORT_METHODS:
+        cases[f"PortScanner.{name}"] = getattr(PortScanner, name)
+    for name in PACKAGE_METHODS:
+        method = getattr(PackageInfo, name)
+        cases[f"PackageInfo.{name}"] = lambda method=method: method(paths["project"])
+    
+    # Cold is the first full grep; warm calls find every blob cached
+    cases["TodoScanner.scan"] = TodoScanner(paths["repo"]).scan
+    
+    # Steady state skips panels whose model did not change; rebuild
+    # forgets the previous frame so every panel is rendered again
+    dash = DevDash(paths["repo"])
+    layout = dash.create_layout()
+    cases["DevDash.update_layout"] = lambda: dash.update_layout(layout)
+    
+    def rebuild():
+        dash._frame_keys.clear()
+        dash.update_layout(layout)
+    
+    cases["DevDash.update_layout.rebuild"] = rebuild
+    return cases
+
+
+def get_commit() -> Dict:
+    """Commit of the code under test, and whether the tree has local changes"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root, capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit or None, "dirty": bool(dirty)}
+
+
+def run_suite(
+    scale: str = "small",
+    fixtures_dir: Optional[str] = None,
+    repeat: int = 5,
+    only: Optional[List[str]] = None,
+    log=None
+) -> Dict:
+    """Generate fixtures if needed, run every benchmark and return the results document"""
+    fixtures_dir = fixtures_dir or os.path.join(tempfile.gettempdir(), "devdash-bench")
+    info = ensure_fixtures(fixtures_dir, scale)
+    isolate(os.path.join(fixtures_dir, scale, "cache"))
+    
+    from devdash import __version__
+    
+    cases = get_cases(info["paths"])
+    results = {}
+    for name, func in cases.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        try:
+            result = measure(func, repeat)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        results[name] = result
+        if log:
+            log(format_result(name, result))
+    
+    return {
+        "meta": dict(
+            get_commit(),
+            version=__version__,
+            python=platform.python_version(),
+            platform=platform.platform(),
+            scale=scale,
+            sizes=info["sizes"],
+            repeat=repeat,
+            timestamp=time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        ),
+        "results": results,
+    }
+
+
+def format_result(name: str, result: Dict) -> str:
+    """One line per benchmark for the terminal"""
+    if "error" in result:
+        return f"{name:<40} error: {result['error']}"
+    return (
+        f"{name:<40} {result['median_ms']:>10.2f} ms  (cold {result['cold_ms']:>9.2f} ms)"
+        f"  {result['subprocesses']:>5g} proc  {result['peak_kib']:>9.1f} KiB"
+    )
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 1.25) -> List[Dict]:
+    """Median latency of every benchmark in both documents, flagging slowdowns"""
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or "error" in before or "error" in result:
+            continue
+        old, new = before["median_ms"], result["median_ms"]
+        ratio = new / old if old else (1.0 if not new else float("inf"))
+        rows.append({
+            "name": name,
+            "before_ms": old,
+            "after_ms": new,
+            "ratio": round(ratio, 3),
+            "subprocesses": (before["subprocesses"], result["subprocesses"]),
+            # Sub-millisecond calls are too noisy to flag
+            "regression": ratio > threshold and new - old > 1.0,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Workload size")
+    parser.add_argument("--repeat", type=int, default=5, help="Warm calls per benchmark")
+    parser.add_argument("--only", action="append", help="Run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--fixtures-dir", help="Where fixtures are generated and reused")
+    parser.add_argument("--output", "-o", help="Write results JSON here instead of stdout")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+    
+    def log(line: str) -> None:
+        print(line, file=sys.stderr, flush=True)
+    
+    document = run_suite(args.scale, args.fixtures_dir, max(1, args.repeat), args.only, log)
+    
+    text = json.dumps(document, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, document, args.threshold)
+        log(f"\nCompared with {baseline['meta'].get('commit') or args.compare}:")
+        for row in rows:
+            mark = "  REGRESSION" if row["regression"] else ""
+            log(f"{row['name']:<40} {row['before_ms']:>10.2f} -> {row['after_ms']:>10.2f} ms  x{row['ratio']:.2f}{mark}")
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
@@ -9,9 +9,27 @@ License: MIT
 __version__ = "1.0.0"
 __author__ = "DAXXTEAM"
 
-from .dashboard import DevDash
-from .git_utils import GitInfo
-from .system_utils import SystemInfo
-from .port_utils import PortScanner
-
 __all__ = ["DevDash", "GitInfo", "SystemInfo", "PortScanner"]
+
+# Public names -> defining module, imported on first access (PEP 562) so
+# that 'import devdash' does not pull in rich and psutil
+_LAZY_ATTRIBUTES = {
+    "DevDash": ".dashboard",
+    "GitInfo": ".git_utils",
+    "SystemInfo": ".system_utils",
+    "PortScanner": ".port_utils",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -0,0 +1,158 @@
+"""
+Cache utilities for DevDash
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+def get_cache_dir() -> Path:
+    """Get the per-user cache directory for DevDash"""
+    override = os.environ.get("DEVDASH_CACHE_DIR")
+    if override:
+        return Path(override)
+    
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        return Path(base) / "devdash" / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "devdash"
+    
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(base) / "devdash"
+
+
+def shard_of(name: str, shards: int) -> int:
+    """Stable shard number of a name, for indexes stored as several entries"""
+    return zlib.crc32(name.encode("utf-8")) % shards
+
+
+class DiskCache:
+    """JSON file cache with TTL and stale-while-revalidate"""
+    
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float = 3600,
+        stale_ttl: float = 86400,
+        cache_dir: Optional[Path] = None
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._cache_dir = cache_dir
+        self._refreshing = set()
+        self._lock = threading.Lock()
+    
+    @property
+    def directory(self) -> Path:
+        """Cache directory for this namespace (resolved lazily)"""
+        return (self._cache_dir or get_cache_dir()) / self.namespace
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a stable key from arbitrary JSON-serializable parts"""
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+    
+    def get_entry(self, key: str) -> Optional[Dict]:
+        """Read a raw entry ({'created': ts, 'value': ...}) or None"""
+        try:
+            with open(self._entry_path(key)) as f:
+                entry = json.load(f)
+            if isinstance(entry, dict) and "created" in entry and "value" in entry:
+                return entry
+        except (OSError, ValueError):
+            pass
+        return None
+    
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Get a value if it is still fresh"""
+        entry = self.get_entry(key)
+        ttl = self.ttl if ttl is None else ttl
+        if entry is not None and time.time() - entry["created"] < ttl:
+            return entry["value"]
+        return None
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a value atomically"""
+        directory = self.directory
+        tmp = None
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"created": time.time(), "value": value}, f)
+            os.replace(tmp, self._entry_path(key))
+        except (OSError, TypeError, ValueError):
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+    
+    def delete(self, key: str) -> None:
+        """Remove an entry"""
+        try:
+            self._entry_path(key).unlink()
+        except OSError:
+            pass
+    
+    def is_refreshing(self, key: str) -> bool:
+        """Check if a background refresh is running for a key"""
+        with self._lock:
+            return key in self._refreshing
+    
+    def refresh_async(self, key: str, compute: Callable[[], Any]) -> bool:
+        """Recompute a value in a background thread (at most one per key)"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+        
+        def worker():
+            try:
+                self.set(key, compute())
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+        
+        threading.Thread(target=worker, name=f"devdash-cache-{key[:8]}", daemon=True).start()
+        return True
+    
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None
+    ) -> Any:
+        """Return a cached value, serving stale entries while refreshing them"""
+        ttl = self.ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        
+        entry = self.get_entry(key)
+        if entry is not None:
+            age = time.time() - entry["created"]
+            if age < ttl:
+                return entry["value"]
+            if age < ttl + stale_ttl:
+                self.refresh_async(key, compute)
+                return entry["value"]
+        
+        value = compute()
+        self.set(key, value)
+        return value
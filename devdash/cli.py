@@ -1,51 +1,38 @@
 """
 CLI interface for DevDash
+
+Heavy modules (typer, rich, psutil, the dashboard) are imported by the
+commands that use them, so quick commands like 'version' and 'info' start
+fast enough for shell prompts and status bars.
 """
 
+import os
 import sys
-
-try:
-    import typer
-    from typing_extensions import Annotated
-    TYPER_AVAILABLE = True
-except ImportError:
-    TYPER_AVAILABLE = False
+from importlib.util import find_spec
+from typing import List, Optional
 
 from . import __version__
-from .dashboard import DevDash
-from .git_utils import GitInfo
-from .system_utils import SystemInfo
-from .port_utils import PortScanner
 
-if TYPER_AVAILABLE:
-    app = typer.Typer(
-        name="devdash",
-        help="⚡ DevDash - Developer Dashboard CLI",
-        add_completion=False,
-        rich_markup_mode="rich"
-    )
-else:
-    app = None
+TYPER_AVAILABLE = find_spec("typer") is not None
+
+# Commands answered without importing typer or rich
+FAST_COMMANDS = ("version", "info", "prompt")
+
+ANSI_STYLES = {
+    "bold cyan": "1;36",
+    "bold magenta": "1;35",
+    "cyan": "36",
+    "green": "32",
+    "yellow": "33",
+    "blue": "34",
+    "dim": "2",
+}
 
 
 def check_dependencies():
     """Check and install missing dependencies"""
-    missing = []
-    
-    try:
-        import rich
-    except ImportError:
-        missing.append("rich")
-    
-    try:
-        import typer
-    except ImportError:
-        missing.append("typer")
-    
-    try:
-        import psutil
-    except ImportError:
-        missing.append("psutil")
+    # find_spec locates a module without importing (and initialising) it
+    missing = [name for name in ("rich", "typer", "psutil") if find_spec(name) is None]
     
     if missing:
         print(f"Installing dependencies: {', '.join(missing)}")
@@ -55,25 +42,133 @@ def check_dependencies():
         sys.exit(0)
 
 
-if TYPER_AVAILABLE:
+def use_color(stream=None) -> bool:
+    """Whether to emit ANSI colors (honours NO_COLOR and FORCE_COLOR)"""
+    stream = stream or sys.stdout
+    if os.environ.get("NO_COLOR"):
+        return False
+    if os.environ.get("FORCE_COLOR"):
+        return True
+    return stream.isatty() and os.environ.get("TERM") != "dumb"
+
+
+def styled(parts, color: bool) -> str:
+    """Join (text, style) parts, wrapping styled text in ANSI codes"""
+    if not color:
+        return "".join(text for text, _ in parts)
+    return "".join(
+        f"\x1b[{ANSI_STYLES[style]}m{text}\x1b[0m" if style else text
+        for text, style in parts
+    )
+
+
+def print_version() -> None:
+    """Print the version line"""
+    print(styled([
+        ("⚡ DevDash ", "bold cyan"),
+        (f"v{__version__}", "green"),
+        (" by ", "dim"),
+        ("DAXXTEAM", "bold magenta"),
+    ], use_color()))
+
+
+def print_info() -> None:
+    """Print the one-line system summary"""
+    import platform
+    from .daemon import DaemonClient, DaemonUnavailable
+    
+    cpu = mem_percent = port_count = None
+    client = DaemonClient.from_environment()
+    if client is not None and client.available():
+        # devdashd already has these, without importing psutil here
+        try:
+            system = client.get("system", max_age=2.0)
+            cpu, mem_percent = system["cpu"], system["mem_percent"]
+            port_count = len(client.get("ports", max_age=2.0)["rows"])
+        except (DaemonUnavailable, RuntimeError):
+            cpu = None
+        finally:
+            client.close()
+    
+    if cpu is None:
+        from .system_utils import SystemInfo
+        from .port_utils import PortScanner
+        cpu = SystemInfo.get_cpu_percent()
+        mem_percent = SystemInfo.get_memory_info()["percent"]
+        port_count = len(PortScanner.get_listening_ports())
+    
+    print(styled([
+        ("⚡ ", "yellow"),
+        (f"{platform.system()} ", "cyan"),
+        ("│ ", "dim"),
+        (f"CPU: {cpu:.0f}% ", "green" if cpu < 50 else "yellow"),
+        ("│ ", "dim"),
+        (f"RAM: {mem_percent:.0f}% ", "green" if mem_percent < 50 else "yellow"),
+        ("│ ", "dim"),
+        (f"Ports: {port_count} ", "blue"),
+        ("│ ", "dim"),
+        (f"Python: {platform.python_version()}", "dim"),
+    ], use_color()))
+
+
+def create_app():
+    """Build the Typer app"""
+    import typer
+    from typing_extensions import Annotated
+    
+    app = typer.Typer(
+        name="devdash",
+        help="⚡ DevDash - Developer Dashboard CLI",
+        add_completion=False,
+        rich_markup_mode="rich"
+    )
+    
     @app.command()
     def dashboard(
         path: Annotated[str, typer.Option("--path", "-p", help="Project path")] = ".",
         once: Annotated[bool, typer.Option("--once", "-1", help="Show once without live updates")] = False,
-        refresh: Annotated[float, typer.Option("--refresh", "-r", help="Refresh rate in seconds")] = 2.0
+        refresh: Annotated[Optional[float], typer.Option("--refresh", "-r", help="Refresh rate in seconds (default 5)")] = None,
+        compact: Annotated[bool, typer.Option("--compact", "-c", help="Send only changed cells (slow SSH/serial links)")] = False,
+        max_bps: Annotated[Optional[float], typer.Option("--max-bps", help="Cap terminal output in bytes per second (implies --compact)")] = None,
+        ascii_only: Annotated[bool, typer.Option("--ascii", help="ASCII only: no emoji or box drawing (implies --compact)")] = False,
+        profile: Annotated[bool, typer.Option("--profile", help="Show per-panel timings")] = False,
+        trace: Annotated[Optional[str], typer.Option("--trace", help="Write a Chrome trace of the run to this file on exit (implies --profile)")] = None,
+        cpu_budget: Annotated[Optional[float], typer.Option("--cpu-budget", help="CPU devdash may use, in percent of one core (default 1, 0: fixed intervals)")] = None,
+        config: Annotated[Optional[str], typer.Option("--config", envvar="DEVDASH_CONFIG", help="Config file instead of ~/.config/devdash/config.toml")] = None
     ):
         """
         ⚡ Launch the main developer dashboard
         
         Shows git status, system info, ports, and packages in a beautiful TUI.
+        Panels, sizes and intervals come from the config file and the
+        project's .devdash.toml.
         """
         check_dependencies()
-        dash = DevDash(path)
+        from .config import ConfigError, load_config
+        from .dashboard import DevDash
+        try:
+            settings = load_config(path, config)
+        except ConfigError as e:
+            print(f"Error: {e}")
+            raise typer.Exit(code=2)
         
-        if once:
-            dash.show_once()
-        else:
-            dash.run(refresh_rate=refresh)
+        dash = DevDash(path, settings)
+        if cpu_budget is not None:
+            dash.cpu_budget = cpu_budget / 100 if cpu_budget > 0 else None
+        if profile or trace:
+            dash.enable_profiling()
+        
+        try:
+            if once:
+                dash.show_once()
+            else:
+                dash.run(refresh_rate=refresh or dash.refresh_rate, compact=compact, max_bps=max_bps, ascii_only=ascii_only)
+        finally:
+            if dash.profiler is not None:
+                dash.profiler.uninstall()
+            if trace:
+                events = dash.profiler.export_chrome_trace(trace)
+                dash.console.print(f"[dim]Wrote {events} trace events to {trace} (open in chrome://tracing or ui.perfetto.dev)[/dim]")
 
 
     @app.command()
@@ -84,6 +179,7 @@ if TYPER_AVAILABLE:
         📂 Show git repository status
         """
         check_dependencies()
+        from .dashboard import DevDash
         dash = DevDash(path)
         dash.show_git()
 
@@ -94,89 +190,241 @@ if TYPER_AVAILABLE:
         🖥️  Show system information
         """
         check_dependencies()
+        from .dashboard import DevDash
         dash = DevDash()
         dash.show_system()
 
 
     @app.command()
-    def ports():
+    def ports(
+        watch: Annotated[bool, typer.Option("--watch", "-w", help="Stream open/close events")] = False,
+        ndjson: Annotated[bool, typer.Option("--ndjson", help="Emit events as NDJSON (implies --watch)")] = False,
+        interval: Annotated[float, typer.Option("--interval", "-i", help="Seconds between socket table polls")] = 1.0
+    ):
         """
         🌐 Show listening ports and services
         """
         check_dependencies()
+        from .dashboard import DevDash
         dash = DevDash()
-        dash.show_ports()
+        if watch or ndjson:
+            dash.watch_ports(interval=interval, ndjson=ndjson)
+        else:
+            dash.show_ports()
 
 
     @app.command()
     def packages(
-        path: Annotated[str, typer.Option("--path", "-p", help="Project path")] = "."
+        path: Annotated[str, typer.Option("--path", "-p", help="Project path")] = ".",
+        refresh: Annotated[bool, typer.Option("--refresh", help="Ignore the cache and check again")] = False,
+        ttl: Annotated[Optional[float], typer.Option("--ttl", help="Max cache age in seconds")] = None
     ):
         """
         📦 Show outdated packages
+        
+        Results are cached per project and lockfile contents, so repeat calls are instant.
         """
         check_dependencies()
+        from .dashboard import DevDash
         dash = DevDash(path)
-        dash.show_packages()
+        dash.show_packages(refresh=refresh, ttl=ttl)
 
 
     @app.command()
-    def info():
+    def logs(
+        files: Annotated[Optional[List[str]], typer.Argument(help="Log files (default: panels.logs.files, or *.log, logs/ and log/ in the project)")] = None,
+        path: Annotated[str, typer.Option("--path", "-p", help="Project path")] = ".",
+        lines: Annotated[int, typer.Option("--lines", "-n", help="Lines to show before following")] = 20,
+        follow: Annotated[bool, typer.Option("--follow", "-f", help="Keep printing lines as they are written")] = False,
+        highlight: Annotated[Optional[str], typer.Option("--highlight", help="Regex shown in bold magenta")] = None,
+        config: Annotated[Optional[str], typer.Option("--config", envvar="DEVDASH_CONFIG", help="Config file instead of ~/.config/devdash/config.toml")] = None
+    ):
         """
-        ℹ️  Show quick system info (one-liner)
+        📜 Show and follow project log files
+        
+        Reads only the end of each file, however large, and follows appends,
+        rotation and truncation.
         """
         check_dependencies()
+        from .config import ConfigError, load_config
+        from .dashboard import DevDash
+        try:
+            dash = DevDash(path, load_config(path, config))
+            dash.show_logs(files, lines=lines, follow=follow, highlight=highlight)
+        except (ConfigError, ValueError) as e:
+            print(f"Error: {e}")
+            raise typer.Exit(code=2)
+    
+    
+    @app.command()
+    def projects(
+        query: Annotated[Optional[str], typer.Argument(help="Words to find in project paths")] = None,
+        scan: Annotated[Optional[List[str]], typer.Option("--scan", "-s", help="Directory to search for projects (repeatable)")] = None,
+        rescan: Annotated[bool, typer.Option("--rescan", help="Search the scanned directories again and refresh all metadata")] = False,
+        depth: Annotated[int, typer.Option("--depth", help="Directory levels searched below each --scan directory")] = 4,
+        list_only: Annotated[bool, typer.Option("--list", "-l", help="Print the matching paths, best first, instead of the finder")] = False
+    ):
+        """
+        🗂️  Fuzzy-find a project and print its path
         
-        from rich.console import Console
-        from rich.text import Text
+        Ranks the indexed projects by match and frecency; the chosen path is
+        printed, so cd "$(devdash projects)" jumps to it. The first run
+        indexes your home directory unless --scan says where to look.
+        """
+        check_dependencies()
+        from .dashboard import DevDash
+        dash = DevDash()
+        index = dash.project_index
         
-        console = Console()
+        if scan or rescan or not len(index):
+            roots = scan or index.roots or [os.path.expanduser("~")]
+            found = index.scan(roots, max_depth=depth)
+            print(f"Indexed {found} projects under {', '.join(roots)}", file=sys.stderr)
         
-        cpu = SystemInfo.get_cpu_percent()
-        mem = SystemInfo.get_memory_info()
-        os_info = SystemInfo.get_os_info()
-        port_count = len(PortScanner.get_listening_ports())
+        if list_only:
+            for project in index.search(query or "", limit=50):
+                print(project["path"])
+            return
         
-        info_text = Text()
-        info_text.append("⚡ ", style="yellow")
-        info_text.append(f"{os_info['system']} ", style="cyan")
-        info_text.append("│ ", style="dim")
-        info_text.append(f"CPU: {cpu:.0f}% ", style="green" if cpu < 50 else "yellow")
-        info_text.append("│ ", style="dim")
-        info_text.append(f"RAM: {mem['percent']:.0f}% ", style="green" if mem['percent'] < 50 else "yellow")
-        info_text.append("│ ", style="dim")
-        info_text.append(f"Ports: {port_count} ", style="blue")
-        info_text.append("│ ", style="dim")
-        info_text.append(f"Python: {os_info['python']}", style="dim")
+        path = dash.pick_project(query or "")
+        if path is None:
+            raise typer.Exit(code=1)
+        print(path)
+    
+    
+    @app.command()
+    def probe(
+        targets: Annotated[Optional[List[str]], typer.Argument(help="Targets: PORT, HOST:PORT or http://, https://, redis://, postgres:// URLs")] = None,
+        count: Annotated[int, typer.Option("--count", "-n", help="Probe rounds before reporting")] = 1,
+        interval: Annotated[float, typer.Option("--interval", "-i", help="Seconds between rounds")] = 1.0,
+        timeout: Annotated[float, typer.Option("--timeout", "-t", help="Connect/handshake timeout in seconds")] = 1.0,
+        watch: Annotated[bool, typer.Option("--watch", "-w", help="Keep probing and show live latency")] = False
+    ):
+        """
+        🩺 Probe local services and measure connect latency
         
-        console.print(info_text)
+        Probes all targets concurrently (default: well-known dev ports on localhost)
+        and reports p50/p99 latency over the rounds.
+        """
+        check_dependencies()
+        from .dashboard import DevDash
+        dash = DevDash()
+        try:
+            dash.show_probe(targets, count=count, interval=interval, timeout=timeout, watch=watch)
+        except ValueError as e:
+            print(f"Error: {e}")
+            raise typer.Exit(code=2)
+    
+    
+    @app.command()
+    def info():
+        """
+        ℹ️  Show quick system info (one-liner)
+        """
+        check_dependencies()
+        print_info()
 
 
     @app.command()
-    def version():
+    def agent(
+        host: Annotated[str, typer.Option("--host", help="Address to listen on (0.0.0.0 for all interfaces)")] = "127.0.0.1",
+        port: Annotated[int, typer.Option("--port", help="TCP port")] = 7878,
+        interval: Annotated[float, typer.Option("--interval", "-i", help="Seconds between snapshots")] = 2.0,
+        path: Annotated[str, typer.Option("--path", "-p", help="Repository to report")] = ".",
+        token: Annotated[Optional[str], typer.Option("--token", envvar="DEVDASH_FLEET_TOKEN", help="Shared secret fleet monitors must send")] = None
+    ):
         """
-        Show DevDash version
+        📡 Stream this host's snapshot to 'devdash fleet' monitors
         """
+        check_dependencies()
+        import asyncio
+        from .fleet import FleetAgent
+        
+        server = FleetAgent(host=host, port=port, interval=interval, path=path, token=token)
+        print(f"devdash agent listening on {host}:{port}")
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+    
+    @app.command()
+    def fleet(
+        hosts_file: Annotated[str, typer.Argument(help="File with one host[:port] per line")],
+        once: Annotated[bool, typer.Option("--once", "-1", help="Print the table once and exit")] = False,
+        timeout: Annotated[float, typer.Option("--timeout", "-t", help="Connect timeout in seconds")] = 5.0,
+        token: Annotated[Optional[str], typer.Option("--token", envvar="DEVDASH_FLEET_TOKEN", help="Shared secret of the agents")] = None
+    ):
+        """
+        🛰️  Live table of many hosts running 'devdash agent'
+        """
+        check_dependencies()
+        import asyncio
         from rich.console import Console
-        from rich.text import Text
+        from .fleet import load_hosts, run_fleet
+        
+        try:
+            hosts = load_hosts(hosts_file)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            raise typer.Exit(code=2)
         
-        console = Console()
-        text = Text()
-        text.append("⚡ DevDash ", style="bold cyan")
-        text.append(f"v{__version__}", style="green")
-        text.append(" by ", style="dim")
-        text.append("DAXXTEAM", style="bold magenta")
-        console.print(text)
+        try:
+            asyncio.run(run_fleet(hosts, Console(), token=token, once=once, timeout=timeout))
+        except KeyboardInterrupt:
+            pass
+    
+    @app.command(
+        context_settings={"allow_extra_args": True, "ignore_unknown_options": True},
+        add_help_option=False
+    )
+    def prompt(ctx: typer.Context):
+        """
+        💲 Print a git/system segment for shell prompts (see devdash prompt --help)
+        """
+        from .prompt import main as prompt_main
+        raise typer.Exit(prompt_main(ctx.args))
+    
+    @app.command()
+    def version():
+        """
+        Show DevDash version
+        """
+        print_version()
+    
+    return app
+
+
+def __getattr__(name):
+    # 'from devdash.cli import app' still works; the app is built on first access (PEP 562)
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    app = create_app()
+    globals()["app"] = app
+    return app
 
 
 def main():
     """Main entry point"""
+    args = sys.argv[1:]
+    if args and args[0] == "prompt":
+        # Runs on every shell prompt: parses its own options
+        from .prompt import main as prompt_main
+        sys.exit(prompt_main(args[1:]))
+    
+    if len(args) == 1 and args[0] in FAST_COMMANDS:
+        if args[0] == "version":
+            print_version()
+        else:
+            check_dependencies()
+            print_info()
+        return
+    
     if not TYPER_AVAILABLE:
         check_dependencies()
         print("Dependencies installed. Please run again.")
         return
     
-    app()
+    create_app()()
 
 
 if __name__ == "__main__":
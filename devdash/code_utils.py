@@ -0,0 +1,289 @@
+"""
+Code statistics for DevDash
+
+Counts files and code/comment/blank lines per language. The file list
+comes from `git ls-files` (tracked and untracked, not ignored) or a walk
+of the directory outside git. Counts are cached per file by size and
+modification time in an on-disk index, so a refresh costs a stat of each
+file plus counting the files that changed; many changed files (the first
+run) are counted on a process pool. The index is stored in INDEX_SHARDS
+entries, and a scan rewrites only the shards whose files changed. Files
+larger than MMAP_THRESHOLD are read through mmap rather than loaded into
+memory.
+"""
+
+import os
+import mmap
+import threading
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cache_utils import DiskCache, shard_of
+from .workspace_utils import IGNORED_DIRS
+
+# Language -> (line comment prefixes, block comment (start, end) or None)
+LANGUAGES = {
+    "Python": (("#",), None),
+    "JavaScript": (("//",), ("/*", "*/")),
+    "TypeScript": (("//",), ("/*", "*/")),
+    "Go": (("//",), ("/*", "*/")),
+    "Rust": (("//",), ("/*", "*/")),
+    "C": (("//",), ("/*", "*/")),
+    "C++": (("//",), ("/*", "*/")),
+    "C#": (("//",), ("/*", "*/")),
+    "Java": (("//",), ("/*", "*/")),
+    "Kotlin": (("//",), ("/*", "*/")),
+    "Swift": (("//",), ("/*", "*/")),
+    "PHP": (("//", "#"), ("/*", "*/")),
+    "Ruby": (("#",), ("=begin", "=end")),
+    "Shell": (("#",), None),
+    "Lua": (("--",), ("--[[", "]]")),
+    "SQL": (("--",), ("/*", "*/")),
+    "HTML": ((), ("<!--", "-->")),
+    "CSS": ((), ("/*", "*/")),
+    "YAML": (("#",), None),
+    "TOML": (("#",), None),
+    "JSON": ((), None),
+    "Markdown": ((), ("<!--", "-->")),
+    "Makefile": (("#",), None),
+    "Dockerfile": (("#",), None),
+}
+
+EXTENSIONS = {
+    ".py": "Python", ".pyi": "Python",
+    ".js": "JavaScript", ".jsx": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".c": "C", ".h": "C",
+    ".cc": "C++", ".cpp": "C++", ".cxx": "C++", ".hpp": "C++", ".hh": "C++",
+    ".cs": "C#",
+    ".java": "Java",
+    ".kt": "Kotlin", ".kts": "Kotlin",
+    ".swift": "Swift",
+    ".php": "PHP",
+    ".rb": "Ruby",
+    ".sh": "Shell", ".bash": "Shell", ".zsh": "Shell",
+    ".lua": "Lua",
+    ".sql": "SQL",
+    ".html": "HTML", ".htm": "HTML",
+    ".css": "CSS", ".scss": "CSS",
+    ".yml": "YAML", ".yaml": "YAML",
+    ".toml": "TOML",
+    ".json": "JSON",
+    ".md": "Markdown",
+}
+
+FILENAMES = {"Makefile": "Makefile", "makefile": "Makefile", "Dockerfile": "Dockerfile"}
+
+# Files above this are read through mmap
+MMAP_THRESHOLD = 1024 * 1024
+
+# Changed files counted in this process below this many; above, on a pool
+POOL_MIN_FILES = 200
+POOL_CHUNK = 64
+
+# Bump when counting changes, so cached counts are recomputed
+INDEX_VERSION = 2
+
+# Cache entries the per-file index is split over (by path)
+INDEX_SHARDS = 64
+
+# One cached file: [size, mtime_ns, language, code, comment, blank]; the
+# language is None for binary and unreadable files, kept so they are not
+# reread on every scan
+Entry = List
+
+
+def detect_language(path: str) -> Optional[str]:
+    """Language of a file from its name, or None for files not counted"""
+    name = os.path.basename(path)
+    if name in FILENAMES:
+        return FILENAMES[name]
+    return EXTENSIONS.get(os.path.splitext(name)[1].lower())
+
+
+def count_lines(lines: Iterable[bytes], language: str) -> Tuple[int, int, int]:
+    """(code, comment, blank) lines
+    
+    A line is a comment when it starts with a line comment prefix or lies
+    within a block comment; code followed by a comment counts as code, and
+    so do Python docstrings.
+    """
+    prefixes, block = LANGUAGES[language]
+    prefixes = tuple(p.encode() for p in prefixes)
+    start, end = (block[0].encode(), block[1].encode()) if block else (None, None)
+    code = comment = blank = 0
+    in_block = False
+    for line in lines:
+        line = line.strip()
+        if not line:
+            blank += 1
+        elif in_block:
+            comment += 1
+            in_block = end not in line
+        elif start and line.startswith(start):
+            comment += 1
+            in_block = end not in line[len(start):]
+        elif prefixes and line.startswith(prefixes):
+            comment += 1
+        else:
+            code += 1
+    return code, comment, blank
+
+
+def _mmap_lines(mapped: mmap.mmap) -> Iterator[bytes]:
+    return iter(mapped.readline, b"")
+
+
+def count_file(path: str) -> Optional[Tuple[int, int, int]]:
+    """(code, comment, blank) of one file; None if unreadable or binary"""
+    language = detect_language(path)
+    if language is None:
+        return None
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return 0, 0, 0
+            if size <= MMAP_THRESHOLD:
+                data = f.read()
+                if b"\0" in data[:8192]:
+                    return None
+                return count_lines(data.splitlines(), language)
+            # Large files are paged in by the OS a line at a time
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if b"\0" in mapped[:8192]:
+                    return None
+                return count_lines(_mmap_lines(mapped), language)
+    except (OSError, ValueError):
+        return None
+
+
+def _count_many(paths: List[str]) -> List[Optional[Tuple[int, int, int]]]:
+    return [count_file(path) for path in paths]
+
+
+class CodeCounter:
+    """Lines of code per language for a project, cached per file"""
+    
+    def __init__(self, path: str = ".", cache: Optional[DiskCache] = None, workers: Optional[int] = None):
+        self.path = os.path.abspath(path)
+        self.cache = cache if cache is not None else DiskCache("code-stats", ttl=float("inf"))
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self._files: Optional[Dict[str, Entry]] = None
+        self._lock = threading.Lock()
+        self.last_scan = {"files": 0, "counted": 0, "pool": False}
+    
+    def list_files(self) -> List[str]:
+        """Paths (relative to path) of the files to count"""
+        try:
+            result = subprocess.run(
+                ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                cwd=self.path,
+                capture_output=True,
+                text=True,
+                errors="replace"
+            )
+            if result.returncode == 0:
+                return sorted({p for p in result.stdout.split("\0") if p and detect_language(p)})
+        except OSError:
+            pass
+        
+        files = []
+        for directory, dirs, names in os.walk(self.path):
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRS and not d.startswith(".")]
+            for name in names:
+                if detect_language(name):
+                    files.append(os.path.relpath(os.path.join(directory, name), self.path))
+        return sorted(files)
+    
+    def _count(self, paths: List[str]) -> List[Optional[Tuple[int, int, int]]]:
+        """Count files, on a process pool when there are many"""
+        absolute = [os.path.join(self.path, p) for p in paths]
+        if len(absolute) < POOL_MIN_FILES or self.workers < 2:
+            return _count_many(absolute)
+        chunks = [absolute[i:i + POOL_CHUNK] for i in range(0, len(absolute), POOL_CHUNK)]
+        # spawn: forking a process whose other threads hold locks is unsafe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            return [counts for chunk in pool.map(_count_many, chunks) for counts in chunk]
+    
+    def _load(self) -> Dict[str, Entry]:
+        if self._files is None:
+            files: Dict[str, Entry] = {}
+            for shard in range(INDEX_SHARDS):
+                stored = self.cache.get(self.cache.make_key(self.path, shard))
+                if isinstance(stored, dict) and stored.get("version") == INDEX_VERSION:
+                    files.update(stored["files"])
+            self._files = files
+        return self._files
+    
+    def _save(self, files: Dict[str, Entry], dirty: Iterable[int]) -> None:
+        """Rewrite the index shards whose files were counted or removed"""
+        shards: Dict[int, Dict[str, Entry]] = {shard: {} for shard in dirty}
+        for path, entry in files.items():
+            shard = shard_of(path, INDEX_SHARDS)
+            if shard in shards:
+                shards[shard][path] = entry
+        for shard, entries in shards.items():
+            self.cache.set(self.cache.make_key(self.path, shard), {"version": INDEX_VERSION, "files": entries})
+    
+    def scan(self) -> Dict[str, Entry]:
+        """{path: [size, mtime_ns, language, code, comment, blank]} for every listed file"""
+        with self._lock:
+            cached = self._load()
+            files: Dict[str, Entry] = {}
+            changed = []
+            for path in self.list_files():
+                try:
+                    st = os.stat(os.path.join(self.path, path))
+                except OSError:
+                    continue
+                entry = cached.get(path)
+                if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                    files[path] = entry
+                else:
+                    changed.append((path, st))
+            
+            counts = self._count([path for path, _ in changed])
+            for (path, st), result in zip(changed, counts):
+                language = detect_language(path) if result is not None else None
+                files[path] = [st.st_size, st.st_mtime_ns, language, *(result or (0, 0, 0))]
+            
+            dirty = {shard_of(path, INDEX_SHARDS) for path, _ in changed}
+            dirty.update(shard_of(path, INDEX_SHARDS) for path in cached if path not in files)
+            if dirty:
+                self._save(files, dirty)
+            self._files = files
+            self.last_scan = {
+                "files": sum(1 for entry in files.values() if entry[2]),
+                "counted": len(changed),
+                "pool": len(changed) >= POOL_MIN_FILES and self.workers >= 2,
+            }
+            return files
+    
+    def get_stats(self, limit: int = 5) -> Dict:
+        """Totals, per-language counts (most code first) and the largest files"""
+        files = {path: entry for path, entry in self.scan().items() if entry[2]}
+        languages: Dict[str, Dict] = {}
+        for language, code, comment, blank in (entry[2:] for entry in files.values()):
+            stats = languages.setdefault(language, {"name": language, "files": 0, "code": 0, "comment": 0, "blank": 0})
+            stats["files"] += 1
+            stats["code"] += code
+            stats["comment"] += comment
+            stats["blank"] += blank
+        
+        ranked = sorted(languages.values(), key=lambda s: (-s["code"], s["name"]))
+        largest = sorted(files.items(), key=lambda item: (-sum(item[1][3:]), item[0]))[:limit]
+        return {
+            "files": len(files),
+            "code": sum(s["code"] for s in ranked),
+            "comment": sum(s["comment"] for s in ranked),
+            "blank": sum(s["blank"] for s in ranked),
+            "languages": ranked,
+            "largest": [{"path": path, "lines": sum(entry[3:])} for path, entry in largest],
+            **self.last_scan,
+        }
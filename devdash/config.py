@@ -0,0 +1,211 @@
+"""
+Configuration for DevDash
+
+Settings are read from the user's config file
+($XDG_CONFIG_HOME/devdash/config.toml, or $DEVDASH_CONFIG) and then from
+the nearest .devdash.toml at or above the project path, which overrides
+it key by key:
+    
+    [dashboard]
+    refresh = 5          # seconds
+    cpu_budget = 1       # percent of one core, 0 for fixed intervals
+    
+    [layout]
+    # Columns of panels, top to bottom; a nested list shares a row
+    columns = [["git", "stats", "todos", "probes"], ["system", "code", ["ports", "packages"]]]
+    widths = [1, 1]
+    
+    [panels.packages]
+    enabled = true       # false hides the panel, like leaving it out of the layout
+    size = 1             # share of its column (or row)
+    refresh = 60         # seconds between collector runs, whatever the rate
+    outdated = true      # query package indexes for newer versions
+
+Panels left out of the layout never run their collectors or import
+their backends.
+"""
+
+import copy
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+PROJECT_CONFIG = ".devdash.toml"
+
+PANEL_NAMES = ("git", "stats", "todos", "probes", "system", "code", "ports", "packages", "projects", "logs", "containers")
+
+# Options every panel takes, and those specific to one panel's collector
+COMMON_OPTIONS = {"enabled": bool, "size": (int, float), "refresh": (int, float)}
+PANEL_OPTIONS = {
+    "packages": {"outdated": bool, "ttl": (int, float)},
+    "probes": {"targets": list, "timeout": (int, float)},
+    "logs": {"files": list, "highlight": str},
+    "containers": {"socket": str},
+}
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "dashboard": {
+        "refresh": 5.0,
+        "cpu_budget": 1.0,
+    },
+    "layout": {
+        "columns": [["git", "stats", "todos", "probes"], ["system", "code", ["ports", "packages"]]],
+        "widths": [1, 1],
+    },
+    "panels": {},
+}
+
+
+class ConfigError(ValueError):
+    """A config file could not be read or has invalid settings"""
+
+
+def get_user_config_path() -> str:
+    """The user's config file ($DEVDASH_CONFIG or under $XDG_CONFIG_HOME)"""
+    if os.environ.get("DEVDASH_CONFIG"):
+        return os.environ["DEVDASH_CONFIG"]
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base, "devdash", "config.toml")
+
+
+def find_project_config(path: str = ".") -> Optional[str]:
+    """Nearest .devdash.toml at or above path"""
+    current = os.path.abspath(path)
+    while True:
+        candidate = os.path.join(current, PROJECT_CONFIG)
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def read_toml(path: str) -> Dict[str, Any]:
+    """Parse a TOML file"""
+    if tomllib is None:
+        raise ConfigError(f"{path}: reading TOML needs Python 3.11+ or 'pip install tomli'")
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except OSError as e:
+        raise ConfigError(f"{path}: {e.strerror}") from e
+    except tomllib.TOMLDecodeError as e:
+        raise ConfigError(f"{path}: {e}") from e
+
+
+def merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep-merge override into a copy of base (lists are replaced, not joined)"""
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def _check_type(where: str, value: Any, expected) -> None:
+    # bool is an int; a number option must not accept true/false
+    if isinstance(value, bool) and expected is not bool:
+        raise ConfigError(f"{where} must be a number, not {value!r}")
+    if not isinstance(value, expected):
+        names = " or ".join(t.__name__ for t in (expected if isinstance(expected, tuple) else (expected,)))
+        raise ConfigError(f"{where} must be {names}, not {value!r}")
+
+
+def validate(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Check panel names, option names and types; returns config"""
+    dashboard = config.get("dashboard", {})
+    for key, value in dashboard.items():
+        if key not in ("refresh", "cpu_budget"):
+            raise ConfigError(f"unknown setting dashboard.{key}")
+        _check_type(f"dashboard.{key}", value, (int, float))
+    if dashboard.get("refresh", 1) <= 0:
+        raise ConfigError("dashboard.refresh must be positive")
+    if dashboard.get("cpu_budget", 0) < 0:
+        raise ConfigError("dashboard.cpu_budget must not be negative")
+    
+    layout = config.get("layout", {})
+    for key in layout:
+        if key not in ("columns", "widths"):
+            raise ConfigError(f"unknown setting layout.{key}")
+    seen = set()
+    for column in layout.get("columns", []):
+        _check_type("layout.columns entries", column, list)
+        for row in column:
+            for name in row if isinstance(row, list) else [row]:
+                if name not in PANEL_NAMES:
+                    raise ConfigError(f"unknown panel {name!r} in layout.columns (panels: {', '.join(PANEL_NAMES)})")
+                if name in seen:
+                    raise ConfigError(f"panel {name!r} appears twice in layout.columns")
+                seen.add(name)
+    for width in layout.get("widths", []):
+        _check_type("layout.widths entries", width, (int, float))
+    
+    for name, options in config.get("panels", {}).items():
+        if name not in PANEL_NAMES:
+            raise ConfigError(f"unknown panel [panels.{name}] (panels: {', '.join(PANEL_NAMES)})")
+        allowed = dict(COMMON_OPTIONS, **PANEL_OPTIONS.get(name, {}))
+        for key, value in options.items():
+            if key not in allowed:
+                raise ConfigError(f"unknown option panels.{name}.{key}")
+            _check_type(f"panels.{name}.{key}", value, allowed[key])
+            if key in ("size", "refresh") and value <= 0:
+                raise ConfigError(f"panels.{name}.{key} must be positive")
+            if key == "highlight":
+                try:
+                    re.compile(value)
+                except re.error as e:
+                    raise ConfigError(f"panels.{name}.{key}: invalid pattern: {e}") from e
+    return config
+
+
+def load_config(path: str = ".", config_file: Optional[str] = None) -> Dict[str, Any]:
+    """Defaults, then the user's config file, then the project's .devdash.toml
+    
+    config_file replaces the user's config file (it must exist).
+    """
+    config = get_default_config()
+    user_file = config_file or get_user_config_path()
+    if config_file or os.path.isfile(user_file):
+        config = merge(config, read_toml(user_file))
+    project_file = find_project_config(path)
+    if project_file:
+        config = merge(config, read_toml(project_file))
+    return validate(config)
+
+
+def get_default_config() -> Dict[str, Any]:
+    """A copy of the built-in settings"""
+    return copy.deepcopy(DEFAULT_CONFIG)
+
+
+def get_panel_options(config: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """A panel's settings (empty when it has none)"""
+    return config.get("panels", {}).get(name, {})
+
+
+def get_collector_options(config: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """A panel's settings that change what its collector returns (not enabled/size/refresh)"""
+    options = get_panel_options(config, name)
+    return {key: value for key, value in options.items() if key in PANEL_OPTIONS.get(name, {})}
+
+
+def get_visible_panels(config: Dict[str, Any]) -> List[str]:
+    """Panels placed in the layout and not disabled, in layout order"""
+    panels = []
+    for column in config.get("layout", {}).get("columns", []):
+        for row in column:
+            for name in row if isinstance(row, list) else [row]:
+                if get_panel_options(config, name).get("enabled", True):
+                    panels.append(name)
+    return panels
@@ -0,0 +1,401 @@
+"""
+Container utilities for DevDash
+
+Talks to the Docker Engine API (which Podman also serves) over the
+engine's Unix socket, without the docker CLI or an SDK. Requests share a
+small pool of keep-alive connections. The container table is read once
+and then kept current from the streaming /events endpoint, instead of
+polling the engine. CPU and memory stats come in one batch: a single
+libpod request on Podman, or one-shot requests to all containers at once
+over the pool on Docker.
+"""
+
+import os
+import json
+import socket
+import time
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import quote
+
+from .index_utils import ConnectionPool
+
+# Engine sockets tried in order when $DOCKER_HOST/$CONTAINER_HOST is not a unix:// URL
+DEFAULT_SOCKETS = (
+    "/var/run/docker.sock",
+    "$XDG_RUNTIME_DIR/podman/podman.sock",
+    "/run/podman/podman.sock",
+    "~/.docker/run/docker.sock",
+)
+
+# Keep-alive connections kept open for requests (the event stream has its own)
+POOL_SIZE = 4
+
+# Seconds before reconnecting a dropped event stream
+RECONNECT_DELAY = 2.0
+
+# Container events that change what the table shows
+TABLE_EVENTS = {
+    "create", "start", "restart", "stop", "die", "kill", "pause", "unpause",
+    "rename", "update", "health_status", "oom",
+}
+
+
+class EngineError(OSError):
+    """The container engine could not be reached or refused a request"""
+
+
+def find_socket() -> Optional[str]:
+    """Path of the Docker or Podman API socket, if one exists"""
+    for variable in ("DOCKER_HOST", "CONTAINER_HOST"):
+        value = os.environ.get(variable, "")
+        if value.startswith("unix://"):
+            return value[len("unix://"):]
+    for candidate in DEFAULT_SOCKETS:
+        path = os.path.expanduser(os.path.expandvars(candidate))
+        if "$" not in path and os.path.exists(path):
+            return path
+    return None
+
+
+class UnixConnection(http.client.HTTPConnection):
+    """HTTP/1.1 connection over a Unix domain socket"""
+    
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+    
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class UnixConnectionPool(ConnectionPool):
+    """ConnectionPool whose connections go to a Unix socket"""
+    
+    def __init__(self, socket_path: str, size: int = POOL_SIZE, timeout: float = 5.0):
+        super().__init__("http", "localhost", None, size=size, timeout=timeout)
+        self.socket_path = socket_path
+    
+    def _new_connection(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.created += 1
+        return UnixConnection(self.socket_path, timeout=self.timeout)
+
+
+class EngineClient:
+    """Docker Engine API client over a Unix socket"""
+    
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 5.0, pool_size: int = POOL_SIZE):
+        self.socket_path = socket_path or find_socket()
+        self.timeout = timeout
+        self.pool = UnixConnectionPool(self.socket_path, pool_size, timeout) if self.socket_path else None
+        self._stream: Optional[UnixConnection] = None
+    
+    def get(self, path: str) -> Any:
+        """GET an API path and decode its JSON body"""
+        if self.pool is None:
+            raise EngineError("no Docker or Podman socket found (set DOCKER_HOST=unix://...)")
+        try:
+            status, _, body = self.pool.request(path, {"Accept": "application/json"})
+        except (http.client.HTTPException, OSError) as e:
+            raise EngineError(f"{self.socket_path}: {e}") from e
+        try:
+            data = json.loads(body) if body else None
+        except ValueError as e:
+            raise EngineError(f"{path}: invalid JSON from engine") from e
+        if status >= 400:
+            message = data.get("message") if isinstance(data, dict) else None
+            raise EngineError(f"{path}: HTTP {status}" + (f": {message}" if message else ""))
+        return data
+    
+    def version(self) -> Dict:
+        """Engine name and version ({"name": "Docker"|"Podman", "version": ...})"""
+        data = self.get("/version")
+        if not isinstance(data, dict):
+            raise EngineError("/version: unexpected reply from engine")
+        components = [c.get("Name", "") for c in data.get("Components") or []]
+        name = "Podman" if any("Podman" in c for c in components) else "Docker"
+        return {"name": name, "version": data.get("Version", "?"), "api": data.get("ApiVersion")}
+    
+    def list_containers(self, all: bool = True, container_id: Optional[str] = None) -> List[Dict]:
+        """Container summaries (/containers/json), optionally just one"""
+        path = f"/containers/json?all={int(all)}"
+        if container_id:
+            path += "&filters=" + quote(json.dumps({"id": [container_id]}))
+        data = self.get(path) or []
+        if not isinstance(data, list) or any(not isinstance(summary, dict) for summary in data):
+            raise EngineError(f"{path}: unexpected reply from engine")
+        return data
+    
+    def stats(self, container_id: str) -> Dict:
+        """One stats sample of a container, without waiting for a second one"""
+        return self.get(f"/containers/{container_id}/stats?stream=false&one-shot=true")
+    
+    def podman_stats(self) -> List[Dict]:
+        """Stats of every running container in one libpod request (Podman only)"""
+        data = self.get("/v4.0.0/libpod/containers/stats?stream=false")
+        return (data or {}).get("Stats") or []
+    
+    def events(self) -> Iterator[Dict]:
+        """Container events as they happen, until the stream ends or close_events()
+        
+        The stream has a connection of its own; it is open (and nothing is
+        missed) by the time the first event is asked for, so callers can
+        read the container table after starting it.
+        """
+        if self.socket_path is None:
+            raise EngineError("no Docker or Podman socket found (set DOCKER_HOST=unix://...)")
+        conn = UnixConnection(self.socket_path, timeout=None)
+        self._stream = conn
+        try:
+            conn.request("GET", "/events?filters=" + quote(json.dumps({"type": ["container"]})))
+            response = conn.getresponse()
+            if response.status >= 400:
+                raise EngineError(f"/events: HTTP {response.status}")
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            raise EngineError(f"{self.socket_path}: {e}") from e
+        stream = self._read_events(conn, response)
+        # Enter the generator so that closing it before the first event closes the connection
+        next(stream)
+        return stream
+    
+    def _read_events(self, conn: UnixConnection, response: http.client.HTTPResponse) -> Iterator[Dict]:
+        try:
+            yield {}
+            while True:
+                line = response.readline()
+                if not line:
+                    return
+                if line.strip():
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(event, dict):
+                        yield event
+        except (http.client.HTTPException, OSError, ValueError):
+            return
+        finally:
+            conn.close()
+    
+    def close_events(self) -> None:
+        """End the event stream (from any thread)"""
+        stream, self._stream = self._stream, None
+        if stream is not None and stream.sock is not None:
+            try:
+                stream.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    
+    def close(self) -> None:
+        """Close the event stream and pooled connections"""
+        self.close_events()
+        if self.pool is not None:
+            self.pool.close()
+
+
+def parse_container(summary: Dict) -> Dict:
+    """Table row for a /containers/json entry"""
+    names = summary.get("Names") or [summary.get("Id", "")[:12]]
+    ports = sorted({
+        (p["PublicPort"], p.get("PrivatePort"), p.get("Type", "tcp"))
+        for p in summary.get("Ports") or [] if p.get("PublicPort")
+    })
+    return {
+        "id": summary.get("Id", ""),
+        "name": names[0].lstrip("/"),
+        "image": summary.get("Image", ""),
+        "state": summary.get("State", "unknown"),
+        "status": summary.get("Status", ""),
+        "ports": [{"public": public, "private": private, "proto": proto} for public, private, proto in ports],
+        "cpu": None,
+        "mem": None,
+        "mem_limit": None,
+    }
+
+
+def memory_usage(stats: Dict) -> Optional[int]:
+    """Memory in use from a Docker stats sample, page cache excluded like docker stats"""
+    memory = stats.get("memory_stats") or {}
+    usage = memory.get("usage")
+    if usage is None:
+        return None
+    detail = memory.get("stats") or {}
+    cache = detail.get("inactive_file", detail.get("total_inactive_file", 0))
+    return max(0, usage - cache)
+
+
+class ContainerWatcher:
+    """Container table kept current by the engine's event stream"""
+    
+    def __init__(self, client: Optional[EngineClient] = None, stats_workers: int = POOL_SIZE):
+        self.client = client or EngineClient()
+        self.stats_workers = stats_workers
+        self.containers: Dict[str, Dict] = {}
+        self.engine: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.connected = False
+        self.events_seen = 0
+        # Bumped whenever the table changes
+        self.version = 0
+        self._cpu_samples: Dict[str, tuple] = {}
+        self._stats_time = float("-inf")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> "ContainerWatcher":
+        """Start following engine events in a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._follow, name="devdash-containers", daemon=True)
+            self._thread.start()
+        return self
+    
+    def sync(self) -> None:
+        """Replace the table with the engine's container list"""
+        rows = {}
+        for summary in self.client.list_containers(all=True):
+            row = parse_container(summary)
+            rows[row["id"]] = row
+        with self._lock:
+            for container_id, row in rows.items():
+                previous = self.containers.get(container_id)
+                if previous is not None:
+                    row.update(cpu=previous["cpu"], mem=previous["mem"], mem_limit=previous["mem_limit"])
+            self.containers = rows
+            self.version += 1
+    
+    def _follow(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.engine is None:
+                    self.engine = self.client.version()
+                events = self.client.events()
+                try:
+                    # The stream is open: nothing between this read and the first event is lost
+                    self.sync()
+                    self.connected, self.error = True, None
+                    for event in events:
+                        self.handle_event(event)
+                        if self._stop.is_set():
+                            break
+                finally:
+                    events.close()
+            except EngineError as e:
+                self.error = str(e)
+            except Exception as e:
+                # A reply of an unexpected shape must not end the thread unnoticed
+                self.error = f"{type(e).__name__}: {e}"
+            self.connected = False
+            self._stop.wait(RECONNECT_DELAY)
+    
+    def handle_event(self, event: Dict) -> None:
+        """Apply one container event to the table"""
+        self.events_seen += 1
+        action = (event.get("Action") or event.get("status") or "").split(":", 1)[0]
+        container_id = event.get("id") or (event.get("Actor") or {}).get("ID")
+        if not container_id:
+            return
+        if action == "destroy":
+            with self._lock:
+                if self.containers.pop(container_id, None) is not None:
+                    self.version += 1
+                self._cpu_samples.pop(container_id, None)
+            return
+        if action not in TABLE_EVENTS:
+            return
+        try:
+            summaries = self.client.list_containers(all=True, container_id=container_id)
+        except EngineError:
+            return
+        with self._lock:
+            for summary in summaries:
+                row = parse_container(summary)
+                previous = self.containers.get(row["id"])
+                if previous is not None and row["state"] == "running":
+                    row.update(cpu=previous["cpu"], mem=previous["mem"], mem_limit=previous["mem_limit"])
+                self.containers[row["id"]] = row
+            self.version += 1
+    
+    def _docker_stats(self, container_id: str) -> Optional[Dict]:
+        try:
+            stats = self.client.stats(container_id)
+        except EngineError:
+            return None
+        cpu_stats = stats.get("cpu_stats") or {}
+        total = (cpu_stats.get("cpu_usage") or {}).get("total_usage")
+        system = cpu_stats.get("system_cpu_usage")
+        cpus = cpu_stats.get("online_cpus") or len((cpu_stats.get("cpu_usage") or {}).get("percpu_usage") or []) or 1
+        
+        # One-shot samples carry no previous reading: compare with ours
+        cpu = None
+        previous = self._cpu_samples.get(container_id)
+        if total is not None and system is not None:
+            if previous is not None and system > previous[1]:
+                cpu = max(0.0, (total - previous[0]) / (system - previous[1]) * cpus * 100)
+            self._cpu_samples[container_id] = (total, system)
+        return {"cpu": cpu, "mem": memory_usage(stats), "mem_limit": (stats.get("memory_stats") or {}).get("limit")}
+    
+    def update_stats(self, max_age: float = 0.0) -> None:
+        """Read CPU and memory of the running containers in one batch
+        
+        Nothing is read when the last batch is less than max_age seconds old.
+        """
+        if time.monotonic() - self._stats_time < max_age:
+            return
+        self._stats_time = time.monotonic()
+        with self._lock:
+            running = [cid for cid, row in self.containers.items() if row["state"] == "running"]
+        if not running:
+            return
+        
+        if self.engine is not None and self.engine["name"] == "Podman":
+            try:
+                samples = {
+                    s.get("ContainerID"): {"cpu": s.get("CPU"), "mem": s.get("MemUsage"), "mem_limit": s.get("MemLimit")}
+                    for s in self.client.podman_stats()
+                }
+            except EngineError:
+                return
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.stats_workers, len(running)))) as pool:
+                samples = dict(zip(running, pool.map(self._docker_stats, running)))
+        
+        with self._lock:
+            for container_id, sample in samples.items():
+                row = self.containers.get(container_id)
+                if row is not None and sample is not None:
+                    row.update(sample)
+    
+    def get_rows(self) -> List[Dict]:
+        """Containers, running first, then by name"""
+        with self._lock:
+            rows = [dict(row) for row in self.containers.values()]
+        return sorted(rows, key=lambda r: (r["state"] != "running", r["name"]))
+    
+    def get_port_map(self) -> Dict[int, str]:
+        """Published host port -> name of the running container behind it"""
+        with self._lock:
+            return {
+                port["public"]: row["name"]
+                for row in self.containers.values() if row["state"] == "running"
+                for port in row["ports"]
+            }
+    
+    def stop(self) -> None:
+        """Stop following events and close the connections"""
+        self._stop.set()
+        self.client.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
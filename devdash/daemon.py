@@ -0,0 +1,437 @@
+"""
+Collector daemon for DevDash
+
+devdashd owns the collectors and serves their snapshots over a Unix
+domain socket, so that several dashboards, CLI calls and prompt hooks
+share one `git status`, one socket table scan and one `pip list` instead
+of each running their own.
+"""
+
+import os
+import sys
+import json
+import stat
+import time
+import socket
+import argparse
+import threading
+import socketserver
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import __version__
+from .protocol import ProtocolError, get_socket_path, recv_frame, send_frame
+
+UNIX_SOCKETS_AVAILABLE = hasattr(socket, "AF_UNIX")
+
+# Collectors served by the daemon; the rest of the dashboard stays local
+DAEMON_COLLECTORS = ("git", "stats", "system", "ports", "packages", "probes", "todos", "code")
+
+# Collectors that do not depend on the project path: one snapshot per options
+SHARED_COLLECTORS = ("system", "ports", "probes")
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening, or it stopped answering"""
+
+
+class SnapshotCache:
+    """Latest value per key with single-flight recomputation
+    
+    Concurrent requests for a key that is being collected wait for that
+    collection instead of starting their own.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, Dict] = {}
+        self._inflight: Dict[Tuple, threading.Event] = {}
+        self.hits = 0
+        self.collections = 0
+    
+    def get(self, key: Tuple, max_age: float, compute: Callable[[], Any]) -> Dict:
+        """Entry {"value", "error", "updated"} no older than max_age seconds"""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.time() - entry["updated"] <= max_age:
+                    self.hits += 1
+                    return entry
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    break
+            # Someone else is collecting: share their result
+            event.wait()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    return entry
+        
+        try:
+            value, error = None, None
+            try:
+                value = compute()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            entry = {"value": value, "error": error, "updated": time.time()}
+            with self._lock:
+                self._entries[key] = entry
+                self.collections += 1
+            return entry
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Serve frames on one client connection until it disconnects"""
+    
+    def handle(self) -> None:
+        daemon = self.server.collector_daemon
+        with daemon._lock:
+            daemon.clients += 1
+        try:
+            while True:
+                try:
+                    message = recv_frame(self.request)
+                except (ProtocolError, OSError):
+                    return
+                if message is None:
+                    return
+                send_frame(self.request, daemon.handle(message))
+        except OSError:
+            pass
+        finally:
+            with daemon._lock:
+                daemon.clients -= 1
+
+
+if UNIX_SOCKETS_AVAILABLE:
+    class _Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+class CollectorDaemon:
+    """Serve collector snapshots over a Unix domain socket"""
+    
+    def __init__(self, socket_path: Optional[str] = None, idle_timeout: Optional[float] = None):
+        self.socket_path = socket_path or get_socket_path()
+        # The default directory may be in /tmp, where anyone can create it first
+        self._check_directory = socket_path is None and not os.environ.get("DEVDASH_SOCKET")
+        self.idle_timeout = idle_timeout
+        self.cache = SnapshotCache()
+        self._dashboards: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.BaseServer] = None
+        self.started = time.time()
+        self.last_request = time.time()
+        self.requests = 0
+        self.clients = 0
+    
+    def _get_dashboard(self, path: str, name: str = "", options: Optional[Dict] = None):
+        """DevDash instance whose collectors serve a project path
+        
+        A collector's options (packages.outdated, probes.targets) come with
+        each request, from the config the client loaded; requests with the
+        default options share one instance per path.
+        """
+        key = (path, name, json.dumps(options, sort_keys=True)) if options else (path,)
+        with self._lock:
+            dash = self._dashboards.get(key)
+            if dash is None:
+                from .config import get_default_config
+                from .dashboard import DevDash
+                config = get_default_config()
+                if options:
+                    config["panels"][name] = dict(options)
+                dash = self._dashboards[key] = DevDash(path, config)
+                # Collect here rather than asking ourselves
+                dash.daemon = None
+            return dash
+    
+    def collect(self, name: str, path: str, max_age: float, options: Optional[Dict] = None) -> Dict:
+        """Snapshot of a collector, collected at most once at a time
+        
+        Raises KeyError for an unknown collector, ConfigError for options
+        the collector does not take.
+        """
+        if name not in DAEMON_COLLECTORS:
+            raise KeyError(name)
+        from .config import validate
+        options = options or {}
+        validate({"panels": {name: options}})
+        path = os.path.abspath(path)
+        # Snapshots differ by path (unless shared) and by the options they were collected with
+        key = (name, None if name in SHARED_COLLECTORS else path, json.dumps(options, sort_keys=True))
+        return self.cache.get(
+            key, max_age,
+            lambda: self._get_dashboard(path, name, options).get_local_collectors()[name]()
+        )
+    
+    def handle(self, message: Dict) -> Dict:
+        """Reply to one request"""
+        with self._lock:
+            self.requests += 1
+            self.last_request = time.time()
+        
+        op = message.get("op")
+        if op == "ping":
+            return {"ok": True, "version": __version__, "pid": os.getpid()}
+        
+        if op == "get":
+            from .config import ConfigError
+            options = message.get("options") or {}
+            if not isinstance(options, dict):
+                return {"ok": False, "error": "options must be a table"}
+            try:
+                entry = self.collect(
+                    message.get("name", ""),
+                    message.get("path") or ".",
+                    float(message.get("max_age", 2.0)),
+                    options
+                )
+            except ConfigError as e:
+                return {"ok": False, "error": f"ConfigError: {e}"}
+            except (KeyError, TypeError, ValueError):
+                return {"ok": False, "error": f"unknown collector {message.get('name')!r}"}
+            if entry["error"] is not None:
+                return {"ok": False, "error": entry["error"], "updated": entry["updated"]}
+            return {"ok": True, "value": entry["value"], "updated": entry["updated"]}
+        
+        if op == "stats":
+            return {"ok": True, "stats": self.get_stats()}
+        
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        
+        return {"ok": False, "error": f"unknown op {op!r}"}
+    
+    def get_stats(self) -> Dict:
+        """Requests served, collections run and cache hits"""
+        return {
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started, 1),
+            "clients": self.clients,
+            "requests": self.requests,
+            "collections": self.cache.collections,
+            "hits": self.cache.hits,
+            "projects": len({key[0] for key in self._dashboards}),
+        }
+    
+    def _bind(self) -> "socketserver.BaseServer":
+        """Bind the socket, replacing a stale one left by a crashed daemon"""
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            if self._check_directory and hasattr(os, "getuid"):
+                st = os.lstat(directory)
+                if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+                    raise RuntimeError(f"{directory} is not a private directory owned by this user")
+        
+        if os.path.exists(self.socket_path):
+            if DaemonClient(self.socket_path).ping():
+                raise RuntimeError(f"devdashd is already running on {self.socket_path}")
+            os.unlink(self.socket_path)
+        
+        old_umask = os.umask(0o177)
+        try:
+            server = _Server(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        server.collector_daemon = self
+        return server
+    
+    def _watch_idle(self) -> None:
+        while self._server is not None:
+            time.sleep(min(1.0, self.idle_timeout))
+            if self.clients == 0 and time.time() - self.last_request > self.idle_timeout:
+                self.shutdown()
+                return
+    
+    def serve_forever(self) -> None:
+        """Serve until shutdown() (or idle_timeout seconds without requests)"""
+        if not UNIX_SOCKETS_AVAILABLE:
+            raise RuntimeError("devdashd needs Unix domain sockets")
+        self._server = self._bind()
+        if self.idle_timeout:
+            threading.Thread(target=self._watch_idle, daemon=True).start()
+        try:
+            self._server.serve_forever(poll_interval=0.2)
+        finally:
+            server, self._server = self._server, None
+            if server is not None:
+                server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+    
+    def shutdown(self) -> None:
+        """Stop serving (from any thread but the serving one)"""
+        server = self._server
+        if server is not None:
+            server.shutdown()
+
+
+class DaemonClient:
+    """Client for devdashd that callers can fall back from
+    
+    After a failed connection the daemon is not tried again for
+    RETRY_INTERVAL seconds, so a missing daemon costs one failed
+    connect() now and then rather than one per collection.
+    """
+    
+    RETRY_INTERVAL = 5.0
+    
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 120.0):
+        self.socket_path = socket_path or get_socket_path()
+        self.timeout = timeout
+        # One connection per thread, so a slow collection (packages) does
+        # not hold up requests from other collector threads
+        self._local = threading.local()
+        self._sockets: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self._retry_at = 0.0
+    
+    @classmethod
+    def from_environment(cls) -> Optional["DaemonClient"]:
+        """Client for the default socket, or None if disabled (DEVDASH_NO_DAEMON)"""
+        if not UNIX_SOCKETS_AVAILABLE or os.environ.get("DEVDASH_NO_DAEMON"):
+            return None
+        return cls()
+    
+    def available(self) -> bool:
+        """Cheap check whether a daemon might be listening"""
+        return time.monotonic() >= self._retry_at and os.path.exists(self.socket_path)
+    
+    def _connect(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            return sock
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._local.sock = sock
+        with self._lock:
+            self._sockets.append(sock)
+        return sock
+    
+    def _disconnect(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            self._local.sock = None
+            with self._lock:
+                if sock in self._sockets:
+                    self._sockets.remove(sock)
+            sock.close()
+    
+    def request(self, message: Dict) -> Dict:
+        """Send a request and wait for its reply"""
+        if not UNIX_SOCKETS_AVAILABLE:
+            raise DaemonUnavailable("Unix domain sockets are not supported")
+        # A kept-alive connection may have been closed by a restarted daemon
+        for attempt in range(2):
+            try:
+                sock = self._connect()
+                send_frame(sock, message)
+                reply = recv_frame(sock)
+                if reply is None:
+                    raise ProtocolError("daemon closed the connection")
+                return reply
+            except (OSError, ProtocolError) as e:
+                self._disconnect()
+                if attempt or isinstance(e, (FileNotFoundError, ConnectionRefusedError, socket.timeout)):
+                    self._retry_at = time.monotonic() + self.RETRY_INTERVAL
+                    raise DaemonUnavailable(str(e)) from e
+    
+    def get(self, name: str, path: str = ".", max_age: float = 2.0, options: Optional[Dict] = None) -> Any:
+        """A collector's snapshot from the daemon
+        
+        options are the collector's settings from the client's config
+        (see config.get_collector_options). Raises DaemonUnavailable to
+        fall back to collecting in-process, RuntimeError if the daemon's
+        collector failed.
+        """
+        reply = self.request({
+            "op": "get",
+            "name": name,
+            "path": os.path.abspath(path),
+            "max_age": max_age,
+            "options": options or {},
+        })
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error", "daemon error"))
+        return reply.get("value")
+    
+    def ping(self) -> bool:
+        """Whether a daemon answers"""
+        try:
+            return bool(self.request({"op": "ping"}).get("ok"))
+        except DaemonUnavailable:
+            return False
+    
+    def close(self) -> None:
+        """Close the connections of all threads"""
+        with self._lock:
+            sockets, self._sockets = self._sockets, []
+        for sock in sockets:
+            sock.close()
+        self._local = threading.local()
+
+
+def main(argv=None) -> int:
+    """Entry point for devdashd"""
+    parser = argparse.ArgumentParser(
+        prog="devdashd",
+        description="DevDash collector daemon: shares collected data between devdash clients"
+    )
+    parser.add_argument("--socket", help="Socket path (default: %(default)s)", default=get_socket_path())
+    parser.add_argument("--idle-timeout", type=float, default=None, help="Exit after this many idle seconds")
+    parser.add_argument("--status", action="store_true", help="Show whether a daemon is running, then exit")
+    parser.add_argument("--stop", action="store_true", help="Stop the running daemon")
+    args = parser.parse_args(argv)
+    
+    if not UNIX_SOCKETS_AVAILABLE:
+        print("devdashd: Unix domain sockets are not supported on this platform", file=sys.stderr)
+        return 1
+    
+    if args.status or args.stop:
+        client = DaemonClient(args.socket, timeout=2.0)
+        try:
+            reply = client.request({"op": "shutdown" if args.stop else "stats"})
+        except DaemonUnavailable:
+            print(f"devdashd: not running ({args.socket})")
+            return 1
+        finally:
+            client.close()
+        if args.stop:
+            print("devdashd: stopped")
+        else:
+            stats = reply["stats"]
+            print(
+                f"devdashd: running (pid {stats['pid']}, up {stats['uptime']:.0f}s, "
+                f"{stats['clients']} clients, {stats['requests']} requests, "
+                f"{stats['collections']} collections, {stats['hits']} shared)"
+            )
+        return 0
+    
+    daemon = CollectorDaemon(args.socket, idle_timeout=args.idle_timeout)
+    try:
+        daemon.serve_forever()
+    except RuntimeError as e:
+        print(f"devdashd: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
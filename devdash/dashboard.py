@@ -3,9 +3,15 @@ Main Dashboard for DevDash
 Beautiful terminal UI using Rich
 """
 
+import os
+import json
 import time
+import shutil
+import hashlib
+import functools
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Dict, List, Optional
 
 try:
     from rich.console import Console
@@ -16,15 +22,31 @@ try:
     from rich.text import Text
     from rich.progress import Progress, BarColumn, TextColumn
     from rich.align import Align
+    from rich.markup import escape
     from rich import box
     RICH_AVAILABLE = True
 except ImportError:
     RICH_AVAILABLE = False
 
-from .git_utils import GitInfo
-from .system_utils import SystemInfo
-from .port_utils import PortScanner
-from .package_utils import PackageInfo
+from .config import get_collector_options, get_default_config, get_panel_options, get_visible_panels
+from .daemon import DAEMON_COLLECTORS, DaemonClient, DaemonUnavailable
+from .format_utils import format_age
+from .input_utils import KeyReader
+from .profiler import Profiler
+from .scheduler import AdaptiveScheduler
+from .term_utils import CellDiffRenderer
+from .worker_utils import CollectorPool
+
+# Panel backends (git_utils, system_utils, port_utils, probe_utils,
+# package_utils, workspace_utils, todo_utils, code_utils, project_utils,
+# log_utils, container_utils) are imported by the collectors that use
+# them, so panels left out of the layout never load them
+
+
+def hash_model(model) -> str:
+    """Stable digest of a panel data model"""
+    data = json.dumps(model, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
 
 
 class DevDash:
@@ -32,24 +54,125 @@ class DevDash:
     
     VERSION = "1.0.0"
     
-    def __init__(self, path: str = "."):
+    COLLECTOR_WORKERS = 4
+    
+    # Minimum seconds between collector runs (defaults to the refresh rate)
+    COLLECTOR_INTERVALS = {
+        "packages": 30.0,
+        "todos": 30.0,
+        "code": 30.0,
+        "projects": 60.0,
+    }
+    
+    # Outdated packages listed in the packages panel (all projects, ranked)
+    PACKAGE_ROWS = 8
+    
+    # Newest notes listed in the todos panel
+    TODO_ROWS = 6
+    
+    # Languages listed in the code panel (most code first)
+    CODE_ROWS = 6
+    
+    # Newest lines shown in the logs panel
+    LOG_ROWS = 10
+    
+    # Containers listed in the containers panel (running first), and the
+    # minimum seconds between CPU/memory batches
+    CONTAINER_ROWS = 8
+    CONTAINER_STATS_INTERVAL = 5.0
+    
+    # Projects listed in the projects panel (most frecent first) and finder
+    PROJECT_ROWS = 6
+    FINDER_ROWS = 15
+    
+    # Below this terminal size, compact mode shows a single status line
+    NARROW_WIDTH = 80
+    NARROW_HEIGHT = 20
+    
+    # Keys that zoom a panel to full screen (pressed again or Esc to go back)
+    ZOOM_KEYS = {
+        "g": "git",
+        "p": "ports",
+        "s": "system",
+        "k": "packages",
+        "t": "todos",
+        "c": "code",
+        "j": "projects",
+        "l": "logs",
+        "d": "containers",
+    }
+    
+    # Refresh rates stepped through with + (faster) and - (slower)
+    REFRESH_RATES = (0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+    
+    # Oldest devdashd snapshot accepted by one-shot commands (devdash git)
+    ONE_SHOT_MAX_AGE = 1.0
+    
+    # Spans listed in the --profile debug panel (slowest p95 first)
+    PROFILE_ROWS = 6
+    
+    def __init__(self, path: str = ".", config: Optional[Dict] = None):
         if not RICH_AVAILABLE:
             print("Error: 'rich' library required. Install: pip install rich")
             return
         
         self.console = Console()
         self.path = path
-        self.git = GitInfo(path)
+        self.config = config if config is not None else get_default_config()
+        # Panels shown and collected, in layout order
+        self.panels = get_visible_panels(self.config)
+        self.daemon = DaemonClient.from_environment()
+        self._frame_keys: Dict[str, object] = {}
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        packages = get_panel_options(self.config, "packages")
+        self.package_use_cache = True
+        self.package_ttl: Optional[float] = packages.get("ttl")
+        self.package_outdated = packages.get("outdated", True)
+        dashboard = self.config["dashboard"]
+        self.refresh_rate = float(dashboard["refresh"])
+        self.zoom: Optional[str] = None
+        self.layout: Optional[Layout] = None
+        self.profiler: Optional[Profiler] = None
+        # Fraction of one core devdash may use; None keeps fixed intervals
+        self.cpu_budget: Optional[float] = dashboard["cpu_budget"] / 100 or None
+        self.scheduler: Optional[AdaptiveScheduler] = None
+        self.project_visited = False
         self.running = False
     
-    def create_header(self) -> Panel:
-        """Create dashboard header"""
+    @functools.cached_property
+    def git(self):
+        """GitInfo for the project path"""
+        from .git_utils import GitInfo
+        return GitInfo(self.path)
+    
+    @functools.cached_property
+    def prober(self):
+        """ServiceProber keeping latency history across probes"""
+        from .probe_utils import ServiceProber
+        return ServiceProber(timeout=get_panel_options(self.config, "probes").get("timeout", 1.0))
+    
+    @functools.cached_property
+    def port_watcher(self):
+        """PortWatcher diffing the listening sockets between polls"""
+        from .port_utils import PortWatcher
+        return PortWatcher()
+    
+    def collect_header(self) -> Dict:
+        """Collect header data (clock at minute resolution)"""
+        return {
+            "version": self.VERSION,
+            "clock": datetime.now().strftime("%H:%M"),
+        }
+    
+    def render_header(self, model: Dict) -> Panel:
+        """Render the dashboard header"""
         header_text = Text()
         header_text.append("⚡ ", style="bold yellow")
         header_text.append("DEVDASH", style="bold cyan")
-        header_text.append(" v" + self.VERSION, style="dim")
+        header_text.append(" v" + model["version"], style="dim")
         header_text.append(" │ ", style="dim")
-        header_text.append(datetime.now().strftime("%H:%M:%S"), style="green")
+        header_text.append(model["clock"], style="green")
         header_text.append(" │ ", style="dim")
         header_text.append("Developer Dashboard", style="italic dim")
         
@@ -59,38 +182,56 @@ class DevDash:
             box=box.DOUBLE
         )
     
-    def create_git_panel(self) -> Panel:
-        """Create git information panel"""
+    def create_header(self) -> Panel:
+        """Create dashboard header"""
+        return self.render_header(self.collect_header())
+    
+    def collect_git(self) -> Dict:
+        """Collect git information"""
+        if not self.git.is_git_repo:
+            return {"repo": False}
+        
+        # Branch and change counts from one `git status --porcelain=v2`
+        state = self.git.get_state() or {"branch": None, "status": self.git.get_status()}
+        return {
+            "repo": True,
+            "project": self.git.get_repo_name(),
+            "branch": state["branch"] or "detached",
+            "status": state["status"],
+            "last_commit": self.git.get_last_commit(),
+            "uncommitted": sum(state["status"].values()),
+            "today": self.git.get_today_commits(),
+            "stash": self.git.get_stash_count(),
+        }
+    
+    def render_git(self, model: Dict) -> Panel:
+        """Render the git information panel"""
         git_info = Table(show_header=False, box=None, padding=(0, 1))
         git_info.add_column("Key", style="dim")
         git_info.add_column("Value", style="bold")
         
-        if self.git.is_git_repo:
-            branch = self.git.get_branch()
-            status = self.git.get_status()
-            last_commit = self.git.get_last_commit()
-            uncommitted = self.git.get_uncommitted_count()
-            today_commits = self.git.get_today_commits()
+        if model["repo"]:
+            status = model["status"]
+            last_commit = model["last_commit"]
             
-            branch_display = f"[cyan]{branch}[/cyan]"
-            if uncommitted > 0:
-                branch_display += f" [yellow]({uncommitted} changes)[/yellow]"
+            branch_display = f"[cyan]{model['branch']}[/cyan]"
+            if model["uncommitted"] > 0:
+                branch_display += f" [yellow]({model['uncommitted']} changes)[/yellow]"
             
-            git_info.add_row("📁 Project", f"[bold white]{self.git.get_repo_name()}[/bold white]")
+            git_info.add_row("📁 Project", f"[bold white]{model['project']}[/bold white]")
             git_info.add_row("🌿 Branch", branch_display)
             git_info.add_row("📝 Last Commit", f"[dim]{last_commit['message']}[/dim]")
             git_info.add_row("⏰ Committed", f"[green]{last_commit['time']}[/green]")
             git_info.add_row("👤 Author", f"{last_commit['author']}")
-            git_info.add_row("📊 Today", f"[cyan]{today_commits}[/cyan] commits")
+            git_info.add_row("📊 Today", f"[cyan]{model['today']}[/cyan] commits")
             
             if status['modified'] > 0:
                 git_info.add_row("✏️  Modified", f"[yellow]{status['modified']}[/yellow] files")
             if status['untracked'] > 0:
                 git_info.add_row("❓ Untracked", f"[red]{status['untracked']}[/red] files")
             
-            stash = self.git.get_stash_count()
-            if stash > 0:
-                git_info.add_row("📦 Stashed", f"[magenta]{stash}[/magenta]")
+            if model["stash"] > 0:
+                git_info.add_row("📦 Stashed", f"[magenta]{model['stash']}[/magenta]")
         else:
             git_info.add_row("⚠️  Status", "[yellow]Not a git repository[/yellow]")
         
@@ -101,34 +242,57 @@ class DevDash:
             box=box.ROUNDED
         )
     
-    def create_system_panel(self) -> Panel:
-        """Create system information panel"""
-        sys_info = Table(show_header=False, box=None, padding=(0, 1))
-        sys_info.add_column("Key", style="dim")
-        sys_info.add_column("Value")
+    def create_git_panel(self) -> Panel:
+        """Create git information panel"""
+        return self.render_git(self.collect("git", self.ONE_SHOT_MAX_AGE))
+    
+    def collect_system(self) -> Dict:
+        """Collect system information, rounded to what the panel shows"""
+        from .system_utils import SystemInfo
         
-        cpu = SystemInfo.get_cpu_percent()
         mem = SystemInfo.get_memory_info()
         disk = SystemInfo.get_disk_info()
         os_info = SystemInfo.get_os_info()
-        uptime = SystemInfo.get_uptime()
+        battery = SystemInfo.get_battery_info()
+        
+        return {
+            "os": f"{os_info['system']} {os_info['release']}",
+            "python": os_info["python"],
+            "uptime": SystemInfo.get_uptime(),
+            "cpu": round(SystemInfo.get_cpu_percent(), 1),
+            "mem_percent": round(mem["percent"], 1),
+            "mem_used": round(mem["used"], 1),
+            "mem_total": round(mem["total"], 1),
+            "disk_percent": round(disk["percent"], 1),
+            "disk_free": round(disk["free"]),
+            "processes": SystemInfo.get_process_count(),
+            "battery": {"percent": battery["percent"], "plugged": battery["plugged"]} if battery else None,
+        }
+    
+    def render_system(self, model: Dict) -> Panel:
+        """Render the system information panel"""
+        sys_info = Table(show_header=False, box=None, padding=(0, 1))
+        sys_info.add_column("Key", style="dim")
+        sys_info.add_column("Value")
+        
+        cpu = model["cpu"]
+        mem_percent = model["mem_percent"]
+        disk_percent = model["disk_percent"]
         
         cpu_color = "green" if cpu < 50 else "yellow" if cpu < 80 else "red"
-        mem_color = "green" if mem['percent'] < 50 else "yellow" if mem['percent'] < 80 else "red"
-        disk_color = "green" if disk['percent'] < 70 else "yellow" if disk['percent'] < 90 else "red"
+        mem_color = "green" if mem_percent < 50 else "yellow" if mem_percent < 80 else "red"
+        disk_color = "green" if disk_percent < 70 else "yellow" if disk_percent < 90 else "red"
         
-        sys_info.add_row("💻 OS", f"{os_info['system']} {os_info['release']}")
-        sys_info.add_row("🐍 Python", f"v{os_info['python']}")
-        sys_info.add_row("⏱️  Uptime", uptime)
+        sys_info.add_row("💻 OS", model["os"])
+        sys_info.add_row("🐍 Python", f"v{model['python']}")
+        sys_info.add_row("⏱️  Uptime", model["uptime"])
         sys_info.add_row("", "")
         sys_info.add_row("🔥 CPU", f"[{cpu_color}]{cpu:.1f}%[/{cpu_color}]")
-        sys_info.add_row("🧠 RAM", f"[{mem_color}]{mem['percent']:.1f}%[/{mem_color}] ({mem['used']:.1f}GB / {mem['total']:.1f}GB)")
-        sys_info.add_row("💾 Disk", f"[{disk_color}]{disk['percent']:.1f}%[/{disk_color}] ({disk['free']:.0f}GB free)")
+        sys_info.add_row("🧠 RAM", f"[{mem_color}]{mem_percent:.1f}%[/{mem_color}] ({model['mem_used']:.1f}GB / {model['mem_total']:.1f}GB)")
+        sys_info.add_row("💾 Disk", f"[{disk_color}]{disk_percent:.1f}%[/{disk_color}] ({model['disk_free']:.0f}GB free)")
+        sys_info.add_row("⚙️  Processes", f"{model['processes']}")
         
-        processes = SystemInfo.get_process_count()
-        sys_info.add_row("⚙️  Processes", f"{processes}")
-        
-        battery = SystemInfo.get_battery_info()
+        battery = model["battery"]
         if battery:
             bat_color = "green" if battery['percent'] > 50 else "yellow" if battery['percent'] > 20 else "red"
             bat_status = "🔌" if battery['plugged'] else "🔋"
@@ -141,26 +305,106 @@ class DevDash:
             box=box.ROUNDED
         )
     
-    def create_ports_panel(self) -> Panel:
-        """Create ports information panel"""
+    def create_system_panel(self) -> Panel:
+        """Create system information panel"""
+        return self.render_system(self.collect("system", self.ONE_SHOT_MAX_AGE))
+    
+    def collect_ports(self) -> Dict:
+        """Collect listening ports with recent open/close/owner-change markers"""
+        self.port_watcher.poll()
+        recent = self.port_watcher.recent_changes()
+        
+        rows = []
+        seen_ports = set()
+        for p in self.port_watcher.ports:
+            if p["port"] not in seen_ports:
+                seen_ports.add(p["port"])
+                rows.append(p)
+        for port, event in recent.items():
+            if event["event"] == "closed" and port not in seen_ports:
+                rows.append(event)
+        rows.sort(key=lambda p: (p["port"] not in recent, -(p.get("established") or 0), p["port"]))
+        
+        model_rows = []
+        for p in rows:
+            event = recent.get(p["port"])
+            change = None
+            if event is not None:
+                if event["event"] == "closed" and p["port"] in seen_ports:
+                    change = None
+                else:
+                    change = event["event"]
+            cpu = p.get("cpu")
+            rss = p.get("rss")
+            model_rows.append({
+                "port": p["port"],
+                "icon": p.get("icon", "●"),
+                "change": change,
+                "service": p["service"],
+                "process": p["process"][:15],
+                "established": p.get("established"),
+                "queue": f"{p['rx_queue']}/{p['tx_queue']}" if p.get("rx_queue") is not None else None,
+                "cpu": round(cpu) if cpu is not None else None,
+                "rss": round(rss / (1024 ** 2)) if rss else None,
+            })
+        return {"rows": model_rows}
+    
+    def label_container_ports(self, model: Dict) -> Dict:
+        """Credit ports published by containers to the container, not the engine's proxy
+        
+        Done after collection, on this client: the ports snapshot is shared
+        through devdashd with dashboards that show no containers panel.
+        """
+        containers = self.container_watcher.get_port_map()
+        rows = []
+        for row in model["rows"]:
+            container = containers.get(row["port"])
+            rows.append(dict(row, icon="🐳", service=container) if container else row)
+        return dict(model, rows=rows)
+    
+    def render_ports(self, model: Dict) -> Panel:
+        """Render the ports panel"""
         ports_table = Table(show_header=True, box=box.SIMPLE, padding=(0, 1))
         ports_table.add_column("Port", style="cyan", justify="right")
         ports_table.add_column("", width=2)
         ports_table.add_column("Service", style="white")
         ports_table.add_column("Process", style="dim")
+        ports_table.add_column("Conn", justify="right")
+        ports_table.add_column("Queue", justify="right", style="dim")
+        ports_table.add_column("CPU", justify="right")
+        ports_table.add_column("RSS", justify="right", style="dim")
         
-        ports = PortScanner.get_listening_ports()
+        changes = {
+            "opened": ("bold green", "+"),
+            "closed": ("red strike", "-"),
+            "owner-changed": ("bold yellow", "~"),
+        }
         
-        if ports:
-            for p in ports[:8]:
+        if model["rows"]:
+            for p in model["rows"]:
+                style, marker = changes.get(p["change"], (None, p["icon"]))
+                
+                established = p["established"]
+                conn_color = "dim" if not established else "green" if established < 50 else "yellow"
+                cpu = p["cpu"]
+                cpu_text = "-"
+                if cpu is not None:
+                    cpu_color = "green" if cpu < 50 else "yellow" if cpu < 80 else "red"
+                    cpu_text = f"[{cpu_color}]{cpu}%[/{cpu_color}]"
+                
                 ports_table.add_row(
                     str(p['port']),
-                    p['icon'],
+                    marker,
                     p['service'],
-                    p['process'][:15]
+                    p['process'],
+                    f"[{conn_color}]{established or 0}[/{conn_color}]" if established is not None else "-",
+                    p["queue"] or "-",
+                    cpu_text,
+                    f"{p['rss']}M" if p["rss"] else "-",
+                    style=style
                 )
         else:
-            ports_table.add_row("-", "", "No active ports", "")
+            ports_table.add_row("-", "", "No active ports", "", "", "", "", "")
         
         return Panel(
             ports_table,
@@ -169,30 +413,181 @@ class DevDash:
             box=box.ROUNDED
         )
     
-    def create_packages_panel(self) -> Panel:
-        """Create packages information panel"""
+    def create_ports_panel(self) -> Panel:
+        """Create ports information panel"""
+        return self.render_ports(self.collect("ports", self.ONE_SHOT_MAX_AGE))
+    
+    def collect_probes(self, targets: Optional[List[Dict]] = None) -> Dict:
+        """Probe services and collect latency stats
+        
+        Without targets, probes the configured panels.probes.targets, or
+        else every listening port.
+        """
+        from .port_utils import PortScanner
+        from .probe_utils import ServiceProber
+        
+        if targets is None:
+            configured = get_panel_options(self.config, "probes").get("targets")
+            if configured:
+                targets = [ServiceProber.parse_target(t) for t in configured]
+            else:
+                targets = ServiceProber.targets_from_ports(PortScanner.get_listening_ports())
+        
+        results = self.prober.probe(targets) if targets else []
+        
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value, 1) if value is not None else None
+        
+        rows = []
+        for r in results:
+            stats = self.prober.get_stats(r["key"])
+            rows.append({
+                "target": f"{r['service']} {r['port']}" if r["service"] != "Unknown" else r["key"],
+                "check": r["check"],
+                "latency": ms(r["latency"]),
+                "p50": ms(stats["p50"]),
+                "p99": ms(stats["p99"]),
+                "up": r["up"],
+                "detail": r["detail"],
+            })
+        return {"rows": rows}
+    
+    def render_probes(self, model: Dict) -> Panel:
+        """Render the service health/latency panel"""
+        probe_table = Table(show_header=True, box=box.SIMPLE, padding=(0, 1))
+        probe_table.add_column("Target", style="cyan")
+        probe_table.add_column("Check", style="dim")
+        probe_table.add_column("Last", justify="right")
+        probe_table.add_column("p50", justify="right", style="dim")
+        probe_table.add_column("p99", justify="right", style="dim")
+        probe_table.add_column("Status")
+        
+        def fmt_ms(value: Optional[float]) -> str:
+            return f"{value:.1f}ms" if value is not None else "-"
+        
+        if model["rows"]:
+            for r in model["rows"]:
+                latency = r["latency"]
+                lat_color = "green" if latency is not None and latency < 50 else "yellow" if latency is not None and latency < 500 else "red"
+                status = f"[green]✔ {r['detail']}[/green]" if r["up"] else f"[red]✘ {r['detail']}[/red]"
+                probe_table.add_row(
+                    r["target"],
+                    r["check"],
+                    f"[{lat_color}]{fmt_ms(latency)}[/{lat_color}]",
+                    fmt_ms(r["p50"]),
+                    fmt_ms(r["p99"]),
+                    status
+                )
+        else:
+            probe_table.add_row("-", "", "", "", "", "No services to probe")
+        
+        return Panel(
+            probe_table,
+            title="[bold red]🩺 HEALTH[/bold red]",
+            border_style="red",
+            box=box.ROUNDED
+        )
+    
+    def create_probe_panel(self, targets: Optional[List[Dict]] = None) -> Panel:
+        """Create service health/latency panel"""
+        return self.render_probes(self.collect_probes(targets))
+    
+    def collect_packages(self) -> Dict:
+        """Collect outdated packages, dependency inventory and conflicts
+        
+        With panels.packages.outdated = false, package indexes are not
+        queried and "outdated" is None. "errors" lists the projects whose
+        check could not run; "environment" is False for a Python project
+        without a virtualenv (None for other projects).
+        """
+        from .package_utils import PackageInfo
+        
+        project_type = PackageInfo.detect_project_type(self.path)
+        projects = PackageInfo.find_projects(self.path)
+        outdated, errors = None, []
+        if self.package_outdated:
+            report = PackageInfo.get_outdated_report(
+                self.path,
+                use_cache=self.package_use_cache,
+                ttl=self.package_ttl,
+                projects=projects
+            )
+            outdated, errors = report["outdated"], report["errors"]
+        
+        has_projects = bool(outdated or project_type or projects)
+        
+        inventory = PackageInfo.get_dependency_inventory(self.path)
+        conflicts, environment = 0, None
+        if project_type in ["python-pip", "python-poetry"]:
+            summary = PackageInfo.get_python_environment(self.path)
+            conflicts = len(summary["conflicts"])
+            environment = summary["environment"] is not None
+        
+        return {
+            "outdated": [
+                {k: pkg.get(k) for k in ("name", "current", "latest", "project")}
+                for pkg in outdated[:self.PACKAGE_ROWS]
+            ] if outdated is not None else None,
+            "multi_project": len({pkg["project"] for pkg in outdated or []}) > 1,
+            "has_projects": has_projects,
+            "errors": errors,
+            "inventory": {
+                "direct": inventory["direct"],
+                "transitive": inventory["transitive"],
+                "duplicates": len(inventory["duplicates"]),
+                "heaviest": inventory["heaviest"][0] if inventory["heaviest"] else None,
+            } if inventory else None,
+            "conflicts": conflicts,
+            "environment": environment,
+        }
+    
+    def render_packages(self, model: Dict) -> Panel:
+        """Render the packages panel"""
         pkg_table = Table(show_header=True, box=box.SIMPLE, padding=(0, 1))
         pkg_table.add_column("Package", style="white")
         pkg_table.add_column("Current", style="red")
         pkg_table.add_column("Latest", style="green")
         
-        project_type = PackageInfo.detect_project_type(self.path)
+        # Name the project only when the results span several
+        if model["multi_project"]:
+            pkg_table.add_column("Project", style="dim")
         
-        if project_type:
-            outdated = PackageInfo.get_outdated_packages(self.path)
-            
-            if outdated:
-                for pkg in outdated[:5]:
-                    pkg_table.add_row(
-                        pkg['name'][:20],
-                        pkg['current'],
-                        pkg['latest']
-                    )
-            else:
-                pkg_table.add_row("✅", "All packages", "up to date")
+        if model["outdated"]:
+            for pkg in model["outdated"]:
+                row = [pkg['name'][:20], pkg['current'], pkg['latest']]
+                if model["multi_project"]:
+                    row.append(pkg['project'][:16])
+                pkg_table.add_row(*row)
+        elif model["outdated"] is None:
+            pkg_table.add_row("-", "Outdated check", "disabled")
+        elif model["errors"]:
+            # Nothing is known about the projects whose check failed
+            pkg_table.add_row("⚠", "Outdated check", "failed")
+        elif model["has_projects"]:
+            pkg_table.add_row("✅", "All packages", "up to date")
         else:
             pkg_table.add_row("-", "No package", "manager found")
         
+        captions = []
+        for error in model["errors"]:
+            where = f"{error['project']}: " if len(model["errors"]) > 1 else ""
+            captions.append(f"⚠ {where}check failed: {error['error']}")
+        inventory = model["inventory"]
+        if inventory:
+            caption = f"{inventory['direct']} direct · {inventory['transitive']} transitive"
+            if inventory["duplicates"]:
+                caption += f" · {inventory['duplicates']} dup"
+            if inventory["heaviest"]:
+                caption += f" · heaviest {inventory['heaviest']['name']} ({inventory['heaviest']['size']})"
+            captions.append(caption)
+        if model["conflicts"]:
+            captions.append(f"⚠ {model['conflicts']} conflicts")
+        if model["environment"] is False:
+            captions.append("⚠ no virtualenv found")
+        if captions:
+            pkg_table.caption = " · ".join(captions)
+            pkg_table.caption_style = "dim"
+        
         return Panel(
             pkg_table,
             title="[bold magenta]📦 PACKAGES[/bold magenta]",
@@ -200,22 +595,37 @@ class DevDash:
             box=box.ROUNDED
         )
     
-    def create_stats_panel(self) -> Panel:
-        """Create today's coding stats panel"""
+    def create_packages_panel(self) -> Panel:
+        """Create packages information panel"""
+        if not self.package_use_cache or self.package_ttl is not None:
+            # The daemon only serves the default caching policy
+            return self.render_packages(self.collect_packages())
+        return self.render_packages(self.collect("packages", self.ONE_SHOT_MAX_AGE))
+    
+    def collect_stats(self) -> Dict:
+        """Collect today's coding stats"""
+        if not self.git.is_git_repo:
+            return {"repo": False}
+        
+        return {
+            "repo": True,
+            "today": self.git.get_today_stats(),
+            "commits": self.git.get_today_commits(),
+            "branches": len(self.git.get_branches()),
+        }
+    
+    def render_stats(self, model: Dict) -> Panel:
+        """Render today's coding stats panel"""
         stats_table = Table(show_header=False, box=None, padding=(0, 1))
         stats_table.add_column("Key", style="dim")
         stats_table.add_column("Value", style="bold")
         
-        if self.git.is_git_repo:
-            today_stats = self.git.get_today_stats()
-            today_commits = self.git.get_today_commits()
-            
-            stats_table.add_row("📊 Commits Today", f"[cyan]{today_commits}[/cyan]")
+        if model["repo"]:
+            today_stats = model["today"]
+            stats_table.add_row("📊 Commits Today", f"[cyan]{model['commits']}[/cyan]")
             stats_table.add_row("➕ Lines Added", f"[green]+{today_stats['added']}[/green]")
             stats_table.add_row("➖ Lines Removed", f"[red]-{today_stats['removed']}[/red]")
-            
-            branches = len(self.git.get_branches())
-            stats_table.add_row("🌿 Branches", f"{branches}")
+            stats_table.add_row("🌿 Branches", f"{model['branches']}")
         else:
             stats_table.add_row("📊 Stats", "[dim]No git repo[/dim]")
         
@@ -226,6 +636,437 @@ class DevDash:
             box=box.ROUNDED
         )
     
+    def create_stats_panel(self) -> Panel:
+        """Create today's coding stats panel"""
+        return self.render_stats(self.collect("stats", self.ONE_SHOT_MAX_AGE))
+    
+    @functools.cached_property
+    def todo_scanner(self):
+        """TodoScanner whose blob cache lasts across refreshes"""
+        from .todo_utils import TodoScanner
+        return TodoScanner(self.path)
+    
+    def collect_todos(self) -> Dict:
+        """Collect TODO/FIXME/HACK counts, top authors and the newest notes"""
+        index = self.todo_scanner.scan(limit=self.TODO_ROWS)
+        return {
+            "total": index["total"],
+            "counts": index["counts"],
+            "authors": index["authors"][:3],
+            "newest": [
+                {
+                    "marker": item["marker"],
+                    "text": item["text"],
+                    "where": f"{item['path']}:{item['line']}",
+                    "author": item["author"],
+                    "age": format_age(item["time"]),
+                }
+                for item in index["newest"]
+            ],
+            "pending_blame": index["pending_blame"],
+        }
+    
+    def render_todos(self, model: Dict) -> Panel:
+        """Render the TODO/FIXME/HACK panel"""
+        todo_table = Table(show_header=False, box=None, padding=(0, 1), expand=True)
+        todo_table.add_column("Marker", no_wrap=True)
+        todo_table.add_column("Note", no_wrap=True, overflow="ellipsis", ratio=3)
+        todo_table.add_column("Where", style="dim", no_wrap=True, overflow="ellipsis", ratio=2)
+        todo_table.add_column("Age", style="dim", justify="right", no_wrap=True)
+        
+        colors = {"TODO": "cyan", "FIXME": "red", "HACK": "yellow"}
+        for item in model["newest"]:
+            color = colors.get(item["marker"], "white")
+            todo_table.add_row(f"[{color}]{item['marker']}[/{color}]", item["text"], item["where"], item["age"])
+        if not model["newest"]:
+            todo_table.add_row("✅", "No markers found", "", "")
+        
+        counts = " · ".join(f"{marker} {count}" for marker, count in model["counts"].items())
+        authors = ", ".join(f"{name} {count}" for name, count in model["authors"])
+        todo_table.caption = counts + (f" │ {authors}" if authors else "")
+        todo_table.caption_style = "dim"
+        
+        return Panel(
+            todo_table,
+            title=f"[bold bright_yellow]📝 TODOS ({model['total']})[/bold bright_yellow]",
+            border_style="bright_yellow",
+            box=box.ROUNDED
+        )
+    
+    def create_todos_panel(self) -> Panel:
+        """Create the TODO/FIXME/HACK panel"""
+        return self.render_todos(self.collect("todos", self.ONE_SHOT_MAX_AGE))
+    
+    @functools.cached_property
+    def code_counter(self):
+        """CodeCounter whose per-file index lasts across refreshes"""
+        from .code_utils import CodeCounter
+        return CodeCounter(self.path)
+    
+    def collect_code(self) -> Dict:
+        """Collect files and code/comment/blank lines per language"""
+        stats = self.code_counter.get_stats(limit=3)
+        return {
+            "files": stats["files"],
+            "code": stats["code"],
+            "comment": stats["comment"],
+            "blank": stats["blank"],
+            "languages": stats["languages"][:self.CODE_ROWS],
+            "largest": stats["largest"],
+        }
+    
+    def render_code(self, model: Dict) -> Panel:
+        """Render the code statistics panel"""
+        code_table = Table(show_header=True, box=box.SIMPLE, padding=(0, 1))
+        code_table.add_column("Language", style="cyan", no_wrap=True)
+        code_table.add_column("Files", justify="right", style="dim", no_wrap=True)
+        code_table.add_column("Code", justify="right", style="bold", no_wrap=True)
+        code_table.add_column("Comment", justify="right", style="dim")
+        
+        for language in model["languages"]:
+            code_table.add_row(
+                language["name"],
+                f"{language['files']:,}",
+                f"{language['code']:,}",
+                f"{language['comment']:,}"
+            )
+        if not model["languages"]:
+            code_table.add_row("-", "", "No source files", "")
+        
+        if model["largest"]:
+            largest = ", ".join(f"{f['path']} ({f['lines']:,})" for f in model["largest"])
+            code_table.caption = f"Largest: {largest}"
+            code_table.caption_style = "dim"
+        
+        return Panel(
+            code_table,
+            title=f"[bold bright_cyan]🧮 CODE · {model['code']:,} lines in {model['files']:,} files[/bold bright_cyan]",
+            border_style="bright_cyan",
+            box=box.ROUNDED
+        )
+    
+    def create_code_panel(self) -> Panel:
+        """Create the code statistics panel"""
+        return self.render_code(self.collect("code", self.ONE_SHOT_MAX_AGE))
+    
+    @functools.cached_property
+    def project_index(self):
+        """ProjectIndex of every known project, loaded once"""
+        from .project_utils import ProjectIndex
+        return ProjectIndex()
+    
+    def collect_projects(self) -> Dict:
+        """Collect the most frecent projects, refreshing their metadata"""
+        # Opening the dashboard on a project counts as a visit
+        if not self.project_visited:
+            self.project_index.visit(self.path)
+            self.project_visited = True
+        top = self.project_index.search("", limit=self.PROJECT_ROWS)
+        self.project_index.refresh([project["path"] for project in top])
+        return {
+            "rows": self.get_project_rows(self.project_index.search("", limit=self.PROJECT_ROWS)),
+            "total": len(self.project_index),
+        }
+    
+    def get_project_rows(self, projects: List[Dict]) -> List[Dict]:
+        """Display rows for project index entries"""
+        home = os.path.expanduser("~")
+        current = os.path.abspath(self.path)
+        return [
+            {
+                "name": project["name"],
+                "path": "~" + project["path"][len(home):] if project["path"].startswith(home + os.sep) else project["path"],
+                "type": project["type"] or "-",
+                "age": format_age(project["commit"]),
+                "dirty": project["dirty"],
+                "current": project["path"] == current,
+            }
+            for project in projects
+        ]
+    
+    def render_projects(self, model: Dict) -> Panel:
+        """Render the projects panel (or the finder, when the model has a query)"""
+        project_table = Table(show_header=False, box=None, padding=(0, 1), expand=True)
+        project_table.add_column("", no_wrap=True, width=1)
+        project_table.add_column("Name", style="bold", no_wrap=True, overflow="ellipsis", ratio=2)
+        project_table.add_column("Path", style="dim", no_wrap=True, overflow="ellipsis", ratio=3)
+        project_table.add_column("Type", style="cyan", no_wrap=True)
+        project_table.add_column("Commit", style="dim", justify="right", no_wrap=True)
+        project_table.add_column("State", no_wrap=True)
+        
+        states = {True: "[yellow]dirty[/yellow]", False: "[green]clean[/green]", None: "[dim]-[/dim]"}
+        for i, row in enumerate(model["rows"]):
+            project_table.add_row(
+                "▶" if i == model.get("selected") else ("●" if row["current"] else ""),
+                row["name"],
+                row["path"],
+                row["type"],
+                row["age"],
+                states[row["dirty"]],
+                style="reverse" if i == model.get("selected") else None
+            )
+        if not model["rows"]:
+            hint = "No matches" if model.get("query") else "No projects yet: devdash projects --scan ~/code"
+            project_table.add_row("", hint, "", "", "", "")
+        
+        title = f"🗂️  PROJECTS ({model['total']})"
+        if "query" in model:
+            project_table.caption = "Type to filter · ↑/↓ select · Enter open · Esc cancel"
+            project_table.caption_style = "dim"
+            title = f"🗂️  PROJECTS ❯ {escape(model['query'])}▏"
+        return Panel(
+            project_table,
+            title=f"[bold bright_magenta]{title}[/bold bright_magenta]",
+            title_align="left" if "query" in model else "center",
+            border_style="bright_magenta",
+            box=box.ROUNDED
+        )
+    
+    def create_projects_panel(self) -> Panel:
+        """Create the projects panel"""
+        return self.render_projects(self.collect("projects", self.ONE_SHOT_MAX_AGE))
+    
+    def create_log_tailer(
+        self,
+        files: Optional[List[str]] = None,
+        highlight: Optional[str] = None,
+        use_inotify: bool = True
+    ):
+        """LogTailer for files (default: configured, or found in the project)"""
+        from .log_utils import LogTailer, find_log_files
+        
+        options = get_panel_options(self.config, "logs")
+        files = files or [os.path.join(self.path, f) for f in options.get("files", [])] or find_log_files(self.path)
+        return LogTailer(files, root=self.path, highlight=highlight or options.get("highlight"), use_inotify=use_inotify)
+    
+    @functools.cached_property
+    def log_tailer(self):
+        """LogTailer following the project's logs across refreshes
+        
+        The panel polls on its refresh interval, so it holds no inotify watches.
+        """
+        return self.create_log_tailer(use_inotify=False)
+    
+    def collect_logs(self) -> Dict:
+        """Collect the newest log lines and the line and error rates"""
+        self.log_tailer.poll()
+        return self.log_tailer.snapshot(limit=self.LOG_ROWS)
+    
+    def format_log_line(self, line: Dict, show_file: bool = True) -> Text:
+        """A log line colored by level, with highlight pattern matches in bold"""
+        styles = {"error": "red", "warning": "yellow"}
+        text = Text()
+        if show_file:
+            text.append(f"{line['file']} ", style="dim")
+        text.append(line["text"], style=styles.get(line["level"], ""))
+        if self.log_tailer.highlight is not None:
+            text.highlight_regex(self.log_tailer.highlight, "bold magenta")
+        return text
+    
+    def render_logs(self, model: Dict) -> Panel:
+        """Render the log tail panel"""
+        show_file = len(model["files"]) > 1
+        if model["lines"]:
+            body = Text("\n", no_wrap=True, overflow="ellipsis").join(
+                self.format_log_line(line, show_file) for line in model["lines"]
+            )
+        elif model["files"]:
+            body = Text("No lines yet", style="dim")
+        else:
+            body = Text("No log files found (set panels.logs.files)", style="dim")
+        
+        rates = model["rates"]
+        error_color = "red" if rates["errors"] else "dim"
+        title = f"[bold bright_blue]📜 LOGS[/bold bright_blue] [dim]{rates['lines']} lines/min[/dim] [{error_color}]{rates['errors']} errors/min[/{error_color}]"
+        return Panel(
+            body,
+            title=title,
+            border_style="bright_blue",
+            box=box.ROUNDED
+        )
+    
+    def create_logs_panel(self) -> Panel:
+        """Create the log tail panel"""
+        return self.render_logs(self.collect("logs", self.ONE_SHOT_MAX_AGE))
+    
+    @functools.cached_property
+    def container_watcher(self):
+        """ContainerWatcher kept current by the engine's event stream"""
+        from .container_utils import ContainerWatcher, EngineClient
+        
+        socket_path = get_panel_options(self.config, "containers").get("socket")
+        return ContainerWatcher(EngineClient(os.path.expanduser(socket_path) if socket_path else None)).start()
+    
+    def collect_containers(self) -> Dict:
+        """Collect the container table with CPU and memory of running containers"""
+        watcher = self.container_watcher
+        if watcher.connected:
+            watcher.update_stats(max_age=self.CONTAINER_STATS_INTERVAL)
+        rows = watcher.get_rows()
+        return {
+            "engine": watcher.engine,
+            "connected": watcher.connected,
+            "error": watcher.error,
+            "running": sum(1 for r in rows if r["state"] == "running"),
+            "total": len(rows),
+            "rows": [
+                {
+                    "name": r["name"],
+                    "image": r["image"],
+                    "state": r["state"],
+                    "status": r["status"],
+                    "ports": ", ".join(
+                        f"{p['public']}→{p['private']}" + ("/udp" if p["proto"] == "udp" else "")
+                        for p in r["ports"]
+                    ),
+                    "cpu": round(r["cpu"], 1) if r["cpu"] is not None else None,
+                    "mem": round(r["mem"] / (1024 ** 2)) if r["mem"] is not None else None,
+                }
+                for r in rows[:self.CONTAINER_ROWS]
+            ],
+        }
+    
+    def render_containers(self, model: Dict) -> Panel:
+        """Render the containers panel"""
+        container_table = Table(show_header=True, box=box.SIMPLE, padding=(0, 1))
+        container_table.add_column("Name", style="white", no_wrap=True, overflow="ellipsis")
+        container_table.add_column("Image", style="dim", no_wrap=True, overflow="ellipsis")
+        container_table.add_column("State")
+        container_table.add_column("Ports", style="cyan")
+        container_table.add_column("CPU", justify="right")
+        container_table.add_column("Mem", justify="right", style="dim")
+        
+        states = {"running": "green", "paused": "yellow", "restarting": "yellow", "exited": "dim", "dead": "red"}
+        for c in model["rows"]:
+            state_color = states.get(c["state"], "white")
+            cpu = c["cpu"]
+            cpu_text = "-"
+            if cpu is not None:
+                cpu_color = "green" if cpu < 50 else "yellow" if cpu < 80 else "red"
+                cpu_text = f"[{cpu_color}]{cpu}%[/{cpu_color}]"
+            container_table.add_row(
+                escape(c["name"]),
+                escape(c["image"]),
+                f"[{state_color}]{c['state']}[/{state_color}]",
+                c["ports"] or "-",
+                cpu_text,
+                f"{c['mem']}M" if c["mem"] is not None else "-",
+            )
+        if not model["rows"]:
+            if model["error"]:
+                message = f"[red]{escape(model['error'])}[/red]"
+            elif model["connected"]:
+                message = "No containers"
+            else:
+                message = "Connecting…"
+            container_table.add_row(message, "", "", "", "", "")
+        
+        engine = model["engine"]
+        engine_text = f" [dim]{engine['name']} {engine['version']}[/dim]" if engine else ""
+        return Panel(
+            container_table,
+            title=f"[bold bright_green]🐳 CONTAINERS ({model['running']}/{model['total']})[/bold bright_green]{engine_text}",
+            border_style="bright_green",
+            box=box.ROUNDED
+        )
+    
+    def create_containers_panel(self) -> Panel:
+        """Create the containers panel"""
+        return self.render_containers(self.collect("containers", self.ONE_SHOT_MAX_AGE))
+    
+    def enable_profiling(self) -> Profiler:
+        """Time collectors, panel renders, frames and subprocesses from now on
+        
+        Wraps this instance's collect_*, render_* and create_*_panel methods
+        (and devdashd requests) in profiler spans, except the debug panel's own.
+        """
+        if self.profiler is not None:
+            return self.profiler
+        
+        self.profiler = Profiler()
+        self.profiler.install()
+        for attr in dir(self):
+            if attr in ("collect_profile", "render_profile", "create_profile_panel"):
+                continue
+            if attr.startswith("collect_"):
+                category = "collect"
+            elif attr.startswith("render_") or (attr.startswith("create_") and attr.endswith("_panel")):
+                category = "render"
+            else:
+                continue
+            setattr(self, attr, self.profiler.wrap(getattr(self, attr), attr, category))
+        
+        if self.daemon is not None:
+            self.daemon.get = self.profiler.wrap(
+                self.daemon.get, "devdashd", "collect", detail=lambda name, *args, **kwargs: name
+            )
+        return self.profiler
+    
+    def profile_frame(self):
+        """Context timing one frame while profiling (no-op otherwise)"""
+        return self.profiler.frame() if self.profiler is not None else nullcontext()
+    
+    def collect_profile(self) -> Dict:
+        """Collect the profiler summary, rounded to what the panel shows"""
+        summary = self.profiler.get_summary(self.PROFILE_ROWS)
+        
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value, 1) if value is not None else None
+        
+        per_frame = summary["subprocesses_per_frame"]
+        return {
+            "spans": [
+                {"name": s["name"], "category": s["category"], "count": s["count"], "p50": ms(s["p50"]), "p95": ms(s["p95"])}
+                for s in summary["spans"]
+            ],
+            "frames": summary["frames"],
+            "frame_p50": ms(summary["frame_p50"]),
+            "frame_p95": ms(summary["frame_p95"]),
+            "subprocesses_per_frame": round(per_frame, 1) if per_frame is not None else None,
+            "cpu": round(summary["cpu"]) if summary["cpu"] is not None else None,
+            "rss": summary["rss"] // (1024 * 1024) if summary["rss"] is not None else None,
+        }
+    
+    def render_profile(self, model: Dict) -> Panel:
+        """Render the --profile debug panel"""
+        profile_table = Table(show_header=True, box=None, padding=(0, 1), expand=True, caption_justify="left")
+        profile_table.add_column("Span", style="cyan", no_wrap=True, ratio=1)
+        profile_table.add_column("Kind", style="dim")
+        profile_table.add_column("Calls", justify="right", style="dim")
+        profile_table.add_column("p50", justify="right")
+        profile_table.add_column("p95", justify="right")
+        
+        def fmt_ms(value: Optional[float]) -> str:
+            if value is None:
+                return "-"
+            color = "green" if value < 50 else "yellow" if value < 250 else "red"
+            return f"[{color}]{value:.1f} ms[/{color}]"
+        
+        for s in model["spans"]:
+            profile_table.add_row(s["name"], s["category"], str(s["count"]), fmt_ms(s["p50"]), fmt_ms(s["p95"]))
+        if not model["spans"]:
+            profile_table.add_row("[dim]no spans yet[/dim]", "", "", "", "")
+        
+        per_frame = model["subprocesses_per_frame"]
+        profile_table.caption = (
+            f"[dim]frames[/dim] {model['frames']}  "
+            f"[dim]render p50/p95[/dim] {fmt_ms(model['frame_p50'])} / {fmt_ms(model['frame_p95'])}  "
+            f"[dim]subprocesses/frame[/dim] {'-' if per_frame is None else per_frame}  "
+            f"[dim]devdash CPU[/dim] {'-' if model['cpu'] is None else str(model['cpu']) + '%'}  "
+            f"[dim]RSS[/dim] {'-' if model['rss'] is None else str(model['rss']) + 'M'}"
+        )
+        
+        return Panel(
+            profile_table,
+            title="[bold red]🔬 PROFILE[/bold red]",
+            border_style="red",
+            box=box.ROUNDED
+        )
+    
+    def create_profile_panel(self) -> Panel:
+        """Create the --profile debug panel"""
+        return self.render_profile(self.collect_profile())
+    
     def create_help_panel(self) -> Panel:
         """Create help/shortcuts panel"""
         help_text = Text()
@@ -233,12 +1074,21 @@ class DevDash:
         help_text.append(" Quit  ", style="dim")
         help_text.append("[R]", style="bold cyan")
         help_text.append(" Refresh  ", style="dim")
-        help_text.append("[G]", style="bold cyan")
-        help_text.append(" Git  ", style="dim")
-        help_text.append("[P]", style="bold cyan")
-        help_text.append(" Ports  ", style="dim")
-        help_text.append("[S]", style="bold cyan")
-        help_text.append(" System  ", style="dim")
+        for key, name in self.ZOOM_KEYS.items():
+            if name in self.panels:
+                help_text.append(f"[{key.upper()}]", style="bold cyan")
+                help_text.append(f" {name.capitalize()}  ", style="dim")
+        help_text.append("[+/-]", style="bold cyan")
+        help_text.append(f" Rate {self.refresh_rate:g}s  ", style="dim")
+        usage = self.get_cpu_usage()
+        if usage is not None:
+            help_text.append(f" CPU {usage}  ", style="dim")
+        if self.zoom:
+            help_text.append("[Esc]", style="bold cyan")
+            help_text.append(" Back  ", style="dim")
+        
+        if self.frames_rendered or self.frames_skipped:
+            help_text.append(f" {self.frames_skipped} frames skipped", style="dim italic")
         
         return Panel(
             Align.center(help_text),
@@ -246,64 +1096,482 @@ class DevDash:
             box=box.SIMPLE
         )
     
-    def create_layout(self) -> Layout:
-        """Create the main layout"""
+    def create_layout(self, zoom: Optional[str] = None) -> Layout:
+        """Create the main layout, or a full-screen view of one panel"""
         layout = Layout()
         
-        layout.split_column(
-            Layout(name="header", size=3),
-            Layout(name="main", ratio=1),
-            Layout(name="footer", size=3)
-        )
+        # The --profile debug panel sits above the footer in both views
+        rows = [Layout(name="header", size=3), Layout(name=zoom or "main", ratio=1)]
+        if self.profiler is not None:
+            rows.append(Layout(name="profile", size=self.PROFILE_ROWS + 4))
+        rows.append(Layout(name="footer", size=3))
+        layout.split_column(*rows)
         
-        layout["main"].split_row(
-            Layout(name="left", ratio=1),
-            Layout(name="right", ratio=1)
-        )
+        if zoom:
+            return layout
         
-        layout["left"].split_column(
-            Layout(name="git", ratio=1),
-            Layout(name="stats", ratio=1)
-        )
+        # Configured columns of panels; a nested list shares a row.
+        # Hidden panels get no slot, and emptied rows and columns collapse
+        settings = self.config["layout"]
+        widths = settings.get("widths", [])
+        columns = []
+        for i, column in enumerate(settings["columns"]):
+            rows = []
+            for j, row in enumerate(column):
+                names = [n for n in (row if isinstance(row, list) else [row]) if n in self.panels]
+                if not names:
+                    continue
+                slots = [Layout(name=n, ratio=self.get_panel_size(n)) for n in names]
+                if len(slots) == 1:
+                    rows.append(slots[0])
+                    continue
+                group = Layout(name=f"column-{i}-row-{j}", ratio=max(slot.ratio for slot in slots))
+                group.split_row(*slots)
+                rows.append(group)
+            if rows:
+                ratio = widths[i] if i < len(widths) else 1
+                columns.append(Layout(name=f"column-{i}", ratio=ratio))
+                columns[-1].split_column(*rows)
         
-        layout["right"].split_column(
-            Layout(name="system", ratio=1),
-            Layout(name="bottom_right", ratio=1)
-        )
+        if columns:
+            layout["main"].split_row(*columns)
+        return layout
+    
+    def get_panel_size(self, name: str) -> int:
+        """A panel's share of its column or row (panels.<name>.size)"""
+        return get_panel_options(self.config, name).get("size", 1)
+    
+    def get_collectors(self) -> Dict[str, Callable[[], Dict]]:
+        """Map the visible panels to their collectors, served by devdashd when it runs"""
+        return {
+            name: functools.partial(self.collect, name)
+            for name in self.get_local_collectors() if name in self.panels
+        }
+    
+    def get_local_collectors(self) -> Dict[str, Callable[[], Dict]]:
+        """Map layout slots to the functions that collect their data models"""
+        return {
+            "git": self.collect_git,
+            "system": self.collect_system,
+            "ports": self.collect_ports,
+            "packages": self.collect_packages,
+            "stats": self.collect_stats,
+            "probes": self.collect_probes,
+            "todos": self.collect_todos,
+            "code": self.collect_code,
+            "projects": self.collect_projects,
+            "logs": self.collect_logs,
+            "containers": self.collect_containers,
+        }
+    
+    def collect(self, name: str, max_age: Optional[float] = None) -> Dict:
+        """Collect a panel's data model, from devdashd when it is running
         
-        layout["bottom_right"].split_row(
-            Layout(name="ports", ratio=1),
-            Layout(name="packages", ratio=1)
+        Falls back to collecting in-process when no daemon answers. The
+        daemon's snapshot may be up to max_age seconds old (default: half
+        the panel's refresh interval).
+        """
+        model = None
+        if self.daemon is not None and name in DAEMON_COLLECTORS and self.daemon.available():
+            if max_age is None:
+                max_age = self.get_interval(name, self.refresh_rate) / 2
+            try:
+                model = self.daemon.get(name, self.path, max_age, get_collector_options(self.config, name))
+            except DaemonUnavailable:
+                model = None
+        if model is None:
+            model = self.get_local_collectors()[name]()
+        if name == "ports" and "containers" in self.panels:
+            model = self.label_container_ports(model)
+        return model
+    
+    def get_renderers(self) -> Dict[str, Callable[[Dict], Panel]]:
+        """Map layout slots to the functions that turn data models into panels"""
+        return {
+            "header": self.render_header,
+            "git": self.render_git,
+            "system": self.render_system,
+            "ports": self.render_ports,
+            "packages": self.render_packages,
+            "stats": self.render_stats,
+            "probes": self.render_probes,
+            "todos": self.render_todos,
+            "code": self.render_code,
+            "projects": self.render_projects,
+            "logs": self.render_logs,
+            "containers": self.render_containers,
+            "profile": self.render_profile,
+        }
+    
+    def create_loading_panel(self, name: str) -> Panel:
+        """Placeholder shown until a collector publishes its first result"""
+        return Panel(
+            Align.center(Text("refreshing…", style="dim italic"), vertical="middle"),
+            title=f"[dim]{name.upper()}[/dim]",
+            border_style="dim",
+            box=box.ROUNDED
         )
+    
+    def create_error_panel(self, name: str, error: str) -> Panel:
+        """Shown when a collector failed before publishing any result"""
+        return Panel(
+            Text(error, style="red"),
+            title=f"[red]{name.upper()}[/red]",
+            border_style="red",
+            box=box.ROUNDED
+        )
+    
+    def _get_subtitle(self, name: str, pool: CollectorPool) -> Optional[str]:
+        """Refreshing/stale/error marker for a published result"""
+        result = pool.get(name)
+        if pool.is_stale(name):
+            since = datetime.fromtimestamp(result["updated"]).strftime("%H:%M:%S")
+            marker = "refreshing… " if result["refreshing"] else ""
+            return f"[dim]{marker}stale since {since}[/dim]"
+        if result.get("error"):
+            return f"[red]{result['error'][:40]}[/red]"
+        return None
+    
+    def _update_slot(
+        self,
+        layout: Layout,
+        name: str,
+        model: Optional[Dict],
+        subtitle: Optional[str] = None
+    ) -> bool:
+        """Re-render a slot only if its model (or subtitle) changed"""
+        key = (hash_model(model), subtitle)
+        if self._frame_keys.get(name) == key:
+            return False
         
-        return layout
+        panel = self.get_renderers()[name](model)
+        panel.subtitle = subtitle
+        layout[name].update(panel)
+        self._frame_keys[name] = key
+        return True
+    
+    def _update_slot_from_result(self, layout: Layout, name: str, pool: CollectorPool) -> bool:
+        """Re-render a slot from the collector pool's latest result"""
+        result = pool.get(name)
+        if result.get("value") is None:
+            # Loading and error placeholders
+            key = ("error", result["error"]) if result.get("error") else ("loading",)
+            if self._frame_keys.get(name) == key:
+                return False
+            if result.get("error"):
+                layout[name].update(self.create_error_panel(name, result["error"]))
+            else:
+                layout[name].update(self.create_loading_panel(name))
+            self._frame_keys[name] = key
+            return True
+        return self._update_slot(layout, name, result["value"], self._get_subtitle(name, pool))
+    
+    def update_layout(self, layout: Layout, pool: Optional[CollectorPool] = None) -> bool:
+        """Update layout with current data
+        
+        With a collector pool, panels show the latest published result
+        instead of being collected on the render thread. Only panels whose
+        data model changed are rebuilt; returns whether anything changed.
+        """
+        changed = self._update_slot(layout, "header", self.collect_header())
+        for name, collector in self.get_collectors().items():
+            if layout.get(name) is None:
+                # Hidden while another panel is zoomed
+                continue
+            if pool is None:
+                changed = self._update_slot(layout, name, collector()) or changed
+            else:
+                changed = self._update_slot_from_result(layout, name, pool) or changed
+        
+        if self.profiler is not None and layout.get("profile") is not None:
+            changed = self._update_slot(layout, "profile", self.collect_profile()) or changed
+        
+        footer_key = (self.refresh_rate, self.zoom, self.get_cpu_usage())
+        if changed or self._frame_keys.get("footer") != footer_key:
+            layout["footer"].update(self.create_help_panel())
+            self._frame_keys["footer"] = footer_key
+            changed = True
+        return changed
     
-    def update_layout(self, layout: Layout) -> None:
-        """Update layout with current data"""
-        layout["header"].update(self.create_header())
-        layout["git"].update(self.create_git_panel())
-        layout["system"].update(self.create_system_panel())
-        layout["ports"].update(self.create_ports_panel())
-        layout["packages"].update(self.create_packages_panel())
-        layout["stats"].update(self.create_stats_panel())
-        layout["footer"].update(self.create_help_panel())
-    
-    def run(self, refresh_rate: float = 2.0) -> None:
-        """Run the dashboard"""
+    def create_collector_pool(self, refresh_rate: float = 5.0) -> CollectorPool:
+        """Create a started collector pool for all panels
+        
+        With a CPU budget, an adaptive scheduler retunes the intervals as
+        collector costs and change rates are measured.
+        """
+        pool = CollectorPool(max_workers=self.COLLECTOR_WORKERS)
+        for name, collector in self.get_collectors().items():
+            pool.register(name, collector, self.get_interval(name, refresh_rate))
+        pool.start()
+        self.scheduler = None
+        if self.cpu_budget:
+            self.scheduler = AdaptiveScheduler(
+                pool, lambda name: self.get_interval(name, self.refresh_rate), self.cpu_budget
+            )
+        return pool
+    
+    def get_cpu_usage(self) -> Optional[str]:
+        """devdash's measured CPU use against its budget ("0.4%/1%")"""
+        if self.scheduler is None or self.scheduler.usage is None:
+            return None
+        return f"{self.scheduler.usage * 100:.1f}%/{self.scheduler.budget * 100:g}%"
+    
+    def get_interval(self, name: str, refresh_rate: float) -> float:
+        """Seconds between runs of a collector at a refresh rate
+        
+        A configured panels.<name>.refresh is used as is, whatever the rate.
+        """
+        configured = get_panel_options(self.config, name).get("refresh")
+        if configured is not None:
+            return float(configured)
+        return max(refresh_rate, self.COLLECTOR_INTERVALS.get(name, refresh_rate))
+    
+    def set_refresh_rate(self, refresh_rate: float, pool: Optional[CollectorPool] = None) -> None:
+        """Change the refresh rate, applying it to a running pool"""
+        self.refresh_rate = refresh_rate
+        if pool is not None:
+            for name in self.get_collectors():
+                pool.set_interval(name, self.get_interval(name, refresh_rate))
+    
+    def set_zoom(self, zoom: Optional[str]) -> None:
+        """Show one panel full screen (None for the overview)"""
+        self.zoom = zoom
+        self.layout = self.create_layout(zoom)
+        # Every slot of the new layout must be drawn
+        self._frame_keys.clear()
+    
+    def handle_key(self, key: str, pool: Optional[CollectorPool] = None) -> Optional[str]:
+        """Act on a keypress
+        
+        Returns what happened: "quit", "refresh", "layout" (zoom changed),
+        "rate" (refresh rate changed) or None for unbound keys.
+        """
+        key = key.lower()
+        if key in ("q", "ctrl-c"):
+            self.running = False
+            return "quit"
+        
+        if key == "r":
+            if pool is not None:
+                pool.refresh_all()
+            return "refresh"
+        
+        if self.ZOOM_KEYS.get(key) in self.panels or (key == "escape" and self.zoom):
+            target = self.ZOOM_KEYS.get(key)
+            self.set_zoom(None if target == self.zoom else target)
+            return "layout"
+        
+        if key in ("+", "=", "-", "_"):
+            faster = key in ("+", "=")
+            if faster:
+                rates = [r for r in self.REFRESH_RATES if r < self.refresh_rate]
+                rate = rates[-1] if rates else self.refresh_rate
+            else:
+                rates = [r for r in self.REFRESH_RATES if r > self.refresh_rate]
+                rate = rates[0] if rates else self.refresh_rate
+            if rate == self.refresh_rate:
+                return None
+            self.set_refresh_rate(rate, pool)
+            return "rate"
+        
+        return None
+    
+    @property
+    def frame_stats(self) -> Dict[str, int]:
+        """Frames drawn and frames skipped because no panel changed"""
+        return {"rendered": self.frames_rendered, "skipped": self.frames_skipped}
+    
+    def create_status_line(self, pool: Optional[CollectorPool] = None) -> str:
+        """One-line summary for terminals too narrow for the layout"""
+        if pool is not None:
+            models = {name: pool.get(name).get("value") for name in self.get_collectors()}
+        else:
+            models = {name: collector() for name, collector in self.get_collectors().items()}
+        
+        parts = [f"⚡ {self.collect_header()['clock']}"]
+        
+        git = models.get("git")
+        if git and git["repo"]:
+            branch = git["branch"]
+            if git["uncommitted"]:
+                branch += f" +{git['uncommitted']}"
+            parts.append(branch)
+        
+        system = models.get("system")
+        if system:
+            parts.append(f"CPU {system['cpu']:.0f}% RAM {system['mem_percent']:.0f}%")
+        
+        ports = models.get("ports")
+        if ports is not None:
+            parts.append(f"{len(ports['rows'])} ports")
+        
+        probes = models.get("probes")
+        if probes and probes["rows"]:
+            down = sum(1 for r in probes["rows"] if not r["up"])
+            parts.append(f"{down} down" if down else "all up")
+        
+        packages = models.get("packages")
+        if packages and packages["outdated"]:
+            parts.append(f"{len(packages['outdated'])} outdated")
+        
+        return " │ ".join(parts)
+    
+    def run(
+        self,
+        refresh_rate: float = 5.0,
+        compact: bool = False,
+        max_bps: Optional[float] = None,
+        ascii_only: bool = False
+    ) -> None:
+        """Run the dashboard
+        
+        compact sends only changed cells (for slow SSH/serial links), at
+        most max_bps bytes per second, and falls back to a single status
+        line on narrow terminals.
+        """
         if not RICH_AVAILABLE:
             return
         
+        if compact or max_bps or ascii_only:
+            self.run_compact(refresh_rate, max_bps, ascii_only)
+            return
+        
         self.running = True
-        layout = self.create_layout()
+        self.refresh_rate = refresh_rate
+        self.set_zoom(None)
+        pool = self.create_collector_pool(refresh_rate)
         
         try:
-            with Live(layout, console=self.console, refresh_per_second=1, screen=True) as live:
-                while self.running:
-                    self.update_layout(layout)
-                    live.update(layout)
-                    time.sleep(refresh_rate)
+            # Redraw only when a panel changed, not on a fixed timer
+            with KeyReader() as keys, Live(
+                self.layout, console=self.console, auto_refresh=False, screen=True
+            ) as live:
+                def render(force: bool) -> Optional[float]:
+                    with self.profile_frame():
+                        if force:
+                            live.update(self.layout, refresh=False)
+                        if self.update_layout(self.layout, pool) or force:
+                            self.frames_rendered += 1
+                            live.refresh()
+                        else:
+                            self.frames_skipped += 1
+                    return None
+                
+                self._event_loop(pool, keys, render)
         except KeyboardInterrupt:
             self.running = False
+        finally:
+            pool.stop()
+            self.close_backends()
+    
+    def run_compact(
+        self,
+        refresh_rate: float = 5.0,
+        max_bps: Optional[float] = None,
+        ascii_only: bool = False
+    ) -> None:
+        """Run the dashboard sending only terminal cell diffs"""
+        self.running = True
+        self.refresh_rate = refresh_rate
+        self.set_zoom(None)
+        pool = self.create_collector_pool(refresh_rate)
+        renderer = CellDiffRenderer(
+            self.console.file,
+            max_bytes_per_second=max_bps,
+            ascii_only=ascii_only,
+            color_system=self.console.color_system
+        )
+        size = None
+        
+        def render(force: bool) -> Optional[float]:
+            with self.profile_frame():
+                return draw(force)
+        
+        def draw(force: bool) -> Optional[float]:
+            nonlocal size
+            width, height = shutil.get_terminal_size()
+            if width < self.NARROW_WIDTH or height < self.NARROW_HEIGHT:
+                size = None
+                if renderer.status_line(self.create_status_line(pool), width):
+                    return None
+                return renderer.retry_after()
+            
+            changed = self.update_layout(self.layout, pool)
+            if changed or force or renderer.pending or size != (width, height):
+                size = (width, height)
+                if renderer.draw(self.layout, width, height):
+                    self.frames_rendered += 1
+            else:
+                self.frames_skipped += 1
+            return renderer.retry_after() if renderer.pending else None
+        
+        renderer.enter()
+        try:
+            with KeyReader() as keys:
+                self._event_loop(pool, keys, render)
+        except KeyboardInterrupt:
+            self.running = False
+        finally:
+            renderer.exit()
+            pool.stop()
+            self.close_backends()
+    
+    def close_backends(self) -> None:
+        """Stop the container event thread and close the log tailer, if they were started"""
+        watcher = self.__dict__.get("container_watcher")
+        if watcher is not None:
+            watcher.stop()
+        tailer = self.__dict__.get("log_tailer")
+        if tailer is not None:
+            tailer.close()
+    
+    def _event_loop(
+        self,
+        pool: CollectorPool,
+        keys: KeyReader,
+        render: Callable[[bool], Optional[float]]
+    ) -> None:
+        """Wait on keys, published results and the next deadline; draw on change
+        
+        Collectors are submitted when their own interval is due and the
+        loop sleeps until the earliest of those deadlines or the next tick
+        (which redraws the clock and stale markers). render(force) draws a
+        frame if anything changed (always when force) and returns how soon
+        it wants to be called again, if sooner than that (compact mode
+        retrying a frame held back by the byte cap).
+        """
+        next_tick = time.monotonic()
+        force = True
+        while self.running:
+            now = time.monotonic()
+            if now >= next_tick:
+                # Step from the deadline, not from now, so slow frames do
+                # not push every later tick back; skip ticks missed entirely
+                next_tick += self.refresh_rate
+                if next_tick <= now:
+                    next_tick = now + self.refresh_rate
+            
+            if self.scheduler is not None:
+                self.scheduler.update(self.get_collectors())
+            pool.refresh_due()
+            
+            retry = render(force)
+            force = False
+            
+            wait = max(0.0, next_tick - time.monotonic())
+            due = pool.next_due()
+            if due is not None:
+                wait = min(wait, due)
+            if retry is not None:
+                wait = min(wait, retry)
+            for key in keys.wait(wait, pool):
+                action = self.handle_key(key, pool)
+                if action == "quit":
+                    return
+                if action == "layout":
+                    force = True
+                elif action == "rate":
+                    next_tick = min(next_tick, time.monotonic() + self.refresh_rate)
     
     def show_once(self) -> None:
         """Show dashboard once without live updates"""
@@ -311,8 +1579,9 @@ class DevDash:
             return
         
         layout = self.create_layout()
-        self.update_layout(layout)
-        self.console.print(layout)
+        with self.profile_frame():
+            self.update_layout(layout)
+            self.console.print(layout)
     
     def show_git(self) -> None:
         """Show only git information"""
@@ -332,8 +1601,151 @@ class DevDash:
             return
         self.console.print(self.create_ports_panel())
     
-    def show_packages(self) -> None:
+    def watch_ports(self, interval: float = 1.0, ndjson: bool = False) -> None:
+        """Stream port open/close events until interrupted
+        
+        NDJSON goes straight to stdout, so only the colored view needs rich.
+        """
+        if not RICH_AVAILABLE and not ndjson:
+            return
+        
+        colors = {"opened": "green", "closed": "red", "owner-changed": "yellow"}
+        try:
+            for event in self.port_watcher.watch(interval, include_current=ndjson):
+                if ndjson:
+                    print(self.port_watcher.to_ndjson(event), flush=True)
+                    continue
+                color = colors[event["event"]]
+                owner = f"{event['process']} ({event['pid']})" if event["pid"] else event["process"]
+                if event["event"] == "owner-changed":
+                    owner = f"{event['previous_process']} ({event['previous_pid']}) → {owner}"
+                self.console.print(
+                    f"[dim]{datetime.fromtimestamp(event['time']).strftime('%H:%M:%S')}[/dim] "
+                    f"[{color}]{event['event']:<13}[/{color}] "
+                    f"{event['proto']} {event['address']}:{event['port']} {owner}"
+                )
+        except KeyboardInterrupt:
+            pass
+    
+    def show_packages(self, refresh: bool = False, ttl: Optional[float] = None) -> None:
         """Show only packages information"""
         if not RICH_AVAILABLE:
             return
+        self.package_use_cache = not refresh
+        self.package_ttl = ttl
         self.console.print(self.create_packages_panel())
+    
+    def show_probe(
+        self,
+        targets: Optional[List[str]] = None,
+        count: int = 1,
+        interval: float = 1.0,
+        timeout: float = 1.0,
+        watch: bool = False
+    ) -> None:
+        """Probe services and show latency stats"""
+        if not RICH_AVAILABLE:
+            return
+        
+        from .probe_utils import ServiceProber
+        
+        self.prober.timeout = timeout
+        parsed = [ServiceProber.parse_target(t) for t in targets] if targets else ServiceProber.default_targets()
+        
+        if watch:
+            try:
+                with Live(self.create_probe_panel(parsed), console=self.console, refresh_per_second=1) as live:
+                    while True:
+                        time.sleep(interval)
+                        live.update(self.create_probe_panel(parsed))
+            except KeyboardInterrupt:
+                pass
+            return
+        
+        for _ in range(max(1, count) - 1):
+            self.prober.probe(parsed)
+            time.sleep(interval)
+        self.console.print(self.create_probe_panel(parsed))
+    
+    def pick_project(self, query: str = "") -> Optional[str]:
+        """Fuzzy-find a project; returns its path, or None when cancelled
+        
+        Drawn on stderr, so only the chosen path reaches stdout and
+        cd "$(devdash projects)" works. Without a terminal the best match
+        for the query is returned.
+        """
+        if not RICH_AVAILABLE:
+            return None
+        
+        index = self.project_index
+        selected = 0
+        try:
+            with KeyReader() as reader:
+                if not reader.enabled:
+                    results = index.search(query, limit=1)
+                    return results[0]["path"] if results else None
+                
+                with Live(console=Console(stderr=True), auto_refresh=False, transient=True) as live:
+                    while True:
+                        results = index.search(query, limit=self.FINDER_ROWS)
+                        selected = max(0, min(selected, len(results) - 1))
+                        live.update(self.render_projects({
+                            "rows": self.get_project_rows(results),
+                            "total": len(index),
+                            "query": query,
+                            "selected": selected if results else None,
+                        }), refresh=True)
+                        
+                        for key in reader.wait(60.0):
+                            if key == "enter" and results:
+                                path = results[selected]["path"]
+                                index.visit(path)
+                                return path
+                            if key in ("escape", "ctrl-c"):
+                                return None
+                            if key in ("up", "\x10"):
+                                selected -= 1
+                            elif key in ("down", "\x0e"):
+                                selected += 1
+                            elif key == "backspace":
+                                query, selected = query[:-1], 0
+                            elif len(key) == 1 and key.isprintable():
+                                query, selected = query + key, 0
+        except KeyboardInterrupt:
+            return None
+    
+    def show_logs(
+        self,
+        files: Optional[List[str]] = None,
+        lines: int = 20,
+        follow: bool = False,
+        highlight: Optional[str] = None
+    ) -> None:
+        """Print the last lines of the logs, then follow them until interrupted"""
+        if not RICH_AVAILABLE:
+            return
+        
+        from .log_utils import get_level
+        
+        self.log_tailer = self.create_log_tailer(files, highlight)
+        if not self.log_tailer.files:
+            raise ValueError(f"no log files found in {os.path.abspath(self.path)} (pass files or set panels.logs.files)")
+        
+        show_file = len(self.log_tailer.files) > 1
+        for line in self.log_tailer.snapshot(limit=lines)["lines"]:
+            self.console.print(self.format_log_line(line, show_file))
+        if not follow:
+            return
+        
+        try:
+            for name, text in self.log_tailer.follow():
+                line = {"file": name, "text": text, "level": get_level(text)}
+                self.console.print(self.format_log_line(line, show_file))
+        except KeyboardInterrupt:
+            rates = self.log_tailer.rates()
+            self.console.print(
+                f"[dim]{self.log_tailer.total} new lines, {self.log_tailer.errors} errors "
+                f"({rates['errors']} in the last minute)[/dim]"
+            )
+        finally:
+            self.log_tailer.close()
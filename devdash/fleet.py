@@ -0,0 +1,528 @@
+"""
+Fleet utilities for DevDash
+
+`devdash agent` streams this host's snapshot (system metrics, listening
+ports, repository state) over TCP; `devdash fleet` keeps a connection to
+every agent and merges their updates into one table as they arrive.
+
+Frames are a 4-byte big-endian length and a MessagePack body. After the
+first full snapshot an agent only sends the sections that changed, or a
+heartbeat. Both sides are asyncio, so a fleet of hundreds of hosts costs
+hundreds of tasks rather than threads.
+"""
+
+import os
+import hmac
+import time
+import random
+import socket
+import struct
+import asyncio
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from . import __version__
+from .msgpack_utils import MsgpackError, packb, unpackb
+
+try:
+    from rich.table import Table
+    from rich.text import Text
+    from rich import box
+    RICH_AVAILABLE = True
+except ImportError:
+    RICH_AVAILABLE = False
+
+DEFAULT_PORT = 7878
+
+HEADER = struct.Struct("!I")
+
+# Snapshots are small; anything bigger is a corrupt or hostile stream
+MAX_FRAME_SIZE = 1024 * 1024
+
+# Parts of a snapshot that are sent only when they change
+SECTIONS = ("system", "ports", "repo")
+
+# An agent's client whose unsent output exceeds this is disconnected,
+# rather than buffering without bound for a peer that stopped reading
+MAX_CLIENT_BUFFER = 256 * 1024
+
+# A host is stale after this many missed intervals
+STALE_INTERVALS = 3
+
+
+class FleetProtocolError(Exception):
+    """Malformed frame or unexpected message"""
+
+
+def encode_message(message: Dict) -> bytes:
+    """Serialize a message to one frame"""
+    payload = packb(message)
+    if len(payload) > MAX_FRAME_SIZE:
+        raise FleetProtocolError(f"frame of {len(payload)} bytes exceeds {MAX_FRAME_SIZE}")
+    return HEADER.pack(len(payload)) + payload
+
+
+async def read_message(reader: asyncio.StreamReader) -> Dict:
+    """Read one message (asyncio.IncompleteReadError on EOF)"""
+    (size,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if size > MAX_FRAME_SIZE:
+        raise FleetProtocolError(f"frame of {size} bytes exceeds {MAX_FRAME_SIZE}")
+    try:
+        message = unpackb(await reader.readexactly(size))
+    except MsgpackError as e:
+        raise FleetProtocolError(f"invalid frame: {e}") from e
+    if not isinstance(message, dict):
+        raise FleetProtocolError("frame is not a map")
+    return message
+
+
+def collect_snapshot(path: str = ".") -> Dict:
+    """This host's system metrics, listening ports and repository state (blocking)"""
+    from .git_utils import GitInfo
+    from .port_utils import PortScanner
+    from .system_utils import SystemInfo
+    
+    mem = SystemInfo.get_memory_info()
+    disk = SystemInfo.get_disk_info()
+    system = {
+        "cpu": round(SystemInfo.get_cpu_percent()),
+        "mem": round(mem["percent"]),
+        "disk": round(disk["percent"]),
+        "load": round(SystemInfo.get_load_average()[0], 2),
+    }
+    
+    # [port, process] pairs: compact, and stable while nothing changes
+    ports = sorted({p["port"]: p["process"] for p in PortScanner.get_listening_ports()}.items())
+    
+    repo = None
+    state = GitInfo(path).get_state()
+    if state is not None:
+        repo = {
+            "name": os.path.basename(os.path.abspath(path)),
+            "branch": state["branch"] or (state["oid"] or "")[:7],
+            "ahead": state["ahead"],
+            "behind": state["behind"],
+            "dirty": state["staged"] + state["unstaged"] + state["conflicts"],
+            "untracked": state["untracked"],
+        }
+    
+    return {"system": system, "ports": [list(p) for p in ports], "repo": repo}
+
+
+class FleetAgent:
+    """Serve this host's snapshot stream to fleet monitors"""
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        interval: float = 2.0,
+        path: str = ".",
+        token: Optional[str] = None,
+        collect: Optional[Callable[[], Dict]] = None
+    ):
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.token = token
+        self.collect = collect or (lambda: collect_snapshot(path))
+        self.hostname = socket.gethostname()
+        self.snapshot: Dict = {}
+        self.seq = 0
+        self.clients: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._collector: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        """Start listening and collecting (port 0 picks a free port)"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._collector = asyncio.ensure_future(self._collect_loop())
+    
+    async def serve_forever(self) -> None:
+        """Run until cancelled"""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+    
+    async def close(self) -> None:
+        """Stop collecting and disconnect every client"""
+        if self._collector is not None:
+            self._collector.cancel()
+            self._collector = None
+        # Disconnect clients first: wait_closed() waits for open connections
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self.clients):
+            writer.close()
+        self.clients.clear()
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+    
+    async def _collect_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            try:
+                snapshot = await loop.run_in_executor(None, self.collect)
+            except Exception as e:
+                # Keep the last good sections; only report the failure
+                self.seq += 1
+                self.broadcast({
+                    "type": "heartbeat",
+                    "seq": self.seq,
+                    "time": time.time(),
+                    "error": f"{type(e).__name__}: {e}",
+                })
+            else:
+                changed = {key: snapshot.get(key) for key in SECTIONS if snapshot.get(key) != self.snapshot.get(key)}
+                self.snapshot.update(changed)
+                self.seq += 1
+                message = {"type": "update" if changed else "heartbeat", "seq": self.seq, "time": time.time()}
+                message.update(changed)
+                if snapshot.get("error"):
+                    message["error"] = snapshot["error"]
+                self.broadcast(message)
+            
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+    
+    def broadcast(self, message: Dict) -> None:
+        """Queue a message for every client without waiting on any of them"""
+        frame = encode_message(message)
+        for writer in list(self.clients):
+            if writer.is_closing() or writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+                self.clients.discard(writer)
+                writer.close()
+                continue
+            writer.write(frame)
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            subscribe = await asyncio.wait_for(read_message(reader), timeout=10)
+            if subscribe.get("type") != "subscribe":
+                raise FleetProtocolError("expected subscribe")
+            offered = str(subscribe.get("token", "")).encode("utf-8")
+            if self.token and not hmac.compare_digest(offered, self.token.encode("utf-8")):
+                writer.write(encode_message({"type": "error", "error": "invalid token"}))
+                await writer.drain()
+                return
+            
+            writer.write(encode_message({
+                "type": "hello",
+                "host": self.hostname,
+                "version": __version__,
+                "interval": self.interval,
+            }))
+            if self.snapshot:
+                writer.write(encode_message(dict(self.snapshot, type="update", seq=self.seq, time=time.time())))
+            await writer.drain()
+            self.clients.add(writer)
+            
+            # Nothing more is expected from the client; wait for it to leave
+            while await reader.read(4096):
+                pass
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, FleetProtocolError):
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+
+def describe_error(error: Exception) -> str:
+    """Short reason for a lost connection, for the status column"""
+    if isinstance(error, asyncio.IncompleteReadError):
+        return "closed"
+    if isinstance(error, (asyncio.TimeoutError, socket.timeout)):
+        return "timed out"
+    if isinstance(error, ConnectionRefusedError):
+        return "refused"
+    if isinstance(error, socket.gaierror):
+        return "unknown host"
+    if isinstance(error, OSError) and error.strerror:
+        return error.strerror.lower()
+    return str(error) or type(error).__name__
+
+
+def parse_hosts(lines: List[str]) -> List[Tuple[str, int]]:
+    """Parse 'host', 'host:port' and '[ipv6]:port' lines ('#' comments)"""
+    hosts = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        host, port = line, DEFAULT_PORT
+        if line.startswith("["):
+            host, _, rest = line[1:].partition("]")
+            if rest.startswith(":"):
+                port = int(rest[1:])
+        elif line.count(":") == 1:
+            host, port_text = line.split(":")
+            port = int(port_text)
+        hosts.append((host, port))
+    return hosts
+
+
+def load_hosts(path: str) -> List[Tuple[str, int]]:
+    """Read a hosts file"""
+    with open(path, encoding="utf-8") as f:
+        return parse_hosts(f.readlines())
+
+
+class FleetMonitor:
+    """Keep a connection to every agent and merge their snapshots"""
+    
+    def __init__(
+        self,
+        hosts: List[Tuple[str, int]],
+        token: Optional[str] = None,
+        connect_timeout: float = 5.0,
+        max_backoff: float = 30.0
+    ):
+        self.token = token
+        self.connect_timeout = connect_timeout
+        self.max_backoff = max_backoff
+        self.states: Dict[str, Dict] = {}
+        for host, port in hosts:
+            name = host if port == DEFAULT_PORT else f"{host}:{port}"
+            self.states[name] = {
+                "host": host,
+                "port": port,
+                "hostname": None,
+                "status": "connecting",
+                "interval": None,
+                "last_seen": None,
+                "error": None,
+                "updates": 0,
+                "system": None,
+                "ports": None,
+                "repo": None,
+            }
+        self.version = 0
+        self._changed: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+    
+    def merge(self, name: str, message: Dict) -> None:
+        """Apply one message from an agent"""
+        state = self.states[name]
+        kind = message.get("type")
+        if kind == "hello":
+            state["hostname"] = message.get("host")
+            state["interval"] = message.get("interval")
+            state["status"] = "up"
+            state["error"] = None
+        elif kind == "error":
+            raise FleetProtocolError(message.get("error", "agent error"))
+        elif kind in ("update", "heartbeat"):
+            for key in SECTIONS:
+                if key in message:
+                    state[key] = message[key]
+            state["error"] = message.get("error")
+            state["updates"] += 1
+        state["last_seen"] = time.time()
+        self._notify()
+    
+    def _notify(self) -> None:
+        self.version += 1
+        if self._changed is not None:
+            self._changed.set()
+    
+    def _set_status(self, name: str, status: str, error: Optional[str] = None) -> None:
+        state = self.states[name]
+        state["status"] = status
+        state["error"] = error
+        self._notify()
+    
+    async def _follow(self, name: str) -> None:
+        """Stay connected to one agent, reconnecting with backoff"""
+        state = self.states[name]
+        failures = 0
+        while self._running:
+            writer = None
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(state["host"], state["port"]),
+                    timeout=self.connect_timeout
+                )
+                writer.write(encode_message({"type": "subscribe", "token": self.token or ""}))
+                await writer.drain()
+                while self._running:
+                    # A silent agent (half-open connection) counts as gone
+                    timeout = max(self.connect_timeout, STALE_INTERVALS * (state["interval"] or 0) * 2)
+                    message = await asyncio.wait_for(read_message(reader), timeout=timeout)
+                    self.merge(name, message)
+                    failures = 0
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, FleetProtocolError) as e:
+                self._set_status(name, "down", describe_error(e))
+            finally:
+                if writer is not None:
+                    writer.close()
+            
+            failures += 1
+            delay = min(self.max_backoff, 0.5 * 2 ** min(failures, 10))
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+    
+    async def start(self) -> None:
+        """Start one task per host"""
+        self._changed = asyncio.Event()
+        self._running = True
+        self._tasks = [asyncio.ensure_future(self._follow(name)) for name in self.states]
+    
+    async def stop(self) -> None:
+        """Disconnect from every agent"""
+        # wait_for() can swallow a cancel that races with a read completing,
+        # so the follow loops also check this flag
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    async def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Wait until any host's state changes"""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+    
+    async def wait_until(self, predicate: Callable[["FleetMonitor"], bool], timeout: float) -> bool:
+        """Wait until predicate(self) holds or timeout expires"""
+        deadline = time.monotonic() + timeout
+        while not predicate(self):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await self.wait_for_change(remaining)
+        return True
+    
+    def get_age(self, name: str, now: Optional[float] = None) -> Optional[float]:
+        """Seconds since the host was last heard from"""
+        last_seen = self.states[name]["last_seen"]
+        if last_seen is None:
+            return None
+        return (time.time() if now is None else now) - last_seen
+    
+    def is_stale(self, name: str, now: Optional[float] = None) -> bool:
+        """Whether a connected host has missed several updates"""
+        state = self.states[name]
+        age = self.get_age(name, now)
+        return (
+            state["status"] == "up" and age is not None and
+            age > STALE_INTERVALS * (state["interval"] or 1.0)
+        )
+    
+    def get_summary(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Hosts up, stale and down"""
+        summary = {"hosts": len(self.states), "up": 0, "stale": 0, "down": 0}
+        for name, state in self.states.items():
+            if state["status"] != "up":
+                summary["down"] += 1
+            elif self.is_stale(name, now):
+                summary["stale"] += 1
+            else:
+                summary["up"] += 1
+        return summary
+
+
+def render_fleet(monitor: FleetMonitor, now: Optional[float] = None, max_rows: Optional[int] = None) -> "Table":
+    """One row per host: problems first, then by name"""
+    now = time.time() if now is None else now
+    summary = monitor.get_summary(now)
+    table = Table(
+        title=f"⚡ Fleet: {summary['up']} up, {summary['stale']} stale, {summary['down']} down",
+        box=box.SIMPLE_HEAD,
+        expand=True
+    )
+    table.add_column("Host", style="cyan", no_wrap=True)
+    table.add_column("Status", no_wrap=True)
+    table.add_column("CPU", justify="right")
+    table.add_column("RAM", justify="right")
+    table.add_column("Disk", justify="right")
+    table.add_column("Load", justify="right")
+    table.add_column("Ports", justify="right")
+    table.add_column("Repo", no_wrap=True, overflow="ellipsis", min_width=12, ratio=1)
+    
+    def rank(name: str) -> Tuple[int, str]:
+        state = monitor.states[name]
+        if state["status"] != "up":
+            return 0, name
+        return (1 if monitor.is_stale(name, now) else 2), name
+    
+    def percent(value: Optional[float], warn: float = 80) -> Text:
+        if value is None:
+            return Text("-", style="dim")
+        return Text(f"{value:.0f}%", style="red" if value >= warn else "green")
+    
+    names = sorted(monitor.states, key=rank)
+    for name in names[:max_rows]:
+        state = monitor.states[name]
+        age = monitor.get_age(name, now) or 0
+        if state["status"] != "up":
+            status = Text(state["status"], style="red" if state["status"] == "down" else "yellow")
+        elif monitor.is_stale(name, now):
+            status = Text(f"stale {age:.0f}s", style="yellow")
+        else:
+            status = Text("up", style="green")
+        
+        system = state["system"] or {}
+        repo = state["repo"]
+        repo_text = Text("-", style="dim")
+        if state["error"]:
+            repo_text = Text(state["error"], style="red" if state["status"] != "up" else "yellow")
+        elif repo:
+            repo_text = Text(f"{repo['name']} {repo['branch']}", style="magenta")
+            if repo["ahead"] or repo["behind"]:
+                repo_text.append(f" ↑{repo['ahead']}↓{repo['behind']}", style="cyan")
+            if repo["dirty"]:
+                repo_text.append(f" !{repo['dirty']}", style="yellow")
+        
+        table.add_row(
+            name,
+            status,
+            percent(system.get("cpu")),
+            percent(system.get("mem")),
+            percent(system.get("disk"), warn=90),
+            "-" if system.get("load") is None else f"{system['load']:.2f}",
+            "-" if state["ports"] is None else str(len(state["ports"])),
+            repo_text
+        )
+    
+    if max_rows is not None and len(names) > max_rows:
+        table.caption = f"{len(names) - max_rows} more hosts"
+    return table
+
+
+async def run_fleet(
+    hosts: List[Tuple[str, int]],
+    console,
+    token: Optional[str] = None,
+    once: bool = False,
+    timeout: float = 5.0
+) -> None:
+    """Show the fleet table, redrawn as updates arrive"""
+    monitor = FleetMonitor(hosts, token=token, connect_timeout=timeout)
+    await monitor.start()
+    try:
+        if once:
+            await monitor.wait_until(
+                lambda m: all(s["status"] != "connecting" and (s["status"] != "up" or s["updates"]) for s in m.states.values()),
+                timeout
+            )
+            console.print(render_fleet(monitor))
+            return
+        
+        from rich.live import Live
+        with Live(render_fleet(monitor), console=console, auto_refresh=False, screen=True) as live:
+            while True:
+                # Ages tick every second; otherwise redraw on change, at most 4 times a second
+                await monitor.wait_for_change(1.0)
+                live.update(render_fleet(monitor, max_rows=max(1, console.height - 6)), refresh=True)
+                await asyncio.sleep(0.25)
+    finally:
+        await monitor.stop()
@@ -0,0 +1,17 @@
+"""
+Formatting helpers shared by DevDash panels
+"""
+
+import time
+from typing import Optional
+
+
+def format_age(timestamp: Optional[int], now: Optional[float] = None) -> str:
+    """Compact age of a timestamp: 'now', '5h', '3d', '2y'"""
+    if timestamp is None:
+        return "-"
+    seconds = max(0, (time.time() if now is None else now) - timestamp)
+    for unit, size in (("y", 365 * 86400), ("mo", 30 * 86400), ("d", 86400), ("h", 3600)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit}"
+    return "now"
@@ -7,6 +7,123 @@ import os
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+# Files in the git dir that mark an operation in progress
+GIT_OPERATIONS = (
+    ("rebase-merge", "REBASING"),
+    ("rebase-apply", "REBASING"),
+    ("MERGE_HEAD", "MERGING"),
+    ("CHERRY_PICK_HEAD", "CHERRY-PICKING"),
+    ("REVERT_HEAD", "REVERTING"),
+    ("BISECT_LOG", "BISECTING"),
+)
+
+
+def find_git_dir(path: str = ".") -> Optional[str]:
+    """Locate the git dir for path without running git
+    
+    Walks up to the filesystem root; follows 'gitdir:' files (worktrees,
+    submodules). GIT_DIR overrides the search.
+    """
+    if os.environ.get("GIT_DIR"):
+        return os.path.abspath(os.environ["GIT_DIR"])
+    
+    directory = os.path.abspath(path)
+    while True:
+        candidate = os.path.join(directory, ".git")
+        if os.path.isdir(candidate):
+            return candidate
+        if os.path.isfile(candidate):
+            try:
+                with open(candidate, encoding="utf-8") as f:
+                    line = f.readline().strip()
+            except OSError:
+                return None
+            if line.startswith("gitdir:"):
+                return os.path.normpath(os.path.join(directory, line[len("gitdir:"):].strip()))
+            return None
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def read_head(git_dir: str) -> Tuple[Optional[str], Optional[str]]:
+    """(branch, commit) from HEAD; branch is None when detached"""
+    try:
+        with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as f:
+            head = f.read().strip()
+    except OSError:
+        return None, None
+    if head.startswith("ref:"):
+        ref = head[len("ref:"):].strip()
+        return ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref, None
+    return None, head or None
+
+
+def get_operation(git_dir: str) -> Optional[str]:
+    """Rebase/merge/cherry-pick/revert/bisect in progress, if any"""
+    for name, operation in GIT_OPERATIONS:
+        if os.path.exists(os.path.join(git_dir, name)):
+            return operation
+    return None
+
+
+def _count_change(code: str, status: Dict[str, int]) -> None:
+    """Classify a two-letter status code into modified/added/deleted"""
+    if "M" in code:
+        status["modified"] += 1
+    elif "A" in code:
+        status["added"] += 1
+    elif "D" in code:
+        status["deleted"] += 1
+
+
+def parse_status_v2(output: str) -> Dict:
+    """Parse `git status --porcelain=v2 --branch` output
+    
+    One command gives the branch, upstream, ahead/behind and the change
+    counts that otherwise take a subprocess each.
+    """
+    state = {
+        "branch": None,
+        "oid": None,
+        "upstream": None,
+        "ahead": 0,
+        "behind": 0,
+        "staged": 0,
+        "unstaged": 0,
+        "untracked": 0,
+        "conflicts": 0,
+        "status": {"modified": 0, "added": 0, "deleted": 0, "untracked": 0},
+    }
+    for line in output.splitlines():
+        if line.startswith("# branch.oid "):
+            oid = line[len("# branch.oid "):]
+            state["oid"] = None if oid == "(initial)" else oid
+        elif line.startswith("# branch.head "):
+            head = line[len("# branch.head "):]
+            state["branch"] = None if head == "(detached)" else head
+        elif line.startswith("# branch.upstream "):
+            state["upstream"] = line[len("# branch.upstream "):]
+        elif line.startswith("# branch.ab "):
+            ahead, behind = line[len("# branch.ab "):].split()
+            state["ahead"] = abs(int(ahead))
+            state["behind"] = abs(int(behind))
+        elif line.startswith(("1 ", "2 ")):
+            code = line[2:4]
+            if code[0] != ".":
+                state["staged"] += 1
+            if code[1] != ".":
+                state["unstaged"] += 1
+            _count_change(code, state["status"])
+        elif line.startswith("u "):
+            state["conflicts"] += 1
+            _count_change(line[2:4], state["status"])
+        elif line.startswith("? "):
+            state["untracked"] += 1
+            state["status"]["untracked"] += 1
+    return state
+
 
 class GitInfo:
     """Get git repository information"""
@@ -62,17 +179,26 @@ class GitInfo:
             if not line:
                 continue
             code = line[:2]
-            if "M" in code:
-                status["modified"] += 1
-            elif "A" in code:
-                status["added"] += 1
-            elif "D" in code:
-                status["deleted"] += 1
-            elif "?" in code:
+            if "?" in code:
                 status["untracked"] += 1
+            else:
+                _count_change(code, status)
         
         return status
     
+    def get_state(self, untracked: bool = True) -> Optional[Dict]:
+        """Branch, upstream, ahead/behind and change counts in one git call
+        
+        See parse_status_v2 for the keys; None outside a repository.
+        """
+        if not self.is_git_repo:
+            return None
+        success, output = self._run_git(
+            "--no-optional-locks", "status", "--porcelain=v2", "--branch",
+            "--untracked-files=" + ("normal" if untracked else "no")
+        )
+        return parse_status_v2(output) if success else None
+    
     def get_last_commit(self) -> Dict[str, str]:
         """Get last commit info"""
         if not self.is_git_repo:
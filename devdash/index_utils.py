@@ -0,0 +1,291 @@
+"""
+Package index utilities for DevDash (PEP 503/691 simple API)
+"""
+
+import os
+import re
+import json
+import queue
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urljoin, urlsplit
+
+from .version_utils import canonicalize_name, compare_versions, is_prerelease, latest_version
+
+DEFAULT_INDEX_URL = "https://pypi.org/simple/"
+
+SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+
+ANCHOR_PATTERN = re.compile(r"<a\s+([^>]*)>([^<]*)</a>", re.IGNORECASE)
+
+ARCHIVE_EXTENSIONS = (".tar.gz", ".tar.bz2", ".tar.xz", ".tgz", ".zip", ".tar")
+
+
+def get_index_url() -> str:
+    """Configured index URL (DEVDASH_INDEX_URL, PIP_INDEX_URL or PyPI)"""
+    return (
+        os.environ.get("DEVDASH_INDEX_URL")
+        or os.environ.get("PIP_INDEX_URL")
+        or DEFAULT_INDEX_URL
+    )
+
+
+def version_from_filename(filename: str) -> Optional[str]:
+    """Extract the version from a wheel or sdist filename"""
+    filename = unquote(filename.split("#", 1)[0].split("?", 1)[0].rsplit("/", 1)[-1])
+    if filename.endswith(".whl"):
+        parts = filename[:-4].split("-")
+        return parts[1] if len(parts) >= 5 else None
+    for ext in ARCHIVE_EXTENSIONS:
+        if filename.endswith(ext):
+            stem = filename[:-len(ext)]
+            if "-" in stem:
+                return stem.rsplit("-", 1)[1]
+    return None
+
+
+def name_from_filename(filename: str) -> Optional[str]:
+    """Extract the canonical project name from a wheel or sdist filename"""
+    if filename.endswith(".whl"):
+        return canonicalize_name(filename.split("-", 1)[0])
+    for ext in ARCHIVE_EXTENSIONS:
+        if filename.endswith(ext):
+            stem = filename[:-len(ext)]
+            if "-" in stem:
+                return canonicalize_name(stem.rsplit("-", 1)[0])
+    return None
+
+
+def parse_simple_json(data: Dict) -> List[str]:
+    """Versions from a PEP 691 JSON project page"""
+    versions = set()
+    for info in data.get("files", []):
+        if info.get("yanked"):
+            continue
+        version = version_from_filename(info.get("filename", ""))
+        if version:
+            versions.add(version)
+    if not versions and data.get("versions"):
+        versions.update(data["versions"])
+    return sorted(versions)
+
+
+def parse_simple_html(text: str) -> List[str]:
+    """Versions from a PEP 503 HTML project page"""
+    versions = set()
+    for attrs, label in ANCHOR_PATTERN.findall(text):
+        if "data-yanked" in attrs.lower():
+            continue
+        href = re.search(r"href\s*=\s*[\"']([^\"']*)[\"']", attrs, re.IGNORECASE)
+        filename = unescape(label.strip()) or (unescape(href.group(1)) if href else "")
+        version = version_from_filename(filename)
+        if version:
+            versions.add(version)
+    return sorted(versions)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections shared by lookup threads"""
+    
+    def __init__(self, scheme: str, host: str, port: Optional[int], size: int = 8, timeout: float = 10.0):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=size)
+        self.created = 0
+        self._lock = threading.Lock()
+    
+    def _new_connection(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.created += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+    
+    def request(self, path: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """GET a path, reusing an idle connection when one is available"""
+        for attempt in range(2):
+            try:
+                conn = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                conn = self._new_connection()
+                reused = False
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                # A reused connection may have been closed by the server
+                if reused and attempt == 0:
+                    continue
+                raise
+            response_headers = {k.lower(): v for k, v in response.getheaders()}
+            if response.will_close:
+                conn.close()
+            else:
+                try:
+                    self._idle.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+            return response.status, response_headers, body
+        raise OSError("request failed")
+    
+    def close(self) -> None:
+        """Close all idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class PackageIndex:
+    """Look up available versions on a PEP 503/691 simple index"""
+    
+    def __init__(self, index_url: Optional[str] = None, concurrency: int = 16, timeout: float = 10.0):
+        self.index_url = index_url or get_index_url()
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._pools: Dict[Tuple[str, str, Optional[int]], ConnectionPool] = {}
+        self._pools_lock = threading.Lock()
+        self._flat_listing: Optional[Dict[str, List[str]]] = None
+        
+        parts = urlsplit(self.index_url)
+        if parts.scheme in ("http", "https"):
+            self.local_path = None
+        elif parts.scheme == "file":
+            self.local_path = unquote(parts.path)
+        else:
+            self.local_path = self.index_url
+    
+    def _get_pool(self, url: str) -> Tuple[ConnectionPool, str]:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname or "", parts.port)
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(parts.scheme, key[1], parts.port, self.concurrency, self.timeout)
+                self._pools[key] = pool
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        return pool, path
+    
+    @property
+    def connections_created(self) -> int:
+        """Number of TCP connections opened so far"""
+        return sum(pool.created for pool in self._pools.values())
+    
+    def _fetch_http(self, name: str) -> Optional[List[str]]:
+        url = urljoin(self.index_url.rstrip("/") + "/", canonicalize_name(name) + "/")
+        headers = {
+            "Accept": f"{SIMPLE_JSON}, text/html;q=0.1",
+            "User-Agent": "devdash",
+        }
+        for _ in range(3):
+            pool, path = self._get_pool(url)
+            status, response_headers, body = pool.request(path, headers)
+            if status in (301, 302, 303, 307, 308) and "location" in response_headers:
+                url = urljoin(url, response_headers["location"])
+                continue
+            if status == 404:
+                return None
+            if status != 200:
+                raise OSError(f"index returned HTTP {status} for {name}")
+            content_type = response_headers.get("content-type", "")
+            text = body.decode("utf-8", "replace")
+            if "json" in content_type:
+                return parse_simple_json(json.loads(text))
+            return parse_simple_html(text)
+        raise OSError(f"too many redirects for {name}")
+    
+    def _fetch_local(self, name: str) -> Optional[List[str]]:
+        project_dir = os.path.join(self.local_path, canonicalize_name(name))
+        for page, parser in (("index.json", "json"), ("index.html", "html")):
+            try:
+                with open(os.path.join(project_dir, page), encoding="utf-8") as f:
+                    content = f.read()
+            except OSError:
+                continue
+            return parse_simple_json(json.loads(content)) if parser == "json" else parse_simple_html(content)
+        
+        if os.path.isdir(project_dir):
+            versions = {version_from_filename(f) for f in os.listdir(project_dir)}
+            return sorted(v for v in versions if v)
+        
+        # Flat directory of distributions (like pip --find-links)
+        if self._flat_listing is None:
+            listing: Dict[str, List[str]] = {}
+            try:
+                for filename in os.listdir(self.local_path):
+                    project = name_from_filename(filename)
+                    version = version_from_filename(filename)
+                    if project and version:
+                        listing.setdefault(project, []).append(version)
+            except OSError:
+                pass
+            self._flat_listing = listing
+        return self._flat_listing.get(canonicalize_name(name))
+    
+    def get_versions(self, name: str) -> Optional[List[str]]:
+        """Available versions of a project, None if the index does not have it"""
+        if self.local_path is not None:
+            return self._fetch_local(name)
+        return self._fetch_http(name)
+    
+    def get_many_versions(self, names: Iterable[str]) -> Dict[str, Optional[List[str]]]:
+        """Look up many projects concurrently over pooled connections
+        
+        Projects whose lookup failed are left out of the result.
+        """
+        names = list(names)
+        results: Dict[str, Optional[List[str]]] = {}
+        
+        def lookup(name: str):
+            try:
+                return name, self.get_versions(name), True
+            except (OSError, ValueError, http.client.HTTPException):
+                return name, None, False
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.concurrency, len(names) or 1))) as executor:
+            for name, versions, ok in executor.map(lookup, names):
+                if ok:
+                    results[name] = versions
+        return results
+    
+    def get_outdated(self, installed: Dict[str, str]) -> List[Dict]:
+        """Compare installed versions against the index
+        
+        Raises OSError when the index could not be reached at all.
+        """
+        outdated = []
+        found = self.get_many_versions(installed)
+        if installed and not found:
+            raise OSError(f"package index unreachable: {self.index_url}")
+        for name, current in installed.items():
+            versions = found.get(name)
+            if not versions:
+                continue
+            latest = latest_version(versions, include_prereleases=is_prerelease(current))
+            if latest is None:
+                continue
+            if compare_versions(latest, current) > 0:
+                outdated.append({
+                    "name": name,
+                    "current": current,
+                    "wanted": latest,
+                    "latest": latest,
+                    "type": "pip",
+                })
+        return sorted(outdated, key=lambda p: p["name"].lower())
+    
+    def close(self) -> None:
+        """Close pooled connections"""
+        for pool in self._pools.values():
+            pool.close()
@@ -0,0 +1,159 @@
+"""
+Keyboard input utilities for DevDash
+"""
+
+import os
+import sys
+import time
+from typing import List
+
+try:
+    import selectors
+    import termios
+    import tty
+    TERMIOS_AVAILABLE = True
+except ImportError:
+    TERMIOS_AVAILABLE = False
+
+try:
+    import msvcrt
+    MSVCRT_AVAILABLE = True
+except ImportError:
+    MSVCRT_AVAILABLE = False
+
+
+# Control characters and arrow keys (final byte of "ESC [ x" / "ESC O x") by name
+CONTROL_KEYS = {"\x03": "ctrl-c", "\r": "enter", "\n": "enter", "\x7f": "backspace", "\x08": "backspace"}
+ARROW_KEYS = {"A": "up", "B": "down", "C": "right", "D": "left"}
+
+
+def parse_keys(data: str) -> List[str]:
+    """Split raw terminal input into keys
+    
+    Printable keys are returned as themselves, a lone ESC as "escape",
+    arrows as "up"/"down"/"left"/"right" and Enter, Backspace and Ctrl-C by
+    name; other escape sequences (function keys) are skipped.
+    """
+    keys = []
+    i = 0
+    while i < len(data):
+        char = data[i]
+        if char == "\x1b":
+            if i + 1 < len(data) and data[i + 1] in "[O":
+                # CSI/SS3 sequence: parameters, then one final byte in @..~
+                start = i + 2
+                i = start
+                while i < len(data) and not ("@" <= data[i] <= "~"):
+                    i += 1
+                if i == start and i < len(data) and data[i] in ARROW_KEYS:
+                    keys.append(ARROW_KEYS[data[i]])
+                i += 1
+                continue
+            keys.append("escape")
+        else:
+            keys.append(CONTROL_KEYS.get(char, char))
+        i += 1
+    return keys
+
+
+class KeyReader:
+    """Non-blocking single-key reader for the dashboard loop
+    
+    On a POSIX terminal, stdin is switched to cbreak mode (no line
+    buffering, no echo; Ctrl-C still interrupts) and multiplexed with the
+    collector pool's wakeup pipe in one selector, so the loop sleeps until
+    a key is pressed, a result is published or the timer expires.
+    Elsewhere keys are polled (Windows) or ignored (not a terminal).
+    """
+    
+    # Windows has no select() on consoles; poll this often instead
+    POLL_INTERVAL = 0.05
+    
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdin
+        self._saved_attrs = None
+        self._selector = None
+        try:
+            self._fd = self.stream.fileno()
+            self.is_terminal = os.isatty(self._fd)
+        except (AttributeError, ValueError, OSError):
+            self._fd = None
+            self.is_terminal = False
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether keypresses can be read"""
+        return self.is_terminal and (TERMIOS_AVAILABLE or MSVCRT_AVAILABLE)
+    
+    def __enter__(self) -> "KeyReader":
+        if self.is_terminal and TERMIOS_AVAILABLE:
+            self._saved_attrs = termios.tcgetattr(self._fd)
+            tty.setcbreak(self._fd)
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self._fd, selectors.EVENT_READ, "keys")
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self._saved_attrs is not None:
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved_attrs)
+            self._saved_attrs = None
+    
+    def read_keys(self) -> List[str]:
+        """Keys already waiting on stdin (never blocks)"""
+        if not self.enabled:
+            return []
+        if MSVCRT_AVAILABLE and not TERMIOS_AVAILABLE:
+            data = ""
+            while msvcrt.kbhit():
+                data += msvcrt.getwch()
+            return parse_keys(data)
+        if self._selector is None or not self._selector.select(0):
+            return []
+        try:
+            data = os.read(self._fd, 64)
+        except OSError:
+            return []
+        return parse_keys(data.decode("utf-8", "replace"))
+    
+    def wait(self, timeout: float, pool=None) -> List[str]:
+        """Sleep until a key, a published collector result or timeout
+        
+        Returns the keys pressed (possibly none).
+        """
+        if self._selector is not None:
+            wakeup_fd = pool.get_wakeup_fd() if pool is not None else None
+            if wakeup_fd is not None and wakeup_fd not in self._registered_fds():
+                self._selector.register(wakeup_fd, selectors.EVENT_READ, "wakeup")
+            keys = []
+            for key, _ in self._selector.select(max(0.0, timeout)):
+                if key.data == "wakeup":
+                    pool.drain_wakeup()
+                else:
+                    keys += self.read_keys()
+            return keys
+        
+        if self.enabled:
+            deadline = time.monotonic() + timeout
+            while True:
+                keys = self.read_keys()
+                remaining = deadline - time.monotonic()
+                if keys or remaining <= 0:
+                    return keys
+                step = min(self.POLL_INTERVAL, remaining)
+                if pool is not None:
+                    if pool.wait_for_update(step):
+                        return self.read_keys()
+                else:
+                    time.sleep(step)
+        
+        if pool is not None:
+            pool.wait_for_update(timeout)
+        else:
+            time.sleep(timeout)
+        return []
+    
+    def _registered_fds(self) -> List[int]:
+        return [key.fd for key in self._selector.get_map().values()]
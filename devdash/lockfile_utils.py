@@ -0,0 +1,581 @@
+"""
+Lockfile utilities for DevDash
+
+Streaming, line-oriented parsers for the lockfiles of the common package
+managers. Files are never loaded whole: memory grows with the number of
+packages, not with the size of the file.
+"""
+
+import os
+import re
+import json
+from typing import Dict, IO, Iterable, Optional, Set, Tuple
+
+from .version_utils import canonicalize_name
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# (versions by name, dependency names by name, direct dependency names)
+LockGraph = Tuple[Dict[str, Set[str]], Dict[str, Set[str]], Set[str]]
+
+JSON_MEMBER = re.compile(r'^"((?:[^"\\]|\\.)*)"\s*:\s*(.*?),?$')
+TOML_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"')
+TOML_NAME = re.compile(r'name\s*=\s*"([^"]+)"')
+PNPM_V5_KEY = re.compile(r"^/?((?:@[^/]+/)?[^/@]+)/([0-9][^/_]*)(?:_.*)?$")
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
+
+def _unquote(value: str) -> str:
+    value = value.strip().rstrip(",").strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def _split_spec(spec: str) -> str:
+    """'@scope/name@^1.0' -> '@scope/name'"""
+    at = spec.rfind("@")
+    return spec[:at] if at > 0 else spec
+
+
+class LockfileInventory:
+    """Dependency inventory from lockfiles, without spawning package managers"""
+    
+    # Checked in order; the first lockfile found wins
+    LOCKFILES = [
+        ("package-lock.json", "npm"),
+        ("npm-shrinkwrap.json", "npm"),
+        ("pnpm-lock.yaml", "pnpm"),
+        ("yarn.lock", "yarn"),
+        ("poetry.lock", "poetry"),
+        ("uv.lock", "uv"),
+        ("Cargo.lock", "cargo"),
+        ("go.sum", "go"),
+        ("Gemfile.lock", "bundler"),
+    ]
+    
+    # Manifests that declare direct dependencies for lockfiles that don't
+    MANIFESTS = {
+        "yarn": "package.json",
+        "poetry": "pyproject.toml",
+        "go": "go.mod",
+    }
+    
+    HEAVIEST_LIMIT = 5
+    
+    # abs lockfile path -> (signature, inventory)
+    _cache: Dict[str, Tuple[Tuple, Dict]] = {}
+    
+    @classmethod
+    def find_lockfile(cls, path: str = ".") -> Optional[Tuple[str, str]]:
+        """Find the lockfile of a project: (file path, ecosystem)"""
+        for name, ecosystem in cls.LOCKFILES:
+            candidate = os.path.join(path, name)
+            if os.path.isfile(candidate):
+                return candidate, ecosystem
+        return None
+    
+    @classmethod
+    def _signature(cls, files: Iterable[str]) -> Tuple:
+        signature = []
+        for name in files:
+            try:
+                st = os.stat(name)
+                signature.append((name, st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append((name, None, None))
+        return tuple(signature)
+    
+    @classmethod
+    def get_inventory(cls, path: str = ".") -> Optional[Dict]:
+        """Get the dependency inventory of a project, cached by mtime and size"""
+        found = cls.find_lockfile(path)
+        if found is None:
+            return None
+        lockfile, ecosystem = found
+        
+        files = [lockfile]
+        if ecosystem in cls.MANIFESTS:
+            files.append(os.path.join(path, cls.MANIFESTS[ecosystem]))
+        key = os.path.abspath(lockfile)
+        signature = cls._signature(files)
+        
+        cached = cls._cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        inventory = cls.parse(lockfile, ecosystem)
+        cls._cache[key] = (signature, inventory)
+        return inventory
+    
+    @classmethod
+    def parse(cls, lockfile: str, ecosystem: str) -> Dict:
+        """Parse a lockfile into a summary"""
+        parser = {
+            "npm": cls._parse_package_lock,
+            "pnpm": cls._parse_pnpm_lock,
+            "yarn": cls._parse_yarn_lock,
+            "poetry": cls._parse_toml_lock,
+            "uv": cls._parse_toml_lock,
+            "cargo": cls._parse_cargo_lock,
+            "go": cls._parse_go_sum,
+            "bundler": cls._parse_gemfile_lock,
+        }[ecosystem]
+        
+        with open(lockfile, encoding="utf-8", errors="replace") as f:
+            versions, graph, direct = parser(f)
+        
+        project_dir = os.path.dirname(lockfile)
+        if ecosystem == "yarn" and not direct:
+            direct = cls._read_package_json_direct(project_dir)
+        elif ecosystem == "poetry":
+            direct = cls._read_pyproject_direct(project_dir)
+        elif ecosystem == "go":
+            direct = cls._read_go_mod_direct(project_dir)
+        
+        return cls.summarize(versions, graph, direct, ecosystem, os.path.basename(lockfile))
+    
+    @classmethod
+    def summarize(
+        cls,
+        versions: Dict[str, Set[str]],
+        graph: Dict[str, Set[str]],
+        direct: Set[str],
+        ecosystem: str = "",
+        lockfile: str = ""
+    ) -> Dict:
+        """Count direct/transitive dependencies, duplicates and heavy subtrees"""
+        direct = {name for name in direct if name in versions} or set(direct)
+        installed = set(versions)
+        
+        heaviest = []
+        if graph:
+            for name in direct:
+                seen = {name}
+                stack = [name]
+                while stack:
+                    for dep in graph.get(stack.pop(), ()):
+                        if dep not in seen:
+                            seen.add(dep)
+                            stack.append(dep)
+                heaviest.append({"name": name, "size": len(seen)})
+            heaviest.sort(key=lambda h: (-h["size"], h["name"]))
+        
+        duplicates = [
+            {"name": name, "versions": sorted(v)}
+            for name, v in versions.items() if len(v) > 1
+        ]
+        duplicates.sort(key=lambda d: (-len(d["versions"]), d["name"]))
+        
+        return {
+            "ecosystem": ecosystem,
+            "lockfile": lockfile,
+            "packages": sum(len(v) for v in versions.values()),
+            "direct": len(direct),
+            "transitive": len(installed - direct),
+            "duplicates": duplicates,
+            "heaviest": heaviest[:cls.HEAVIEST_LIMIT],
+        }
+    
+    @staticmethod
+    def _add(versions: Dict[str, Set[str]], name: str, version: Optional[str]) -> None:
+        bucket = versions.setdefault(name, set())
+        if version:
+            bucket.add(version)
+    
+    @classmethod
+    def _parse_package_lock(cls, f: IO[str]) -> LockGraph:
+        """package-lock.json v2/v3 as written by npm (2-space indented)"""
+        versions: Dict[str, Set[str]] = {}
+        graph: Dict[str, Set[str]] = {}
+        direct: Set[str] = set()
+        
+        in_packages = False
+        entry: Optional[str] = None
+        name = version = None
+        link = False
+        deps: Set[str] = set()
+        section = None
+        
+        for line in f:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            indent = _indent(line)
+            
+            if not in_packages:
+                if indent == 2 and stripped.startswith('"packages"'):
+                    in_packages = not stripped.endswith(("{},", "{}"))
+                continue
+            
+            if indent <= 2:
+                break
+            
+            if indent == 4:
+                if stripped.endswith("{"):
+                    match = JSON_MEMBER.match(stripped)
+                    entry = json.loads(f'"{match.group(1)}"') if match else ""
+                    name = entry.rsplit("node_modules/", 1)[-1] if entry else ""
+                    version, link, deps, section = None, False, set(), None
+                elif stripped.startswith("}") and entry is not None:
+                    if entry == "":
+                        direct.update(deps)
+                    elif not link and not entry.startswith("node_modules/") and "/node_modules/" not in entry:
+                        # Workspace package sources: their dependencies are direct too
+                        direct.update(deps)
+                    elif not link:
+                        cls._add(versions, name, version)
+                        graph.setdefault(name, set()).update(deps)
+                    entry = None
+                continue
+            
+            if entry is None:
+                continue
+            
+            if indent == 6:
+                match = JSON_MEMBER.match(stripped)
+                if stripped.startswith("}"):
+                    section = None
+                elif match:
+                    key, value = match.group(1), match.group(2)
+                    if key == "version":
+                        version = _unquote(value)
+                    elif key == "link":
+                        link = value.startswith("true")
+                    elif key in ("dependencies", "optionalDependencies", "devDependencies", "peerDependencies"):
+                        # peerDependencies of installed packages are provided by others
+                        section = key if value.startswith("{") and not value.startswith("{}") else None
+                        if key == "peerDependencies" and entry != "":
+                            section = None
+            elif indent == 8 and section:
+                match = JSON_MEMBER.match(stripped)
+                if match:
+                    deps.add(match.group(1))
+        
+        return versions, graph, direct
+    
+    @classmethod
+    def _parse_yarn_lock(cls, f: IO[str]) -> LockGraph:
+        """yarn.lock, both classic (v1) and berry (v2+) formats"""
+        versions: Dict[str, Set[str]] = {}
+        graph: Dict[str, Set[str]] = {}
+        direct: Set[str] = set()
+        
+        name: Optional[str] = None
+        version = None
+        workspace = False
+        deps: Set[str] = set()
+        section = False
+        
+        def finish():
+            if name is None:
+                return
+            if workspace:
+                direct.update(deps)
+            else:
+                cls._add(versions, name, version)
+                graph.setdefault(name, set()).update(deps)
+        
+        for line in f:
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            indent = _indent(line)
+            stripped = line.strip()
+            
+            if indent == 0:
+                finish()
+                name, version, workspace, deps, section = None, None, False, set(), False
+                if stripped.endswith(":") and not stripped.startswith("__metadata"):
+                    first = stripped[:-1].split(",")[0].strip().strip('"')
+                    name = _split_spec(first)
+                    if name.endswith("@npm"):
+                        name = name[:-4]
+                    workspace = "@workspace:" in first
+                continue
+            
+            if name is None:
+                continue
+            
+            if indent == 2:
+                section = False
+                if stripped.startswith("version"):
+                    version = _unquote(stripped[len("version"):].lstrip(":").strip())
+                elif stripped.rstrip(":") in ("dependencies", "optionalDependencies"):
+                    section = True
+            elif indent == 4 and section:
+                dep = stripped.split(" ", 1)[0].rstrip(":")
+                deps.add(_unquote(dep))
+        
+        finish()
+        return versions, graph, direct
+    
+    @classmethod
+    def _parse_pnpm_key(cls, key: str) -> Tuple[str, Optional[str]]:
+        # Drop inline values such as "name@1.0.0: {}"
+        key = key.split(": ", 1)[0]
+        key = _unquote(key.rstrip(":")).split("(", 1)[0]
+        # lockfile v5: /name/version_peer-suffix
+        match = PNPM_V5_KEY.match(key)
+        if match:
+            return match.group(1), match.group(2)
+        key = key.lstrip("/")
+        at = key.rfind("@")
+        if at > 0:
+            return key[:at], key[at + 1:]
+        return key, None
+    
+    @classmethod
+    def _parse_pnpm_lock(cls, f: IO[str]) -> LockGraph:
+        """pnpm-lock.yaml (v5 to v9)"""
+        versions: Dict[str, Set[str]] = {}
+        graph: Dict[str, Set[str]] = {}
+        direct: Set[str] = set()
+        
+        top = None
+        current: Optional[str] = None
+        section = False
+        
+        for line in f:
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            indent = _indent(line)
+            stripped = line.strip()
+            
+            if indent == 0:
+                top = stripped.rstrip(":").strip()
+                current, section = None, False
+                continue
+            
+            if top == "importers":
+                if indent == 4:
+                    section = stripped.rstrip(":") in ("dependencies", "devDependencies", "optionalDependencies")
+                elif indent == 6 and section:
+                    direct.add(_unquote(stripped.split(":", 1)[0]))
+            elif top in ("dependencies", "devDependencies", "optionalDependencies"):
+                if indent == 2:
+                    direct.add(_unquote(stripped.split(":", 1)[0]))
+            elif top in ("packages", "snapshots"):
+                if indent == 2:
+                    name, version = cls._parse_pnpm_key(stripped)
+                    current = name
+                    cls._add(versions, name, version)
+                    graph.setdefault(name, set())
+                    section = False
+                elif indent == 4:
+                    section = stripped.rstrip(":") in ("dependencies", "optionalDependencies")
+                elif indent == 6 and section and current:
+                    graph[current].add(_unquote(stripped.split(":", 1)[0]))
+        
+        return versions, graph, direct
+    
+    @classmethod
+    def _parse_cargo_lock(cls, f: IO[str]) -> LockGraph:
+        """Cargo.lock: workspace members are the packages without a source"""
+        return cls._parse_toml_lock(f, sourceless_roots=True)
+    
+    @classmethod
+    def _parse_toml_lock(cls, f: IO[str], sourceless_roots: bool = False) -> LockGraph:
+        """[[package]] lockfiles: poetry.lock, uv.lock and Cargo.lock"""
+        versions: Dict[str, Set[str]] = {}
+        graph: Dict[str, Set[str]] = {}
+        direct: Set[str] = set()
+        
+        table = None
+        name = version = None
+        is_root = False
+        has_source = False
+        deps: Set[str] = set()
+        in_array = False
+        
+        def finish():
+            if name is None:
+                return
+            # The project itself (uv: editable/virtual sources, Cargo:
+            # workspace members) is not a dependency; what it requires is direct
+            if is_root or (sourceless_roots and not has_source):
+                direct.update(deps)
+                return
+            cls._add(versions, name, version)
+            graph.setdefault(name, set()).update(deps)
+        
+        def add_items(text: str) -> None:
+            names = TOML_NAME.findall(text)
+            if names:
+                deps.update(names)
+                return
+            for item in TOML_STRING.findall(text):
+                deps.add(item.split(" ", 1)[0])
+        
+        for line in f:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            
+            if in_array:
+                if stripped.startswith("]"):
+                    in_array = False
+                elif table in ("package", "package.dev-dependencies"):
+                    add_items(stripped)
+                continue
+            
+            if stripped.startswith("["):
+                header = stripped.strip("[]").strip()
+                if stripped.startswith("[[package]]"):
+                    finish()
+                    name, version, is_root, has_source, deps = None, None, False, False, set()
+                    table = "package"
+                else:
+                    table = header
+                continue
+            
+            key, _, value = stripped.partition("=")
+            key, value = key.strip(), value.strip()
+            
+            if table == "package":
+                if key == "name":
+                    name = _unquote(value)
+                elif key == "version":
+                    version = _unquote(value)
+                elif key == "source":
+                    has_source = True
+                    is_root = "editable" in value or "virtual" in value
+                elif key == "dependencies" and value.startswith("["):
+                    add_items(value)
+                    in_array = not value.rstrip().endswith("]")
+            elif table == "package.dependencies" and key:
+                # poetry: one table row per dependency
+                deps.add(_unquote(key))
+            elif table == "package.dev-dependencies" and value.startswith("["):
+                add_items(value)
+                in_array = not value.rstrip().endswith("]")
+        
+        finish()
+        return versions, graph, direct
+    
+    @classmethod
+    def _parse_go_sum(cls, f: IO[str]) -> LockGraph:
+        """go.sum: one line per module version (graph edges are not recorded)"""
+        versions: Dict[str, Set[str]] = {}
+        for line in f:
+            parts = line.split()
+            if len(parts) < 3 or parts[1].endswith("/go.mod"):
+                continue
+            cls._add(versions, parts[0], parts[1])
+        return versions, {}, set()
+    
+    @classmethod
+    def _parse_gemfile_lock(cls, f: IO[str]) -> LockGraph:
+        """Gemfile.lock specs and DEPENDENCIES sections"""
+        versions: Dict[str, Set[str]] = {}
+        graph: Dict[str, Set[str]] = {}
+        direct: Set[str] = set()
+        
+        section = None
+        in_specs = False
+        current: Optional[str] = None
+        
+        for line in f:
+            if not line.strip():
+                continue
+            indent = _indent(line)
+            stripped = line.strip()
+            
+            if indent == 0:
+                section = stripped
+                in_specs, current = False, None
+                continue
+            
+            if section == "DEPENDENCIES" and indent == 2:
+                direct.add(stripped.split(" ", 1)[0].rstrip("!"))
+            elif section in ("GEM", "GIT", "PATH"):
+                if indent == 2:
+                    in_specs = stripped == "specs:"
+                elif in_specs and indent == 4:
+                    gem, _, rest = stripped.partition(" ")
+                    version = rest.strip("()").split("-", 1)[0] if rest else None
+                    current = gem
+                    cls._add(versions, gem, version)
+                    graph.setdefault(gem, set())
+                elif in_specs and indent == 6 and current:
+                    graph[current].add(stripped.split(" ", 1)[0])
+        
+        return versions, graph, direct
+    
+    @staticmethod
+    def _read_package_json_direct(path: str) -> Set[str]:
+        try:
+            with open(os.path.join(path, "package.json")) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        direct: Set[str] = set()
+        for key in ("dependencies", "devDependencies", "optionalDependencies"):
+            direct.update(data.get(key, {}) or {})
+        return direct
+    
+    @staticmethod
+    def _read_pyproject_direct(path: str) -> Set[str]:
+        pyproject = os.path.join(path, "pyproject.toml")
+        direct: Set[str] = set()
+        if tomllib is not None:
+            try:
+                with open(pyproject, "rb") as f:
+                    data = tomllib.load(f)
+            except (OSError, ValueError):
+                return direct
+            for req in data.get("project", {}).get("dependencies", []):
+                direct.add(re.split(r"[\s\[<>=!~;(]", req.strip(), 1)[0])
+            poetry = data.get("tool", {}).get("poetry", {})
+            tables = [poetry.get("dependencies", {}), poetry.get("dev-dependencies", {})]
+            tables += [g.get("dependencies", {}) for g in poetry.get("group", {}).values()]
+            for table in tables:
+                direct.update(table)
+        else:
+            # Without a TOML parser, read the [tool.poetry.*dependencies] tables by line
+            table = None
+            try:
+                with open(pyproject) as f:
+                    for line in f:
+                        stripped = line.strip()
+                        if stripped.startswith("["):
+                            table = stripped.strip("[]")
+                        elif table and table.startswith("tool.poetry") and table.endswith("dependencies") and "=" in stripped:
+                            direct.add(_unquote(stripped.split("=", 1)[0]))
+            except OSError:
+                return direct
+        direct.discard("python")
+        return {canonicalize_name(name) for name in direct}
+    
+    @staticmethod
+    def _read_go_mod_direct(path: str) -> Set[str]:
+        direct: Set[str] = set()
+        in_block = False
+        try:
+            with open(os.path.join(path, "go.mod")) as f:
+                for line in f:
+                    stripped = line.strip()
+                    if stripped.startswith("require ("):
+                        in_block = True
+                        continue
+                    if in_block and stripped.startswith(")"):
+                        in_block = False
+                        continue
+                    if stripped.startswith("require "):
+                        stripped = stripped[len("require "):]
+                    elif not in_block:
+                        continue
+                    if "// indirect" in stripped or not stripped or stripped.startswith("//"):
+                        continue
+                    direct.add(stripped.split()[0])
+        except OSError:
+            pass
+        return direct
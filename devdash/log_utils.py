@@ -0,0 +1,364 @@
+"""
+Log tailing for DevDash
+
+Follows a project's log files (configured, or the *.log files at its root
+and in logs/ or log/, npm-debug.log included) in memory bounded by the
+number of lines kept, however big the files are. The last lines of a file
+are found by searching backward for newlines through mmap, so only the
+pages at the end of a multi-GB file are touched; appended data is read in
+fixed-size chunks. Appends are noticed through inotify on Linux (called
+through ctypes, no extra dependency) and by polling elsewhere. Files that
+are rotated (renamed or recreated) or truncated are read again from the
+start.
+"""
+
+import os
+import re
+import sys
+import mmap
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+# Lines kept by a tailer, across all of its files
+TAIL_LINES = 200
+
+# Bytes read at a time from a growing file
+READ_CHUNK = 64 * 1024
+
+# Longer lines are cut; the rest is dropped rather than buffered
+MAX_LINE = 4096
+
+# How far back a line start is searched for before giving up on older lines
+MAX_SCAN = 1024 * 1024
+
+# Auto-detected logs: *.log at the project root and in these directories
+LOG_DIRS = ("logs", "log")
+MAX_FILES = 8
+
+# Line levels for colors and the errors/min counter
+ERROR_PATTERN = re.compile(r"\b(?:error|fatal|critical|panic|exception|traceback)\b", re.IGNORECASE)
+WARNING_PATTERN = re.compile(r"\bwarn(?:ing)?\b", re.IGNORECASE)
+
+# Rate counters cover the last RATE_WINDOW seconds, in one-second buckets
+RATE_WINDOW = 60
+
+# Seconds between checks without inotify, and between safety checks with it
+POLL_INTERVAL = 0.5
+INOTIFY_TIMEOUT = 5.0
+
+
+def find_log_files(path: str = ".") -> List[str]:
+    """Log files of a project, most recently written first"""
+    found = []
+    for directory in (path,) + tuple(os.path.join(path, d) for d in LOG_DIRS):
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.name.endswith(".log") and entry.is_file():
+                    found.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+    return [p for _, p in sorted(found, reverse=True)[:MAX_FILES]]
+
+
+def tail_lines(path: str, count: int) -> List[str]:
+    """Last count lines of a file, read backward through mmap
+    
+    Touching a mapped page past the end of a file that was truncated
+    meanwhile (copytruncate rotation) raises SIGBUS, so the size is checked
+    again before each block is read; a truncated file yields no lines.
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0 or count <= 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                size = len(mapped)
+                if os.fstat(f.fileno()).st_size < size:
+                    return []
+                end = size - 1 if mapped[size - 1:size] == b"\n" else size
+                lines = []
+                while len(lines) < count and end > 0:
+                    if os.fstat(f.fileno()).st_size < end:
+                        return []
+                    floor = max(0, end - MAX_SCAN)
+                    newline = mapped.rfind(b"\n", floor, end)
+                    if newline < 0 and floor > 0:
+                        # A line longer than MAX_SCAN: keep its end and stop there
+                        lines.append(mapped[end - MAX_LINE:end])
+                        break
+                    lines.append(mapped[newline + 1:min(end, newline + 1 + MAX_LINE)])
+                    end = newline
+    except (OSError, ValueError):
+        return []
+    return [line.decode("utf-8", "replace").rstrip("\r") for line in reversed(lines)]
+
+
+def get_level(text: str) -> Optional[str]:
+    """'error', 'warning' or None for a log line"""
+    if ERROR_PATTERN.search(text):
+        return "error"
+    if WARNING_PATTERN.search(text):
+        return "warning"
+    return None
+
+
+class LogFile:
+    """The lines appended to one log file since the last read"""
+    
+    def __init__(self, path: str, name: Optional[str] = None):
+        self.path = path
+        self.name = name or os.path.basename(path)
+        self.rotations = 0
+        self._file = None
+        self._identity: Optional[Tuple[int, int]] = None
+        self._position = 0
+        self._partial = b""
+    
+    def open(self, at_end: bool = True) -> bool:
+        """Start following the file, from its end or its start"""
+        self.close()
+        try:
+            self._file = open(self.path, "rb")
+        except OSError:
+            return False
+        st = os.fstat(self._file.fileno())
+        self._identity = (st.st_dev, st.st_ino)
+        self._position = st.st_size if at_end else 0
+        self._file.seek(self._position)
+        self._partial = b""
+        return True
+    
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def _drain(self) -> Iterator[str]:
+        while True:
+            chunk = self._file.read(READ_CHUNK)
+            if not chunk:
+                return
+            self._position += len(chunk)
+            lines = (self._partial + chunk).split(b"\n")
+            self._partial = lines.pop()[:MAX_LINE]
+            for line in lines:
+                yield line[:MAX_LINE].decode("utf-8", "replace").rstrip("\r")
+    
+    def read(self) -> Iterator[str]:
+        """Complete lines written since the last read"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            st = None
+        
+        if self._file is None:
+            # Created (or recreated) since we started: all of it is new
+            if st is None or not self.open(at_end=False):
+                return
+            yield from self._drain()
+            return
+        
+        # What was written to the old file before a rename still counts
+        yield from self._drain()
+        if st is None:
+            return
+        if (st.st_dev, st.st_ino) != self._identity:
+            self.rotations += 1
+            if self.open(at_end=False):
+                yield from self._drain()
+        elif st.st_size < self._position:
+            self.rotations += 1
+            self._file.seek(0)
+            self._position = 0
+            self._partial = b""
+            yield from self._drain()
+
+
+class Inotify:
+    """Wait for changes in directories through Linux inotify (via ctypes)"""
+    
+    IN_MODIFY = 0x002
+    IN_ATTRIB = 0x004
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    
+    # Appends, truncation, and a file renamed, replaced or removed
+    LOG_EVENTS = IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    
+    EVENT_HEADER = struct.Struct("iIII")
+    
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        # Watch descriptor -> names in that directory we care about
+        self._names: Dict[int, set] = {}
+    
+    def add_watch(self, directory: str, names: List[str]) -> None:
+        """Report changes to the given file names in a directory"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.LOG_EVENTS)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), directory)
+        self._names.setdefault(wd, set()).update(names)
+    
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """(watch, mask, name) of the events waiting (never blocks)"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+                offset += length
+                events.append((wd, mask, name))
+    
+    def wait(self, timeout: float) -> bool:
+        """Sleep until a watched file changes or timeout; True if one did"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return False
+            if any(name in self._names.get(wd, ()) for wd, _, name in self.read_events()):
+                return True
+    
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class LogTailer:
+    """Last lines and line/error rates of several log files, updated as they grow"""
+    
+    def __init__(
+        self,
+        paths: List[str],
+        root: Optional[str] = None,
+        lines: int = TAIL_LINES,
+        highlight: Optional[str] = None,
+        use_inotify: bool = True
+    ):
+        try:
+            self.highlight = re.compile(highlight) if highlight else None
+        except re.error as e:
+            raise ValueError(f"invalid highlight pattern {highlight!r}: {e}") from e
+        
+        self.files = [
+            LogFile(path, os.path.relpath(path, root) if root else None)
+            for path in paths
+        ]
+        self.lines: Deque[Tuple[str, str]] = deque(maxlen=lines)
+        self.total = 0
+        self.errors = 0
+        # [second, lines, errors] per second of the rate window
+        self._buckets = [[0, 0, 0] for _ in range(RATE_WINDOW)]
+        
+        for log in self.files:
+            for text in tail_lines(log.path, lines):
+                self.lines.append((log.name, text))
+            log.open(at_end=True)
+        
+        self.inotify: Optional[Inotify] = None
+        if use_inotify and self.files:
+            try:
+                self.inotify = Inotify()
+                directories: Dict[str, List[str]] = {}
+                for log in self.files:
+                    directory, name = os.path.split(os.path.abspath(log.path))
+                    directories.setdefault(directory, []).append(name)
+                for directory, names in directories.items():
+                    self.inotify.add_watch(directory, names)
+            except (OSError, AttributeError):
+                # Not Linux, no libc, or out of watches: poll instead
+                if self.inotify is not None:
+                    self.inotify.close()
+                self.inotify = None
+    
+    def _count(self, text: str, now: float) -> None:
+        second = int(now)
+        bucket = self._buckets[second % RATE_WINDOW]
+        if bucket[0] != second:
+            bucket[:] = [second, 0, 0]
+        bucket[1] += 1
+        self.total += 1
+        if get_level(text) == "error":
+            bucket[2] += 1
+            self.errors += 1
+    
+    def poll(self, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """Read what was appended since the last poll; returns the new (file, line) pairs
+        
+        Only the newest `lines` of them are returned when more arrived.
+        """
+        now = time.time() if now is None else now
+        new: Deque[Tuple[str, str]] = deque(maxlen=self.lines.maxlen)
+        for log in self.files:
+            for text in log.read():
+                self._count(text, now)
+                self.lines.append((log.name, text))
+                new.append((log.name, text))
+        return list(new)
+    
+    def rates(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Lines and errors over the last RATE_WINDOW seconds"""
+        second = int(time.time() if now is None else now)
+        recent = [b for b in self._buckets if second - RATE_WINDOW < b[0] <= second]
+        return {"lines": sum(b[1] for b in recent), "errors": sum(b[2] for b in recent)}
+    
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Sleep until a followed file changes (inotify) or for a polling interval"""
+        if self.inotify is not None:
+            self.inotify.wait(INOTIFY_TIMEOUT if timeout is None else timeout)
+        else:
+            time.sleep(POLL_INTERVAL if timeout is None else min(timeout, POLL_INTERVAL))
+    
+    def follow(self) -> Iterator[Tuple[str, str]]:
+        """Yield (file, line) for every new line, forever"""
+        while True:
+            yield from self.poll()
+            self.wait()
+    
+    def snapshot(self, limit: int = 10, now: Optional[float] = None) -> Dict:
+        """The newest lines with their levels, and the counters"""
+        lines = list(self.lines)[-limit:] if limit > 0 else []
+        return {
+            "files": [log.name for log in self.files],
+            "lines": [{"file": name, "text": text, "level": get_level(text)} for name, text in lines],
+            "total": self.total,
+            "errors": self.errors,
+            "rates": self.rates(now),
+            "rotations": sum(log.rotations for log in self.files),
+        }
+    
+    def close(self) -> None:
+        """Stop following"""
+        for log in self.files:
+            log.close()
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
@@ -0,0 +1,196 @@
+"""
+MessagePack utilities for DevDash
+
+A dependency-free encoder/decoder for the subset of MessagePack that
+devdash snapshots use: nil, booleans, integers, floats, strings, binary,
+arrays and maps. The output is standard MessagePack, readable by any
+msgpack library.
+"""
+
+import struct
+from typing import Any, List, Tuple
+
+
+class MsgpackError(ValueError):
+    """Data that cannot be encoded, or bytes that are not valid MessagePack"""
+
+
+def _pack(obj: Any, out: List[bytes]) -> None:
+    if obj is None:
+        out.append(b"\xc0")
+    elif obj is True:
+        out.append(b"\xc3")
+    elif obj is False:
+        out.append(b"\xc2")
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(struct.pack("B", obj))
+        elif -32 <= obj < 0:
+            out.append(struct.pack("b", obj))
+        elif 0 <= obj <= 0xFF:
+            out.append(struct.pack(">BB", 0xCC, obj))
+        elif 0 <= obj <= 0xFFFF:
+            out.append(struct.pack(">BH", 0xCD, obj))
+        elif 0 <= obj <= 0xFFFFFFFF:
+            out.append(struct.pack(">BI", 0xCE, obj))
+        elif 0 <= obj <= 0xFFFFFFFFFFFFFFFF:
+            out.append(struct.pack(">BQ", 0xCF, obj))
+        elif -0x80 <= obj < 0:
+            out.append(struct.pack(">Bb", 0xD0, obj))
+        elif -0x8000 <= obj < 0:
+            out.append(struct.pack(">Bh", 0xD1, obj))
+        elif -0x80000000 <= obj < 0:
+            out.append(struct.pack(">Bi", 0xD2, obj))
+        elif -0x8000000000000000 <= obj < 0:
+            out.append(struct.pack(">Bq", 0xD3, obj))
+        else:
+            raise MsgpackError(f"integer out of range: {obj}")
+    elif isinstance(obj, float):
+        out.append(struct.pack(">Bd", 0xCB, obj))
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        size = len(data)
+        if size < 32:
+            out.append(struct.pack("B", 0xA0 | size))
+        elif size <= 0xFF:
+            out.append(struct.pack(">BB", 0xD9, size))
+        elif size <= 0xFFFF:
+            out.append(struct.pack(">BH", 0xDA, size))
+        else:
+            out.append(struct.pack(">BI", 0xDB, size))
+        out.append(data)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = bytes(obj)
+        size = len(data)
+        if size <= 0xFF:
+            out.append(struct.pack(">BB", 0xC4, size))
+        elif size <= 0xFFFF:
+            out.append(struct.pack(">BH", 0xC5, size))
+        else:
+            out.append(struct.pack(">BI", 0xC6, size))
+        out.append(data)
+    elif isinstance(obj, (list, tuple)):
+        size = len(obj)
+        if size < 16:
+            out.append(struct.pack("B", 0x90 | size))
+        elif size <= 0xFFFF:
+            out.append(struct.pack(">BH", 0xDC, size))
+        else:
+            out.append(struct.pack(">BI", 0xDD, size))
+        for item in obj:
+            _pack(item, out)
+    elif isinstance(obj, dict):
+        size = len(obj)
+        if size < 16:
+            out.append(struct.pack("B", 0x80 | size))
+        elif size <= 0xFFFF:
+            out.append(struct.pack(">BH", 0xDE, size))
+        else:
+            out.append(struct.pack(">BI", 0xDF, size))
+        for key, value in obj.items():
+            _pack(key, out)
+            _pack(value, out)
+    else:
+        raise MsgpackError(f"cannot encode {type(obj).__name__}")
+
+
+def packb(obj: Any) -> bytes:
+    """Encode obj as MessagePack (tuples become arrays)"""
+    out: List[bytes] = []
+    _pack(obj, out)
+    return b"".join(out)
+
+
+# Fixed-size formats: first byte -> (struct format, size)
+_FIXED = {
+    0xCA: (">f", 4), 0xCB: (">d", 8),
+    0xCC: (">B", 1), 0xCD: (">H", 2), 0xCE: (">I", 4), 0xCF: (">Q", 8),
+    0xD0: (">b", 1), 0xD1: (">h", 2), 0xD2: (">i", 4), 0xD3: (">q", 8),
+}
+
+# Length-prefixed formats: first byte -> (kind, length format, length size)
+_SIZED = {
+    0xC4: ("bin", ">B", 1), 0xC5: ("bin", ">H", 2), 0xC6: ("bin", ">I", 4),
+    0xD9: ("str", ">B", 1), 0xDA: ("str", ">H", 2), 0xDB: ("str", ">I", 4),
+    0xDC: ("array", ">H", 2), 0xDD: ("array", ">I", 4),
+    0xDE: ("map", ">H", 2), 0xDF: ("map", ">I", 4),
+}
+
+
+def _unpack(data: bytes, offset: int, depth: int) -> Tuple[Any, int]:
+    if depth > 64:
+        raise MsgpackError("nesting too deep")
+    try:
+        first = data[offset]
+    except IndexError:
+        raise MsgpackError("truncated data") from None
+    offset += 1
+    
+    if first < 0x80:
+        return first, offset
+    if first >= 0xE0:
+        return first - 0x100, offset
+    if first == 0xC0:
+        return None, offset
+    if first == 0xC2:
+        return False, offset
+    if first == 0xC3:
+        return True, offset
+    
+    if first in _FIXED:
+        fmt, size = _FIXED[first]
+        if offset + size > len(data):
+            raise MsgpackError("truncated data")
+        return struct.unpack_from(fmt, data, offset)[0], offset + size
+    
+    if 0xA0 <= first <= 0xBF:
+        kind, count = "str", first & 0x1F
+    elif 0x90 <= first <= 0x9F:
+        kind, count = "array", first & 0x0F
+    elif 0x80 <= first <= 0x8F:
+        kind, count = "map", first & 0x0F
+    elif first in _SIZED:
+        kind, fmt, size = _SIZED[first]
+        if offset + size > len(data):
+            raise MsgpackError("truncated data")
+        count = struct.unpack_from(fmt, data, offset)[0]
+        offset += size
+    else:
+        raise MsgpackError(f"unsupported type byte 0x{first:02x}")
+    
+    if kind in ("str", "bin"):
+        end = offset + count
+        if end > len(data):
+            raise MsgpackError("truncated data")
+        raw = bytes(data[offset:end])
+        if kind == "bin":
+            return raw, end
+        try:
+            return raw.decode("utf-8"), end
+        except UnicodeDecodeError as e:
+            raise MsgpackError(f"invalid UTF-8 string: {e}") from e
+    
+    if kind == "array":
+        items = []
+        for _ in range(count):
+            item, offset = _unpack(data, offset, depth + 1)
+            items.append(item)
+        return items, offset
+    
+    result = {}
+    for _ in range(count):
+        key, offset = _unpack(data, offset, depth + 1)
+        value, offset = _unpack(data, offset, depth + 1)
+        try:
+            result[key] = value
+        except TypeError:
+            raise MsgpackError("unhashable map key") from None
+    return result, offset
+
+
+def unpackb(data: bytes) -> Any:
+    """Decode one MessagePack object that fills data exactly"""
+    obj, offset = _unpack(data, 0, 0)
+    if offset != len(data):
+        raise MsgpackError(f"{len(data) - offset} extra bytes after object")
+    return obj
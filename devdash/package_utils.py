@@ -3,15 +3,104 @@ Package management utilities for DevDash
 """
 
 import os
+import re
 import json
+import shutil
+import time
+import hashlib
+import functools
 import subprocess
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from .cache_utils import DiskCache
+from .index_utils import PackageIndex, get_index_url
+from .lockfile_utils import LockfileInventory
+from .pyenv_utils import PythonEnvScanner
+from .version_utils import parse_version
+from .workspace_utils import ECOSYSTEM_MANIFESTS, WorkspaceScanner
+
+
+class PackageCheckError(Exception):
+    """A package manager or index check could not run; nothing is known, so nothing is cached"""
+
+
+def env_number(name: str, default: float, kind: type = float) -> float:
+    """Numeric setting from the environment, default when unset or malformed"""
+    try:
+        return kind(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def run_check(command: List[str], path: str, timeout: float) -> subprocess.CompletedProcess:
+    """Run a package manager check in path
+    
+    Raises PackageCheckError when the tool is missing, times out, or fails
+    without printing a result (outdated checks may exit non-zero when
+    they find updates, so the exit status alone is not a failure).
+    """
+    try:
+        result = subprocess.run(command, cwd=path, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.SubprocessError) as e:
+        raise PackageCheckError(f"{command[0]}: {e}") from e
+    if result.returncode != 0 and not result.stdout.strip():
+        message = result.stderr.strip().splitlines()
+        tool = " ".join(os.path.basename(part) for part in command[:2])
+        raise PackageCheckError(f"{tool} failed: {message[-1] if message else result.returncode}")
+    return result
+
 
 class PackageInfo:
     """Check for outdated packages"""
     
+    # Outdated results are cached on disk for CACHE_TTL seconds, then served
+    # stale for up to CACHE_STALE_TTL more while a background refresh runs
+    CACHE_TTL = env_number("DEVDASH_PACKAGE_TTL", 6 * 3600)
+    CACHE_STALE_TTL = env_number("DEVDASH_PACKAGE_STALE_TTL", 7 * 24 * 3600)
+    
+    MANIFESTS = {
+        "node": [
+            "package.json", "package-lock.json", "npm-shrinkwrap.json",
+            "yarn.lock", "pnpm-lock.yaml",
+        ],
+        "python": [
+            "requirements.txt", "requirements-dev.txt", "pyproject.toml", "setup.py",
+            "setup.cfg", "poetry.lock", "uv.lock", "Pipfile", "Pipfile.lock",
+        ],
+        "rust": ["Cargo.toml", "Cargo.lock"],
+        "go": ["go.mod", "go.sum"],
+        "ruby": ["Gemfile", "Gemfile.lock"],
+        "php": ["composer.json", "composer.lock"],
+    }
+    
+    # Tool whose version/location goes into the cache key of each ecosystem
+    TOOLS = {"node": "npm", "rust": "cargo", "go": "go", "ruby": "bundle", "php": "composer"}
+    
+    # Ecosystem checks run at the same time (each spawns a package manager)
+    MAX_PARALLEL_CHECKS = env_number("DEVDASH_PACKAGE_JOBS", 4, int)
+    
+    # The project list is reused while no project directory or manifest
+    # changes, and walked again after PROJECT_RESCAN seconds to find
+    # projects created below a directory that is not one
+    PROJECT_RESCAN = 60.0
+    PROJECT_FILES = sorted(
+        {name for names in ECOSYSTEM_MANIFESTS.values() for name in names}
+        | {"pnpm-workspace.yaml", "go.work"}
+    )
+    
+    # Merged results are ranked by how big the update is
+    UPDATE_RANKS = {"major": 0, "minor": 1, "patch": 2, "other": 3}
+    
+    _cache = DiskCache("outdated")
+    
+    # abs path -> {"walked", "files", "signature", "projects"}
+    _projects: Dict[str, Dict] = {}
+    
+    # manifest path -> ((mtime, size), sha256 of its contents)
+    _manifest_hashes: Dict[str, Tuple[Tuple, bytes]] = {}
+    
     @staticmethod
     def detect_project_type(path: str = ".") -> Optional[str]:
         """Detect project type based on config files"""
@@ -35,22 +124,25 @@ class PackageInfo:
         return None
     
     @staticmethod
-    def get_node_outdated(path: str = ".") -> List[Dict]:
+    def get_node_outdated(path: str = ".", workspaces: bool = False) -> List[Dict]:
         """Get outdated npm packages"""
         outdated = []
         
+        command = ["npm", "outdated", "--json"]
+        if workspaces:
+            command += ["--workspaces", "--include-workspace-root"]
+        
         try:
-            result = subprocess.run(
-                ["npm", "outdated", "--json"],
-                cwd=path,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            result = run_check(command, path, timeout=30)
             
             if result.stdout:
                 data = json.loads(result.stdout)
+                # Registry unreachable, bad lockfile, ...: npm reports the error as JSON
+                if isinstance(data.get("error"), dict):
+                    raise PackageCheckError(f"npm outdated failed: {data['error'].get('summary', '')}")
                 for name, info in data.items():
+                    # One entry per dependent workspace when checking workspaces
+                    info = info[0] if isinstance(info, list) else info
                     outdated.append({
                         "name": name,
                         "current": info.get("current", "?"),
@@ -58,27 +150,181 @@ class PackageInfo:
                         "latest": info.get("latest", "?"),
                         "type": "npm"
                     })
-        except Exception:
-            pass
+        except (ValueError, TypeError, AttributeError) as e:
+            raise PackageCheckError(f"unexpected output from npm outdated: {e}") from e
         
-        return outdated[:10]
+        return outdated
     
     @staticmethod
-    def get_python_outdated(path: str = ".") -> List[Dict]:
-        """Get outdated pip packages"""
+    def get_cargo_outdated(path: str = ".") -> List[Dict]:
+        """Get outdated crates via 'cargo outdated' (the cargo-outdated plugin)"""
         outdated = []
         
         try:
-            result = subprocess.run(
-                ["pip", "list", "--outdated", "--format=json"],
-                capture_output=True,
-                text=True,
-                timeout=30
+            result = run_check(
+                ["cargo", "outdated", "--workspace", "--root-deps-only", "--format", "json"],
+                path,
+                timeout=60
             )
             
+            # One JSON document per workspace member
+            for line in result.stdout.splitlines():
+                if not line.strip():
+                    continue
+                for dep in json.loads(line).get("dependencies", []):
+                    if dep.get("latest") in (None, "---", dep.get("project")):
+                        continue
+                    outdated.append({
+                        "name": dep.get("name", "?"),
+                        "current": dep.get("project", "?"),
+                        "wanted": dep.get("compat", "?"),
+                        "latest": dep.get("latest", "?"),
+                        "type": "cargo"
+                    })
+        except (ValueError, TypeError, AttributeError) as e:
+            raise PackageCheckError(f"unexpected output from cargo outdated: {e}") from e
+        
+        return outdated
+    
+    @staticmethod
+    def get_go_outdated(path: str = ".") -> List[Dict]:
+        """Get outdated direct Go module requirements via 'go list -m -u'"""
+        outdated = []
+        
+        try:
+            result = run_check(["go", "list", "-m", "-u", "-json", "all"], path, timeout=60)
+            
+            # A stream of concatenated JSON objects
+            decoder = json.JSONDecoder()
+            text = result.stdout
+            position = 0
+            while True:
+                while position < len(text) and text[position].isspace():
+                    position += 1
+                if position >= len(text):
+                    break
+                module, position = decoder.raw_decode(text, position)
+                update = module.get("Update")
+                if module.get("Main") or module.get("Indirect") or not update:
+                    continue
+                outdated.append({
+                    "name": module.get("Path", "?"),
+                    "current": module.get("Version", "?"),
+                    "wanted": update.get("Version", "?"),
+                    "latest": update.get("Version", "?"),
+                    "type": "go"
+                })
+        except (ValueError, TypeError, AttributeError) as e:
+            raise PackageCheckError(f"unexpected output from go list: {e}") from e
+        
+        return outdated
+    
+    @staticmethod
+    def get_bundle_outdated(path: str = ".") -> List[Dict]:
+        """Get outdated gems via 'bundle outdated --parseable'"""
+        outdated = []
+        pattern = re.compile(r"^(\S+) \(newest ([^,]+), installed ([^,)]+)(?:, requested ([^)]+))?\)")
+        
+        try:
+            result = run_check(["bundle", "outdated", "--parseable"], path, timeout=60)
+            
+            for line in result.stdout.splitlines():
+                match = pattern.match(line.strip())
+                if match:
+                    name, newest, installed, _ = match.groups()
+                    outdated.append({
+                        "name": name,
+                        "current": installed,
+                        "wanted": newest,
+                        "latest": newest,
+                        "type": "gem"
+                    })
+        except (ValueError, TypeError, AttributeError) as e:
+            raise PackageCheckError(f"unexpected output from bundle outdated: {e}") from e
+        
+        return outdated
+    
+    @staticmethod
+    def get_composer_outdated(path: str = ".") -> List[Dict]:
+        """Get outdated PHP packages via 'composer outdated'"""
+        outdated = []
+        
+        try:
+            result = run_check(["composer", "outdated", "--direct", "--format=json", "--no-interaction"], path, timeout=60)
+            
+            if result.stdout:
+                for pkg in json.loads(result.stdout).get("installed", []):
+                    if pkg.get("latest-status") == "up-to-date":
+                        continue
+                    outdated.append({
+                        "name": pkg.get("name", "?"),
+                        "current": pkg.get("version", "?"),
+                        "wanted": pkg.get("latest", "?"),
+                        "latest": pkg.get("latest", "?"),
+                        "type": "composer"
+                    })
+        except (ValueError, TypeError, AttributeError) as e:
+            raise PackageCheckError(f"unexpected output from composer outdated: {e}") from e
+        
+        return outdated
+    
+    @staticmethod
+    def find_site_packages(path: str = ".") -> List[str]:
+        """Find site-packages of the project's virtualenv (or the running interpreter)"""
+        return PythonEnvScanner(path).get_site_packages()
+    
+    @staticmethod
+    def get_python_installed(path: str = ".") -> Dict[str, str]:
+        """Get installed distributions of the project's environment"""
+        return PythonEnvScanner(path).get_installed()
+    
+    @staticmethod
+    def get_python_environment(path: str = ".") -> Dict:
+        """Get the project's Python environment: packages, size and conflicts"""
+        return PythonEnvScanner(path).get_summary()
+    
+    @classmethod
+    def get_python_outdated(cls, path: str = ".", index_url: Optional[str] = None) -> List[Dict]:
+        """Get outdated Python packages by querying the package index directly"""
+        if not cls.find_site_packages(path):
+            raise PackageCheckError("no virtualenv found")
+        installed = cls.get_python_installed(path)
+        if not installed:
+            return []
+        
+        index = PackageIndex(index_url)
+        try:
+            return index.get_outdated(installed)
+        except OSError as e:
+            # pip cannot reach an index we could not reach either: it prints
+            # a warning and an empty list, which is no answer
+            outdated = cls.get_pip_outdated(path)
+            if not outdated:
+                raise PackageCheckError(str(e)) from e
+            return outdated
+        finally:
+            index.close()
+    
+    @staticmethod
+    def get_pip_outdated(path: str = ".") -> List[Dict]:
+        """Get outdated pip packages via 'pip list --outdated'"""
+        outdated = []
+        
+        # Run the environment's own pip so it lists the project's packages
+        env = PythonEnvScanner(path).find_environment()
+        python = None
+        if env:
+            for candidate in ("bin/python", "Scripts/python.exe"):
+                if os.path.isfile(os.path.join(env, candidate)):
+                    python = os.path.join(env, candidate)
+        command = [python, "-m", "pip"] if python else ["pip"]
+        
+        try:
+            result = run_check(command + ["list", "--outdated", "--format=json"], path, timeout=30)
+            
             if result.stdout:
                 data = json.loads(result.stdout)
-                for pkg in data[:10]:
+                for pkg in data:
                     outdated.append({
                         "name": pkg.get("name", "?"),
                         "current": pkg.get("version", "?"),
@@ -86,25 +332,246 @@ class PackageInfo:
                         "latest": pkg.get("latest_version", "?"),
                         "type": "pip"
                     })
-        except Exception:
-            pass
+        except (ValueError, TypeError, AttributeError) as e:
+            raise PackageCheckError(f"unexpected output from pip list: {e}") from e
         
         return outdated
     
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    @classmethod
+    def find_projects(cls, path: str = ".") -> List[Dict]:
+        """Projects of the repository (see WorkspaceScanner.find_projects)
+        
+        Cached by the mtimes of the project directories and their manifests;
+        Python projects also carry their environment's site-packages.
+        """
+        key = os.path.abspath(path)
+        cached = cls._projects.get(key)
+        if (
+            cached is not None
+            and time.monotonic() - cached["walked"] < cls.PROJECT_RESCAN
+            and [cls._stat(name) for name in cached["files"]] == cached["signature"]
+        ):
+            return cached["projects"]
+        
+        walked = time.monotonic()
+        projects = WorkspaceScanner(key).find_projects()
+        for project in projects:
+            if project["ecosystem"] == "python":
+                project["site_packages"] = cls.find_site_packages(project["path"])
+        
+        # Adding or removing a manifest updates its directory's mtime
+        files = []
+        for directory in [key] + sorted({project["path"] for project in projects} - {key}):
+            files.append(directory)
+            files += [
+                os.path.join(directory, name) for name in cls.PROJECT_FILES
+                if os.path.isfile(os.path.join(directory, name))
+            ]
+        cls._projects[key] = {
+            "walked": walked,
+            "files": files,
+            "signature": [cls._stat(name) for name in files],
+            "projects": projects,
+        }
+        return projects
+    
+    @classmethod
+    def get_manifest_hash(cls, path: str, ecosystem: str) -> str:
+        """Hash the manifest and lockfile contents of a project
+        
+        Each file is only read again when its mtime or size changes.
+        """
+        digest = hashlib.sha256()
+        for name in cls.MANIFESTS.get(ecosystem, []):
+            filename = os.path.join(path, name)
+            stat = cls._stat(filename)
+            if stat is None:
+                continue
+            cached = cls._manifest_hashes.get(filename)
+            if cached is not None and cached[0] == stat:
+                content_hash = cached[1]
+            else:
+                try:
+                    with open(filename, "rb") as f:
+                        content_hash = hashlib.sha256(f.read()).digest()
+                except OSError:
+                    continue
+                cls._manifest_hashes[filename] = (stat, content_hash)
+            digest.update(name.encode("utf-8") + b"\0")
+            digest.update(content_hash)
+        return digest.hexdigest()
+    
+    @classmethod
+    def get_outdated_cache_key(
+        cls,
+        path: str,
+        ecosystem: str,
+        site_packages: Optional[List[str]] = None
+    ) -> str:
+        """Cache key: project path, ecosystem, tool/interpreter and manifest hash"""
+        if ecosystem == "python":
+            interpreter = cls.find_site_packages(path) if site_packages is None else site_packages
+            source = get_index_url()
+        else:
+            tool = cls.TOOLS.get(ecosystem, ecosystem)
+            interpreter = shutil.which(tool) or tool
+            source = None
+        return DiskCache.make_key(
+            os.path.abspath(path),
+            ecosystem,
+            interpreter,
+            source,
+            cls.get_manifest_hash(path, ecosystem)
+        )
+    
+    @classmethod
+    def get_project_outdated(
+        cls,
+        path: str,
+        ecosystem: str,
+        use_cache: bool = True,
+        ttl: Optional[float] = None,
+        workspaces: bool = False,
+        site_packages: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """Get outdated packages of one project (cached)
+        
+        A check that could not run raises PackageCheckError and is not
+        cached, so it is tried again next time instead of reading as "up to
+        date" for hours.
+        """
+        checks = {
+            "node": functools.partial(cls.get_node_outdated, path, workspaces=workspaces),
+            "python": functools.partial(cls.get_python_outdated, path),
+            "rust": functools.partial(cls.get_cargo_outdated, path),
+            "go": functools.partial(cls.get_go_outdated, path),
+            "ruby": functools.partial(cls.get_bundle_outdated, path),
+            "php": functools.partial(cls.get_composer_outdated, path),
+        }
+        if ecosystem not in checks:
+            return []
+        
+        key = cls.get_outdated_cache_key(path, ecosystem, site_packages)
+        if not use_cache:
+            cls._cache.delete(key)
+        
+        return cls._cache.get_or_compute(
+            key,
+            checks[ecosystem],
+            ttl=cls.CACHE_TTL if ttl is None else ttl,
+            stale_ttl=cls.CACHE_STALE_TTL
+        )
+    
+    @classmethod
+    def get_update_kind(cls, current: str, latest: str) -> str:
+        """Classify an update as major, minor, patch or other"""
+        current_key = parse_version(str(current).lstrip("v"))
+        latest_key = parse_version(str(latest).lstrip("v"))
+        if current_key is None or latest_key is None:
+            return "other"
+        current_release = current_key[1] + (0, 0)
+        latest_release = latest_key[1] + (0, 0)
+        for index, kind in enumerate(["major", "minor", "patch"]):
+            if current_release[index] != latest_release[index]:
+                return kind
+        return "other"
+    
+    @classmethod
+    def get_outdated_packages(
+        cls,
+        path: str = ".",
+        use_cache: bool = True,
+        ttl: Optional[float] = None,
+        projects: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """Get outdated packages of every project in the repository, ranked"""
+        return cls.get_outdated_report(path, use_cache, ttl, projects)["outdated"]
+    
     @classmethod
-    def get_outdated_packages(cls, path: str = ".") -> List[Dict]:
-        """Get outdated packages based on project type"""
-        project_type = cls.detect_project_type(path)
+    def get_outdated_report(
+        cls,
+        path: str = ".",
+        use_cache: bool = True,
+        ttl: Optional[float] = None,
+        projects: Optional[List[Dict]] = None
+    ) -> Dict:
+        """Outdated packages of every project, ranked, and the checks that failed
+        
+        Returns {"outdated": [...], "errors": [{"project", "error"}]}. Each
+        project is checked with its own package manager, at most
+        MAX_PARALLEL_CHECKS at a time. projects defaults to find_projects(path).
+        """
+        if projects is None:
+            projects = cls.find_projects(path)
         
-        if project_type == "node":
-            return cls.get_node_outdated(path)
-        elif project_type in ["python-pip", "python-poetry"]:
-            return cls.get_python_outdated(path)
+        # Python projects sharing one environment need only one check
+        units, seen_envs = [], set()
+        for project in projects:
+            if project["ecosystem"] == "python":
+                if project.get("site_packages") is None:
+                    project = dict(project, site_packages=cls.find_site_packages(project["path"]))
+                env = tuple(project["site_packages"])
+                if env in seen_envs:
+                    continue
+                seen_envs.add(env)
+            units.append(project)
+        
+        if not units:
+            return {"outdated": [], "errors": []}
+        
+        def check(project: Dict) -> Optional[List[Dict]]:
+            try:
+                return cls.get_project_outdated(
+                    project["path"],
+                    project["ecosystem"],
+                    use_cache=use_cache,
+                    ttl=ttl,
+                    workspaces=bool(project["members"]),
+                    site_packages=project.get("site_packages")
+                )
+            except PackageCheckError as e:
+                errors.append({"project": project["name"], "error": str(e)})
+                return None
         
-        return []
+        errors: List[Dict] = []
+        with ThreadPoolExecutor(max_workers=max(1, min(cls.MAX_PARALLEL_CHECKS, len(units)))) as executor:
+            results = list(executor.map(check, units))
+        
+        merged, seen = [], set()
+        for project, outdated in zip(units, results):
+            for pkg in outdated or []:
+                identity = (project["ecosystem"], pkg.get("name"), pkg.get("current"))
+                if identity in seen:
+                    continue
+                seen.add(identity)
+                merged.append(dict(
+                    pkg,
+                    project=project["name"],
+                    update=cls.get_update_kind(pkg.get("current", ""), pkg.get("latest", ""))
+                ))
+        
+        merged.sort(key=lambda p: (cls.UPDATE_RANKS[p["update"]], str(p.get("name", "")).lower(), p["project"]))
+        errors.sort(key=lambda e: e["project"])
+        return {"outdated": merged, "errors": errors}
     
     @staticmethod
-    def get_package_count(path: str = ".") -> Dict[str, int]:
+    def get_dependency_inventory(path: str = ".") -> Optional[Dict]:
+        """Get direct/transitive counts, duplicates and heaviest subtrees from the lockfile"""
+        try:
+            return LockfileInventory.get_inventory(path)
+        except OSError:
+            return None
+    
+    @classmethod
+    def get_package_count(cls, path: str = ".") -> Dict[str, int]:
         """Get count of installed packages"""
         path = Path(path)
         result = {"dependencies": 0, "dev_dependencies": 0}
@@ -119,6 +586,14 @@ class PackageInfo:
             except Exception:
                 pass
         
+        inventory = cls.get_dependency_inventory(str(path))
+        if inventory:
+            if not package_json.exists():
+                result["dependencies"] = inventory["direct"]
+            result["transitive"] = inventory["transitive"]
+            result["total"] = inventory["packages"]
+            result["duplicates"] = len(inventory["duplicates"])
+        
         return result
     
     @staticmethod
@@ -2,10 +2,14 @@
 Port scanning utilities for DevDash
 """
 
+import os
+import json
 import socket
 import subprocess
 import platform
-from typing import Dict, List, Optional
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
 
 try:
     import psutil
@@ -51,6 +55,244 @@ class PortScanner:
         "docker": "🐳",
     }
     
+    PROC_ROOT = "/proc"
+    PROC_NET = "/proc/net"
+    
+    # Cached per-PID process handles (cpu_percent needs the same handle
+    # between calls) and socket inode -> owning pid (None when no visible
+    # process owns it, e.g. root's sockets seen by an unprivileged user)
+    _processes: Dict[int, "psutil.Process"] = {}
+    _socket_owners: Dict[int, Optional[int]] = {}
+    
+    TCP_STATES = {
+        "01": "ESTABLISHED",
+        "02": "SYN_SENT",
+        "03": "SYN_RECV",
+        "04": "FIN_WAIT1",
+        "05": "FIN_WAIT2",
+        "06": "TIME_WAIT",
+        "07": "CLOSE",
+        "08": "CLOSE_WAIT",
+        "09": "LAST_ACK",
+        "0A": "LISTEN",
+        "0B": "CLOSING",
+    }
+    
+    @staticmethod
+    def _decode_address(value: str) -> Tuple[str, int]:
+        """Decode a /proc/net hex 'ADDR:PORT' pair"""
+        addr_hex, port_hex = value.split(":")
+        raw = bytes.fromhex(addr_hex)
+        if len(raw) == 4:
+            ip = socket.inet_ntop(socket.AF_INET, raw[::-1])
+        else:
+            # IPv6 is stored as four host-order 32-bit words
+            words = b"".join(raw[i:i + 4][::-1] for i in range(0, 16, 4))
+            ip = socket.inet_ntop(socket.AF_INET6, words)
+        return ip, int(port_hex, 16)
+    
+    @classmethod
+    def read_socket_table(cls, protos: Tuple[str, ...] = ("tcp", "tcp6")) -> List[Dict]:
+        """Read sockets from /proc/net (Linux only, empty elsewhere)"""
+        sockets = []
+        
+        for proto in protos:
+            try:
+                with open(os.path.join(cls.PROC_NET, proto)) as f:
+                    next(f, None)
+                    for line in f:
+                        parts = line.split()
+                        if len(parts) < 10:
+                            continue
+                        try:
+                            address, port = cls._decode_address(parts[1])
+                            remote_address, remote_port = cls._decode_address(parts[2])
+                            tx_queue, rx_queue = parts[4].split(":")
+                            sockets.append({
+                                "proto": proto,
+                                "address": address,
+                                "port": port,
+                                "remote_address": remote_address,
+                                "remote_port": remote_port,
+                                "state": cls.TCP_STATES.get(parts[3], parts[3]),
+                                "tx_queue": int(tx_queue, 16),
+                                "rx_queue": int(rx_queue, 16),
+                                "uid": int(parts[7]),
+                                "inode": int(parts[9]),
+                            })
+                        except (ValueError, OSError):
+                            continue
+            except OSError:
+                continue
+        
+        return sockets
+    
+    @classmethod
+    def _resolve_socket_owners(cls, inodes: set) -> Dict[int, int]:
+        """Map socket inodes to pids by scanning /proc/<pid>/fd"""
+        owners: Dict[int, int] = {}
+        wanted = {f"socket:[{inode}]": inode for inode in inodes}
+        
+        try:
+            pids = [int(d) for d in os.listdir(cls.PROC_ROOT) if d.isdigit()]
+        except OSError:
+            return owners
+        
+        for pid in pids:
+            fd_dir = os.path.join(cls.PROC_ROOT, str(pid), "fd")
+            try:
+                fds = os.listdir(fd_dir)
+            except OSError:
+                continue
+            for fd in fds:
+                try:
+                    inode = wanted.get(os.readlink(os.path.join(fd_dir, fd)))
+                except OSError:
+                    continue
+                if inode is not None and inode not in owners:
+                    owners[inode] = pid
+                    if len(owners) == len(wanted):
+                        return owners
+        
+        return owners
+    
+    @classmethod
+    def get_process_usage(cls, pid: Optional[int]) -> Dict:
+        """Get name, CPU% and RSS for a pid through a cached process handle"""
+        usage = {"name": "Unknown", "cpu": None, "rss": None}
+        if not pid or not PSUTIL_AVAILABLE:
+            return usage
+        
+        proc = cls._processes.get(pid)
+        try:
+            if proc is None:
+                proc = psutil.Process(pid)
+                cls._processes[pid] = proc
+            with proc.oneshot():
+                usage["name"] = proc.name()
+                usage["cpu"] = proc.cpu_percent(interval=None)
+                usage["rss"] = proc.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            cls._processes.pop(pid, None)
+        
+        return usage
+    
+    @classmethod
+    def get_listening_sockets(cls) -> List[Dict]:
+        """Get every listening TCP socket with its connection load and owner"""
+        # /proc/net is the only source where it exists; psutil would parse
+        # the same table again
+        if not os.path.exists(os.path.join(cls.PROC_NET, "tcp")):
+            return cls._get_sockets_fallback()
+        
+        listening = []
+        established: Dict[int, int] = {}
+        
+        # Single pass: LISTEN rows become records, ESTABLISHED rows are
+        # counted against the local port they were accepted on
+        for s in cls.read_socket_table():
+            if s["state"] == "LISTEN":
+                listening.append(s)
+            elif s["state"] == "ESTABLISHED":
+                established[s["port"]] = established.get(s["port"], 0) + 1
+        
+        # Socket owners only change when sockets appear or owners exit,
+        # so only unknown inodes trigger a /proc/<pid>/fd scan. Inodes no
+        # process could be found for stay unowned until they leave the table.
+        inodes = {s["inode"] for s in listening}
+        unknown = {
+            inode for inode in inodes
+            if inode not in cls._socket_owners
+            or cls._socket_owners[inode] is not None
+            and not os.path.exists(os.path.join(cls.PROC_ROOT, str(cls._socket_owners[inode])))
+        }
+        if unknown:
+            owners = cls._resolve_socket_owners(unknown)
+            for inode in unknown:
+                cls._socket_owners[inode] = owners.get(inode)
+        for inode in list(cls._socket_owners):
+            if inode not in inodes:
+                del cls._socket_owners[inode]
+        
+        usages: Dict[int, Dict] = {}
+        records = []
+        for s in listening:
+            pid = cls._socket_owners.get(s["inode"])
+            if pid not in usages:
+                usages[pid] = cls.get_process_usage(pid)
+            usage = usages[pid]
+            
+            records.append({
+                "proto": s["proto"],
+                "port": s["port"],
+                "process": usage["name"],
+                "pid": pid,
+                "service": cls.COMMON_PORTS.get(s["port"], usage["name"]),
+                "icon": cls._get_process_icon(usage["name"]),
+                "address": s["address"],
+                "inode": s["inode"],
+                "established": established.get(s["port"], 0),
+                "rx_queue": s["rx_queue"],
+                "tx_queue": s["tx_queue"],
+                "cpu": usage["cpu"],
+                "rss": usage["rss"],
+            })
+        
+        for pid in list(cls._processes):
+            if pid not in usages:
+                del cls._processes[pid]
+        
+        return records
+    
+    @classmethod
+    def _get_sockets_fallback(cls) -> List[Dict]:
+        """Listening sockets without /proc/net (macOS, Windows)"""
+        if not PSUTIL_AVAILABLE:
+            return [
+                dict(p, proto="tcp", inode=None, established=0, rx_queue=None,
+                     tx_queue=None, cpu=None, rss=None)
+                for p in cls._get_ports_fallback()
+            ]
+        
+        try:
+            connections = psutil.net_connections(kind="tcp")
+        except (psutil.AccessDenied, PermissionError):
+            connections = []
+        
+        listening = []
+        established: Dict[int, int] = {}
+        for conn in connections:
+            if not conn.laddr:
+                continue
+            if conn.status == "LISTEN":
+                listening.append(conn)
+            elif conn.status == "ESTABLISHED":
+                established[conn.laddr.port] = established.get(conn.laddr.port, 0) + 1
+        
+        usages: Dict[Optional[int], Dict] = {}
+        records = []
+        for conn in listening:
+            if conn.pid not in usages:
+                usages[conn.pid] = cls.get_process_usage(conn.pid)
+            usage = usages[conn.pid]
+            records.append({
+                "proto": "tcp6" if conn.family == socket.AF_INET6 else "tcp",
+                "port": conn.laddr.port,
+                "process": usage["name"],
+                "pid": conn.pid,
+                "service": cls.COMMON_PORTS.get(conn.laddr.port, usage["name"]),
+                "icon": cls._get_process_icon(usage["name"]),
+                "address": conn.laddr.ip,
+                "inode": None,
+                "established": established.get(conn.laddr.port, 0),
+                "rx_queue": None,
+                "tx_queue": None,
+                "cpu": usage["cpu"],
+                "rss": usage["rss"],
+            })
+        
+        return records
+    
     @classmethod
     def get_listening_ports(cls) -> List[Dict]:
         """Get all listening ports with process info"""
@@ -174,15 +416,23 @@ class PortScanner:
         return "●"
     
     @classmethod
-    def check_port(cls, port: int, host: str = "127.0.0.1") -> bool:
+    def check_port(cls, port: int, host: str = "127.0.0.1", timeout: float = 1.0) -> bool:
         """Check if a specific port is open"""
+        return cls.measure_port(port, host, timeout) is not None
+    
+    @classmethod
+    def measure_port(cls, port: int, host: str = "127.0.0.1", timeout: float = 1.0) -> Optional[float]:
+        """Get TCP connect latency to a port in milliseconds, None if closed"""
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(1)
+        sock.settimeout(timeout)
         try:
+            start = time.perf_counter()
             result = sock.connect_ex((host, port))
-            return result == 0
+            if result != 0:
+                return None
+            return (time.perf_counter() - start) * 1000
         except Exception:
-            return False
+            return None
         finally:
             sock.close()
     
@@ -203,3 +453,149 @@ class PortScanner:
             "dev_ports": len([p for p in ports if p["port"] in [3000, 3001, 5000, 5173, 8000, 8080]]),
             "db_ports": len([p for p in ports if p["port"] in [3306, 5432, 6379, 27017]]),
         }
+
+
+class PortWatcher:
+    """Diff listening sockets between polls and emit open/close events"""
+    
+    def __init__(
+        self,
+        source: Optional[Callable[[], List[Dict]]] = None,
+        history: int = 200,
+        highlight_seconds: float = 30.0
+    ):
+        self.source = source or PortScanner.get_listening_sockets
+        self.highlight_seconds = highlight_seconds
+        self.sockets: Dict[Tuple, Dict] = {}
+        self.events: Deque[Dict] = deque(maxlen=history)
+        # Bumped whenever the sorted view changes: the set, an owner, or the
+        # load as shown (whole CPU%, MiB of RSS)
+        self.version = 0
+        self._sorted: List[Dict] = []
+        self._primed = False
+    
+    @staticmethod
+    def socket_key(record: Dict) -> Tuple:
+        """Identity of a listening socket"""
+        return (record.get("proto", "tcp"), record.get("address"), record["port"], record.get("inode"))
+    
+    @staticmethod
+    def _shown(record: Dict) -> Tuple:
+        """Owner and load at the precision the ports panel shows them"""
+        cpu, rss = record.get("cpu"), record.get("rss")
+        return (
+            record.get("pid"),
+            record.get("process"),
+            record.get("established"),
+            record.get("rx_queue"),
+            record.get("tx_queue"),
+            round(cpu) if cpu is not None else None,
+            rss >> 20 if rss else None,
+        )
+    
+    @staticmethod
+    def _sort_key(record: Dict) -> Tuple:
+        return (record["port"], record.get("address") or "", record.get("proto", "tcp"))
+    
+    @property
+    def ports(self) -> List[Dict]:
+        """Current listening sockets sorted by port"""
+        return self._sorted
+    
+    def _event(self, kind: str, record: Dict, now: float, previous: Optional[Dict] = None) -> Dict:
+        event = {
+            "event": kind,
+            "time": now,
+            "proto": record.get("proto", "tcp"),
+            "address": record.get("address"),
+            "port": record["port"],
+            "inode": record.get("inode"),
+            "pid": record.get("pid"),
+            "process": record.get("process", "Unknown"),
+            "service": record.get("service", "Unknown"),
+        }
+        if previous is not None:
+            event["previous_pid"] = previous.get("pid")
+            event["previous_process"] = previous.get("process", "Unknown")
+        return event
+    
+    def poll(self) -> List[Dict]:
+        """Take a snapshot and return the events since the last one"""
+        current = {self.socket_key(r): r for r in self.source()}
+        now = time.time()
+        
+        if not self._primed:
+            self._primed = True
+            self.sockets = current
+            self._sorted = sorted(current.values(), key=self._sort_key)
+            self.version += 1
+            return []
+        
+        events = []
+        opened = current.keys() - self.sockets.keys()
+        closed = self.sockets.keys() - current.keys()
+        
+        for key in closed:
+            events.append(self._event("closed", self.sockets.pop(key), now))
+        
+        for key in opened:
+            record = current[key]
+            self.sockets[key] = record
+            events.append(self._event("opened", record, now))
+        
+        changed = refreshed = False
+        for key, record in current.items():
+            if key in opened:
+                continue
+            previous = self.sockets[key]
+            if record == previous:
+                continue
+            # Same socket with new load figures or a new owner; CPU% jitter
+            # is kept but does not count as a change of the view
+            self.sockets[key] = record
+            changed = True
+            if self._shown(record) != self._shown(previous):
+                refreshed = True
+            if record.get("pid") != previous.get("pid"):
+                events.append(self._event("owner-changed", record, now, previous))
+        
+        if opened or closed:
+            self._sorted = sorted(self.sockets.values(), key=self._sort_key)
+        elif changed:
+            self._sorted = [self.sockets[self.socket_key(r)] for r in self._sorted]
+        
+        if events:
+            events.sort(key=lambda e: (e["port"], e["event"]))
+            self.events.extend(events)
+        if events or refreshed:
+            self.version += 1
+        
+        return events
+    
+    def watch(self, interval: float = 1.0, include_current: bool = False) -> Iterator[Dict]:
+        """Yield events forever, polling every interval seconds"""
+        self.poll()
+        if include_current:
+            now = time.time()
+            for record in self._sorted:
+                yield self._event("opened", record, now)
+        
+        while True:
+            time.sleep(interval)
+            for event in self.poll():
+                yield event
+    
+    def recent_changes(self, now: Optional[float] = None) -> Dict[int, Dict]:
+        """Latest event per port within the highlight window"""
+        now = time.time() if now is None else now
+        recent: Dict[int, Dict] = {}
+        for event in reversed(self.events):
+            if now - event["time"] > self.highlight_seconds:
+                break
+            recent.setdefault(event["port"], event)
+        return recent
+    
+    @staticmethod
+    def to_ndjson(event: Dict) -> str:
+        """Serialize an event as one NDJSON line"""
+        return json.dumps(event, separators=(",", ":"))
@@ -0,0 +1,286 @@
+"""
+Service probing utilities for DevDash
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .port_utils import PortScanner
+
+
+class ServiceProber:
+    """Probe local services concurrently and keep rolling latency stats"""
+    
+    CHECKS = ("tcp", "http", "redis", "postgres")
+    
+    DEFAULT_CHECKS = {
+        5432: "postgres",
+        6379: "redis",
+    }
+    
+    SCHEME_CHECKS = {
+        "tcp": "tcp",
+        "http": "http",
+        "https": "http",
+        "redis": "redis",
+        "postgres": "postgres",
+        "postgresql": "postgres",
+    }
+    
+    # PostgreSQL SSLRequest: int32 length (8) + int32 request code (80877103)
+    POSTGRES_SSL_REQUEST = (8).to_bytes(4, "big") + (80877103).to_bytes(4, "big")
+    REDIS_PING = b"*1\r\n$4\r\nPING\r\n"
+    
+    _tls_context = None
+    
+    def __init__(
+        self,
+        targets: Optional[List] = None,
+        timeout: float = 1.0,
+        window: int = 100,
+        concurrency: int = 64
+    ):
+        self.targets = [self.parse_target(t) if isinstance(t, str) else t for t in targets or []]
+        self.timeout = timeout
+        self.window = window
+        self.concurrency = concurrency
+        self.history: Dict[str, Deque[Optional[float]]] = {}
+        self.last_results: Dict[str, Dict] = {}
+    
+    @classmethod
+    def parse_target(cls, spec: str, default_host: str = "127.0.0.1") -> Dict:
+        """Parse '5432', 'host:port' or 'scheme://host:port/path' into a target"""
+        spec = spec.strip()
+        
+        if "://" in spec:
+            parts = urlsplit(spec)
+            scheme = parts.scheme.lower()
+            method = "HEAD"
+            if scheme.endswith("+get"):
+                scheme, method = scheme[:-4], "GET"
+            check = cls.SCHEME_CHECKS.get(scheme)
+            if check is None or parts.port is None and check != "http":
+                raise ValueError(f"Unsupported probe target: {spec}")
+            host = parts.hostname or default_host
+            tls = scheme == "https"
+            port = parts.port or (443 if tls else 80)
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+        else:
+            host, _, port_text = spec.rpartition(":")
+            host = host.strip("[]") or default_host
+            try:
+                port = int(port_text)
+            except ValueError:
+                raise ValueError(f"Invalid port in probe target: {spec}")
+            check = cls.DEFAULT_CHECKS.get(port, "tcp")
+            tls = False
+            method = "HEAD"
+            path = "/"
+        
+        if not 1 <= port <= 65535:
+            raise ValueError(f"Port out of range in probe target: {spec}")
+        
+        return {
+            "key": f"{host}:{port}",
+            "host": host,
+            "port": port,
+            "check": check,
+            "tls": tls,
+            "method": method,
+            "path": path,
+            "service": PortScanner.COMMON_PORTS.get(port, "Unknown"),
+        }
+    
+    @classmethod
+    def default_targets(cls, host: str = "127.0.0.1") -> List[Dict]:
+        """Targets for every well-known development port"""
+        return [cls.parse_target(f"{host}:{port}") for port in sorted(PortScanner.COMMON_PORTS)]
+    
+    @classmethod
+    def targets_from_ports(cls, ports: List[Dict]) -> List[Dict]:
+        """Targets for listening ports that map to a known service"""
+        targets = []
+        seen = set()
+        for p in ports:
+            if p["port"] not in PortScanner.COMMON_PORTS:
+                continue
+            address = p.get("address") or "127.0.0.1"
+            if address in ("0.0.0.0", "", "*"):
+                address = "127.0.0.1"
+            elif address == "::":
+                address = "::1"
+            target = cls.parse_target(f"[{address}]:{p['port']}" if ":" in address else f"{address}:{p['port']}")
+            if target["key"] not in seen:
+                seen.add(target["key"])
+                targets.append(target)
+        return targets
+    
+    async def _handshake(
+        self,
+        target: Dict,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> Tuple[bool, str]:
+        """Run the protocol-level check for a connected target"""
+        check = target["check"]
+        
+        if check == "http":
+            request = (
+                f"{target['method']} {target['path']} HTTP/1.1\r\n"
+                f"Host: {target['host']}\r\n"
+                "User-Agent: devdash-probe\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(request.encode("ascii"))
+            await writer.drain()
+            line = await reader.readline()
+            parts = line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0].startswith("HTTP/") and parts[1].isdigit():
+                status = int(parts[1])
+                return status < 500, f"HTTP {status}"
+            return False, "bad HTTP response"
+        
+        if check == "redis":
+            writer.write(self.REDIS_PING)
+            await writer.drain()
+            line = await reader.readline()
+            if line.startswith(b"+PONG"):
+                return True, "PONG"
+            if line.startswith(b"-NOAUTH"):
+                return True, "auth required"
+            return False, line.decode("latin-1").strip()[:30] or "no reply"
+        
+        if check == "postgres":
+            writer.write(self.POSTGRES_SSL_REQUEST)
+            await writer.drain()
+            reply = await reader.read(1)
+            if reply in (b"S", b"N"):
+                return True, "ssl" if reply == b"S" else "ready"
+            if reply == b"E":
+                return True, "error reply"
+            return False, "no reply"
+        
+        return True, "open"
+    
+    @classmethod
+    def tls_context(cls):
+        """TLS context for https targets, created once
+        
+        Certificates are not verified: local services mostly use self-signed
+        ones, and the probe checks that a service answers, not who it is.
+        """
+        if cls._tls_context is None:
+            import ssl
+            
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+            cls._tls_context = context
+        return cls._tls_context
+    
+    async def probe_target(self, target: Dict) -> Dict:
+        """Connect to one target, time the connect and run its check"""
+        result = {
+            "key": target["key"],
+            "host": target["host"],
+            "port": target["port"],
+            "check": target["check"],
+            "service": target["service"],
+            "up": False,
+            "latency": None,
+            "check_latency": None,
+            "detail": "",
+            "time": time.time(),
+        }
+        
+        # For https the connect latency includes the TLS handshake
+        tls = {"ssl": self.tls_context(), "server_hostname": target["host"]} if target.get("tls") else {}
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(target["host"], target["port"], **tls),
+                timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            result["detail"] = "timeout"
+            self._record(result)
+            return result
+        except OSError as e:
+            result["detail"] = "refused" if isinstance(e, ConnectionRefusedError) else (e.strerror or str(e))
+            self._record(result)
+            return result
+        
+        connected = time.perf_counter()
+        result["latency"] = (connected - start) * 1000
+        
+        try:
+            ok, detail = await asyncio.wait_for(
+                self._handshake(target, reader, writer),
+                timeout=self.timeout
+            )
+            result["up"] = ok
+            result["detail"] = detail
+            if target["check"] != "tcp":
+                result["check_latency"] = (time.perf_counter() - connected) * 1000
+        except asyncio.TimeoutError:
+            result["detail"] = f"{target['check']} timeout"
+        except OSError as e:
+            result["detail"] = e.strerror or str(e)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        
+        self._record(result)
+        return result
+    
+    async def probe_all(self, targets: Optional[List[Dict]] = None) -> List[Dict]:
+        """Probe all targets concurrently"""
+        targets = self.targets if targets is None else targets
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def bounded(target: Dict) -> Dict:
+            async with semaphore:
+                return await self.probe_target(target)
+        
+        return list(await asyncio.gather(*(bounded(t) for t in targets)))
+    
+    def probe(self, targets: Optional[List[Dict]] = None) -> List[Dict]:
+        """Run one probe round from synchronous code"""
+        return asyncio.run(self.probe_all(targets))
+    
+    def _record(self, result: Dict) -> None:
+        """Store a result in the target's rolling window"""
+        history = self.history.get(result["key"])
+        if history is None:
+            history = deque(maxlen=self.window)
+            self.history[result["key"]] = history
+        history.append(result["latency"] if result["up"] else None)
+        self.last_results[result["key"]] = result
+    
+    def get_stats(self, key: str) -> Dict:
+        """Get rolling latency stats for a target"""
+        history = self.history.get(key, ())
+        latencies = sorted(v for v in history if v is not None)
+        return {
+            "samples": len(history),
+            "ok": len(latencies),
+            "availability": len(latencies) / len(history) * 100 if history else 0.0,
+            "p50": self.percentile(latencies, 50),
+            "p99": self.percentile(latencies, 99),
+        }
+    
+    @staticmethod
+    def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+        """Nearest-rank percentile of an already sorted list"""
+        if not sorted_values:
+            return None
+        rank = max(1, -(-len(sorted_values) * pct // 100))
+        return sorted_values[int(rank) - 1]
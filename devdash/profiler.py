@@ -0,0 +1,224 @@
+"""
+Self-profiling for DevDash
+
+Records timing spans around collectors, panel renders, frames and every
+subprocess devdash starts, summarizes them as p50/p95 per span for the
+dashboard's debug panel, and exports them as a Chrome trace-event file
+(load it in chrome://tracing or https://ui.perfetto.dev).
+"""
+
+import os
+import json
+import math
+import time
+import functools
+import threading
+import subprocess
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Durations kept per span name for percentiles
+WINDOW = 200
+
+# Trace events kept for export (oldest dropped first)
+MAX_EVENTS = 100_000
+
+# Frames kept for subprocesses-per-frame
+FRAME_WINDOW = 50
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile (fraction in 0..1)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def describe_command(args) -> str:
+    """Short span name for a subprocess: program and subcommand ('git status')"""
+    if isinstance(args, (str, bytes)):
+        args = str(args).split()
+    words = [str(a) for a in args]
+    if not words:
+        return "subprocess"
+    name = os.path.basename(words[0])
+    for word in words[1:]:
+        if not word.startswith("-"):
+            return f"{name} {word}"
+    return name
+
+
+class Profiler:
+    """Collect timing spans and subprocess counts from any thread"""
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.pid = os.getpid()
+        self.events: Deque[Dict] = deque(maxlen=MAX_EVENTS)
+        self.durations: Dict[str, Deque[float]] = {}
+        self.categories: Dict[str, str] = {}
+        self.counts: Dict[str, int] = {}
+        self.threads: Dict[int, str] = {}
+        self.subprocesses = 0
+        self.frames = 0
+        self.frame_subprocesses: Deque[int] = deque(maxlen=FRAME_WINDOW)
+        self._frame_start_subprocesses = 0
+        self._lock = threading.Lock()
+        self._installed: Optional[Tuple[Callable, Callable]] = None
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+    
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self.started) * 1e6
+    
+    def record(self, name: str, category: str, start_us: float, duration_us: float, args: Optional[Dict] = None) -> None:
+        """Add one completed span"""
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(start_us, 1),
+            "dur": round(duration_us, 1),
+            "pid": self.pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+            self.threads[thread.ident] = thread.name
+            if name not in self.durations:
+                self.durations[name] = deque(maxlen=WINDOW)
+                self.categories[name] = category
+                self.counts[name] = 0
+            self.durations[name].append(duration_us / 1000)
+            self.counts[name] += 1
+    
+    @contextmanager
+    def span(self, name: str, category: str = "function", args: Optional[Dict] = None) -> Iterator[None]:
+        """Time the enclosed block"""
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            self.record(name, category, start, self._now_us() - start, args)
+    
+    def wrap(
+        self,
+        func: Callable,
+        name: str,
+        category: str = "function",
+        detail: Optional[Callable[..., str]] = None
+    ) -> Callable:
+        """Wrap func in a span; detail(*args, **kwargs) is appended to the name"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            span_name = f"{name} {detail(*args, **kwargs)}" if detail else name
+            with self.span(span_name, category):
+                return func(*args, **kwargs)
+        
+        return wrapper
+    
+    @contextmanager
+    def frame(self) -> Iterator[None]:
+        """Time one dashboard frame and count the subprocesses started since the last"""
+        with self.span("frame", "render"):
+            yield
+        with self._lock:
+            self.frames += 1
+            self.frame_subprocesses.append(self.subprocesses - self._frame_start_subprocesses)
+            self._frame_start_subprocesses = self.subprocesses
+    
+    def install(self) -> None:
+        """Count every subprocess and time those started through subprocess.run"""
+        if self._installed is not None:
+            return
+        original_init, original_run = subprocess.Popen.__init__, subprocess.run
+        profiler = self
+        
+        def counting_init(popen, *args, **kwargs):
+            with profiler._lock:
+                profiler.subprocesses += 1
+            original_init(popen, *args, **kwargs)
+        
+        def timed_run(*args, **kwargs):
+            command = args[0] if args else kwargs.get("args", ())
+            with profiler.span(describe_command(command), "subprocess"):
+                return original_run(*args, **kwargs)
+        
+        subprocess.Popen.__init__ = counting_init
+        subprocess.run = timed_run
+        self._installed = (original_init, original_run)
+    
+    def uninstall(self) -> None:
+        """Restore subprocess"""
+        if self._installed is None:
+            return
+        subprocess.Popen.__init__, subprocess.run = self._installed
+        self._installed = None
+    
+    def get_process_usage(self) -> Dict:
+        """devdash's own CPU% (since the previous call) and RSS"""
+        if self._process is None:
+            return {"cpu": None, "rss": None}
+        try:
+            with self._process.oneshot():
+                return {"cpu": self._process.cpu_percent(interval=None), "rss": self._process.memory_info().rss}
+        except psutil.Error:
+            return {"cpu": None, "rss": None}
+    
+    def get_summary(self, limit: Optional[int] = None) -> Dict:
+        """p50/p95 per span (slowest p95 first), frames, subprocesses and own usage"""
+        with self._lock:
+            samples = {name: list(values) for name, values in self.durations.items()}
+            counts = dict(self.counts)
+            per_frame = list(self.frame_subprocesses)
+            frames, subprocesses = self.frames, self.subprocesses
+        
+        spans = [
+            {
+                "name": name,
+                "category": self.categories[name],
+                "count": counts[name],
+                "p50": percentile(values, 0.5),
+                "p95": percentile(values, 0.95),
+            }
+            for name, values in samples.items() if name != "frame"
+        ]
+        spans.sort(key=lambda s: -s["p95"])
+        
+        frame_times = samples.get("frame", [])
+        return {
+            "spans": spans[:limit],
+            "frames": frames,
+            "frame_p50": percentile(frame_times, 0.5),
+            "frame_p95": percentile(frame_times, 0.95),
+            "subprocesses": subprocesses,
+            "subprocesses_per_frame": sum(per_frame) / len(per_frame) if per_frame else None,
+            **self.get_process_usage(),
+        }
+    
+    def export_chrome_trace(self, path: str) -> int:
+        """Write the recorded spans as Chrome trace-event JSON; returns the event count"""
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self.threads)
+        
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0, "args": {"name": "devdash"}}
+        ] + [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        return len(events)
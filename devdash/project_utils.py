@@ -0,0 +1,295 @@
+"""
+Project index for DevDash
+
+Remembers project roots (git repositories and directories with a package
+manifest) with their type, last commit time and dirty state, and how often
+and how recently each was opened. Metadata is read when projects are
+scanned or refreshed, never while searching: a query goes through a
+trigram index over the project paths (built once when the index is
+loaded) and falls back to an in-order subsequence match only among the
+paths containing all of its characters, so thousands of projects are
+searched in milliseconds. Matches are ranked by how well they match, then
+by frecency.
+"""
+
+import os
+import re
+import time
+import heapq
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set
+
+from .cache_utils import DiskCache
+from .workspace_utils import ECOSYSTEM_MANIFESTS, IGNORED_DIRS
+
+# Bump when the stored entry format changes
+INDEX_VERSION = 1
+
+# Directory levels below a root searched for projects
+SCAN_DEPTH = 4
+
+# Projects whose metadata is read at the same time
+METADATA_WORKERS = 8
+
+# Frecency: visits weighted by how recent the last one was (zoxide's scheme)
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+# Once the visits of all projects add up to more than this, every count is
+# scaled down by AGING so old favourites fade
+MAX_RANK = 1000
+AGING = 0.9
+
+# Match quality of a query term: in the project's name, at the start of a
+# path component, anywhere in the path, or its characters in order
+MATCH_NAME = 4
+MATCH_COMPONENT = 3
+MATCH_PATH = 2
+MATCH_FUZZY = 1
+
+MANIFEST_NAMES = {name for names in ECOSYSTEM_MANIFESTS.values() for name in names}
+
+
+def trigrams(text: str) -> Set[str]:
+    """Every run of three characters in text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def char_mask(text: str) -> int:
+    """Bit set of the characters in text, to rule out fuzzy matches cheaply"""
+    mask = 0
+    for char in text:
+        mask |= 1 << (ord(char) & 127)
+    return mask
+
+
+def frecency(entry: Dict, now: Optional[float] = None) -> float:
+    """Visit count weighted by how recently the project was last opened"""
+    rank = entry.get("rank", 0)
+    if not rank:
+        return 0.0
+    age = (time.time() if now is None else now) - entry.get("visited", 0)
+    if age < HOUR:
+        return rank * 4
+    if age < DAY:
+        return rank * 2
+    if age < WEEK:
+        return rank / 2
+    return rank / 4
+
+
+def is_project(directory: str, names: Optional[Iterable[str]] = None) -> bool:
+    """Whether a directory is a git repository or has a package manifest"""
+    names = set(os.listdir(directory) if names is None else names)
+    return ".git" in names or bool(names & MANIFEST_NAMES)
+
+
+def read_metadata(path: str) -> Dict:
+    """Type, last commit time and dirty state of a project"""
+    from .package_utils import PackageInfo
+    
+    metadata = {"type": PackageInfo.detect_project_type(path), "commit": None, "dirty": None}
+    if not os.path.exists(os.path.join(path, ".git")):
+        return metadata
+    metadata["type"] = metadata["type"] or "git"
+    try:
+        log = subprocess.run(
+            ["git", "log", "-1", "--format=%ct"],
+            cwd=path, capture_output=True, text=True, timeout=10
+        )
+        if log.returncode == 0 and log.stdout.strip().isdigit():
+            metadata["commit"] = int(log.stdout.strip())
+        # Untracked files are left out: listing them walks the whole tree
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=path, capture_output=True, text=True, timeout=10
+        )
+        if status.returncode == 0:
+            metadata["dirty"] = bool(status.stdout.strip())
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+    return metadata
+
+
+class ProjectIndex:
+    """Known projects with their metadata and visit history, searchable by path"""
+    
+    def __init__(self, cache: Optional[DiskCache] = None):
+        self.cache = cache if cache is not None else DiskCache("projects", ttl=float("inf"))
+        self._projects: Optional[Dict[str, Dict]] = None
+        self._roots: List[str] = []
+        self._lock = threading.RLock()
+        # Search index, rebuilt when the set of projects changes
+        self._paths: List[str] = []
+        self._texts: List[str] = []
+        self._masks: List[int] = []
+        self._postings: Dict[str, Set[int]] = {}
+    
+    def _load(self) -> Dict[str, Dict]:
+        """{path: {"name", "type", "commit", "dirty", "rank", "visited", "updated"}}"""
+        with self._lock:
+            if self._projects is None:
+                stored = self.cache.get(self.cache.make_key("index"))
+                valid = isinstance(stored, dict) and stored.get("version") == INDEX_VERSION
+                self._projects = stored["projects"] if valid else {}
+                self._roots = stored["roots"] if valid else []
+                self._build()
+            return self._projects
+    
+    def __len__(self) -> int:
+        return len(self._load())
+    
+    @property
+    def roots(self) -> List[str]:
+        """Directories scanned for projects so far"""
+        self._load()
+        return list(self._roots)
+    
+    def _build(self) -> None:
+        self._paths = sorted(self._projects)
+        self._texts = [path.lower() for path in self._paths]
+        self._masks = [char_mask(text) for text in self._texts]
+        self._postings = {}
+        for i, text in enumerate(self._texts):
+            for trigram in trigrams(text):
+                self._postings.setdefault(trigram, set()).add(i)
+    
+    def save(self) -> None:
+        """Write the index to disk"""
+        with self._lock:
+            self.cache.set(self.cache.make_key("index"), {
+                "version": INDEX_VERSION,
+                "roots": self._roots,
+                "projects": self._load(),
+            })
+    
+    @staticmethod
+    def discover(root: str, max_depth: int = SCAN_DEPTH) -> List[str]:
+        """Project directories under root (not looking inside projects)"""
+        root = os.path.abspath(root)
+        found = []
+        base_depth = root.rstrip(os.sep).count(os.sep)
+        for directory, subdirs, files in os.walk(root):
+            if is_project(directory, subdirs + files):
+                found.append(directory)
+                subdirs[:] = []
+            elif directory.count(os.sep) - base_depth >= max_depth:
+                subdirs[:] = []
+            else:
+                subdirs[:] = sorted(d for d in subdirs if d not in IGNORED_DIRS and not d.startswith("."))
+        return found
+    
+    def refresh(self, paths: Optional[Iterable[str]] = None, workers: int = METADATA_WORKERS) -> None:
+        """Re-read the metadata of some (default: all) projects; gone ones are dropped"""
+        paths = list(self._load() if paths is None else paths)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            metadata = list(pool.map(read_metadata, paths))
+        
+        now = time.time()
+        with self._lock:
+            projects = self._load()
+            for path, found in zip(paths, metadata):
+                if not os.path.isdir(path) or not is_project(path):
+                    projects.pop(path, None)
+                    continue
+                entry = projects.setdefault(path, {"name": os.path.basename(path) or path, "rank": 0, "visited": 0})
+                entry.update(found, updated=now)
+            if set(self._paths) != set(projects):
+                self._build()
+            self.save()
+    
+    def scan(self, roots: Iterable[str], max_depth: int = SCAN_DEPTH, workers: int = METADATA_WORKERS) -> int:
+        """Find the projects under roots and read their metadata; returns how many"""
+        roots = [os.path.abspath(root) for root in roots]
+        found = [path for root in roots for path in self.discover(root, max_depth)]
+        known = set(found)
+        with self._lock:
+            self._load()
+            self._roots = sorted(set(self._roots) | set(roots))
+            # Projects under a scanned root that are no longer there
+            stale = [
+                path for path in self._projects
+                if path not in known and any(path.startswith(root + os.sep) for root in roots)
+            ]
+        self.refresh(found + stale, workers)
+        return len(found)
+    
+    def visit(self, path: str, now: Optional[float] = None) -> Optional[Dict]:
+        """Count an opening of a project, adding it to the index if new"""
+        path = os.path.abspath(path)
+        if path not in self._load():
+            if not os.path.isdir(path) or not is_project(path):
+                return None
+            self.refresh([path])
+        
+        with self._lock:
+            entry = self._projects[path]
+            entry["rank"] = entry.get("rank", 0) + 1
+            entry["visited"] = time.time() if now is None else now
+            if sum(e.get("rank", 0) for e in self._projects.values()) > MAX_RANK:
+                for e in self._projects.values():
+                    e["rank"] = e.get("rank", 0) * AGING
+            self.save()
+            return dict(entry, path=path)
+    
+    def _substring_ids(self, term: str) -> Set[int]:
+        """Projects whose path contains term, narrowed down by trigrams"""
+        if len(term) < 3:
+            candidates: Iterable[int] = range(len(self._texts))
+        else:
+            postings = sorted((self._postings.get(t, set()) for t in trigrams(term)), key=len)
+            candidates = set.intersection(*postings) if postings[0] else set()
+        return {i for i in candidates if term in self._texts[i]}
+    
+    def _fuzzy_ids(self, term: str, exclude: Set[int]) -> Set[int]:
+        """Projects whose path has the characters of term in order"""
+        mask = char_mask(term)
+        pattern = re.compile(".*?".join(map(re.escape, term)))
+        return {
+            i for i, text_mask in enumerate(self._masks)
+            if i not in exclude and text_mask & mask == mask and pattern.search(self._texts[i])
+        }
+    
+    def _quality(self, i: int, terms: List[str]) -> int:
+        text = self._texts[i]
+        name = os.path.basename(text)
+        quality = 0
+        for term in terms:
+            if term in name:
+                quality += MATCH_NAME
+            elif os.sep + term in text:
+                quality += MATCH_COMPONENT
+            elif term in text:
+                quality += MATCH_PATH
+            else:
+                quality += MATCH_FUZZY
+        return quality
+    
+    def search(self, query: str = "", limit: int = 20, now: Optional[float] = None) -> List[Dict]:
+        """Best projects for a query (all of its words must match), best first
+        
+        An empty query lists the projects by frecency.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            projects = self._load()
+            terms = query.lower().split()
+            ids: Optional[Set[int]] = None
+            for term in terms:
+                matched = self._substring_ids(term)
+                # Typos and abbreviations ("ddsh") only when exact matches run short
+                if len(matched) < limit:
+                    matched |= self._fuzzy_ids(term, matched)
+                ids = matched if ids is None else ids & matched
+                if not ids:
+                    return []
+            
+            candidates = range(len(self._paths)) if ids is None else ids
+            ranked = heapq.nsmallest(limit, (
+                (-self._quality(i, terms), -frecency(projects[self._paths[i]], now), self._paths[i])
+                for i in candidates
+            ))
+            return [dict(projects[path], path=path, frecency=-score) for _, score, path in ranked]
@@ -0,0 +1,397 @@
+"""
+Shell prompt segment for DevDash
+
+`devdash prompt` runs on every prompt render, so it has a strict latency
+budget: no Rich, Typer or psutil, the git dir found without running git,
+and branch, ahead/behind and changes from a single
+`git status --porcelain=v2 --branch`. With --async the last cached segment
+is printed at once and refreshed in the background (stale-while-
+revalidate), for repositories where even that is too slow.
+"""
+
+import os
+import sys
+import time
+import subprocess
+from typing import Dict, List, Optional
+
+from .git_utils import find_git_dir, get_operation, parse_status_v2, read_head
+
+# How each shell marks escape sequences as zero-width in a prompt
+ZERO_WIDTH = {
+    "bash": ("\001", "\002"),
+    "zsh": ("%{", "%}"),
+    "fish": ("", ""),
+    "plain": ("", ""),
+}
+
+COLORS = {
+    "branch": "32",
+    "detached": "33",
+    "operation": "1;31",
+    "ahead": "36",
+    "behind": "35",
+    "staged": "32",
+    "unstaged": "33",
+    "untracked": "2",
+    "conflicts": "31",
+    "system": "2",
+}
+
+COUNTERS = (
+    ("ahead", "↑"),
+    ("behind", "↓"),
+    ("staged", "+"),
+    ("unstaged", "!"),
+    ("untracked", "?"),
+    ("conflicts", "✘"),
+)
+
+# Past this, the segment shows what HEAD alone tells (the branch)
+GIT_TIMEOUT = 1.0
+
+# --async: cached segments older than this are refreshed in the background
+DEFAULT_TTL = 2.0
+
+# A background refresh holding its lock longer than this is presumed dead
+REFRESH_LOCK_TIMEOUT = 30.0
+
+USAGE = """Usage: devdash prompt [OPTIONS]
+
+Print a git (and optionally CPU/RAM) segment for a shell prompt.
+
+Options:
+  --shell [bash|zsh|fish|plain]  Escape colors for this shell (default: from $SHELL)
+  --system                       Add CPU/RAM (from devdashd if running, else load/RAM)
+  --async                        Print the cached segment; refresh it in the background
+  --ttl SECONDS                  Cache age that triggers a refresh with --async (default: 2)
+  --no-untracked                 Do not scan for untracked files (faster in huge trees)
+  --no-color                     Plain text
+  --path PATH                    Repository path (default: current directory)
+  -h, --help                     Show this message
+
+Examples:
+  bash:  PS1='$(devdash prompt --shell bash) \\$ '
+  zsh:   setopt PROMPT_SUBST; PROMPT='$(devdash prompt --shell zsh) %# '
+  fish:  function fish_right_prompt; devdash prompt --shell fish; end
+"""
+
+
+def get_git_state(path: str = ".", untracked: bool = True, timeout: Optional[float] = GIT_TIMEOUT) -> Optional[Dict]:
+    """Git state for the prompt; None outside a repository
+    
+    If git is missing or slower than timeout, only the branch (read from
+    HEAD) is filled in and "partial" is set.
+    """
+    git_dir = find_git_dir(path)
+    if git_dir is None:
+        return None
+    
+    state = None
+    try:
+        result = subprocess.run(
+            [
+                "git", "--no-optional-locks", "status", "--porcelain=v2", "--branch",
+                "--untracked-files=" + ("normal" if untracked else "no"),
+            ],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+        if result.returncode == 0:
+            state = parse_status_v2(result.stdout)
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+    
+    if state is None:
+        state = parse_status_v2("")
+        state["branch"], state["oid"] = read_head(git_dir)
+        state["partial"] = True
+    state["operation"] = get_operation(git_dir)
+    return state
+
+
+def get_system_state() -> Optional[Dict]:
+    """CPU and RAM from devdashd when it runs, else load average and RAM"""
+    from .protocol import ProtocolError, get_socket_path, recv_frame, send_frame
+    socket_path = get_socket_path()
+    if os.path.exists(socket_path):
+        import socket
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(0.05)
+                sock.connect(socket_path)
+                send_frame(sock, {"op": "get", "name": "system", "path": "/", "max_age": 5.0})
+                reply = recv_frame(sock)
+            if reply and reply.get("ok"):
+                return {"cpu": reply["value"]["cpu"], "ram": reply["value"]["mem_percent"]}
+        except (OSError, ProtocolError, KeyError, TypeError, AttributeError):
+            pass
+    
+    # psutil costs more to import than the whole git status; read /proc
+    state: Dict = {}
+    try:
+        state["load"] = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        pass
+    try:
+        meminfo = {}
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0])
+        state["ram"] = 100.0 * (1 - meminfo["MemAvailable"] / meminfo["MemTotal"])
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        pass
+    return state or None
+
+
+def format_segment(
+    state: Optional[Dict],
+    shell: str = "plain",
+    color: bool = True,
+    system: Optional[Dict] = None
+) -> str:
+    """Render the prompt segment for a shell"""
+    start, end = ZERO_WIDTH.get(shell, ZERO_WIDTH["plain"])
+    
+    def paint(text: str, kind: str) -> str:
+        if shell == "zsh":
+            text = text.replace("%", "%%")
+        if not color:
+            return text
+        return f"{start}\x1b[{COLORS[kind]}m{end}{text}{start}\x1b[0m{end}"
+    
+    parts = []
+    if state is not None:
+        if state.get("branch"):
+            head = paint(state["branch"], "branch")
+        elif state.get("oid"):
+            head = paint(":" + state["oid"][:7], "detached")
+        else:
+            head = paint("(unknown)", "detached")
+        if state.get("operation"):
+            head += paint("|" + state["operation"], "operation")
+        parts.append(head)
+        
+        counters = "".join(
+            paint(f"{symbol}{state[key]}", key)
+            for key, symbol in COUNTERS if state.get(key)
+        )
+        if counters:
+            parts.append(counters)
+    
+    if system:
+        text = []
+        if system.get("cpu") is not None:
+            text.append(f"CPU {system['cpu']:.0f}%")
+        elif system.get("load") is not None:
+            text.append(f"load {system['load']:.2f}")
+        if system.get("ram") is not None:
+            text.append(f"RAM {system['ram']:.0f}%")
+        if text:
+            parts.append(paint(" ".join(text), "system"))
+    
+    return " ".join(parts)
+
+
+def get_cache_path(git_dir: str) -> str:
+    """Where the --async segment state for a repository is kept"""
+    import zlib
+    from .cache_utils import get_cache_dir
+    return os.path.join(str(get_cache_dir()), "prompt", f"{zlib.crc32(git_dir.encode('utf-8')):08x}.json")
+
+
+def get_state_key(git_dir: str) -> List[int]:
+    """Changes when HEAD, the index or the fetched refs change"""
+    key = []
+    for name in ("HEAD", "index", "FETCH_HEAD", "packed-refs"):
+        try:
+            key.append(os.stat(os.path.join(git_dir, name)).st_mtime_ns)
+        except OSError:
+            key.append(0)
+    return key
+
+
+def load_cached(cache_path: str, git_dir: str) -> Optional[Dict]:
+    """Cached entry for git_dir, if any"""
+    import json
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("git_dir") != git_dir:
+        return None
+    return entry
+
+
+def save_cached(cache_path: str, git_dir: str, state: Dict) -> None:
+    """Atomically write the cached entry"""
+    import json
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    entry = {"git_dir": git_dir, "key": get_state_key(git_dir), "time": time.time(), "state": state}
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(temp_path, cache_path)
+
+
+def spawn_refresh(path: str, cache_path: str, untracked: bool = True) -> bool:
+    """Start a detached refresh unless one is already running"""
+    lock_path = cache_path + ".lock"
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    for _ in range(2):
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.stat(lock_path).st_mtime < REFRESH_LOCK_TIMEOUT:
+                    return False
+                os.unlink(lock_path)
+            except OSError:
+                return False
+    else:
+        return False
+    
+    command = [sys.executable, "-m", "devdash.prompt", "--refresh", "--path", os.path.abspath(path)]
+    if not untracked:
+        command.append("--no-untracked")
+    try:
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True
+        )
+    except OSError:
+        os.unlink(lock_path)
+        return False
+    return True
+
+
+def refresh_cache(path: str, untracked: bool = True) -> None:
+    """Collect without a timeout and store the result (background worker)"""
+    git_dir = find_git_dir(path)
+    if git_dir is None:
+        return
+    cache_path = get_cache_path(git_dir)
+    try:
+        state = get_git_state(path, untracked, timeout=None)
+        if state is not None:
+            save_cached(cache_path, git_dir, state)
+    finally:
+        try:
+            os.unlink(cache_path + ".lock")
+        except OSError:
+            pass
+
+
+def get_async_state(path: str, untracked: bool = True, ttl: float = DEFAULT_TTL) -> Optional[Dict]:
+    """Stale-while-revalidate: the cached state now, a fresh one for next time
+    
+    Only the first call in a repository waits for git.
+    """
+    git_dir = find_git_dir(path)
+    if git_dir is None:
+        return None
+    cache_path = get_cache_path(git_dir)
+    entry = load_cached(cache_path, git_dir)
+    if entry is None:
+        state = get_git_state(path, untracked)
+        if state is not None and not state.get("partial"):
+            try:
+                save_cached(cache_path, git_dir, state)
+            except OSError:
+                pass
+        return state
+    
+    if entry["key"] != get_state_key(git_dir) or time.time() - entry["time"] > ttl:
+        try:
+            spawn_refresh(path, cache_path, untracked)
+        except OSError:
+            pass
+    return entry["state"]
+
+
+def detect_shell() -> str:
+    """Prompt flavour from $SHELL"""
+    name = os.path.basename(os.environ.get("SHELL", ""))
+    return name if name in ZERO_WIDTH else "plain"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for `devdash prompt`
+    
+    Options are parsed by hand: argparse alone costs more than the budget.
+    """
+    args = list(sys.argv[1:] if argv is None else argv)
+    options = {
+        "shell": detect_shell(),
+        "system": False,
+        "async": False,
+        "ttl": DEFAULT_TTL,
+        "untracked": True,
+        "color": not os.environ.get("NO_COLOR"),
+        "path": ".",
+        "refresh": False,
+    }
+    flags = {
+        "--system": ("system", True),
+        "--async": ("async", True),
+        "--no-untracked": ("untracked", False),
+        "--no-color": ("color", False),
+        "--refresh": ("refresh", True),
+    }
+    
+    while args:
+        arg = args.pop(0)
+        name, _, value = arg.partition("=")
+        if arg in ("-h", "--help"):
+            print(USAGE, end="")
+            return 0
+        if arg in flags:
+            key, flag = flags[arg]
+            options[key] = flag
+        elif name in ("--shell", "--ttl", "--path"):
+            if not value:
+                if not args:
+                    print(f"devdash prompt: {name} needs a value", file=sys.stderr)
+                    return 2
+                value = args.pop(0)
+            options[name[2:]] = value
+        else:
+            print(f"devdash prompt: unknown option {arg}\n\n{USAGE}", end="", file=sys.stderr)
+            return 2
+    
+    if options["shell"] not in ZERO_WIDTH:
+        print(f"devdash prompt: unknown shell {options['shell']!r}", file=sys.stderr)
+        return 2
+    try:
+        ttl = float(options["ttl"])
+    except ValueError:
+        print(f"devdash prompt: invalid --ttl {options['ttl']!r}", file=sys.stderr)
+        return 2
+    
+    if options["refresh"]:
+        refresh_cache(options["path"], options["untracked"])
+        return 0
+    
+    if options["async"]:
+        state = get_async_state(options["path"], options["untracked"], ttl)
+    else:
+        state = get_git_state(options["path"], options["untracked"])
+    system = get_system_state() if options["system"] else None
+    
+    segment = format_segment(state, options["shell"], options["color"], system)
+    if segment:
+        print(segment)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Wire protocol between devdashd and its clients
+
+Each message is a 4-byte big-endian length followed by that many bytes of
+compact UTF-8 JSON. Requests carry an "op" ("ping", "get", "stats",
+"shutdown"); replies carry "ok" and either the payload or an "error".
+"""
+
+import os
+import json
+import socket
+import struct
+from typing import Dict, Optional
+
+HEADER = struct.Struct("!I")
+
+# Refuse frames larger than this (a corrupt length would otherwise
+# make the reader allocate gigabytes)
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+def get_socket_path() -> str:
+    """Per-user devdashd socket path (DEVDASH_SOCKET overrides)"""
+    override = os.environ.get("DEVDASH_SOCKET")
+    if override:
+        return override
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "devdash", "devdashd.sock")
+    import tempfile
+    uid = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"devdash-{uid}", "devdashd.sock")
+
+
+class ProtocolError(Exception):
+    """Malformed or oversized frame"""
+
+
+def encode_frame(message: Dict) -> bytes:
+    """Serialize a message to one frame"""
+    payload = json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+    if len(payload) > MAX_FRAME_SIZE:
+        raise ProtocolError(f"frame of {len(payload)} bytes exceeds {MAX_FRAME_SIZE}")
+    return HEADER.pack(len(payload)) + payload
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    """Read exactly size bytes; None on EOF before the first byte"""
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 65536))
+        if not chunk:
+            if remaining == size:
+                return None
+            raise ProtocolError("connection closed mid-frame")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_frame(sock: socket.socket, message: Dict) -> None:
+    """Send one message"""
+    sock.sendall(encode_frame(message))
+
+
+def recv_frame(sock: socket.socket) -> Optional[Dict]:
+    """Receive one message; None when the peer closed the connection"""
+    header = _recv_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ProtocolError(f"frame of {size} bytes exceeds {MAX_FRAME_SIZE}")
+    payload = _recv_exactly(sock, size) if size else b""
+    if payload is None:
+        raise ProtocolError("connection closed mid-frame")
+    try:
+        message = json.loads(payload.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ProtocolError(f"invalid frame: {e}") from e
+    if not isinstance(message, dict):
+        raise ProtocolError("frame is not an object")
+    return message
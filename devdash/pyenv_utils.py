@@ -0,0 +1,439 @@
+"""
+Python environment utilities for DevDash
+
+Reads *.dist-info metadata straight from a project's virtualenv instead of
+asking pip, which alone takes about a second to import.
+"""
+
+import os
+import re
+import csv
+import sys
+import base64
+import hashlib
+import platform
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .version_utils import canonicalize_name, parse_version, version_matches
+
+REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[[^\]]*\])?\s*")
+
+MARKER_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>'[^']*'|"[^"]*")
+        |(?P<op>===|==|!=|<=|>=|~=|<|>|\(|\)|not\s+in\b|in\b|and\b|or\b)
+        |(?P<name>[A-Za-z_.]+)
+    )""",
+    re.VERBOSE,
+)
+
+# Markers compared as versions rather than strings
+VERSION_MARKERS = {"python_version", "python_full_version", "implementation_version"}
+
+
+def parse_requirement(text: str) -> Optional[Dict]:
+    """Split a Requires-Dist value into name, specifier and marker"""
+    requirement, _, marker = text.partition(";")
+    match = REQUIREMENT_NAME.match(requirement)
+    if not match:
+        return None
+    rest = requirement[match.end():].strip()
+    if rest.startswith("@"):
+        # Direct URL reference: nothing to compare against
+        rest = ""
+    specifier = rest.strip("()").replace(" ", "")
+    return {
+        "name": match.group(1),
+        "specifier": specifier,
+        "marker": marker.strip() or None,
+    }
+
+
+def evaluate_marker(marker: Optional[str], environment: Dict[str, str]) -> bool:
+    """Evaluate a PEP 508 environment marker
+    
+    Unknown variables evaluate as empty strings, so 'extra == "x"' is false
+    unless the environment names that extra.
+    """
+    if not marker:
+        return True
+    
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    marker = marker.strip()
+    while position < len(marker):
+        match = MARKER_TOKEN.match(marker, position)
+        if not match or match.end() == position:
+            raise ValueError(f"invalid marker: {marker!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        tokens.append((kind, re.sub(r"\s+", " ", value)))
+        position = match.end()
+    
+    index = 0
+    
+    def peek() -> Optional[str]:
+        return tokens[index][1] if index < len(tokens) else None
+    
+    def take() -> Tuple[str, str]:
+        nonlocal index
+        if index >= len(tokens):
+            raise ValueError(f"invalid marker: {marker!r}")
+        index += 1
+        return tokens[index - 1]
+    
+    def value() -> Tuple[str, bool]:
+        kind, text = take()
+        if kind == "string":
+            return text[1:-1], False
+        if kind == "name":
+            name = text.replace(".", "_")
+            return environment.get(name, ""), name in VERSION_MARKERS
+        raise ValueError(f"invalid marker: {marker!r}")
+    
+    def comparison() -> bool:
+        if peek() == "(":
+            take()
+            result = expression()
+            if take()[1] != ")":
+                raise ValueError(f"invalid marker: {marker!r}")
+            return result
+        left, left_version = value()
+        kind, op = take()
+        if kind != "op":
+            raise ValueError(f"invalid marker: {marker!r}")
+        right, right_version = value()
+        if op == "in":
+            return left in right
+        if op == "not in":
+            return left not in right
+        if (left_version or right_version) and parse_version(left) and parse_version(right):
+            return version_matches(left, op + right)
+        if op in ("==", "==="):
+            return left == right
+        if op == "!=":
+            return left != right
+        return {"<": left < right, "<=": left <= right, ">": left > right, ">=": left >= right}.get(op, False)
+    
+    def conjunction() -> bool:
+        result = comparison()
+        while peek() == "and":
+            take()
+            result = comparison() and result
+        return result
+    
+    def expression() -> bool:
+        result = conjunction()
+        while peek() == "or":
+            take()
+            result = conjunction() or result
+        return result
+    
+    result = expression()
+    if index != len(tokens):
+        raise ValueError(f"invalid marker: {marker!r}")
+    return result
+
+
+class PythonEnvScanner:
+    """Scan the Python environment that belongs to a project"""
+    
+    # Virtualenv directories looked for inside the project
+    IN_PROJECT_ENVS = [".venv", "venv", "env"]
+    
+    # site-packages dirs -> {signature, distributions, conflicts}; only the
+    # latest signature is kept for each environment
+    _cache: Dict[Tuple[str, ...], Dict] = {}
+    
+    def __init__(self, path: str = ".", max_workers: int = 8):
+        self.path = os.path.abspath(path)
+        self.max_workers = max_workers
+    
+    @staticmethod
+    def is_environment(env: str) -> bool:
+        """Check if a directory is a virtualenv"""
+        return os.path.isfile(os.path.join(env, "pyvenv.cfg"))
+    
+    @staticmethod
+    def get_poetry_envs_dir() -> str:
+        """Directory where poetry keeps out-of-project virtualenvs"""
+        if os.environ.get("POETRY_VIRTUALENVS_PATH"):
+            return os.environ["POETRY_VIRTUALENVS_PATH"]
+        cache = os.environ.get("POETRY_CACHE_DIR")
+        if not cache:
+            if sys.platform == "win32":
+                base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+                cache = os.path.join(base, "pypoetry", "Cache")
+            elif sys.platform == "darwin":
+                cache = os.path.expanduser("~/Library/Caches/pypoetry")
+            else:
+                base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+                cache = os.path.join(base, "pypoetry")
+        return os.path.join(cache, "virtualenvs")
+    
+    def get_poetry_env(self) -> Optional[str]:
+        """Find the poetry env: '<name>-<8 chars of urlsafe b64 sha256(project dir)>-py<X.Y>'"""
+        if not os.path.isfile(os.path.join(self.path, "pyproject.toml")):
+            return None
+        digest = hashlib.sha256(str(Path(self.path).resolve()).encode()).digest()
+        project_hash = base64.urlsafe_b64encode(digest).decode()[:8]
+        try:
+            names = os.listdir(self.get_poetry_envs_dir())
+        except OSError:
+            return None
+        matches = sorted(n for n in names if f"-{project_hash}-py" in n)
+        for name in reversed(matches):
+            env = os.path.join(self.get_poetry_envs_dir(), name)
+            if self.is_environment(env):
+                return env
+        return None
+    
+    def get_pipenv_env(self) -> Optional[str]:
+        """Find the pipenv env, whose '.project' file points back at the project"""
+        if not os.path.isfile(os.path.join(self.path, "Pipfile")):
+            return None
+        home = os.environ.get("WORKON_HOME") or os.path.expanduser("~/.local/share/virtualenvs")
+        try:
+            names = os.listdir(home)
+        except OSError:
+            return None
+        prefix = os.path.basename(self.path) + "-"
+        for name in names:
+            if not name.startswith(prefix):
+                continue
+            env = os.path.join(home, name)
+            try:
+                with open(os.path.join(env, ".project"), encoding="utf-8") as f:
+                    if os.path.abspath(f.read().strip()) == self.path:
+                        return env
+            except OSError:
+                continue
+        return None
+    
+    def find_environment(self) -> Optional[str]:
+        """Find the project's virtualenv (in-project, uv, poetry, pipenv, then VIRTUAL_ENV)"""
+        candidates = [os.path.join(self.path, name) for name in self.IN_PROJECT_ENVS]
+        
+        uv_env = os.environ.get("UV_PROJECT_ENVIRONMENT")
+        if uv_env:
+            candidates.insert(0, os.path.join(self.path, uv_env))
+        
+        for env in candidates:
+            if self.is_environment(env):
+                return env
+        
+        for finder in (self.get_poetry_env, self.get_pipenv_env):
+            env = finder()
+            if env:
+                return env
+        
+        env = os.environ.get("VIRTUAL_ENV")
+        if env and self.is_environment(env):
+            return env
+        return None
+    
+    def get_site_packages(self) -> List[str]:
+        """site-packages of the project's virtualenv
+        
+        Empty when there is none: the interpreter running devdash (pipx, a
+        global install) says nothing about the project's packages.
+        """
+        env = self.find_environment()
+        if not env:
+            return []
+        found = [str(p) for p in Path(env).glob("lib/python*/site-packages")]
+        found += [str(p) for p in Path(env).glob("lib64/python*/site-packages") if str(p) not in found]
+        found += [str(p) for p in Path(env).glob("Lib/site-packages")]
+        return found
+    
+    def get_python_version(self) -> str:
+        """Python version of the environment"""
+        env = self.find_environment()
+        if env:
+            try:
+                with open(os.path.join(env, "pyvenv.cfg"), encoding="utf-8") as f:
+                    for line in f:
+                        key, _, value = line.partition("=")
+                        if key.strip() in ("version_info", "version"):
+                            # version_info reads like '3.11.4.final.0'
+                            return ".".join(value.strip().split(".")[:3])
+            except OSError:
+                pass
+            for site in self.get_site_packages():
+                match = re.search(r"python(\d+\.\d+)", site)
+                if match:
+                    return match.group(1)
+        return platform.python_version()
+    
+    def get_marker_environment(self) -> Dict[str, str]:
+        """PEP 508 marker variables for the environment"""
+        full_version = self.get_python_version()
+        return {
+            "python_version": ".".join(full_version.split(".")[:2]),
+            "python_full_version": full_version,
+            "implementation_version": full_version,
+            "os_name": os.name,
+            "sys_platform": sys.platform,
+            "platform_system": platform.system(),
+            "platform_machine": platform.machine(),
+            "platform_release": platform.release(),
+            "implementation_name": sys.implementation.name,
+            "platform_python_implementation": platform.python_implementation(),
+            "extra": "",
+        }
+    
+    @staticmethod
+    def read_metadata(path: str) -> Dict[str, List[str]]:
+        """Read the header fields of a METADATA/PKG-INFO file"""
+        fields: Dict[str, List[str]] = {}
+        last = None
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line in ("\n", "\r\n"):
+                    break
+                if line[:1] in (" ", "\t") and last:
+                    fields[last][-1] += " " + line.strip()
+                    continue
+                key, sep, value = line.partition(":")
+                if not sep:
+                    continue
+                last = key.strip()
+                fields.setdefault(last, []).append(value.strip())
+        return fields
+    
+    @staticmethod
+    def read_record_size(path: str) -> int:
+        """Sum of the file sizes listed in a RECORD file"""
+        total = 0
+        try:
+            with open(path, encoding="utf-8", errors="replace", newline="") as f:
+                for row in csv.reader(f):
+                    if len(row) >= 3 and row[2].isdigit():
+                        total += int(row[2])
+        except OSError:
+            pass
+        return total
+    
+    @classmethod
+    def read_distribution(cls, info_dir: str) -> Optional[Dict]:
+        """Read name, version, requirements and size of one *.dist-info/*.egg-info"""
+        is_egg = info_dir.endswith(".egg-info")
+        try:
+            fields = cls.read_metadata(os.path.join(info_dir, "PKG-INFO" if is_egg else "METADATA"))
+        except OSError:
+            return None
+        name = (fields.get("Name") or [None])[0]
+        if not name:
+            return None
+        return {
+            "name": name,
+            "version": (fields.get("Version") or [""])[0],
+            "requires": fields.get("Requires-Dist", []),
+            "size": 0 if is_egg else cls.read_record_size(os.path.join(info_dir, "RECORD")),
+            "location": os.path.dirname(info_dir),
+        }
+    
+    def _signature(self, sites: List[str]) -> Tuple:
+        signature = []
+        for site in sites:
+            try:
+                signature.append((site, os.stat(site).st_mtime_ns))
+            except OSError:
+                signature.append((site, None))
+        return tuple(signature)
+    
+    def scan(self) -> List[Dict]:
+        """Read all distributions, one directory per worker thread
+        
+        Cached until a site-packages directory changes (install/uninstall
+        updates its mtime).
+        """
+        sites = self.get_site_packages()
+        key = tuple(sites)
+        signature = self._signature(sites)
+        cached = self._cache.get(key)
+        if cached is not None and cached["signature"] == signature:
+            return cached["distributions"]
+        
+        info_dirs = []
+        for site in sites:
+            try:
+                entries = os.listdir(site)
+            except OSError:
+                continue
+            info_dirs += [
+                os.path.join(site, entry) for entry in entries
+                if entry.endswith((".dist-info", ".egg-info"))
+            ]
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(info_dirs) or 1))) as executor:
+            dists = [d for d in executor.map(self.read_distribution, info_dirs) if d]
+        
+        # First occurrence wins, as on sys.path
+        seen = set()
+        distributions = []
+        for dist in dists:
+            name = canonicalize_name(dist["name"])
+            if name not in seen:
+                seen.add(name)
+                distributions.append(dist)
+        distributions.sort(key=lambda d: d["name"].lower())
+        
+        self._cache[key] = {"signature": signature, "distributions": distributions, "conflicts": None}
+        return distributions
+    
+    def get_installed(self) -> Dict[str, str]:
+        """Installed versions by distribution name"""
+        return {dist["name"]: dist["version"] for dist in self.scan()}
+    
+    def find_conflicts(self, distributions: Optional[List[Dict]] = None) -> List[Dict]:
+        """Requirements that are missing or not satisfied (like 'pip check')
+        
+        Cached along with the scan() result it was computed from.
+        """
+        if distributions is None:
+            distributions = self.scan()
+        cached = next((entry for entry in self._cache.values() if entry["distributions"] is distributions), None)
+        if cached is not None and cached["conflicts"] is not None:
+            return cached["conflicts"]
+        
+        installed = {canonicalize_name(d["name"]): d["version"] for d in distributions}
+        environment = self.get_marker_environment()
+        
+        conflicts = []
+        for dist in distributions:
+            for text in dist["requires"]:
+                requirement = parse_requirement(text)
+                if requirement is None:
+                    continue
+                try:
+                    if not evaluate_marker(requirement["marker"], environment):
+                        continue
+                except ValueError:
+                    continue
+                current = installed.get(canonicalize_name(requirement["name"]))
+                if current is None or (
+                    requirement["specifier"] and not version_matches(current, requirement["specifier"])
+                ):
+                    conflicts.append({
+                        "package": dist["name"],
+                        "requires": requirement["name"] + requirement["specifier"],
+                        "installed": current,
+                    })
+        if cached is not None:
+            cached["conflicts"] = conflicts
+        return conflicts
+    
+    def get_summary(self) -> Dict:
+        """Environment path, Python version, package count, size and conflicts"""
+        distributions = self.scan()
+        return {
+            "environment": self.find_environment(),
+            "python": self.get_python_version(),
+            "packages": len(distributions),
+            "size": sum(d["size"] for d in distributions),
+            "largest": sorted(distributions, key=lambda d: -d["size"])[:5],
+            "conflicts": self.find_conflicts(distributions),
+        }
@@ -0,0 +1,172 @@
+"""
+Adaptive refresh scheduling for DevDash
+
+Chooses how often each collector runs from what it costs and how often its
+data changes, keeping devdash's own CPU use (collectors, rendering and the
+subprocesses they start) under a budget given as a fraction of one core.
+Cheap panels whose data keeps changing (CPU) stay at the refresh rate;
+expensive or stable ones (packages, git history) are stretched, up to
+MAX_STRETCH times their base interval.
+"""
+
+import os
+import time
+from typing import Callable, Dict, Optional
+
+from .worker_utils import CollectorPool
+
+# Default CPU budget: 1% of one core
+DEFAULT_BUDGET = 0.01
+
+# Longest interval, as a multiple of a collector's base interval
+MAX_STRETCH = 12.0
+
+# Smoothing of the per-run cost and change estimates (weight of the newest run)
+COST_ALPHA = 0.3
+CHANGE_ALPHA = 0.2
+
+# Seconds of process CPU time averaged for the measured usage
+USAGE_WINDOW = 10.0
+
+# Share of the budget always left to collectors, however much rendering uses
+MIN_COLLECTOR_SHARE = 0.25
+
+
+def process_cpu_time() -> float:
+    """CPU seconds used by this process and its reaped children"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def plan_intervals(
+    costs: Dict[str, Optional[float]],
+    change_rates: Dict[str, float],
+    base_intervals: Dict[str, float],
+    budget: float,
+    max_stretch: float = MAX_STRETCH
+) -> Dict[str, float]:
+    """Seconds between runs per collector, within a CPU budget
+    
+    A collector that changes on every run wants its base interval; one
+    that rarely changes wants up to max_stretch times that. The budget
+    (CPU seconds per second) is then shared in proportion to how often
+    each collector's data changes: collectors that fit their share at the
+    interval they want keep it and leave the rest to the others, which
+    are slowed until they fit. Intervals never go beyond max_stretch times
+    the base, so a budget too small for that is exceeded rather than
+    letting panels go stale indefinitely.
+    """
+    floor = 1 / max_stretch
+    weights = {name: max(floor, min(1.0, change_rates.get(name, 1.0))) for name in base_intervals}
+    intervals = {name: base / weights[name] for name, base in base_intervals.items()}
+    
+    # Not measured yet: run at the base interval to get a first cost
+    active = {name for name in base_intervals if costs.get(name) is not None}
+    for name in set(base_intervals) - active:
+        intervals[name] = base_intervals[name]
+    
+    remaining = max(0.0, budget)
+    while active:
+        total_weight = sum(weights[name] for name in active)
+        fitting = {
+            name for name in active
+            if costs[name] / intervals[name] <= remaining * weights[name] / total_weight
+        }
+        if not fitting:
+            for name in active:
+                share = remaining * weights[name] / total_weight
+                intervals[name] = costs[name] / share if share > 0 else float("inf")
+            break
+        for name in fitting:
+            remaining -= costs[name] / intervals[name]
+        active -= fitting
+    
+    return {
+        name: min(max(intervals[name], base), base * max_stretch)
+        for name, base in base_intervals.items()
+    }
+
+
+class AdaptiveScheduler:
+    """Retune a collector pool's intervals from measured cost and change"""
+    
+    def __init__(
+        self,
+        pool: CollectorPool,
+        get_base_interval: Callable[[str], float],
+        budget: float = DEFAULT_BUDGET,
+        max_stretch: float = MAX_STRETCH
+    ):
+        self.pool = pool
+        self.get_base_interval = get_base_interval
+        self.budget = budget
+        self.max_stretch = max_stretch
+        self.costs: Dict[str, Optional[float]] = {}
+        self.change_rates: Dict[str, float] = {}
+        self.intervals: Dict[str, float] = {}
+        self.usage: Optional[float] = None
+        self._seen: Dict[str, Dict[str, int]] = {}
+        self._usage_mark = (time.monotonic(), process_cpu_time())
+    
+    def observe(self, names) -> None:
+        """Fold the runs finished since the last call into the estimates"""
+        for name in names:
+            result = self.pool.get(name)
+            seen = self._seen.setdefault(name, {"runs": 0, "changes": 0})
+            runs = result.get("runs", 0) - seen["runs"]
+            if runs <= 0:
+                continue
+            changes = result.get("changes", 0) - seen["changes"]
+            seen.update(runs=result["runs"], changes=result["changes"])
+            
+            cost = result.get("cpu")
+            if cost is not None:
+                previous = self.costs.get(name)
+                self.costs[name] = cost if previous is None else previous + COST_ALPHA * (cost - previous)
+            
+            # Several runs since the last look count as one observation of their average
+            rate = self.change_rates.get(name, 1.0)
+            self.change_rates[name] = rate + CHANGE_ALPHA * (min(changes, runs) / runs - rate)
+    
+    def measure_usage(self, now: Optional[float] = None) -> Optional[float]:
+        """devdash's CPU use (fraction of one core) over the last USAGE_WINDOW seconds"""
+        now = time.monotonic() if now is None else now
+        started, cpu = self._usage_mark
+        if now - started >= USAGE_WINDOW:
+            current = process_cpu_time()
+            self.usage = (current - cpu) / (now - started)
+            self._usage_mark = (now, current)
+        return self.usage
+    
+    def collector_usage(self) -> float:
+        """Estimated CPU use of the collectors at their current intervals"""
+        return sum(
+            cost / self.intervals[name]
+            for name, cost in self.costs.items()
+            if cost is not None and self.intervals.get(name)
+        )
+    
+    def update(self, names) -> Dict[str, float]:
+        """Re-plan the intervals of the named collectors and apply them to the pool"""
+        names = list(names)
+        self.observe(names)
+        
+        # Whatever the collector estimates do not explain (rendering, key
+        # handling, the event loop) comes out of the collectors' budget
+        budget = self.budget
+        usage = self.measure_usage()
+        if usage is not None:
+            overhead = max(0.0, usage - self.collector_usage())
+            budget = max(self.budget * MIN_COLLECTOR_SHARE, self.budget - overhead)
+        
+        intervals = plan_intervals(
+            {name: self.costs.get(name) for name in names},
+            self.change_rates,
+            {name: self.get_base_interval(name) for name in names},
+            budget,
+            self.max_stretch
+        )
+        for name, interval in intervals.items():
+            self.pool.set_interval(name, interval)
+        self.intervals.update(intervals)
+        return intervals
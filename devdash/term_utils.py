@@ -0,0 +1,280 @@
+"""
+Terminal utilities for DevDash
+
+A compact output mode for slow links (SSH through bastions, serial
+consoles): only the cells that changed since the previous frame are sent,
+using cursor addressing, within a bytes-per-second budget.
+"""
+
+import io
+import sys
+import time
+import unicodedata
+from typing import Dict, IO, List, Optional, Tuple
+
+try:
+    from rich.cells import cell_len
+    from rich.color import ColorSystem
+    from rich.console import Console
+    from rich.style import Style
+    RICH_AVAILABLE = True
+except ImportError:
+    RICH_AVAILABLE = False
+
+# A cell is (character, style); the right half of a wide character is ("", style)
+Cell = Tuple[str, Optional["Style"]]
+
+ESC = "\x1b["
+
+COLOR_SYSTEMS = {
+    "standard": "STANDARD",
+    "256": "EIGHT_BIT",
+    "truecolor": "TRUECOLOR",
+    "windows": "WINDOWS",
+}
+
+# Box drawing and symbols used by the dashboard, for the ASCII profile
+ASCII_MAP = {
+    "─": "-", "━": "-", "═": "=", "╌": "-", "┄": "-",
+    "│": "|", "┃": "|", "║": "|", "╎": "|", "┆": "|",
+    "╭": "+", "╮": "+", "╰": "+", "╯": "+",
+    "┌": "+", "┐": "+", "└": "+", "┘": "+",
+    "╔": "+", "╗": "+", "╚": "+", "╝": "+",
+    "├": "+", "┤": "+", "┬": "+", "┴": "+", "┼": "+",
+    "╟": "+", "╢": "+", "╤": "+", "╧": "+", "╪": "+",
+    "…": ".", "·": ".", "•": "*", "●": "*", "✔": "v", "✘": "x",
+    "⚠": "!", "⚡": "*", "→": ">", "←": "<", "▲": "^", "▼": "v",
+    "█": "#", "▌": "#", "▐": "#", "░": ".", "▒": ":", "▓": "#",
+}
+
+# Unchanged cells shorter than this between two changes are resent rather
+# than paying for another cursor move (ESC[row;colH is 6-9 bytes)
+GAP_MERGE = 6
+
+
+def to_ascii(char: str, width: int) -> str:
+    """ASCII stand-in for a character that occupies width cells"""
+    if char.isascii():
+        return char
+    if char in ASCII_MAP:
+        return ASCII_MAP[char] + " " * (width - 1)
+    decomposed = unicodedata.normalize("NFKD", char).encode("ascii", "ignore").decode("ascii")
+    if decomposed and width == 1:
+        return decomposed[0]
+    # Emoji and other symbols: keep the columns, drop the glyph
+    return " " * width
+
+
+class CellDiffRenderer:
+    """Draw Rich renderables by sending only the cells that changed"""
+    
+    def __init__(
+        self,
+        stream: Optional[IO[str]] = None,
+        max_bytes_per_second: Optional[float] = None,
+        ascii_only: bool = False,
+        color_system: Optional[str] = "standard"
+    ):
+        self.stream = stream or sys.stdout
+        self.max_bytes_per_second = max_bytes_per_second
+        self.ascii_only = ascii_only
+        self.color_system = color_system
+        
+        self._screen: List[List[Cell]] = []
+        self._size: Optional[Tuple[int, int]] = None
+        self._status: Optional[str] = None
+        self._sgr: Dict[Optional["Style"], str] = {}
+        self._budget = float(max_bytes_per_second or 0)
+        self._budget_time = time.monotonic()
+        
+        self.pending = False
+        self.frames_drawn = 0
+        self.frames_deferred = 0
+        self.bytes_written = 0
+    
+    def _style_codes(self, style: Optional["Style"]) -> str:
+        """SGR sequence that switches from the default style to style"""
+        codes = self._sgr.get(style)
+        if codes is None:
+            codes = ""
+            if style and self.color_system:
+                system = getattr(ColorSystem, COLOR_SYSTEMS.get(self.color_system, "STANDARD"))
+                rendered = style.render("\0", color_system=system)
+                codes = rendered[:rendered.index("\0")]
+            self._sgr[style] = codes
+        return codes
+    
+    def render_cells(self, renderable, width: int, height: int) -> List[List[Cell]]:
+        """Render to a grid of cells"""
+        console = Console(
+            file=io.StringIO(),
+            width=width,
+            height=height,
+            color_system=self.color_system,
+            force_terminal=True,
+            legacy_windows=False
+        )
+        options = console.options.update(width=width, height=height)
+        lines = console.render_lines(renderable, options, pad=True)
+        
+        grid: List[List[Cell]] = []
+        for line in lines[:height]:
+            row: List[Cell] = []
+            for segment in line:
+                if segment.control:
+                    continue
+                style = segment.style
+                for char in segment.text:
+                    width_of = cell_len(char)
+                    if width_of == 0:
+                        # Combining marks and variation selectors join the previous cell
+                        if row and not self.ascii_only:
+                            row[-1] = (row[-1][0] + char, row[-1][1])
+                        continue
+                    if self.ascii_only:
+                        for replacement in to_ascii(char, width_of):
+                            row.append((replacement, style))
+                        continue
+                    row.append((char, style))
+                    if width_of == 2:
+                        row.append(("", style))
+            row = row[:width]
+            row += [(" ", None)] * (width - len(row))
+            grid.append(row)
+        while len(grid) < height:
+            grid.append([(" ", None)] * width)
+        return grid
+    
+    def diff(self, grid: List[List[Cell]]) -> str:
+        """Escape sequences that turn the current screen into grid"""
+        full = self._size != (len(grid[0]) if grid else 0, len(grid)) or not self._screen
+        out = []
+        if full:
+            out.append(ESC + "0m" + ESC + "2J")
+        
+        for y, row in enumerate(grid):
+            previous = None if full else self._screen[y]
+            changed = [x for x in range(len(row)) if previous is None or row[x] != previous[x]]
+            if not changed:
+                continue
+            
+            # Group changed columns into runs, bridging short unchanged gaps
+            runs = []
+            start = end = changed[0]
+            for x in changed[1:]:
+                if x - end <= GAP_MERGE:
+                    end = x
+                else:
+                    runs.append((start, end))
+                    start = end = x
+            runs.append((start, end))
+            
+            for start, end in runs:
+                # Never start on, or stop before, the right half of a wide character
+                if row[start][0] == "" and start > 0:
+                    start -= 1
+                if end + 1 < len(row) and row[end + 1][0] == "":
+                    end += 1
+                out.append(f"{ESC}{y + 1};{start + 1}H")
+                current = None
+                for char, style in row[start:end + 1]:
+                    if char == "":
+                        continue
+                    if style != current:
+                        out.append(ESC + "0m" + self._style_codes(style))
+                        current = style
+                    out.append(char)
+                out.append(ESC + "0m")
+        return "".join(out)
+    
+    def _take_budget(self, size: int) -> bool:
+        """Token bucket: allow a frame while the budget is positive"""
+        if not self.max_bytes_per_second:
+            return True
+        now = time.monotonic()
+        self._budget = min(
+            float(self.max_bytes_per_second),
+            self._budget + (now - self._budget_time) * self.max_bytes_per_second
+        )
+        self._budget_time = now
+        if self._budget <= 0:
+            return False
+        self._budget -= size
+        return True
+    
+    def retry_after(self) -> float:
+        """Seconds until a deferred frame may be sent"""
+        if not self.pending or not self.max_bytes_per_second or self._budget > 0:
+            return 0.0
+        return -self._budget / self.max_bytes_per_second + 0.01
+    
+    def draw(self, renderable, width: int, height: int) -> bool:
+        """Send the changes for a frame; False if deferred by the byte cap
+        
+        A deferred frame stays pending; the screen is diffed against what
+        was last sent, so the next draw catches up in one go.
+        """
+        grid = self.render_cells(renderable, width, height)
+        data = self.diff(grid)
+        if not data:
+            self.pending = False
+            return True
+        
+        if not self._take_budget(len(data.encode("utf-8"))):
+            self.pending = True
+            self.frames_deferred += 1
+            return False
+        
+        self.stream.write(data)
+        self.stream.flush()
+        self.bytes_written += len(data.encode("utf-8"))
+        self._screen = grid
+        self._size = (width, height)
+        self._status = None
+        self.frames_drawn += 1
+        self.pending = False
+        return True
+    
+    def status_line(self, text: str, width: int) -> bool:
+        """Rewrite a single status line in place (for narrow terminals)
+        
+        Counted against the byte cap like frames; False if deferred.
+        """
+        if self.ascii_only:
+            text = "".join(to_ascii(c, cell_len(c)) for c in text)
+        line = ""
+        for char in text:
+            if cell_len(line + char) >= width:
+                break
+            line += char
+        if line == self._status:
+            self.pending = False
+            return True
+        
+        data = f"\r{line}{ESC}K"
+        if self._screen:
+            # Leaving full-screen mode
+            data = ESC + "0m" + ESC + "2J" + ESC + "H" + data
+        if not self._take_budget(len(data.encode("utf-8"))):
+            self.pending = True
+            self.frames_deferred += 1
+            return False
+        
+        self.stream.write(data)
+        self.stream.flush()
+        self.bytes_written += len(data.encode("utf-8"))
+        self._screen = []
+        self._size = None
+        self._status = line
+        self.pending = False
+        return True
+    
+    def enter(self) -> None:
+        """Switch to the alternate screen and hide the cursor"""
+        self.stream.write(ESC + "?1049h" + ESC + "?25l")
+        self.stream.flush()
+    
+    def exit(self) -> None:
+        """Restore the cursor and the normal screen"""
+        self.stream.write(ESC + "0m" + ESC + "?25h" + ESC + "?1049l")
+        self.stream.flush()
@@ -0,0 +1,349 @@
+"""
+TODO/FIXME/HACK index for DevDash
+
+In a git repository markers are found with `git grep` and cached per blob
+SHA, in memory and on disk, so a refresh only rescans files whose content
+changed: the index lists the blob of every tracked file, and files
+modified in the working tree are hashed with `git hash-object`. Authors
+come from `git blame` of the matching lines only, a few files per scan,
+and are cached with the blob. Outside git, files are scanned on a thread
+pool and cached by modification time and size. The blob cache is stored
+in BLOB_SHARDS entries, and a scan rewrites only the shards it changed.
+"""
+
+import os
+import re
+import string
+import threading
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cache_utils import DiskCache, shard_of
+from .git_utils import find_git_dir
+from .workspace_utils import IGNORED_DIRS
+
+MARKERS = ("TODO", "FIXME", "HACK")
+
+# Marker as a comment writes it ("# TODO: x", "// FIXME(ann) x"), not
+# inside a word, path or quoted string, then the note itself
+MARKER_PATTERN = re.compile(r"(?<![\w\"'`/.])(TODO|FIXME|HACK)(?:\([^)]*\))?(?::|\s|$)[\s:\-]*(.*)")
+
+# Block comment closers dropped from the end of a note
+COMMENT_END = re.compile(r"\s*(\*/|-->|\*\))\s*$")
+
+# Characters of each note kept
+TEXT_LENGTH = 100
+
+# Rescanning fewer files than this fraction of the repository greps just
+# those paths (in chunks); more, and one grep of the whole tree is cheaper
+GREP_ALL_FRACTION = 0.5
+GREP_CHUNK = 500
+
+# Files blamed per scan (the rest on later scans) and blames run at once
+BLAME_FILES = 20
+BLAME_WORKERS = 4
+
+# Cache entries the blob cache is split over (by SHA)
+BLOB_SHARDS = 64
+
+# Outside git: files larger than this are skipped
+MAX_FILE_SIZE = 1024 * 1024
+SCAN_WORKERS = 8
+
+# One match: [line, marker, text, author, author time, committed]
+Match = List
+
+
+def parse_marker(text: str) -> Optional[Tuple[str, str]]:
+    """(marker, note) of a source line, or None"""
+    found = MARKER_PATTERN.search(text)
+    if found is None:
+        return None
+    note = COMMENT_END.sub("", found.group(2)).strip()
+    return found.group(1), note[:TEXT_LENGTH]
+
+
+def parse_grep(output: str) -> Dict[str, List[Match]]:
+    """Matches per path from `git grep -n -z` output"""
+    found: Dict[str, List[Match]] = {}
+    for record in output.split("\n"):
+        parts = record.split("\0", 2)
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        marker = parse_marker(parts[2])
+        if marker is not None:
+            found.setdefault(parts[0], []).append([int(parts[1]), marker[0], marker[1], None, None, False])
+    return found
+
+
+def parse_blame(output: str) -> Dict[int, Tuple[str, Optional[int], bool]]:
+    """{final line: (author, author time, committed)} from `git blame --line-porcelain`"""
+    lines: Dict[int, Tuple[str, Optional[int], bool]] = {}
+    commit, final, author, when = None, None, "", None
+    for line in output.split("\n"):
+        if line.startswith("\t"):
+            if final is not None:
+                lines[final] = (author, when, commit is not None and commit.strip("0") != "")
+            commit, final = None, None
+            continue
+        fields = line.split(" ")
+        if commit is None and len(fields) >= 3 and len(fields[0]) >= 40 and not fields[0].strip(string.hexdigits):
+            commit, final = fields[0], int(fields[2])
+        elif line.startswith("author "):
+            author = line[len("author "):]
+        elif line.startswith("author-time "):
+            when = int(line[len("author-time "):])
+    return lines
+
+
+def scan_file(path: str) -> List[Match]:
+    """Matches in one file (binary files have none)"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(MAX_FILE_SIZE + 1)
+    except OSError:
+        return []
+    if len(data) > MAX_FILE_SIZE or b"\0" in data[:8192]:
+        return []
+    matches = []
+    for number, line in enumerate(data.decode("utf-8", errors="replace").splitlines(), 1):
+        if "TODO" in line or "FIXME" in line or "HACK" in line:
+            marker = parse_marker(line)
+            if marker is not None:
+                matches.append([number, marker[0], marker[1], None, None, False])
+    return matches
+
+
+class TodoScanner:
+    """Index TODO/FIXME/HACK markers of a repository, incrementally"""
+    
+    def __init__(self, path: str = ".", cache: Optional[DiskCache] = None):
+        self.path = os.path.abspath(path)
+        self.cache = cache if cache is not None else DiskCache("todos", ttl=float("inf"))
+        self.root: Optional[str] = None
+        self._root_checked = False
+        self._blobs: Optional[Dict[str, List[Match]]] = None
+        self._index_key: Optional[Tuple[int, int]] = None
+        self._index: Dict[str, str] = {}
+        self._files: Dict[str, Tuple[Tuple[int, int], List[Match]]] = {}
+        self._lock = threading.Lock()
+        self.last_scan = {"files": 0, "rescanned": 0, "blamed": 0, "pending_blame": 0}
+    
+    def _git(self, *args, input: Optional[str] = None, ok: Tuple[int, ...] = (0,)) -> Optional[str]:
+        """Run git in the repository root; None on failure"""
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=self.root or self.path,
+                input=input,
+                capture_output=True,
+                text=True,
+                errors="replace"
+            )
+        except OSError:
+            return None
+        return result.stdout if result.returncode in ok else None
+    
+    def find_root(self) -> Optional[str]:
+        """Top level of the git repository containing path (None outside git)"""
+        if not self._root_checked:
+            output = self._git("rev-parse", "--show-toplevel")
+            self.root = output.strip() if output else None
+            self._root_checked = True
+        return self.root
+    
+    def _read_index(self) -> Dict[str, str]:
+        """{path: blob SHA} of tracked files, re-read only when the index changes"""
+        git_dir = find_git_dir(self.root)
+        try:
+            st = os.stat(os.path.join(git_dir, "index")) if git_dir else None
+            key = (st.st_mtime_ns, st.st_size) if st else None
+        except OSError:
+            key = None
+        if key is not None and key == self._index_key:
+            return self._index
+        
+        output = self._git("ls-files", "-s", "-z")
+        index = {}
+        for entry in (output or "").split("\0"):
+            meta, _, path = entry.partition("\t")
+            fields = meta.split(" ")
+            # Skip submodules, symlinks and conflicted paths (hashed from the work tree)
+            if len(fields) == 3 and fields[0] not in ("160000", "120000") and fields[2] == "0":
+                index[path] = fields[1]
+        self._index_key, self._index = key, index
+        return index
+    
+    def _read_worktree(self) -> Tuple[Dict[str, str], set]:
+        """{path: blob SHA} of every tracked file as it is in the work tree, and the modified paths"""
+        current = dict(self._read_index())
+        output = self._git("--no-optional-locks", "diff", "--name-only", "-z")
+        modified = [path for path in (output or "").split("\0") if path]
+        existing = [path for path in modified if os.path.isfile(os.path.join(self.root, path))]
+        for path in set(modified) - set(existing):
+            current.pop(path, None)
+        if existing:
+            hashes = self._git("hash-object", "--stdin-paths", input="\n".join(existing) + "\n")
+            for path, sha in zip(existing, (hashes or "").split()):
+                current[path] = sha
+        return current, set(existing)
+    
+    def _grep(self, paths: Optional[List[str]] = None) -> Dict[str, List[Match]]:
+        """Matches per path in the work tree (all tracked files when paths is None)"""
+        args = ["grep", "-n", "-I", "-w", "-z", "--no-color"]
+        for marker in MARKERS:
+            args += ["-e", marker]
+        if paths is not None:
+            args += ["--", *paths]
+        # Exit status 1: no matches
+        return parse_grep(self._git(*args, ok=(0, 1)) or "")
+    
+    def _blame(self, path: str, matches: List[Match]) -> None:
+        """Fill in the author of each match from one `git blame` of just those lines"""
+        args = ["blame", "--line-porcelain"]
+        for match in matches:
+            args.append(f"-L{match[0]},{match[0]}")
+        output = self._git(*args, "--", path)
+        authors = parse_blame(output or "")
+        for match in matches:
+            # Unknown rather than None, so a failing blame is not retried every scan
+            author, when, committed = authors.get(match[0], ("", None, True))
+            match[3], match[4], match[5] = author, when, committed
+    
+    def _load_blobs(self) -> Dict[str, List[Match]]:
+        if self._blobs is None:
+            blobs: Dict[str, List[Match]] = {}
+            for shard in range(BLOB_SHARDS):
+                stored = self.cache.get(self.cache.make_key(self.root, shard))
+                if isinstance(stored, dict) and isinstance(stored.get("blobs"), dict):
+                    blobs.update(stored["blobs"])
+            self._blobs = blobs
+        return self._blobs
+    
+    def _save_blobs(self, dirty: Iterable[int]) -> None:
+        """Rewrite the blob cache shards that gained, changed or lost blobs"""
+        shards: Dict[int, Dict[str, List[Match]]] = {shard: {} for shard in dirty}
+        for sha, matches in self._blobs.items():
+            shard = shard_of(sha, BLOB_SHARDS)
+            if shard in shards:
+                shards[shard][sha] = matches
+        for shard, blobs in shards.items():
+            self.cache.set(self.cache.make_key(self.root, shard), {"blobs": blobs})
+    
+    def scan_git(self) -> List[Tuple[str, Match]]:
+        """(path, match) for every marker in the repository's tracked files"""
+        current, modified = self._read_worktree()
+        blobs = self._load_blobs()
+        
+        missing = {path: sha for path, sha in current.items() if sha not in blobs}
+        if missing:
+            if len(missing) > len(current) * GREP_ALL_FRACTION:
+                found = self._grep()
+            else:
+                found = {}
+                paths = sorted(missing)
+                for start in range(0, len(paths), GREP_CHUNK):
+                    found.update(self._grep(paths[start:start + GREP_CHUNK]))
+            for path, sha in missing.items():
+                blobs[sha] = found.get(path, [])
+        
+        # Lines blamed while uncommitted are blamed again once committed
+        pending = []
+        for path, sha in current.items():
+            matches = blobs[sha]
+            if any(m[3] is None or (not m[5] and path not in modified) for m in matches):
+                pending.append((path, matches))
+        pending.sort(key=lambda item: item[0] not in modified)
+        batch = pending[:BLAME_FILES]
+        if batch:
+            with ThreadPoolExecutor(max_workers=BLAME_WORKERS) as pool:
+                list(pool.map(lambda item: self._blame(*item), batch))
+        
+        if missing or batch:
+            # Keep only blobs still in the tree, so the cache does not grow forever
+            live = set(current.values())
+            self._blobs = {sha: blobs[sha] for sha in live if sha in blobs}
+            changed = set(missing.values()) | {current[path] for path, _ in batch}
+            changed.update(sha for sha in blobs if sha not in live)
+            self._save_blobs(shard_of(sha, BLOB_SHARDS) for sha in changed)
+        
+        self.last_scan = {
+            "files": len(current),
+            "rescanned": len(missing),
+            "blamed": len(batch),
+            "pending_blame": len(pending) - len(batch),
+        }
+        return [(path, match) for path, sha in current.items() for match in self._blobs[sha]]
+    
+    def _walk(self) -> Iterable[str]:
+        for directory, dirs, files in os.walk(self.path):
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRS and not d.startswith(".")]
+            for name in files:
+                yield os.path.join(directory, name)
+    
+    def scan_tree(self) -> List[Tuple[str, Match]]:
+        """(path, match) for every marker under a path outside git"""
+        stats = {}
+        for path in self._walk():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if st.st_size <= MAX_FILE_SIZE:
+                stats[path] = (st.st_mtime_ns, st.st_size)
+        
+        changed = [path for path, key in stats.items() if self._files.get(path, (None,))[0] != key]
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+            for path, matches in zip(changed, pool.map(scan_file, changed)):
+                # No blame outside git: the file's modification time dates its notes
+                for match in matches:
+                    match[4] = stats[path][0] // 1_000_000_000
+                self._files[path] = (stats[path], matches)
+        self._files = {path: self._files[path] for path in stats}
+        
+        self.last_scan = {"files": len(stats), "rescanned": len(changed), "blamed": 0, "pending_blame": 0}
+        return [
+            (os.path.relpath(path, self.path), match)
+            for path, (_, matches) in self._files.items() for match in matches
+        ]
+    
+    def scan(self, limit: int = 10) -> Dict:
+        """Marker counts, counts per author and the newest notes
+        
+        Returns total, counts ({marker: n}), authors ([[name, n]], most
+        first; lines not blamed or not committed yet are left out), newest
+        (dicts with path, line, marker, text, author and time) and the
+        last_scan statistics.
+        """
+        with self._lock:
+            matches = self.scan_git() if self.find_root() else self.scan_tree()
+            stats = dict(self.last_scan)
+        
+        counts = {marker: 0 for marker in MARKERS}
+        authors: Counter = Counter()
+        for _, match in matches:
+            counts[match[1]] += 1
+            # Uncommitted lines blame to git's "Not Committed Yet" pseudo-author
+            if match[3] and match[5] is not False:
+                authors[match[3]] += 1
+        
+        newest = sorted(matches, key=lambda item: (item[1][4] or 0, item[0], item[1][0]), reverse=True)
+        return {
+            "total": len(matches),
+            "counts": counts,
+            "authors": [[name, count] for name, count in authors.most_common(limit)],
+            "newest": [
+                {
+                    "path": path,
+                    "line": match[0],
+                    "marker": match[1],
+                    "text": match[2],
+                    "author": match[3],
+                    "time": match[4],
+                }
+                for path, match in newest[:limit]
+            ],
+            **stats,
+        }
@@ -0,0 +1,210 @@
+"""
+Version utilities for DevDash (PEP 440 ordering, PEP 503 names)
+"""
+
+import re
+from typing import Optional, Tuple
+
+VERSION_PATTERN = re.compile(
+    r"""
+    ^\s*v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>
+        [-_.]?
+        (?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)
+        [-_.]?
+        (?P<pre_n>[0-9]+)?
+    )?
+    (?P<post>
+        (?:-(?P<post_n1>[0-9]+))
+        |
+        (?:
+            [-_.]?
+            (?P<post_l>post|rev|r)
+            [-_.]?
+            (?P<post_n2>[0-9]+)?
+        )
+    )?
+    (?P<dev>
+        [-_.]?
+        (?P<dev_l>dev)
+        [-_.]?
+        (?P<dev_n>[0-9]+)?
+    )?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+PRE_RELEASE_RANKS = {
+    "a": 0, "alpha": 0,
+    "b": 1, "beta": 1,
+    "c": 2, "rc": 2, "pre": 2, "preview": 2,
+}
+
+
+def canonicalize_name(name: str) -> str:
+    """Normalize a project name as described in PEP 503"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_version(version: str) -> Optional[Tuple]:
+    """Parse a version into a tuple that sorts in PEP 440 order
+    
+    Returns None for versions that are not PEP 440 compliant.
+    """
+    match = VERSION_PATTERN.match(version or "")
+    if not match:
+        return None
+    
+    epoch = int(match.group("epoch") or 0)
+    
+    release = [int(part) for part in match.group("release").split(".")]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    
+    dev_n = match.group("dev_n")
+    has_dev = match.group("dev") is not None
+    
+    if match.group("pre"):
+        pre = (0, PRE_RELEASE_RANKS[match.group("pre_l").lower()], int(match.group("pre_n") or 0))
+    elif has_dev and not match.group("post"):
+        # 1.0.dev1 sorts before 1.0a1
+        pre = (-1,)
+    else:
+        pre = (1,)
+    
+    if match.group("post"):
+        post = (0, int(match.group("post_n1") or match.group("post_n2") or 0))
+    else:
+        post = (-1,)
+    
+    dev = (0, int(dev_n or 0)) if has_dev else (1,)
+    
+    local_text = match.group("local")
+    if local_text:
+        # Numeric segments sort after alphanumeric ones
+        local = (0, tuple(
+            (1, int(part), "") if part.isdigit() else (0, 0, part.lower())
+            for part in re.split(r"[-_.]", local_text)
+        ))
+    else:
+        local = (-1,)
+    
+    return (epoch, tuple(release), pre, post, dev, local)
+
+
+def compare_versions(a: str, b: str) -> int:
+    """Compare two versions: -1, 0 or 1 (unparseable versions sort first)"""
+    key_a, key_b = parse_version(a), parse_version(b)
+    if key_a is None or key_b is None:
+        if key_a is None and key_b is None:
+            return (a > b) - (a < b)
+        return -1 if key_a is None else 1
+    return (key_a > key_b) - (key_a < key_b)
+
+
+def is_prerelease(version: str) -> bool:
+    """Check if a version is a pre-release or development release"""
+    match = VERSION_PATTERN.match(version or "")
+    return bool(match and (match.group("pre") or match.group("dev")))
+
+
+def latest_version(versions, include_prereleases: bool = False) -> Optional[str]:
+    """Pick the highest version, skipping pre-releases unless requested"""
+    best, best_key = None, None
+    for version in versions:
+        if not include_prereleases and is_prerelease(version):
+            continue
+        key = parse_version(version)
+        if key is not None and (best_key is None or key > best_key):
+            best, best_key = version, key
+    return best
+
+
+SPECIFIER_PATTERN = re.compile(r"^\s*(~=|===|==|!=|<=|>=|<|>)\s*([^\s,;]+)\s*$")
+
+
+def _release_prefix(version: str) -> Optional[Tuple[int, ...]]:
+    match = VERSION_PATTERN.match(version)
+    if not match:
+        return None
+    return tuple(int(part) for part in match.group("release").split("."))
+
+
+def _public_key(key: Tuple) -> Tuple:
+    # Drop the local label: "==1.0" matches "1.0+cpu"
+    return key[:5] + ((-1,),)
+
+
+def version_matches(version: str, specifier: str) -> bool:
+    """Check a version against a PEP 440 specifier set such as '>=1.0,!=1.3.*'
+    
+    Unparseable versions or clauses never match, except under '==='.
+    """
+    for clause in (specifier or "").split(","):
+        if not clause.strip():
+            continue
+        match = SPECIFIER_PATTERN.match(clause)
+        if not match:
+            return False
+        op, target = match.groups()
+        
+        if op == "===":
+            if version.strip().lower() != target.lower():
+                return False
+            continue
+        
+        key = parse_version(version)
+        if key is None:
+            return False
+        
+        if target.endswith(".*") and op in ("==", "!="):
+            prefix = _release_prefix(target[:-2])
+            release = _release_prefix(version) or ()
+            if prefix is None:
+                return False
+            padded = release + (0,) * max(0, len(prefix) - len(release))
+            same = key[0] == parse_version(target[:-2])[0] and padded[:len(prefix)] == prefix
+            if same != (op == "=="):
+                return False
+            continue
+        
+        target_key = parse_version(target)
+        if target_key is None:
+            return False
+        
+        if op == "~=":
+            prefix = _release_prefix(target)
+            if prefix is None or len(prefix) < 2:
+                return False
+            upper = ".".join(str(part) for part in prefix[:-1]) + ".*"
+            if not (key >= target_key and version_matches(version, "==" + upper)):
+                return False
+        elif op == "==":
+            if (key if target_key[5] != (-1,) else _public_key(key)) != target_key:
+                return False
+        elif op == "!=":
+            if (key if target_key[5] != (-1,) else _public_key(key)) == target_key:
+                return False
+        elif op == ">=":
+            if key < target_key:
+                return False
+        elif op == "<=":
+            if key > target_key:
+                return False
+        elif op == ">":
+            # >1.7 matches neither 1.7.post1 nor 1.7+local
+            if key <= target_key or _public_key(key) == target_key:
+                return False
+            if key[1] == target_key[1] and key[3] != (-1,) and target_key[3] == (-1,):
+                return False
+        elif op == "<":
+            # <2.0 does not match 2.0a1 unless the bound is itself a pre-release
+            if key >= target_key:
+                return False
+            if key[1] == target_key[1] and key[2] != (1,) and target_key[2] == (1,):
+                return False
+    return True
@@ -0,0 +1,221 @@
+"""
+Background collector utilities for DevDash
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+def children_cpu_time() -> float:
+    """CPU seconds of this process's reaped child processes"""
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+class CollectorPool:
+    """Run panel collectors on worker threads and keep their latest results"""
+    
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._collectors: Dict[str, Dict] = {}
+        self._results: Dict[str, Dict] = {}
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        # Bumped (under the lock) whenever a result is published; waiters
+        # compare it with the last generation they saw, so a result
+        # published while nobody waits is not lost
+        self._published = threading.Condition(self._lock)
+        self._generation = 0
+        self._seen_generation = 0
+        self._wakeup: Optional[Tuple[int, int]] = None
+        self._threads: List[threading.Thread] = []
+    
+    def register(self, name: str, collector: Callable[[], Any], interval: float = 2.0) -> None:
+        """Register a collector to run every interval seconds"""
+        with self._lock:
+            self._collectors[name] = {"collector": collector, "interval": interval}
+            self._results.setdefault(name, {
+                "value": None,
+                "updated": None,
+                "started": None,
+                "duration": None,
+                "cpu": None,
+                "runs": 0,
+                "changes": 0,
+                "error": None,
+                "refreshing": False,
+            })
+    
+    def set_interval(self, name: str, interval: float) -> None:
+        """Change how often a collector runs"""
+        with self._lock:
+            if name in self._collectors:
+                self._collectors[name]["interval"] = interval
+    
+    def start(self) -> None:
+        """Start the worker threads"""
+        # Daemon threads: a slow collector (npm, pip, git fetch) must never
+        # hold up quitting the dashboard
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._worker,
+                name=f"devdash-collector-{len(self._threads)}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+    
+    def stop(self) -> None:
+        """Ask the worker threads to exit once idle"""
+        for _ in self._threads:
+            self._queue.put(None)
+        self._threads = []
+        with self._lock:
+            if self._wakeup is not None:
+                for fd in self._wakeup:
+                    os.close(fd)
+                self._wakeup = None
+    
+    def submit(self, name: str) -> bool:
+        """Queue a collector run unless one is already in flight"""
+        with self._lock:
+            result = self._results.get(name)
+            if result is None or result["refreshing"]:
+                return False
+            result["refreshing"] = True
+            result["started"] = time.time()
+        self._queue.put(name)
+        return True
+    
+    def refresh_due(self, now: Optional[float] = None) -> List[str]:
+        """Submit every collector whose interval has elapsed"""
+        now = time.time() if now is None else now
+        due = []
+        with self._lock:
+            for name, collector in self._collectors.items():
+                result = self._results[name]
+                if result["refreshing"]:
+                    continue
+                last = result["started"]
+                if last is None or now - last >= collector["interval"]:
+                    due.append(name)
+        return [name for name in due if self.submit(name)]
+    
+    def next_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the next collector is due (0 if one is overdue)"""
+        now = time.time() if now is None else now
+        due = None
+        with self._lock:
+            for name, collector in self._collectors.items():
+                result = self._results[name]
+                if result["refreshing"]:
+                    continue
+                if result["started"] is None:
+                    return 0.0
+                wait = max(0.0, result["started"] + collector["interval"] - now)
+                due = wait if due is None else min(due, wait)
+        return due
+    
+    def refresh_all(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """Submit collectors now regardless of their interval"""
+        names = list(self._collectors) if names is None else names
+        return [name for name in names if self.submit(name)]
+    
+    def _worker(self) -> None:
+        while True:
+            name = self._queue.get()
+            if name is None:
+                return
+            self._run(name)
+    
+    def _run(self, name: str) -> None:
+        with self._lock:
+            collector = self._collectors[name]["collector"]
+        start = time.perf_counter()
+        # CPU cost: this thread plus the subprocesses it waited on (children
+        # reaped by a concurrent collector are counted too; an overestimate)
+        cpu_start = time.thread_time() + children_cpu_time()
+        value, error = None, None
+        try:
+            value = collector()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        duration = time.perf_counter() - start
+        cpu = time.thread_time() + children_cpu_time() - cpu_start
+        
+        with self._lock:
+            result = self._results[name]
+            result["refreshing"] = False
+            result["duration"] = duration
+            result["cpu"] = cpu
+            result["runs"] += 1
+            result["error"] = error
+            if error is None:
+                if value != result["value"]:
+                    result["changes"] += 1
+                result["value"] = value
+                result["updated"] = time.time()
+            self._generation += 1
+            self._published.notify_all()
+            # Under the lock so stop() cannot close the pipe mid-write
+            if self._wakeup is not None:
+                try:
+                    os.write(self._wakeup[1], b"\0")
+                except OSError:
+                    # The pipe is full: the reader is already due to wake up
+                    pass
+    
+    def get(self, name: str) -> Dict:
+        """Get a snapshot of a collector's latest result"""
+        with self._lock:
+            result = dict(self._results.get(name) or {})
+            collector = self._collectors.get(name)
+        if collector is not None:
+            result["interval"] = collector["interval"]
+        return result
+    
+    def is_stale(self, name: str, now: Optional[float] = None, grace: float = 1.0) -> bool:
+        """Check if a result is older than its interval plus a grace period"""
+        result = self.get(name)
+        if not result or result.get("updated") is None:
+            return True
+        now = time.time() if now is None else now
+        return now - result["updated"] > result["interval"] + grace
+    
+    def wait_for_update(self, timeout: Optional[float] = None) -> bool:
+        """Block until a collector publishes a result not waited for yet, or timeout expires"""
+        with self._published:
+            updated = self._published.wait_for(lambda: self._generation != self._seen_generation, timeout)
+            self._seen_generation = self._generation
+        return updated
+    
+    def get_wakeup_fd(self) -> Optional[int]:
+        """File descriptor that becomes readable when a result is published
+        
+        For waiting on results and other input (like stdin) in one
+        selector. None where pipes cannot be selected on (Windows).
+        """
+        if os.name == "nt":
+            return None
+        with self._lock:
+            if self._wakeup is None:
+                read_fd, write_fd = os.pipe()
+                os.set_blocking(read_fd, False)
+                os.set_blocking(write_fd, False)
+                self._wakeup = (read_fd, write_fd)
+            return self._wakeup[0]
+    
+    def drain_wakeup(self) -> None:
+        """Consume pending wakeup signals"""
+        with self._lock:
+            self._seen_generation = self._generation
+        if self._wakeup is None:
+            return
+        try:
+            while os.read(self._wakeup[0], 512):
+                pass
+        except OSError:
+            pass
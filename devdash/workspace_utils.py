@@ -0,0 +1,193 @@
+"""
+Workspace utilities for DevDash
+
+Finds every manifest in a (mono)repo: npm/pnpm workspaces, Cargo
+workspaces, Go multi-module setups and nested Python packages.
+"""
+
+import os
+import re
+import json
+import glob
+from typing import Dict, List, Set
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+# Manifests that mark a directory as a project of each ecosystem
+ECOSYSTEM_MANIFESTS = {
+    "node": ["package.json"],
+    "python": ["pyproject.toml", "requirements.txt", "setup.py", "setup.cfg", "Pipfile"],
+    "rust": ["Cargo.toml"],
+    "go": ["go.mod"],
+    "ruby": ["Gemfile"],
+    "php": ["composer.json"],
+}
+
+# Never descended into while walking
+IGNORED_DIRS = {
+    "node_modules", "vendor", "target", "dist", "build", "__pycache__",
+    "venv", "env", "site-packages", "bower_components",
+}
+
+
+class WorkspaceScanner:
+    """Discover the projects of a repository and how they are grouped"""
+    
+    def __init__(self, path: str = ".", max_depth: int = 3):
+        self.path = os.path.abspath(path)
+        self.max_depth = max_depth
+    
+    @staticmethod
+    def detect_ecosystems(directory: str) -> List[str]:
+        """All ecosystems with a manifest in a directory"""
+        return [
+            ecosystem for ecosystem, names in ECOSYSTEM_MANIFESTS.items()
+            if any(os.path.isfile(os.path.join(directory, name)) for name in names)
+        ]
+    
+    def _expand(self, root: str, patterns: List[str], manifest: str) -> List[str]:
+        """Expand workspace globs ('!' excludes) to dirs containing manifest"""
+        included: Set[str] = set()
+        excluded: Set[str] = set()
+        for pattern in patterns:
+            target = excluded if pattern.startswith("!") else included
+            pattern = pattern.lstrip("!").rstrip("/")
+            for match in glob.glob(os.path.join(root, pattern), recursive=True):
+                if os.path.isfile(os.path.join(match, manifest)) and "node_modules" not in match:
+                    target.add(os.path.abspath(match))
+        return sorted(included - excluded)
+    
+    def get_npm_workspaces(self, root: str) -> List[str]:
+        """Members of an npm/yarn ("workspaces") or pnpm (pnpm-workspace.yaml) workspace"""
+        patterns: List[str] = []
+        try:
+            with open(os.path.join(root, "package.json"), encoding="utf-8") as f:
+                workspaces = json.load(f).get("workspaces", [])
+            if isinstance(workspaces, dict):
+                workspaces = workspaces.get("packages", [])
+            patterns += [p for p in workspaces if isinstance(p, str)]
+        except (OSError, ValueError, AttributeError):
+            pass
+        
+        try:
+            with open(os.path.join(root, "pnpm-workspace.yaml"), encoding="utf-8") as f:
+                in_packages = False
+                for line in f:
+                    if not line.strip() or line.lstrip().startswith("#"):
+                        continue
+                    if not line[0].isspace():
+                        in_packages = line.strip().rstrip(":") == "packages"
+                    elif in_packages and line.strip().startswith("-"):
+                        patterns.append(line.strip()[1:].strip().strip("'\""))
+        except OSError:
+            pass
+        
+        return self._expand(root, patterns, "package.json")
+    
+    def get_cargo_workspace(self, root: str) -> List[str]:
+        """Members of a Cargo workspace"""
+        try:
+            with open(os.path.join(root, "Cargo.toml"), "rb") as f:
+                content = f.read()
+        except OSError:
+            return []
+        
+        members: List[str] = []
+        excludes: List[str] = []
+        if tomllib is not None:
+            try:
+                workspace = tomllib.loads(content.decode("utf-8")).get("workspace", {})
+                members = workspace.get("members", [])
+                excludes = workspace.get("exclude", [])
+            except (ValueError, UnicodeDecodeError):
+                return []
+        else:
+            text = content.decode("utf-8", "replace")
+            section = re.search(r"^\[workspace\](.*?)(?=^\[|\Z)", text, re.MULTILINE | re.DOTALL)
+            if section:
+                for key, target in (("members", members), ("exclude", excludes)):
+                    array = re.search(rf"^{key}\s*=\s*\[(.*?)\]", section.group(1), re.MULTILINE | re.DOTALL)
+                    if array:
+                        target += re.findall(r"\"([^\"]+)\"", array.group(1))
+        
+        return self._expand(root, members + ["!" + e for e in excludes], "Cargo.toml")
+    
+    def get_go_workspace(self, root: str) -> List[str]:
+        """Modules listed in go.work 'use' directives"""
+        try:
+            with open(os.path.join(root, "go.work"), encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            return []
+        
+        dirs = []
+        for block in re.findall(r"^use\s*\((.*?)\)", text, re.MULTILINE | re.DOTALL):
+            dirs += block.split()
+        dirs += re.findall(r"^use\s+([^\s(]+)", text, re.MULTILINE)
+        return self._expand(root, [d for d in dirs if not d.startswith("//")], "go.mod")
+    
+    def walk(self) -> List[str]:
+        """Directories (up to max_depth) that contain any manifest"""
+        found = []
+        base_depth = self.path.rstrip(os.sep).count(os.sep)
+        for directory, subdirs, files in os.walk(self.path):
+            if directory.count(os.sep) - base_depth >= self.max_depth:
+                subdirs[:] = []
+            else:
+                subdirs[:] = sorted(
+                    d for d in subdirs
+                    if d not in IGNORED_DIRS and not d.startswith(".")
+                )
+            names = set(files)
+            if any(name in names for manifests in ECOSYSTEM_MANIFESTS.values() for name in manifests):
+                found.append(directory)
+        return found
+    
+    def find_projects(self) -> List[Dict]:
+        """One entry per project that needs its own outdated check
+        
+        Members of npm/pnpm and Cargo workspaces are folded into the
+        workspace root, which checks them all at once. Go modules are
+        always checked separately, even when listed in go.work.
+        """
+        directories = self.walk()
+        finders = (
+            ("node", self.get_npm_workspaces),
+            ("rust", self.get_cargo_workspace),
+            ("go", self.get_go_workspace),
+        )
+        
+        # Workspace members may sit deeper than max_depth
+        groups: Dict[tuple, List[str]] = {}
+        for directory in [self.path] + directories:
+            for ecosystem, finder in finders:
+                found = [m for m in finder(directory) if m != directory]
+                if found and ecosystem != "go":
+                    groups[(directory, ecosystem)] = found
+                directories += [m for m in found if m not in directories]
+        
+        covered = {(m, ecosystem) for (_, ecosystem), found in groups.items() for m in found}
+        
+        projects = []
+        for directory in directories:
+            for ecosystem in self.detect_ecosystems(directory):
+                if (directory, ecosystem) in covered:
+                    continue
+                projects.append({
+                    "path": directory,
+                    "name": self.relative(directory),
+                    "ecosystem": ecosystem,
+                    "members": [self.relative(m) for m in groups.get((directory, ecosystem), [])],
+                })
+        return projects
+    
+    def relative(self, directory: str) -> str:
+        """Path of a project relative to the scanned root"""
+        return os.path.relpath(directory, self.path).replace(os.sep, "/")
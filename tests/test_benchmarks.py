@@ -0,0 +1,127 @@
+"""
+Tests for the benchmark suite and its synthetic fixtures
+"""
+
+import os
+import json
+import subprocess
+
+import pytest
+from benchmarks.fixtures import SCALES, ensure_fixtures
+from benchmarks.measure import SubprocessCounter, measure
+from benchmarks.run import compare, main
+from devdash.port_utils import PortScanner
+
+
+@pytest.fixture(scope="module")
+def fixtures(tmp_path_factory):
+    """Tiny fixtures, generated once for the module"""
+    return ensure_fixtures(str(tmp_path_factory.mktemp("bench")), "tiny")
+
+
+@pytest.fixture
+def isolated(monkeypatch):
+    """Undo the environment and PortScanner changes a suite run makes"""
+    for name in ("DEVDASH_NO_DAEMON", "DEVDASH_CACHE_DIR", "DEVDASH_INDEX_URL", "npm_config_offline"):
+        monkeypatch.setenv(name, os.environ.get(name, ""))
+    monkeypatch.setattr(PortScanner, "PROC_ROOT", PortScanner.PROC_ROOT)
+    monkeypatch.setattr(PortScanner, "PROC_NET", PortScanner.PROC_NET)
+
+
+class TestFixtures:
+    """Test the generated workloads have the requested shape"""
+    
+    def test_git_repo(self, fixtures):
+        """Test history, branches, stashes and the dirty tree"""
+        sizes = SCALES["tiny"]
+        repo = fixtures["paths"]["repo"]
+        
+        def git(*args):
+            return subprocess.run(["git", *args], cwd=repo, capture_output=True, text=True).stdout
+        
+        assert int(git("rev-list", "--count", "HEAD")) == sizes["commits"]
+        assert len(git("ls-files").splitlines()) == sizes["files"] + 1
+        assert len(git("branch").splitlines()) == sizes["branches"] + 1
+        assert len(git("stash", "list").splitlines()) == sizes["stashes"]
+        assert git("rev-list", "--count", "origin/main..HEAD").strip() == str(sizes["ahead"])
+        
+        status = git("status", "--porcelain", "--untracked-files=all").splitlines()
+        assert sum(line.startswith("??") for line in status) == sizes["untracked"]
+        assert sum(line.startswith("M ") for line in status) == sizes["modified"] // 2
+        assert sum(line.startswith(" M") for line in status) == sizes["modified"] - sizes["modified"] // 2
+    
+    def test_proc(self, fixtures, monkeypatch):
+        """Test the fake /proc is readable by PortScanner, owners included"""
+        proc = fixtures["paths"]["proc"]
+        monkeypatch.setattr(PortScanner, "PROC_ROOT", proc)
+        monkeypatch.setattr(PortScanner, "PROC_NET", os.path.join(proc, "net"))
+        
+        sockets = PortScanner.read_socket_table()
+        assert len(sockets) == SCALES["tiny"]["sockets"]
+        listening = [s for s in sockets if s["state"] == "LISTEN"]
+        owners = PortScanner._resolve_socket_owners({s["inode"] for s in listening})
+        assert len(owners) == len(listening)
+    
+    def test_reused(self, fixtures):
+        """Test fixtures are not regenerated while their sizes match"""
+        root = os.path.dirname(os.path.dirname(fixtures["paths"]["repo"]))
+        assert ensure_fixtures(root, "tiny")["paths"] == fixtures["paths"]
+
+
+class TestMeasure:
+    """Test measurement helpers"""
+    
+    def test_counts_subprocesses(self):
+        """Test processes started through subprocess are counted"""
+        original = subprocess.Popen.__init__
+        with SubprocessCounter() as counter:
+            subprocess.run(["git", "--version"], capture_output=True)
+            subprocess.run(["git", "--version"], capture_output=True)
+        assert counter.count == 2
+        assert subprocess.Popen.__init__ is original
+        
+        result = measure(lambda: subprocess.run(["git", "--version"], capture_output=True), repeat=2)
+        assert result["subprocesses"] == 1
+        assert result["cold_subprocesses"] == 1
+        assert result["median_ms"] > 0
+    
+    def test_peak_memory(self):
+        """Test peak memory reflects allocations made during the call"""
+        result = measure(lambda: bytearray(4 * 1024 * 1024), repeat=1)
+        assert result["peak_kib"] >= 4096
+
+
+def test_compare():
+    """Test slowdowns beyond the threshold are flagged, noise is not"""
+    def doc(**medians):
+        return {"results": {name: {"median_ms": ms, "subprocesses": 1} for name, ms in medians.items()}}
+    
+    rows = {row["name"]: row for row in compare(doc(a=10.0, b=10.0, c=0.1), doc(a=20.0, b=11.0, c=0.5))}
+    assert rows["a"]["regression"]
+    assert not rows["b"]["regression"]
+    assert not rows["c"]["regression"]
+
+
+def test_main_writes_json(fixtures, isolated, tmp_path):
+    """Test a suite run writes comparable JSON"""
+    root = os.path.dirname(os.path.dirname(fixtures["paths"]["repo"]))
+    output = tmp_path / "results.json"
+    args = [
+        "--scale", "tiny", "--fixtures-dir", root, "--repeat", "1",
+        "--only", "GitInfo.get_status", "--only", "PortScanner.get_listening_sockets",
+        "--only", "DevDash.update_layout", "--output", str(output),
+    ]
+    assert main(args) == 0
+    
+    document = json.loads(output.read_text())
+    assert document["meta"]["scale"] == "tiny"
+    assert "commit" in document["meta"]
+    results = document["results"]
+    assert set(results) == {
+        "GitInfo.get_status", "PortScanner.get_listening_sockets",
+        "DevDash.update_layout", "DevDash.update_layout.rebuild",
+    }
+    assert results["GitInfo.get_status"]["subprocesses"] == 1
+    assert results["PortScanner.get_listening_sockets"]["subprocesses"] == 0
+    
+    assert main(args[:-2] + ["--output", str(tmp_path / "again.json"), "--compare", str(output), "--threshold", "1000"]) == 0
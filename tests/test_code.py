@@ -0,0 +1,138 @@
+"""
+Tests for the code statistics counter
+"""
+
+import os
+import subprocess
+
+import pytest
+from devdash import code_utils
+from devdash.cache_utils import DiskCache
+from devdash.code_utils import CodeCounter, count_file, count_lines, detect_language
+
+
+def git(repo, *args):
+    """Run git in repo"""
+    subprocess.run(
+        ["git", "-c", "user.name=Ann", "-c", "user.email=ann@example.com", *args],
+        cwd=repo, check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A repository with Python, JavaScript, an ignored and a binary file"""
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q")
+    (path / "app.py").write_text("import os\n\n# comment\nx = 1  # trailing\n")
+    (path / "lib.js").write_text("/* block\n   comment */\nlet x = 1;\n// line\n")
+    (path / "build.py").write_text("ignored = True\n")
+    (path / "blob.py").write_bytes(b"\0\1\2\n")
+    (path / ".gitignore").write_text("build.py\n")
+    git(path, "add", "app.py", ".gitignore")
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Count cache in a temporary directory"""
+    return DiskCache("code-stats", ttl=float("inf"), cache_dir=tmp_path / "cache")
+
+
+class TestLineCounting:
+    """Test line counting and language detection"""
+    
+    def test_count_lines(self):
+        """Test line, block and trailing comments"""
+        assert count_lines([b"x = 1", b"", b"  # note", b"y = 2  # note"], "Python") == (2, 1, 1)
+        assert count_lines([b"/* a", b"b */ ", b"int x;", b"/* c */", b"// d"], "C") == (1, 4, 0)
+        assert count_lines([b"{}"], "JSON") == (1, 0, 0)
+    
+    def test_detect_language(self):
+        """Test extensions and well-known file names"""
+        assert detect_language("src/app.PY") == "Python"
+        assert detect_language("docker/Dockerfile") == "Dockerfile"
+        assert detect_language("notes.txt") is None
+    
+    def test_count_file_mmap(self, tmp_path, monkeypatch):
+        """Test large files read through mmap count the same"""
+        path = tmp_path / "big.py"
+        path.write_text("# header\n" + "x = 1\n" * 100 + "\n")
+        small = count_file(str(path))
+        monkeypatch.setattr(code_utils, "MMAP_THRESHOLD", 16)
+        assert count_file(str(path)) == small == (100, 1, 1)
+
+
+class TestCodeCounter:
+    """Tests for CodeCounter"""
+    
+    def test_lists_tracked_and_untracked_files(self, repo, cache):
+        """Test git's file list skips ignored and unknown files"""
+        assert CodeCounter(str(repo), cache).list_files() == ["app.py", "blob.py", "lib.js"]
+    
+    def test_stats(self, repo, cache):
+        """Test totals, languages and the largest files"""
+        stats = CodeCounter(str(repo), cache).get_stats()
+        assert (stats["files"], stats["code"], stats["comment"], stats["blank"]) == (2, 3, 4, 1)
+        assert [s["name"] for s in stats["languages"]] == ["Python", "JavaScript"]
+        assert stats["largest"][0] == {"path": "app.py", "lines": 4}
+    
+    def test_only_changed_files_are_counted(self, repo, cache):
+        """Test the cache skips unchanged and binary files, also across instances"""
+        counter = CodeCounter(str(repo), cache)
+        counter.scan()
+        assert counter.last_scan["counted"] == 3
+        
+        counter = CodeCounter(str(repo), cache)
+        counter.scan()
+        assert counter.last_scan["counted"] == 0
+        
+        (repo / "app.py").write_text("import os\nimport sys\n")
+        writes = []
+        set_entry = cache.set
+        cache.set = lambda key, value: writes.append(value) or set_entry(key, value)
+        stats = counter.get_stats()
+        assert stats["counted"] == 1
+        # Only the index shard holding app.py is rewritten
+        assert [list(w["files"]) for w in writes] == [["app.py"]]
+        assert stats["languages"][0] == {"name": "Python", "files": 1, "code": 2, "comment": 0, "blank": 0}
+        
+        os.remove(repo / "lib.js")
+        assert counter.get_stats()["files"] == 1
+    
+    def test_process_pool(self, repo, cache, monkeypatch):
+        """Test many changed files are counted on a process pool"""
+        monkeypatch.setattr(code_utils, "POOL_MIN_FILES", 2)
+        counter = CodeCounter(str(repo), cache, workers=2)
+        stats = counter.get_stats()
+        assert stats["pool"] is True
+        assert stats["code"] == 3
+    
+    def test_outside_git(self, tmp_path, cache):
+        """Test a directory walk outside git skips hidden and ignored directories"""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "main.go").write_text("package main\n")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "dep.js").write_text("x\n")
+        (tmp_path / ".venv").mkdir()
+        (tmp_path / ".venv" / "lib.py").write_text("x\n")
+        counter = CodeCounter(str(tmp_path), cache)
+        assert counter.list_files() == [os.path.join("src", "main.go")]
+
+
+class TestCodePanel:
+    """Test the dashboard's code panel"""
+    
+    def test_dashboard_code_panel(self, repo, cache):
+        """Test the code panel model and render"""
+        from devdash.dashboard import DevDash
+        
+        dash = DevDash(str(repo))
+        dash.daemon = None
+        dash.code_counter = CodeCounter(str(repo), cache)
+        model = dash.collect_code()
+        assert model["code"] == 3
+        assert "3 lines in 2 files" in str(dash.render_code(model).title)
+        assert dash.create_layout().get("code") is not None
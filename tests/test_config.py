@@ -0,0 +1,128 @@
+"""
+Tests for config files and the configurable panel set
+"""
+
+import pytest
+from devdash.config import ConfigError, get_visible_panels, load_config
+from devdash.dashboard import DevDash
+
+
+@pytest.fixture
+def user_config(tmp_path, monkeypatch):
+    """Write the user's config file under a temporary XDG_CONFIG_HOME"""
+    monkeypatch.delenv("DEVDASH_CONFIG", raising=False)
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "xdg"))
+    path = tmp_path / "xdg" / "devdash" / "config.toml"
+    path.parent.mkdir(parents=True)
+    
+    def write(text):
+        path.write_text(text)
+        return path
+    
+    return write
+
+
+class TestLoadConfig:
+    """Test config file discovery, merging and validation"""
+    
+    def test_defaults(self, tmp_path, user_config):
+        """Test no config files gives every panel in the built-in layout"""
+        config = load_config(str(tmp_path))
+        assert config["dashboard"]["refresh"] == 5.0
+        assert set(get_visible_panels(config)) == {"git", "stats", "todos", "probes", "system", "code", "ports", "packages"}
+    
+    def test_project_overrides_user(self, tmp_path, user_config):
+        """Test .devdash.toml above the project path overrides the user's file key by key"""
+        user_config(
+            '[dashboard]\nrefresh = 2\ncpu_budget = 3\n'
+            '[layout]\ncolumns = [["git"], ["system", ["ports", "packages"]]]\n'
+        )
+        (tmp_path / ".devdash.toml").write_text(
+            '[dashboard]\nrefresh = 10\n'
+            '[panels.packages]\nenabled = false\n'
+        )
+        project = tmp_path / "src" / "app"
+        project.mkdir(parents=True)
+        
+        config = load_config(str(project))
+        assert config["dashboard"] == {"refresh": 10, "cpu_budget": 3}
+        assert get_visible_panels(config) == ["git", "system", "ports"]
+    
+    def test_explicit_file(self, tmp_path, user_config):
+        """Test config_file replaces the user's file and must exist"""
+        user_config('[dashboard]\nrefresh = 2\n')
+        explicit = tmp_path / "ci.toml"
+        explicit.write_text('[layout]\ncolumns = [["system", "ports"]]\n')
+        
+        config = load_config(str(tmp_path), str(explicit))
+        assert config["dashboard"]["refresh"] == 5.0
+        assert get_visible_panels(config) == ["system", "ports"]
+        with pytest.raises(ConfigError, match="missing.toml"):
+            load_config(str(tmp_path), str(tmp_path / "missing.toml"))
+    
+    @pytest.mark.parametrize("text, message", [
+        ('[layout]\ncolumns = [["git", "docker"]]\n', "unknown panel 'docker'"),
+        ('[layout]\ncolumns = [["git"], ["git"]]\n', "appears twice"),
+        ('[panels.git]\noutdated = true\n', "unknown option panels.git.outdated"),
+        ('[panels.packages]\nrefresh = "slow"\n', "panels.packages.refresh must be"),
+        ('[panels.system]\nsize = true\n', "must be a number"),
+        ('[dashboard]\nrefresh = 0\n', "must be positive"),
+        ('[dashboard]\ncpu_budget = -1\n', "cpu_budget must not be negative"),
+        ('[panels.logs]\nhighlight = "("\n', "panels.logs.highlight: invalid pattern"),
+        ('[dashboard\n', "config.toml"),
+    ])
+    def test_invalid(self, tmp_path, user_config, text, message):
+        """Test typos and bad values are reported with the setting's name"""
+        user_config(text)
+        with pytest.raises(ConfigError, match=message):
+            load_config(str(tmp_path))
+
+
+class TestConfiguredDashboard:
+    """Test the dashboard only lays out and collects configured panels"""
+    
+    def test_hidden_panels_are_not_collected(self, tmp_path, user_config):
+        """Test a system-and-ports layout has no other slots, collectors or zoom keys"""
+        user_config(
+            '[layout]\ncolumns = [["system"], ["ports"]]\nwidths = [2, 1]\n'
+            '[panels.system]\nrefresh = 1\n'
+        )
+        dash = DevDash(str(tmp_path), load_config(str(tmp_path)))
+        assert set(dash.get_collectors()) == {"system", "ports"}
+        
+        layout = dash.create_layout()
+        assert layout.get("system") is not None
+        assert layout.get("ports") is not None
+        assert layout.get("git") is None
+        assert layout.get("packages") is None
+        assert layout["column-0"].ratio == 2
+        
+        assert dash.handle_key("g") is None
+        assert dash.handle_key("s") == "layout"
+        assert dash.get_interval("system", 5.0) == 1.0
+        assert dash.get_interval("ports", 5.0) == 5.0
+    
+    def test_shared_row_and_sizes(self, tmp_path, user_config):
+        """Test nested lists share a row and size sets a panel's share"""
+        user_config(
+            '[layout]\ncolumns = [["git", ["ports", "packages"]]]\n'
+            '[panels.git]\nsize = 3\n'
+        )
+        dash = DevDash(str(tmp_path), load_config(str(tmp_path)))
+        layout = dash.create_layout()
+        assert layout["git"].ratio == 3
+        assert [child.name for child in layout["column-0-row-1"].children] == ["ports", "packages"]
+    
+    def test_outdated_check_disabled(self, tmp_path, user_config, monkeypatch):
+        """Test packages.outdated = false never queries package indexes"""
+        from devdash.package_utils import PackageInfo
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("outdated check ran")
+        
+        monkeypatch.setattr(PackageInfo, "get_outdated_packages", fail)
+        user_config('[panels.packages]\noutdated = false\n')
+        dash = DevDash(str(tmp_path), load_config(str(tmp_path)))
+        model = dash.collect_packages()
+        assert model["outdated"] is None
+        dash.render_packages(model)
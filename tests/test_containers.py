@@ -0,0 +1,239 @@
+"""
+Tests for the container engine client and watcher
+"""
+
+import json
+import queue
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from devdash.container_utils import ContainerWatcher, EngineClient, EngineError, find_socket, parse_container
+
+
+def summary(container_id, name, state="running", ports=()):
+    """A /containers/json entry"""
+    return {
+        "Id": container_id, "Names": [f"/{name}"], "Image": f"{name}:latest", "State": state,
+        "Status": "Up 2 minutes" if state == "running" else "Exited (0)",
+        "Ports": [{"PrivatePort": private, "PublicPort": public, "Type": "tcp"} for public, private in ports],
+    }
+
+
+class FakeEngine(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Docker Engine API subset on a Unix socket"""
+    
+    daemon_threads = True
+    
+    def __init__(self, path):
+        self.containers = {}
+        self.cpu = {}
+        self.events = queue.Queue()
+        self.requests = []
+        self.version = {"Version": "24.0.7", "ApiVersion": "1.43", "Components": [{"Name": "Engine"}]}
+        super().__init__(path, EngineHandler)
+
+
+class EngineHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, *args):
+        pass
+    
+    def send_json(self, data, status=200):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        engine = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        engine.requests.append(url.path)
+        if url.path == "/version":
+            self.send_json(engine.version)
+        elif url.path == "/containers/json":
+            ids = json.loads(query["filters"][0])["id"] if "filters" in query else list(engine.containers)
+            self.send_json([engine.containers[i] for i in ids if i in engine.containers])
+        elif url.path.endswith("/stats"):
+            container_id = url.path.split("/")[2]
+            total, system = engine.cpu[container_id]
+            self.send_json({
+                "cpu_stats": {"cpu_usage": {"total_usage": total}, "system_cpu_usage": system, "online_cpus": 2},
+                "memory_stats": {"usage": 300 * 1024 ** 2, "limit": 1024 ** 3, "stats": {"inactive_file": 100 * 1024 ** 2}},
+            })
+        elif url.path == "/events":
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            while True:
+                event = engine.events.get()
+                if event is None:
+                    self.wfile.write(b"0\r\n\r\n")
+                    return
+                line = json.dumps(event).encode() + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+        else:
+            self.send_json({"message": "page not found"}, status=404)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Fake engine serving two containers"""
+    server = FakeEngine(str(tmp_path / "docker.sock"))
+    server.containers = {
+        "aaa": summary("aaa", "web", ports=[(8080, 80)]),
+        "bbb": summary("bbb", "db", state="exited"),
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.events.put(None)
+    server.shutdown()
+    server.server_close()
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll until condition() is true"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_find_socket(tmp_path, monkeypatch):
+    """Test DOCKER_HOST wins and missing sockets are skipped"""
+    monkeypatch.setenv("DOCKER_HOST", "unix:///tmp/custom.sock")
+    assert find_socket() == "/tmp/custom.sock"
+    monkeypatch.setenv("DOCKER_HOST", "tcp://10.0.0.1:2375")
+    monkeypatch.delenv("CONTAINER_HOST", raising=False)
+    monkeypatch.setattr("devdash.container_utils.DEFAULT_SOCKETS", (str(tmp_path / "none.sock"), str(tmp_path)))
+    assert find_socket() == str(tmp_path)
+
+
+def test_parse_container():
+    """Test names lose their slash and only published ports are kept"""
+    row = parse_container({
+        "Id": "abc", "Names": ["/api"], "Image": "api", "State": "running", "Status": "Up",
+        "Ports": [{"PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"},
+                  {"PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"}, {"PrivatePort": 9000, "Type": "tcp"}],
+    })
+    assert row["name"] == "api"
+    assert row["ports"] == [{"public": 8080, "private": 80, "proto": "tcp"}]
+
+
+class TestEngineClient:
+    """Tests for EngineClient"""
+    
+    def test_requests_share_a_connection(self, engine):
+        """Test keep-alive: many requests, one socket connection"""
+        client = EngineClient(engine.server_address)
+        assert client.version() == {"name": "Docker", "version": "24.0.7", "api": "1.43"}
+        for _ in range(5):
+            assert len(client.list_containers()) == 2
+        assert client.pool.created == 1
+        client.close()
+    
+    def test_errors(self, engine, tmp_path):
+        """Test HTTP errors and a missing socket raise EngineError"""
+        client = EngineClient(engine.server_address)
+        with pytest.raises(EngineError, match="404: page not found"):
+            client.get("/nope")
+        with pytest.raises(EngineError):
+            EngineClient(str(tmp_path / "missing.sock")).version()
+        engine.version = []
+        with pytest.raises(EngineError, match="unexpected reply"):
+            client.version()
+        client.close()
+
+
+class TestContainerWatcher:
+    """Tests for ContainerWatcher"""
+    
+    def test_events_update_the_table(self, engine):
+        """Test the table follows events without listing every container again"""
+        watcher = ContainerWatcher(EngineClient(engine.server_address)).start()
+        wait_for(lambda: watcher.connected)
+        assert [r["name"] for r in watcher.get_rows()] == ["web", "db"]
+        assert watcher.get_port_map() == {8080: "web"}
+        
+        engine.containers["bbb"] = summary("bbb", "db", ports=[(5432, 5432)])
+        engine.events.put({"Type": "container", "Action": "start", "Actor": {"ID": "bbb"}})
+        wait_for(lambda: watcher.get_port_map() == {8080: "web", 5432: "db"})
+        
+        del engine.containers["aaa"]
+        engine.events.put({"Type": "container", "Action": "destroy", "Actor": {"ID": "aaa"}})
+        wait_for(lambda: [r["name"] for r in watcher.get_rows()] == ["db"])
+        assert engine.requests.count("/containers/json") == 2
+        watcher.stop()
+    
+    def test_stats_from_one_shot_samples(self, engine):
+        """Test CPU comes from the change since our last sample, memory without page cache"""
+        watcher = ContainerWatcher(EngineClient(engine.server_address))
+        watcher.sync()
+        engine.cpu["aaa"] = (1000, 10000)
+        watcher.update_stats()
+        web = watcher.get_rows()[0]
+        assert web["cpu"] is None
+        assert web["mem"] == 200 * 1024 ** 2
+        
+        engine.cpu["aaa"] = (1500, 12000)
+        watcher.update_stats(max_age=60)
+        assert watcher.get_rows()[0]["cpu"] is None
+        watcher.update_stats()
+        assert watcher.get_rows()[0]["cpu"] == pytest.approx(50.0)
+        assert engine.requests.count("/containers/aaa/stats") == 2
+        watcher.client.close()
+    
+    def test_failed_sync_closes_stream(self, engine, monkeypatch):
+        """Test an unexpected failure after the stream opened is reported and the stream closed"""
+        monkeypatch.setattr("devdash.container_utils.RECONNECT_DELAY", 60)
+        client = EngineClient(engine.server_address)
+        streams = []
+        events = client.events
+        client.events = lambda: streams.append(events()) or streams[-1]
+        watcher = ContainerWatcher(client)
+        watcher.sync = lambda: {}["Id"]
+        watcher.start()
+        wait_for(lambda: watcher.error is not None)
+        assert watcher.error == "KeyError: 'Id'"
+        assert not watcher.connected
+        assert watcher._thread.is_alive()
+        assert streams[0].gi_frame is None
+        watcher.stop()
+
+
+def test_dashboard_containers_panel(engine):
+    """Test the panel model, its render and container names in the ports panel"""
+    from devdash.config import get_default_config
+    from devdash.dashboard import DevDash
+    
+    config = get_default_config()
+    config["panels"]["containers"] = {"socket": engine.server_address}
+    config["layout"]["columns"] = [["containers", "ports"]]
+    dash = DevDash(".", config)
+    dash.daemon = None
+    wait_for(lambda: dash.container_watcher.connected)
+    engine.cpu["aaa"] = (1000, 10000)
+    model = dash.collect_containers()
+    assert (model["running"], model["total"]) == (1, 2)
+    assert model["rows"][0]["ports"] == "8080→80"
+    panel = dash.render_containers(model)
+    assert "CONTAINERS (1/2)" in str(panel.title)
+    assert "Docker 24.0.7" in str(panel.title)
+    
+    dash.port_watcher.poll = lambda: None
+    dash.port_watcher.recent_changes = lambda: {}
+    dash.port_watcher._sorted = [{"port": 8080, "service": "HTTP", "process": "docker-proxy"}]
+    assert dash.collect_ports()["rows"][0]["service"] == "HTTP"
+    row = dash.collect("ports")["rows"][0]
+    assert (row["service"], row["icon"]) == ("web", "🐳")
+    dash.close_backends()
+    assert dash.container_watcher._thread is None
@@ -0,0 +1,253 @@
+"""
+Tests for the collector daemon and its wire protocol
+"""
+
+import os
+import socket
+import struct
+import shutil
+import tempfile
+import threading
+import time
+
+import pytest
+from devdash.daemon import CollectorDaemon, DaemonClient, DaemonUnavailable, SnapshotCache
+from devdash.protocol import MAX_FRAME_SIZE, ProtocolError, encode_frame, recv_frame, send_frame
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets")
+
+
+class FakeDashboard:
+    """Collectors that count how often they run"""
+    
+    def __init__(self, calls):
+        self.calls = calls
+    
+    def get_local_collectors(self):
+        def git():
+            self.calls.append("git")
+            time.sleep(0.1)
+            return {"repo": True, "branch": "main"}
+        
+        def ports():
+            raise OSError("permission denied")
+        
+        return {"git": git, "ports": ports, "system": lambda: {"cpu": 1.0}}
+
+
+@pytest.fixture
+def socket_path():
+    """Short socket path (AF_UNIX paths are limited to ~100 bytes)"""
+    directory = tempfile.mkdtemp(prefix="dd-")
+    yield os.path.join(directory, "d.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def daemon(socket_path):
+    """Running daemon whose collectors are FakeDashboard's"""
+    daemon = CollectorDaemon(socket_path)
+    daemon.calls = []
+    daemon._get_dashboard = lambda path, name, options: FakeDashboard(daemon.calls)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.time() + 5
+    while not os.path.exists(socket_path) and time.time() < deadline:
+        time.sleep(0.01)
+    yield daemon
+    daemon.shutdown()
+    thread.join(5)
+
+
+class TestProtocol:
+    """Test length-prefixed JSON frames"""
+    
+    def test_round_trip(self):
+        """Test messages survive a socket, including back-to-back frames"""
+        left, right = socket.socketpair()
+        with left, right:
+            send_frame(left, {"op": "get", "name": "git"})
+            send_frame(left, {"op": "ping"})
+            left.shutdown(socket.SHUT_WR)
+            assert recv_frame(right) == {"op": "get", "name": "git"}
+            assert recv_frame(right) == {"op": "ping"}
+            assert recv_frame(right) is None
+    
+    def test_rejects_bad_frames(self):
+        """Test oversized, truncated and non-object frames"""
+        left, right = socket.socketpair()
+        with left, right:
+            left.sendall(struct.pack("!I", MAX_FRAME_SIZE + 1))
+            with pytest.raises(ProtocolError):
+                recv_frame(right)
+        
+        left, right = socket.socketpair()
+        with left, right:
+            left.sendall(encode_frame({"a": 1})[:-1])
+            left.shutdown(socket.SHUT_WR)
+            with pytest.raises(ProtocolError):
+                recv_frame(right)
+        
+        left, right = socket.socketpair()
+        with left, right:
+            left.sendall(struct.pack("!I", 2) + b"[]")
+            with pytest.raises(ProtocolError):
+                recv_frame(right)
+
+
+class TestSnapshotCache:
+    """Test SnapshotCache class"""
+    
+    def test_single_flight(self):
+        """Test concurrent requests share one collection"""
+        cache = SnapshotCache()
+        calls = []
+        
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get(("git", "/p"), 1.0, compute)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(calls) == 1
+        assert [r["value"] for r in results] == ["value"] * 8
+        assert cache.get(("git", "/p"), 0.0, compute)["value"] == "value"
+        assert len(calls) == 2
+
+
+class TestCollectorDaemon:
+    """Test the daemon over its socket"""
+    
+    def test_clients_share_collections(self, daemon, socket_path):
+        """Test two clients get one collection, and paths are keyed apart"""
+        first, second = DaemonClient(socket_path), DaemonClient(socket_path)
+        try:
+            results = []
+            threads = [
+                threading.Thread(target=lambda c=c: results.append(c.get("git", "/repo", max_age=5)))
+                for c in (first, second)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert results == [{"repo": True, "branch": "main"}] * 2
+            assert daemon.calls == ["git"]
+            
+            first.get("git", "/other", max_age=5)
+            assert daemon.calls == ["git", "git"]
+            
+            stats = first.request({"op": "stats"})["stats"]
+            assert stats["collections"] == 2
+            assert stats["hits"] == 1
+        finally:
+            first.close()
+            second.close()
+    
+    def test_probes_are_keyed_by_targets(self):
+        """Test projects share probe snapshots only when they probe the same targets"""
+        daemon = CollectorDaemon("unused.sock")
+        targets = {"/a": ["localhost:80"], "/b": ["localhost:80"], "/c": ["localhost:5432"], "/d": None}
+        dashboards = {}
+        for path in targets:
+            dash = dashboards[path] = FakeDashboard([])
+            dash.get_local_collectors = lambda dash=dash: {"probes": lambda: dash.calls.append(1) or {"rows": []}}
+        daemon._get_dashboard = lambda path, name, options: dashboards[path]
+        for path, configured in targets.items():
+            daemon.collect("probes", path, max_age=5, options={"targets": configured} if configured else None)
+        assert [len(dashboards[path].calls) for path in targets] == [1, 0, 1, 1]
+    
+    def test_client_options(self):
+        """Test collectors run with the options each client sent, and invalid ones are refused"""
+        daemon = CollectorDaemon("unused.sock")
+        dash = daemon._get_dashboard("/a", "packages", {"outdated": False})
+        assert dash.package_outdated is False
+        assert daemon._get_dashboard("/a", "packages", {}) is daemon._get_dashboard("/a", "git", {})
+        assert daemon._get_dashboard("/a", "packages", {}).package_outdated is True
+        
+        reply = daemon.handle({"op": "get", "name": "packages", "path": "/a", "options": {"ttl": "1h"}})
+        assert reply == {"ok": False, "error": "ConfigError: panels.packages.ttl must be int or float, not '1h'"}
+        reply = daemon.handle({"op": "get", "name": "packages", "path": "/a", "options": ["outdated"]})
+        assert reply == {"ok": False, "error": "options must be a table"}
+    
+    def test_errors(self, daemon, socket_path):
+        """Test collector failures and unknown collectors raise RuntimeError"""
+        client = DaemonClient(socket_path)
+        try:
+            assert client.ping()
+            with pytest.raises(RuntimeError, match="permission denied"):
+                client.get("ports")
+            with pytest.raises(RuntimeError, match="unknown collector"):
+                client.get("nope")
+        finally:
+            client.close()
+    
+    def test_already_running(self, daemon, socket_path):
+        """Test a second daemon refuses to take over a live socket"""
+        with pytest.raises(RuntimeError, match="already running"):
+            CollectorDaemon(socket_path).serve_forever()
+    
+    def test_stale_socket_is_replaced(self, socket_path):
+        """Test a socket file left by a crashed daemon does not block startup"""
+        os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+        stale = socket.socket(socket.AF_UNIX)
+        stale.bind(socket_path)
+        stale.close()
+        
+        daemon = CollectorDaemon(socket_path)
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        try:
+            client = DaemonClient(socket_path)
+            deadline = time.time() + 5
+            while not client.ping() and time.time() < deadline:
+                client._retry_at = 0
+                time.sleep(0.01)
+            assert client.ping()
+            client.close()
+        finally:
+            daemon.shutdown()
+            thread.join(5)
+        assert not os.path.exists(socket_path)
+    
+    def test_shared_socket_directory_is_refused(self, tmp_path, monkeypatch):
+        """Test a default socket directory someone else could write to is not used"""
+        monkeypatch.delenv("DEVDASH_SOCKET", raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        (tmp_path / "devdash").mkdir()
+        os.chmod(tmp_path / "devdash", 0o777)
+        with pytest.raises(RuntimeError, match="not a private directory"):
+            CollectorDaemon().serve_forever()
+        assert not os.path.exists(tmp_path / "devdash" / "devdashd.sock")
+
+
+class TestFallback:
+    """Test clients without a daemon"""
+    
+    def test_missing_daemon(self, socket_path):
+        """Test a missing socket is reported and not retried immediately"""
+        client = DaemonClient(socket_path)
+        assert not client.available()
+        with pytest.raises(DaemonUnavailable):
+            client.get("git")
+        assert client.ping() is False
+    
+    def test_dashboard_uses_daemon_then_falls_back(self, daemon, socket_path, tmp_path):
+        """Test DevDash reads snapshots from the daemon, and collects itself without one"""
+        from devdash.dashboard import DevDash
+        dash = DevDash(str(tmp_path))
+        dash.daemon = DaemonClient(socket_path)
+        assert dash.collect("git") == {"repo": True, "branch": "main"}
+        
+        dash.daemon.close()
+        dash.daemon = DaemonClient(socket_path + ".missing")
+        assert dash.collect("git") == {"repo": False}
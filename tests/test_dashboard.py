@@ -0,0 +1,154 @@
+"""
+Tests for dashboard rendering
+"""
+
+import pytest
+from devdash.dashboard import DevDash, hash_model
+from devdash.worker_utils import CollectorPool
+
+
+@pytest.fixture
+def dash(tmp_path, monkeypatch):
+    """Dashboard whose collectors return fixed models"""
+    dash = DevDash(str(tmp_path))
+    models = {
+        "git": {"repo": False},
+        "stats": {"repo": False},
+        "ports": {"rows": []},
+        "probes": {"rows": []},
+        "packages": {
+            "outdated": [], "multi_project": False, "has_projects": False, "errors": [],
+            "inventory": None, "conflicts": 0, "environment": None,
+        },
+        "system": dash.collect_system(),
+    }
+    dash.models = models
+    monkeypatch.setattr(dash, "get_collectors", lambda: {
+        name: (lambda name=name: dict(models[name])) for name in models
+    })
+    monkeypatch.setattr(dash, "collect_header", lambda: {"version": "1.0.0", "clock": "12:00"})
+    return dash
+
+
+class TestRenderSkipping:
+    """Test panels are only rebuilt when their data model changes"""
+    
+    def test_hash_model_is_order_independent(self):
+        """Test equal models hash equally regardless of key order"""
+        assert hash_model({"a": 1, "b": [1, 2]}) == hash_model({"b": [1, 2], "a": 1})
+        assert hash_model({"a": 1}) != hash_model({"a": 2})
+    
+    def test_unchanged_models_skip_the_frame(self, dash):
+        """Test a second update with identical data changes nothing"""
+        layout = dash.create_layout()
+        assert dash.update_layout(layout) is True
+        git_panel = layout["git"].renderable
+        assert dash.update_layout(layout) is False
+        assert layout["git"].renderable is git_panel
+    
+    def test_only_changed_panel_is_rebuilt(self, dash):
+        """Test one changed model rebuilds only its own panel"""
+        layout = dash.create_layout()
+        dash.update_layout(layout)
+        git_panel, ports_panel = layout["git"].renderable, layout["ports"].renderable
+        
+        dash.models["ports"] = {"rows": [{
+            "port": 8000, "icon": "🐍", "change": "opened", "service": "Django",
+            "process": "python", "established": 1, "queue": "0/0", "cpu": 3, "rss": 40,
+        }]}
+        assert dash.update_layout(layout) is True
+        assert layout["git"].renderable is git_panel
+        assert layout["ports"].renderable is not ports_panel
+    
+    def test_pool_results_are_hashed(self, dash):
+        """Test republished but identical collector results skip the frame"""
+        pool = CollectorPool()
+        for name, collector in dash.get_collectors().items():
+            pool.register(name, collector, interval=60)
+        layout = dash.create_layout()
+        
+        assert dash.update_layout(layout, pool) is True
+        assert layout["git"].renderable.title == "[dim]GIT[/dim]"
+        
+        pool.start()
+        try:
+            pool.refresh_all()
+            assert pool.wait_for_update(5)
+            for name in dash.models:
+                while pool.get(name)["value"] is None:
+                    pool.wait_for_update(1)
+            assert dash.update_layout(layout, pool) is True
+            
+            pool.refresh_all()
+            for name in dash.models:
+                while pool.get(name)["refreshing"]:
+                    pool.wait_for_update(1)
+            assert dash.update_layout(layout, pool) is False
+        finally:
+            pool.stop()
+
+
+class TestKeys:
+    """Test keyboard handling"""
+    
+    def test_zoom_and_back(self, dash):
+        """Test a panel key shows that panel alone; Esc returns to the overview"""
+        dash.set_zoom(None)
+        assert dash.handle_key("P") == "layout"
+        assert dash.zoom == "ports"
+        assert dash.update_layout(dash.layout) is True
+        assert dash.layout.get("git") is None
+        assert dash.layout["ports"].renderable.title
+        
+        assert dash.handle_key("escape") == "layout"
+        assert dash.zoom is None
+        assert dash.layout.get("git") is not None
+        assert dash.handle_key("escape") is None
+    
+    def test_refresh_rate_steps(self, dash):
+        """Test + and - step through the rates and update the pool intervals"""
+        pool = CollectorPool()
+        for name, collector in dash.get_collectors().items():
+            pool.register(name, collector, dash.get_interval(name, 5.0))
+        dash.refresh_rate = 5.0
+        
+        assert dash.handle_key("+", pool) == "rate"
+        assert dash.refresh_rate == 2.0
+        assert pool._collectors["git"]["interval"] == 2.0
+        assert pool._collectors["packages"]["interval"] == 30.0
+        
+        dash.set_refresh_rate(60.0, pool)
+        assert dash.handle_key("-", pool) is None
+        assert dash.refresh_rate == 60.0
+        assert pool._collectors["packages"]["interval"] == 60.0
+    
+    def test_refresh_and_quit(self, dash):
+        """Test R submits every collector at once and Q stops the loop"""
+        pool = CollectorPool()
+        for name, collector in dash.get_collectors().items():
+            pool.register(name, collector, interval=60)
+        pool.refresh_due()
+        assert dash.handle_key("r", pool) == "refresh"
+        assert all(pool.get(name)["refreshing"] for name in dash.models)
+        
+        dash.running = True
+        assert dash.handle_key("q") == "quit"
+        assert dash.running is False
+
+
+def test_packages_caption_names_heaviest_subtree(dash):
+    """Test the inventory caption shows counts, duplicates and the heaviest direct dependency"""
+    model = dict(dash.models["packages"], inventory={
+        "direct": 2, "transitive": 5, "duplicates": 1, "heaviest": {"name": "rich", "size": 4},
+    })
+    caption = dash.render_packages(model).renderable.caption
+    assert caption == "2 direct · 5 transitive · 1 dup · heaviest rich (4)"
+
+
+def test_packages_failed_check_is_not_up_to_date(dash):
+    """Test a check that could not run is reported instead of 'All packages up to date'"""
+    errors = [{"project": ".", "error": "npm outdated failed: E404"}]
+    model = dict(dash.models["packages"], has_projects=True, errors=errors)
+    table = dash.render_packages(model).renderable
+    assert [cell for column in table.columns for cell in column._cells] == ["⚠", "Outdated check", "failed"]
+    assert table.caption == "⚠ check failed: npm outdated failed: E404"
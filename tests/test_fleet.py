@@ -0,0 +1,214 @@
+"""
+Tests for fleet agents, the fleet monitor and the MessagePack codec
+"""
+
+import asyncio
+import time
+
+import pytest
+from rich.console import Console
+
+from devdash.fleet import FleetAgent, FleetMonitor, parse_hosts, render_fleet
+from devdash.msgpack_utils import MsgpackError, packb, unpackb
+
+
+def fake_snapshot(cpu=10, branch="main"):
+    return {
+        "system": {"cpu": cpu, "mem": 40, "disk": 50, "load": 0.5},
+        "ports": [[8000, "python"]],
+        "repo": {"name": "app", "branch": branch, "ahead": 0, "behind": 0, "dirty": 0, "untracked": 0},
+    }
+
+
+class TestMsgpack:
+    """Test the MessagePack subset"""
+    
+    def test_known_bytes(self):
+        """Test output matches the MessagePack spec"""
+        assert packb({"a": 1}) == b"\x81\xa1a\x01"
+        assert packb([None, True, False]) == b"\x93\xc0\xc3\xc2"
+        assert packb(-1) == b"\xff"
+        assert packb(300) == b"\xcd\x01\x2c"
+        assert packb(1.5) == b"\xcb" + bytes.fromhex("3ff8000000000000")
+    
+    def test_round_trip(self):
+        """Test every supported type survives, at every size class"""
+        values = [
+            0, 127, 128, 255, 65535, 2 ** 32, 2 ** 64 - 1,
+            -1, -32, -33, -129, -32769, -2 ** 63,
+            0.25, "", "é" * 40, "x" * 70000, b"\x00" * 300,
+            list(range(20)), {str(i): i for i in range(20)},
+            {"nested": [{"deep": [1, [2, [3]]]}]},
+        ]
+        for value in values:
+            assert unpackb(packb(value)) == value
+        assert unpackb(packb((1, 2))) == [1, 2]
+    
+    def test_errors(self):
+        """Test unencodable values and malformed input raise MsgpackError"""
+        with pytest.raises(MsgpackError):
+            packb(2 ** 64)
+        with pytest.raises(MsgpackError):
+            packb({1, 2})
+        with pytest.raises(MsgpackError, match="truncated"):
+            unpackb(b"\xa5abc")
+        with pytest.raises(MsgpackError, match="extra bytes"):
+            unpackb(b"\x01\x02")
+        with pytest.raises(MsgpackError, match="unsupported"):
+            unpackb(b"\xc1")
+        with pytest.raises(MsgpackError, match="unhashable"):
+            unpackb(b"\x81\x90\x01")
+        with pytest.raises(MsgpackError, match="too deep"):
+            unpackb(b"\x91" * 100 + b"\xc0")
+
+
+def test_parse_hosts():
+    """Test hosts file lines"""
+    lines = ["# fleet", "web1", "db1:9000  # primary", "", "[::1]:7000", "[fe80::1]", "10.0.0.5"]
+    assert parse_hosts(lines) == [
+        ("web1", 7878), ("db1", 9000), ("::1", 7000), ("fe80::1", 7878), ("10.0.0.5", 7878)
+    ]
+
+
+class TestFleet:
+    """Test agents and the monitor over real sockets"""
+    
+    def test_monitor_merges_agents(self):
+        """Test several agents stream into one monitor, sending only changes"""
+        async def scenario():
+            snapshots = {"a": fake_snapshot(cpu=10), "b": fake_snapshot(cpu=90, branch="dev")}
+            agents = [
+                FleetAgent(port=0, interval=0.05, collect=lambda key=key: snapshots[key])
+                for key in snapshots
+            ]
+            for agent in agents:
+                await agent.start()
+            monitor = FleetMonitor([("127.0.0.1", agent.port) for agent in agents])
+            names = list(monitor.states)
+            await monitor.start()
+            try:
+                assert await monitor.wait_until(
+                    lambda m: all(s["system"] for s in m.states.values()), timeout=5
+                )
+                assert monitor.states[names[0]]["system"]["cpu"] == 10
+                assert monitor.states[names[1]]["repo"]["branch"] == "dev"
+                assert monitor.get_summary() == {"hosts": 2, "up": 2, "stale": 0, "down": 0}
+                
+                snapshots["a"] = fake_snapshot(cpu=55)
+                assert await monitor.wait_until(
+                    lambda m: m.states[names[0]]["system"]["cpu"] == 55, timeout=5
+                )
+                
+                # Unchanged sections are not resent
+                sent = []
+                original = agents[1].broadcast
+                agents[1].broadcast = lambda message: (sent.append(message), original(message))
+                await asyncio.sleep(0.2)
+                assert sent and all(m["type"] == "heartbeat" for m in sent)
+                
+                await agents[1].close()
+                assert await monitor.wait_until(
+                    lambda m: m.states[names[1]]["status"] == "down", timeout=5
+                )
+                assert monitor.get_summary()["down"] == 1
+            finally:
+                await monitor.stop()
+                for agent in agents:
+                    await agent.close()
+        
+        asyncio.run(scenario())
+    
+    def test_token_mismatch(self):
+        """Test an agent with a token rejects monitors without it"""
+        async def scenario():
+            agent = FleetAgent(port=0, interval=0.05, token="secret", collect=fake_snapshot)
+            await agent.start()
+            wrong = FleetMonitor([("127.0.0.1", agent.port)], token="guess")
+            right = FleetMonitor([("127.0.0.1", agent.port)], token="secret")
+            await wrong.start()
+            await right.start()
+            try:
+                name = next(iter(wrong.states))
+                assert await wrong.wait_until(lambda m: m.states[name]["status"] == "down", timeout=5)
+                assert wrong.states[name]["error"] == "invalid token"
+                assert await right.wait_until(lambda m: m.states[name]["system"] is not None, timeout=5)
+            finally:
+                await wrong.stop()
+                await right.stop()
+                await agent.close()
+        
+        asyncio.run(scenario())
+    
+    def test_collect_error_keeps_last_snapshot(self):
+        """Test a failed collection reports the error without wiping the last good data"""
+        async def scenario():
+            results = [fake_snapshot(cpu=30)]
+            
+            def collect():
+                if not results:
+                    raise OSError("disk gone")
+                return results.pop()
+            
+            agent = FleetAgent(port=0, interval=0.05, collect=collect)
+            await agent.start()
+            monitor = FleetMonitor([("127.0.0.1", agent.port)])
+            await monitor.start()
+            try:
+                name = next(iter(monitor.states))
+                assert await monitor.wait_until(lambda m: m.states[name]["error"] == "OSError: disk gone", timeout=5)
+                assert monitor.states[name]["system"]["cpu"] == 30
+                assert agent.snapshot["system"]["cpu"] == 30
+            finally:
+                await monitor.stop()
+                await agent.close()
+        
+        asyncio.run(scenario())
+    
+    def test_refused(self):
+        """Test an unreachable agent is reported down"""
+        async def scenario():
+            agent = FleetAgent(port=0, collect=fake_snapshot)
+            await agent.start()
+            port = agent.port
+            await agent.close()
+            
+            monitor = FleetMonitor([("127.0.0.1", port)], connect_timeout=1)
+            await monitor.start()
+            try:
+                name = next(iter(monitor.states))
+                assert await monitor.wait_until(lambda m: m.states[name]["status"] == "down", timeout=5)
+                assert monitor.states[name]["error"] == "refused"
+            finally:
+                await monitor.stop()
+        
+        asyncio.run(scenario())
+
+
+class TestRenderFleet:
+    """Test render_fleet function"""
+    
+    def make_monitor(self):
+        monitor = FleetMonitor([("web1", 7878), ("db1", 9000)])
+        monitor.merge("web1", {"type": "hello", "host": "web1", "interval": 1.0})
+        monitor.merge("web1", dict(fake_snapshot(cpu=93), type="update"))
+        monitor.states["db1:9000"].update(status="down", error="refused")
+        return monitor
+    
+    def test_problems_first(self):
+        """Test down hosts sort first and errors are shown"""
+        console = Console(width=80, record=True)
+        console.print(render_fleet(self.make_monitor()))
+        text = console.export_text()
+        assert "1 up, 0 stale, 1 down" in text
+        assert text.index("db1:9000") < text.index("web1")
+        assert "refused" in text
+        assert "93%" in text
+    
+    def test_stale(self):
+        """Test hosts that stop sending are shown stale"""
+        monitor = self.make_monitor()
+        console = Console(width=80, record=True)
+        console.print(render_fleet(monitor, now=time.time() + 10))
+        text = console.export_text()
+        assert "0 up, 1 stale, 1 down" in text
+        assert "stale 10s" in text
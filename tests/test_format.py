@@ -0,0 +1,15 @@
+"""
+Tests for formatting helpers
+"""
+
+from devdash.format_utils import format_age
+
+
+class TestFormatAge:
+    """Test format_age"""
+    
+    def test_format_age(self):
+        """Test ages are compact"""
+        assert format_age(None) == "-"
+        assert format_age(1000, now=1030) == "now"
+        assert format_age(0, now=3 * 86400 + 5) == "3d"
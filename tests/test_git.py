@@ -4,8 +4,17 @@ Tests for git utilities
 
 import pytest
 import os
+import subprocess
 import tempfile
-from devdash.git_utils import GitInfo
+from devdash.git_utils import GitInfo, find_git_dir, get_operation, parse_status_v2, read_head
+
+
+def git(repo, *args):
+    """Run git in repo"""
+    subprocess.run(
+        ["git", "-c", "user.name=Ann", "-c", "user.email=ann@example.com", *args],
+        cwd=repo, check=True, capture_output=True
+    )
 
 
 class TestGitInfo:
@@ -69,3 +78,78 @@ class TestGitInfo:
         count = git.get_stash_count()
         assert isinstance(count, int)
         assert count >= 0
+
+
+STATUS_V2 = """# branch.oid 1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d7e8f9a0b
+# branch.head feature/x
+# branch.upstream origin/feature/x
+# branch.ab +2 -1
+1 M. N... 100644 100644 100644 aaa bbb staged.py
+1 .M N... 100644 100644 100644 aaa aaa edited.py
+1 MM N... 100644 100644 100644 aaa bbb both.py
+1 A. N... 000000 100644 100644 000 bbb new.py
+2 R. N... 100644 100644 100644 aaa aaa R100 moved.py\told.py
+u UU N... 100644 100644 100644 100644 aaa bbb ccc conflict.py
+? notes.txt
+"""
+
+
+class TestGitState:
+    """Test reading git state with one command (or none)"""
+    
+    def test_parse_status_v2(self):
+        """Test branch, ahead/behind and change counts"""
+        state = parse_status_v2(STATUS_V2)
+        assert state["branch"] == "feature/x"
+        assert state["upstream"] == "origin/feature/x"
+        assert (state["ahead"], state["behind"]) == (2, 1)
+        assert (state["staged"], state["unstaged"]) == (4, 2)
+        assert state["conflicts"] == 1
+        assert state["untracked"] == 1
+        assert state["status"] == {"modified": 3, "added": 1, "deleted": 0, "untracked": 1}
+    
+    def test_parse_status_v2_detached_initial(self):
+        """Test detached HEAD and a repository without commits"""
+        assert parse_status_v2("# branch.oid abc\n# branch.head (detached)\n")["branch"] is None
+        assert parse_status_v2("# branch.oid (initial)\n# branch.head main\n")["oid"] is None
+    
+    def test_find_git_dir_and_head(self, tmp_path, monkeypatch):
+        """Test the git dir is found from a subdirectory and via a gitdir file"""
+        monkeypatch.delenv("GIT_DIR", raising=False)
+        git_dir = tmp_path / "repo" / ".git"
+        (git_dir / "refs").mkdir(parents=True)
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        (tmp_path / "repo" / "src").mkdir()
+        assert find_git_dir(str(tmp_path / "repo" / "src")) == str(git_dir)
+        assert read_head(str(git_dir)) == ("main", None)
+        
+        worktree = tmp_path / "worktree"
+        worktree.mkdir()
+        (worktree / ".git").write_text("gitdir: ../repo/.git\n")
+        assert find_git_dir(str(worktree)) == str(git_dir)
+        
+        (git_dir / "HEAD").write_text("0123456789abcdef\n")
+        assert read_head(str(git_dir)) == (None, "0123456789abcdef")
+        assert get_operation(str(git_dir)) is None
+        (git_dir / "MERGE_HEAD").write_text("x")
+        assert get_operation(str(git_dir)) == "MERGING"
+    
+    def test_get_state(self, tmp_path, monkeypatch):
+        """Test get_state agrees with get_status"""
+        monkeypatch.delenv("GIT_DIR", raising=False)
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        git(repo, "init", "-q", "-b", "main")
+        (repo / "a.txt").write_text("a\n")
+        git(repo, "add", "a.txt")
+        git(repo, "commit", "-q", "-m", "init")
+        (repo / "a.txt").write_text("b\n")
+        (repo / "new.txt").write_text("new\n")
+        
+        info = GitInfo(str(repo))
+        state = info.get_state()
+        assert state["branch"] == "main"
+        assert (state["status"]["modified"], state["status"]["untracked"]) == (1, 1)
+        assert state["status"] == info.get_status()
+        assert info.get_state(untracked=False)["status"]["untracked"] == 0
+        assert GitInfo(str(tmp_path)).get_state() is None
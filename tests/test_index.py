@@ -0,0 +1,171 @@
+"""
+Tests for package index and version utilities
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from devdash.index_utils import PackageIndex, parse_simple_html, version_from_filename
+from devdash.package_utils import PackageInfo
+from devdash.version_utils import (
+    canonicalize_name,
+    compare_versions,
+    is_prerelease,
+    latest_version,
+    parse_version,
+)
+
+
+class StandInIndex(BaseHTTPRequestHandler):
+    """Minimal PEP 691 (JSON) / PEP 503 (HTML) index"""
+    
+    protocol_version = "HTTP/1.1"
+    projects = {
+        "requests": ["2.31.0", "2.32.3", "3.0.0b1"],
+        "rich": ["13.0.0", "13.7.1"],
+    }
+    connections = set()
+    
+    def do_GET(self):
+        StandInIndex.connections.add(self.client_address)
+        name = self.path.strip("/").split("/")[-1]
+        versions = self.projects.get(name)
+        if versions is None:
+            body, content_type, status = b"not found", "text/plain", 404
+        elif "json" in self.headers.get("Accept", "") and name == "requests":
+            files = [{"filename": f"requests-{v}-py3-none-any.whl"} for v in versions]
+            files.append({"filename": "requests-9.0.0.tar.gz", "yanked": "broken"})
+            body = json.dumps({"meta": {"api-version": "1.1"}, "name": name, "files": files}).encode()
+            content_type, status = "application/vnd.pypi.simple.v1+json", 200
+        else:
+            links = "".join(f'<a href="../../files/{name}-{v}.tar.gz">{name}-{v}.tar.gz</a>' for v in versions)
+            body, content_type, status = f"<html><body>{links}</body></html>".encode(), "text/html", 200
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def index_server():
+    """Run the stand-in index on a free localhost port"""
+    StandInIndex.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInIndex)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/simple/"
+    server.shutdown()
+    server.server_close()
+
+
+class TestVersions:
+    """Test PEP 440 ordering"""
+    
+    def test_ordering(self):
+        """Test the canonical PEP 440 ordering"""
+        ordered = [
+            "1.0.dev0", "1.0a1", "1.0a2.dev1", "1.0a2", "1.0b1", "1.0rc1",
+            "1.0", "1.0+local.1", "1.0.post1.dev0", "1.0.post1", "1.1", "2!0.1",
+        ]
+        keys = [parse_version(v) for v in ordered]
+        assert keys == sorted(keys)
+    
+    def test_equivalent_forms(self):
+        """Test normalization of equivalent spellings"""
+        assert compare_versions("1.0", "1.0.0") == 0
+        assert compare_versions("1.0-alpha1", "1.0a1") == 0
+        assert compare_versions("1.0-1", "1.0.post1") == 0
+        assert compare_versions("1.10", "1.9") == 1
+    
+    def test_prerelease_and_latest(self):
+        """Test pre-releases are skipped unless requested"""
+        assert is_prerelease("2.0rc1")
+        assert not is_prerelease("2.0.post1")
+        assert latest_version(["1.0", "2.0rc1", "1.5"]) == "1.5"
+        assert latest_version(["1.0", "2.0rc1"], include_prereleases=True) == "2.0rc1"
+        assert parse_version("not a version") is None
+    
+    def test_canonicalize_name(self):
+        """Test PEP 503 name normalization"""
+        assert canonicalize_name("Typing_Extensions") == "typing-extensions"
+        assert canonicalize_name("zope.interface") == "zope-interface"
+
+
+class TestPackageIndex:
+    """Test PackageIndex class"""
+    
+    def test_filename_versions(self):
+        """Test versions are extracted from distribution filenames"""
+        assert version_from_filename("rich-13.7.1-py3-none-any.whl") == "13.7.1"
+        assert version_from_filename("typing_extensions-4.9.0.tar.gz") == "4.9.0"
+        assert version_from_filename("https://x/pkg-1.0.zip#sha256=abc") == "1.0"
+        assert version_from_filename("README.txt") is None
+    
+    def test_parse_html_skips_yanked(self):
+        """Test yanked files are ignored"""
+        html = '<a href="a-1.0.tar.gz">a-1.0.tar.gz</a><a href="a-2.0.tar.gz" data-yanked="">a-2.0.tar.gz</a>'
+        assert parse_simple_html(html) == ["1.0"]
+    
+    def test_http_index(self, index_server):
+        """Test JSON and HTML project pages over pooled connections"""
+        index = PackageIndex(index_server, concurrency=2)
+        try:
+            found = index.get_many_versions(["requests", "Rich", "missing"] * 5)
+            assert found["requests"] == ["2.31.0", "2.32.3", "3.0.0b1"]
+            assert found["Rich"] == ["13.0.0", "13.7.1"]
+            assert found["missing"] is None
+            assert index.connections_created <= 2
+        finally:
+            index.close()
+    
+    def test_outdated_from_http_index(self, index_server):
+        """Test outdated detection ignores pre-releases and yanked files"""
+        index = PackageIndex(index_server)
+        try:
+            outdated = index.get_outdated({"requests": "2.31.0", "rich": "13.7.1"})
+        finally:
+            index.close()
+        assert outdated == [{
+            "name": "requests", "current": "2.31.0", "wanted": "2.32.3",
+            "latest": "2.32.3", "type": "pip",
+        }]
+    
+    def test_unreachable_index_raises(self):
+        """Test an index that cannot be reached raises OSError"""
+        index = PackageIndex("http://127.0.0.1:9/simple/", timeout=0.5)
+        with pytest.raises(OSError):
+            index.get_outdated({"rich": "13.0.0"})
+    
+    def test_local_directory_index(self, tmp_path):
+        """Test PEP 503 directory layout and flat find-links directories"""
+        project = tmp_path / "simple" / "rich"
+        project.mkdir(parents=True)
+        (project / "index.html").write_text('<a href="rich-14.0.0.tar.gz">rich-14.0.0.tar.gz</a>')
+        flat = tmp_path / "wheels"
+        flat.mkdir()
+        (flat / "typer-0.12.0-py3-none-any.whl").write_text("")
+        (flat / "typer-0.9.0.tar.gz").write_text("")
+        
+        assert PackageIndex(str(tmp_path / "simple")).get_versions("rich") == ["14.0.0"]
+        assert PackageIndex(f"file://{flat}").get_versions("Typer") == ["0.12.0", "0.9.0"]
+    
+    def test_python_outdated_uses_project_env(self, tmp_path):
+        """Test installed versions come from the project's virtualenv"""
+        venv = tmp_path / ".venv"
+        site = venv / "lib" / "python3.11" / "site-packages"
+        dist = site / "rich-13.0.0.dist-info"
+        dist.mkdir(parents=True)
+        (venv / "pyvenv.cfg").write_text("home = /usr/bin\n")
+        (dist / "METADATA").write_text("Metadata-Version: 2.1\nName: rich\nVersion: 13.0.0\n")
+        index = tmp_path / "index"
+        index.mkdir()
+        (index / "rich-13.7.1-py3-none-any.whl").write_text("")
+        
+        assert PackageInfo.get_python_installed(str(tmp_path)) == {"rich": "13.0.0"}
+        outdated = PackageInfo.get_python_outdated(str(tmp_path), index_url=str(index))
+        assert [(p["name"], p["latest"]) for p in outdated] == [("rich", "13.7.1")]
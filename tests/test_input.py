@@ -0,0 +1,84 @@
+"""
+Tests for keyboard input utilities
+"""
+
+import os
+import io
+
+import pytest
+from devdash.input_utils import KeyReader, parse_keys
+from devdash.worker_utils import CollectorPool
+
+termios = pytest.importorskip("termios")
+
+
+@pytest.fixture
+def terminal():
+    """A pseudo-terminal: keys written to master arrive on the slave"""
+    master, slave = os.openpty()
+    stream = os.fdopen(slave, "r")
+    yield master, stream
+    stream.close()
+    os.close(master)
+
+
+class TestParseKeys:
+    """Test splitting raw terminal input into keys"""
+    
+    def test_plain_and_escape_keys(self):
+        """Test printable keys, a lone Esc and Ctrl-C"""
+        assert parse_keys("rg+\x1b\x03") == ["r", "g", "+", "escape", "ctrl-c"]
+    
+    def test_escape_sequences(self):
+        """Test arrows are named and function keys do not turn into letters"""
+        assert parse_keys("\x1b[A\x1bOPq\x1b[15~\x1bOB") == ["up", "q", "down"]
+    
+    def test_named_control_keys(self):
+        """Test Enter and Backspace"""
+        assert parse_keys("a\x7f\r") == ["a", "backspace", "enter"]
+
+
+class TestKeyReader:
+    """Test KeyReader class"""
+    
+    def test_not_a_terminal(self):
+        """Test a non-tty stdin is ignored and wait() still times out"""
+        reader = KeyReader(io.StringIO("q"))
+        assert reader.enabled is False
+        with reader:
+            assert reader.read_keys() == []
+            assert reader.wait(0.01) == []
+    
+    def test_cbreak_mode_is_restored(self, terminal):
+        """Test line buffering and echo are switched off, then restored"""
+        _, stream = terminal
+        before = termios.tcgetattr(stream.fileno())
+        with KeyReader(stream):
+            during = termios.tcgetattr(stream.fileno())
+            assert not during[3] & termios.ICANON
+            assert not during[3] & termios.ECHO
+        assert termios.tcgetattr(stream.fileno()) == before
+    
+    def test_reads_keys_without_enter(self, terminal):
+        """Test single keypresses are returned as they are typed"""
+        master, stream = terminal
+        with KeyReader(stream) as reader:
+            assert reader.wait(0.01) == []
+            os.write(master, b"r")
+            assert reader.wait(5) == ["r"]
+            assert reader.read_keys() == []
+    
+    def test_wakes_up_on_published_result(self, terminal):
+        """Test a collector result ends the wait early, with no keys"""
+        _, stream = terminal
+        pool = CollectorPool(max_workers=1)
+        pool.register("git", lambda: "x", interval=60)
+        pool.start()
+        try:
+            with KeyReader(stream) as reader:
+                reader.wait(0, pool)
+                pool.refresh_all()
+                assert reader.wait(5, pool) == []
+                assert pool.get("git")["value"] == "x"
+        finally:
+            pool.stop()
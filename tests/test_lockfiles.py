@@ -0,0 +1,400 @@
+"""
+Tests for lockfile utilities
+"""
+
+import json
+
+import pytest
+from devdash.lockfile_utils import LockfileInventory
+from devdash.package_utils import PackageInfo
+
+PACKAGE_LOCK = {
+    "name": "app",
+    "lockfileVersion": 3,
+    "requires": True,
+    "packages": {
+        "": {"name": "app", "dependencies": {"express": "^4.0.0"}, "devDependencies": {"jest": "^29"}},
+        "node_modules/express": {"version": "4.18.2", "dependencies": {"debug": "2.6.9", "qs": "6.11.0"}},
+        "node_modules/debug": {"version": "4.3.4", "dependencies": {"ms": "2.1.2"}},
+        "node_modules/express/node_modules/debug": {"version": "2.6.9", "dependencies": {"ms": "2.0.0"}},
+        "node_modules/ms": {"version": "2.1.2"},
+        "node_modules/express/node_modules/ms": {"version": "2.0.0"},
+        "node_modules/qs": {"version": "6.11.0", "engines": {"node": ">=0.6"}},
+        "node_modules/jest": {"version": "29.7.0", "dev": True, "dependencies": {"debug": "^4"}},
+    },
+}
+
+YARN_V1 = '''# THIS IS AN AUTOGENERATED FILE.
+# yarn lockfile v1
+
+
+"@babel/code-frame@^7.0.0", "@babel/code-frame@^7.10.4":
+  version "7.12.13"
+  resolved "https://registry.yarnpkg.com/@babel/code-frame/-/code-frame-7.12.13.tgz"
+  dependencies:
+    "@babel/highlight" "^7.12.13"
+
+"@babel/highlight@^7.12.13":
+  version "7.13.10"
+  dependencies:
+    js-tokens "^4.0.0"
+
+js-tokens@^4.0.0:
+  version "4.0.0"
+'''
+
+YARN_BERRY = '''__metadata:
+  version: 6
+
+"app@workspace:.":
+  version: 0.0.0-use.local
+  resolution: "app@workspace:."
+  dependencies:
+    left-pad: "npm:^1.3.0"
+  languageName: unknown
+
+"left-pad@npm:^1.3.0":
+  version: 1.3.0
+  resolution: "left-pad@npm:1.3.0"
+  languageName: node
+'''
+
+PNPM_V9 = '''lockfileVersion: '9.0'
+
+importers:
+  
+  .:
+    dependencies:
+      react-dom:
+        specifier: ^18.2.0
+        version: 18.2.0(react@18.2.0)
+    devDependencies:
+      typescript:
+        specifier: ^5
+        version: 5.4.2
+
+packages:
+  
+  loose-envify@1.4.0:
+    resolution: {integrity: sha512-x}
+  
+  react-dom@18.2.0:
+    resolution: {integrity: sha512-y}
+  
+  react@18.2.0:
+    resolution: {integrity: sha512-z}
+  
+  typescript@5.4.2:
+    resolution: {integrity: sha512-w}
+
+snapshots:
+  
+  loose-envify@1.4.0: {}
+  
+  react-dom@18.2.0(react@18.2.0):
+    dependencies:
+      loose-envify: 1.4.0
+      react: 18.2.0
+  
+  react@18.2.0:
+    dependencies:
+      loose-envify: 1.4.0
+  
+  typescript@5.4.2: {}
+'''
+
+POETRY_LOCK = '''[[package]]
+name = "markdown-it-py"
+version = "3.0.0"
+files = [
+    {file = "markdown_it_py-3.0.0-py3-none-any.whl", hash = "sha256:x"},
+]
+
+[package.dependencies]
+mdurl = ">=0.1,<1.0"
+
+[[package]]
+name = "mdurl"
+version = "0.1.2"
+
+[[package]]
+name = "rich"
+version = "13.7.1"
+
+[package.dependencies]
+markdown-it-py = ">=2.2.0"
+pygments = {version = ">=2.13.0,<3.0.0"}
+
+[package.extras]
+jupyter = ["ipywidgets (>=7.5.1,<9)"]
+
+[[package]]
+name = "pygments"
+version = "2.17.2"
+
+[metadata]
+lock-version = "2.0"
+'''
+
+PYPROJECT = '''[tool.poetry]
+name = "app"
+
+[tool.poetry.dependencies]
+python = "^3.8"
+rich = "^13"
+'''
+
+UV_LOCK = '''version = 1
+requires-python = ">=3.8"
+
+[[package]]
+name = "app"
+version = "0.1.0"
+source = { editable = "." }
+dependencies = [
+    { name = "httpx" },
+]
+
+[package.dev-dependencies]
+dev = [
+    { name = "pytest" },
+]
+
+[[package]]
+name = "httpx"
+version = "0.27.0"
+source = { registry = "https://pypi.org/simple" }
+dependencies = [
+    { name = "idna" },
+    { name = "sniffio" },
+]
+
+[[package]]
+name = "idna"
+version = "3.7"
+source = { registry = "https://pypi.org/simple" }
+
+[[package]]
+name = "sniffio"
+version = "1.3.1"
+source = { registry = "https://pypi.org/simple" }
+
+[[package]]
+name = "pytest"
+version = "8.2.0"
+source = { registry = "https://pypi.org/simple" }
+'''
+
+CARGO_LOCK = '''version = 3
+
+[[package]]
+name = "app"
+version = "0.1.0"
+dependencies = [
+ "serde",
+ "syn 2.0.60",
+]
+
+[[package]]
+name = "serde"
+version = "1.0.200"
+source = "registry+https://github.com/rust-lang/crates.io-index"
+checksum = "abc"
+dependencies = [
+ "syn 1.0.109",
+]
+
+[[package]]
+name = "syn"
+version = "1.0.109"
+source = "registry+https://github.com/rust-lang/crates.io-index"
+
+[[package]]
+name = "syn"
+version = "2.0.60"
+source = "registry+https://github.com/rust-lang/crates.io-index"
+'''
+
+GO_MOD = '''module example.com/app
+
+go 1.22
+
+require (
+\tgithub.com/spf13/cobra v1.8.0
+\tgithub.com/spf13/pflag v1.0.5 // indirect
+)
+
+require golang.org/x/sys v0.19.0
+'''
+
+GO_SUM = '''github.com/spf13/cobra v1.8.0 h1:a=
+github.com/spf13/cobra v1.8.0/go.mod h1:b=
+github.com/spf13/pflag v1.0.5 h1:c=
+golang.org/x/sys v0.18.0 h1:d=
+golang.org/x/sys v0.19.0 h1:e=
+golang.org/x/text v0.14.0/go.mod h1:f=
+'''
+
+GEMFILE_LOCK = '''GEM
+  remote: https://rubygems.org/
+  specs:
+    actionpack (7.1.3)
+      rack (>= 2.2.4)
+      rails-html-sanitizer (~> 1.6)
+    nokogiri (1.16.4-x86_64-linux)
+      racc (~> 1.4)
+    rack (3.0.10)
+    racc (1.7.3)
+    rails-html-sanitizer (1.6.0)
+      nokogiri (~> 1.14)
+
+PLATFORMS
+  x86_64-linux
+
+DEPENDENCIES
+  actionpack (~> 7.1)
+  rack!
+
+BUNDLED WITH
+   2.5.9
+'''
+
+
+def write(directory, files):
+    """Write a dict of filename -> content into directory"""
+    for name, content in files.items():
+        (directory / name).write_text(content)
+    return str(directory)
+
+
+class TestLockfileInventory:
+    """Test LockfileInventory class"""
+    
+    def test_package_lock(self, tmp_path):
+        """Test npm v3 lockfiles: nested duplicates and dev dependencies"""
+        path = write(tmp_path, {"package-lock.json": json.dumps(PACKAGE_LOCK, indent=2)})
+        inv = LockfileInventory.get_inventory(path)
+        assert inv["ecosystem"] == "npm"
+        assert inv["packages"] == 7
+        assert inv["direct"] == 2
+        assert inv["transitive"] == 3
+        assert {d["name"] for d in inv["duplicates"]} == {"debug", "ms"}
+        assert inv["heaviest"][0] == {"name": "express", "size": 4}
+    
+    def test_yarn_classic(self, tmp_path):
+        """Test yarn v1 lockfiles with direct deps from package.json"""
+        path = write(tmp_path, {
+            "yarn.lock": YARN_V1,
+            "package.json": json.dumps({"dependencies": {"@babel/code-frame": "^7.0.0"}}),
+        })
+        inv = LockfileInventory.get_inventory(path)
+        assert inv["packages"] == 3
+        assert inv["direct"] == 1
+        assert inv["heaviest"] == [{"name": "@babel/code-frame", "size": 3}]
+    
+    def test_yarn_berry(self, tmp_path):
+        """Test yarn berry lockfiles with a workspace root"""
+        path = write(tmp_path, {"yarn.lock": YARN_BERRY})
+        inv = LockfileInventory.get_inventory(path)
+        assert inv["packages"] == 1
+        assert inv["direct"] == 1
+        assert inv["transitive"] == 0
+    
+    def test_pnpm(self, tmp_path):
+        """Test pnpm v9 importers, packages and snapshots"""
+        path = write(tmp_path, {"pnpm-lock.yaml": PNPM_V9})
+        inv = LockfileInventory.get_inventory(path)
+        assert inv["packages"] == 4
+        assert inv["direct"] == 2
+        assert inv["transitive"] == 2
+        assert inv["heaviest"][0] == {"name": "react-dom", "size": 3}
+    
+    def test_pnpm_v5_keys(self):
+        """Test pnpm v5 '/name/version_peer' keys"""
+        assert LockfileInventory._parse_pnpm_key("/react-dom/18.2.0_react@18.2.0:") == ("react-dom", "18.2.0")
+        assert LockfileInventory._parse_pnpm_key("/@babel/core/7.24.0:") == ("@babel/core", "7.24.0")
+        assert LockfileInventory._parse_pnpm_key("/@babel/core@7.24.0:") == ("@babel/core", "7.24.0")
+    
+    def test_poetry(self, tmp_path):
+        """Test poetry lockfiles with direct deps from pyproject.toml"""
+        path = write(tmp_path, {"poetry.lock": POETRY_LOCK, "pyproject.toml": PYPROJECT})
+        inv = LockfileInventory.get_inventory(path)
+        assert inv["packages"] == 4
+        assert inv["direct"] == 1
+        assert inv["heaviest"] == [{"name": "rich", "size": 4}]
+    
+    def test_uv(self, tmp_path):
+        """Test uv lockfiles with an editable root and dev dependencies"""
+        path = write(tmp_path, {"uv.lock": UV_LOCK})
+        inv = LockfileInventory.get_inventory(path)
+        assert inv["packages"] == 4
+        assert inv["direct"] == 2
+        assert inv["transitive"] == 2
+        assert inv["heaviest"][0] == {"name": "httpx", "size": 3}
+    
+    def test_cargo(self, tmp_path):
+        """Test Cargo lockfiles: workspace members and duplicate crates"""
+        path = write(tmp_path, {"Cargo.lock": CARGO_LOCK})
+        inv = LockfileInventory.get_inventory(path)
+        assert inv["packages"] == 3
+        assert inv["direct"] == 2
+        assert inv["transitive"] == 0
+        assert inv["duplicates"] == [{"name": "syn", "versions": ["1.0.109", "2.0.60"]}]
+    
+    def test_roots_are_not_dependencies(self, tmp_path):
+        """Test the project's own package is left out of the counts"""
+        (tmp_path / "cargo").mkdir()
+        (tmp_path / "uv").mkdir()
+        cargo = write(tmp_path / "cargo", {"Cargo.lock": (
+            'version = 3\n\n[[package]]\nname = "myapp"\nversion = "0.1.0"\ndependencies = [\n "serde",\n]\n\n'
+            '[[package]]\nname = "serde"\nversion = "1.0.0"\nsource = "registry+https://github.com/rust-lang/crates.io-index"\n'
+        )})
+        inv = LockfileInventory.get_inventory(cargo)
+        assert (inv["packages"], inv["direct"], inv["transitive"]) == (1, 1, 0)
+        
+        uv = write(tmp_path / "uv", {"uv.lock": (
+            'version = 1\n\n[[package]]\nname = "app"\nversion = "0.1.0"\nsource = { virtual = "." }\n'
+            'dependencies = [\n    { name = "requests" },\n]\n\n'
+            '[[package]]\nname = "requests"\nversion = "2.32.0"\nsource = { registry = "https://pypi.org/simple" }\n'
+            'dependencies = [\n    { name = "idna" },\n]\n\n'
+            '[[package]]\nname = "idna"\nversion = "3.7"\nsource = { registry = "https://pypi.org/simple" }\n'
+        )})
+        inv = LockfileInventory.get_inventory(uv)
+        assert (inv["packages"], inv["direct"], inv["transitive"]) == (2, 1, 1)
+        assert inv["heaviest"] == [{"name": "requests", "size": 2}]
+    
+    def test_go(self, tmp_path):
+        """Test go.sum with direct requirements from go.mod"""
+        path = write(tmp_path, {"go.sum": GO_SUM, "go.mod": GO_MOD})
+        inv = LockfileInventory.get_inventory(path)
+        assert inv["packages"] == 4
+        assert inv["direct"] == 2
+        assert inv["duplicates"][0]["name"] == "golang.org/x/sys"
+        assert inv["heaviest"] == []
+    
+    def test_gemfile(self, tmp_path):
+        """Test Gemfile.lock specs and DEPENDENCIES"""
+        path = write(tmp_path, {"Gemfile.lock": GEMFILE_LOCK})
+        inv = LockfileInventory.get_inventory(path)
+        assert inv["packages"] == 5
+        assert inv["direct"] == 2
+        assert inv["heaviest"][0] == {"name": "actionpack", "size": 5}
+    
+    def test_cached_by_mtime_and_size(self, tmp_path, monkeypatch):
+        """Test unchanged lockfiles are not parsed again"""
+        path = write(tmp_path, {"Gemfile.lock": GEMFILE_LOCK})
+        first = LockfileInventory.get_inventory(path)
+        monkeypatch.setattr(LockfileInventory, "parse", classmethod(lambda cls, *a: pytest.fail("reparsed")))
+        assert LockfileInventory.get_inventory(path) is first
+    
+    def test_no_lockfile(self, tmp_path):
+        """Test projects without a lockfile"""
+        assert LockfileInventory.get_inventory(str(tmp_path)) is None
+    
+    def test_package_count_uses_inventory(self, tmp_path):
+        """Test PackageInfo.get_package_count reports lockfile counts"""
+        path = write(tmp_path, {"Cargo.lock": CARGO_LOCK})
+        counts = PackageInfo.get_package_count(path)
+        assert counts["dependencies"] == 2
+        assert counts["total"] == 3
+        assert counts["duplicates"] == 1
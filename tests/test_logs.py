@@ -0,0 +1,190 @@
+"""
+Tests for log tailing
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+from devdash import log_utils
+from devdash.log_utils import Inotify, LogFile, LogTailer, find_log_files, get_level, tail_lines
+
+
+class TestLogHelpers:
+    """Test tailing, log discovery and level detection"""
+    
+    def test_tail_lines(self, tmp_path):
+        """Test the last lines with and without a final newline"""
+        path = tmp_path / "app.log"
+        path.write_text("one\ntwo\r\nthree\n")
+        assert tail_lines(str(path), 2) == ["two", "three"]
+        assert tail_lines(str(path), 10) == ["one", "two", "three"]
+        path.write_text("one\ntwo")
+        assert tail_lines(str(path), 1) == ["two"]
+        path.write_text("")
+        assert tail_lines(str(path), 5) == []
+        assert tail_lines(str(tmp_path / "missing.log"), 5) == []
+    
+    def test_tail_lines_long_lines(self, tmp_path, monkeypatch):
+        """Test over-long lines are cut and the backward search is bounded"""
+        monkeypatch.setattr(log_utils, "MAX_LINE", 4)
+        monkeypatch.setattr(log_utils, "MAX_SCAN", 8)
+        path = tmp_path / "app.log"
+        path.write_text("x" * 20 + "\nabcdef\n")
+        assert tail_lines(str(path), 5) == ["xxxx", "abcd"]
+    
+    def test_tail_lines_truncated_while_reading(self, tmp_path, monkeypatch):
+        """Test a file truncated after it was mapped yields nothing instead of touching lost pages"""
+        path = tmp_path / "app.log"
+        path.write_text("one\ntwo\n")
+        fstat = os.fstat
+        calls = []
+        
+        def truncating_fstat(fd):
+            # The file is copytruncated once it has been mapped
+            calls.append(fd)
+            st = fstat(fd)
+            return st if len(calls) == 1 else os.stat_result((st.st_mode,) + (0,) * 9)
+        
+        monkeypatch.setattr(os, "fstat", truncating_fstat)
+        assert tail_lines(str(path), 2) == []
+    
+    def test_find_log_files(self, tmp_path):
+        """Test *.log at the root and in logs/, newest first"""
+        (tmp_path / "logs").mkdir()
+        (tmp_path / "npm-debug.log").write_text("x")
+        (tmp_path / "logs" / "app.log").write_text("x")
+        (tmp_path / "logs" / "app.log.1").write_text("x")
+        (tmp_path / "README.md").write_text("x")
+        os.utime(tmp_path / "npm-debug.log", (1, 1))
+        assert find_log_files(str(tmp_path)) == [
+            str(tmp_path / "logs" / "app.log"), str(tmp_path / "npm-debug.log")
+        ]
+    
+    def test_get_level(self):
+        """Test error and warning lines"""
+        assert get_level("2024 ERROR db down") == "error"
+        assert get_level("Traceback (most recent call last):") == "error"
+        assert get_level("[warn] slow query") == "warning"
+        assert get_level("errors=0 terror") is None
+
+
+class TestLogFile:
+    """Tests for LogFile"""
+    
+    def test_appends_and_partial_lines(self, tmp_path):
+        """Test only complete new lines are returned"""
+        path = tmp_path / "app.log"
+        path.write_text("old\n")
+        log = LogFile(str(path))
+        log.open(at_end=True)
+        with open(path, "a") as f:
+            f.write("new\npart")
+        assert list(log.read()) == ["new"]
+        with open(path, "a") as f:
+            f.write("ial\n")
+        assert list(log.read()) == ["partial"]
+        assert list(log.read()) == []
+    
+    def test_rotation_and_truncation(self, tmp_path):
+        """Test a renamed or truncated file is read again from the start"""
+        path = tmp_path / "app.log"
+        path.write_text("old\n")
+        log = LogFile(str(path))
+        log.open(at_end=True)
+        with open(path, "a") as f:
+            f.write("last words\n")
+        os.rename(path, tmp_path / "app.log.1")
+        path.write_text("fresh\n")
+        assert list(log.read()) == ["last words", "fresh"]
+        
+        path.write_text("")
+        with open(path, "a") as f:
+            f.write("hi\n")
+        assert list(log.read()) == ["hi"]
+        assert log.rotations == 2
+    
+    def test_file_created_later(self, tmp_path):
+        """Test a file missing at first is read in full once it appears"""
+        log = LogFile(str(tmp_path / "app.log"))
+        assert not log.open()
+        assert list(log.read()) == []
+        (tmp_path / "app.log").write_text("hello\n")
+        assert list(log.read()) == ["hello"]
+
+
+class TestLogTailer:
+    """Tests for LogTailer"""
+    
+    def test_bounded_lines_and_rates(self, tmp_path):
+        """Test history is seeded from the files and kept to a fixed size"""
+        path = tmp_path / "app.log"
+        path.write_text("".join(f"line {i}\n" for i in range(100)))
+        tailer = LogTailer([str(path)], root=str(tmp_path), lines=3, use_inotify=False)
+        assert [text for _, text in tailer.lines] == ["line 97", "line 98", "line 99"]
+        
+        with open(path, "a") as f:
+            f.write("ok\nERROR one\nok\nfatal two\n")
+        new = tailer.poll(now=1000)
+        assert new == [("app.log", "ERROR one"), ("app.log", "ok"), ("app.log", "fatal two")]
+        assert (tailer.total, tailer.errors) == (4, 2)
+        assert tailer.rates(now=1030) == {"lines": 4, "errors": 2}
+        assert tailer.rates(now=1061) == {"lines": 0, "errors": 0}
+        
+        snapshot = tailer.snapshot(limit=2, now=1000)
+        assert snapshot["lines"][-1] == {"file": "app.log", "text": "fatal two", "level": "error"}
+        assert snapshot["files"] == ["app.log"]
+    
+    def test_invalid_highlight(self, tmp_path):
+        """Test a bad pattern is a ValueError"""
+        with pytest.raises(ValueError):
+            LogTailer([], highlight="(")
+    
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+    def test_inotify_wakes_on_append(self, tmp_path):
+        """Test waiting returns as soon as a followed file grows"""
+        path = tmp_path / "app.log"
+        path.write_text("")
+        (tmp_path / "other.log").write_text("")
+        tailer = LogTailer([str(path)], use_inotify=True)
+        assert isinstance(tailer.inotify, Inotify)
+        
+        def write():
+            time.sleep(0.1)
+            with open(tmp_path / "other.log", "a") as f:
+                f.write("not followed\n")
+            time.sleep(0.1)
+            with open(path, "a") as f:
+                f.write("hello\n")
+        
+        threading.Thread(target=write).start()
+        started = time.monotonic()
+        assert tailer.inotify.wait(5.0)
+        assert 0.15 < time.monotonic() - started < 2.0
+        assert tailer.poll() == [("app.log", "hello")]
+        tailer.close()
+
+
+class TestLogsPanel:
+    """Test the dashboard's logs panel"""
+    
+    def test_dashboard_logs_panel(self, tmp_path):
+        """Test the logs panel model and render"""
+        from devdash.config import get_default_config
+        from devdash.dashboard import DevDash
+        
+        (tmp_path / "logs").mkdir()
+        (tmp_path / "logs" / "app.log").write_text("GET /health 200\nERROR db down\n")
+        config = get_default_config()
+        config["panels"]["logs"] = {"highlight": "db"}
+        dash = DevDash(str(tmp_path), config)
+        dash.daemon = None
+        model = dash.collect_logs()
+        assert [line["text"] for line in model["lines"]] == ["GET /health 200", "ERROR db down"]
+        # The panel polls; only 'logs -f' waits on inotify
+        assert dash.log_tailer.inotify is None
+        panel = dash.render_logs(model)
+        assert "0 errors/min" in str(panel.title)
+        assert [span.style for span in panel.renderable.spans if span.style == "bold magenta"]
@@ -0,0 +1,212 @@
+"""
+Tests for package utilities
+"""
+
+import os
+import time
+import subprocess
+
+import pytest
+from devdash.cache_utils import DiskCache, get_cache_dir
+from devdash.package_utils import PackageCheckError, PackageInfo, env_number, run_check
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the DevDash cache at a temporary directory"""
+    directory = tmp_path / "cache"
+    monkeypatch.setenv("DEVDASH_CACHE_DIR", str(directory))
+    return directory
+
+
+class TestDiskCache:
+    """Test DiskCache class"""
+    
+    def test_cache_dir_override(self, cache_dir):
+        """Test DEVDASH_CACHE_DIR overrides the cache location"""
+        assert get_cache_dir() == cache_dir
+    
+    def test_set_and_get(self, cache_dir):
+        """Test values round-trip through the disk"""
+        cache = DiskCache("test", ttl=60)
+        cache.set("k", [{"name": "rich"}])
+        assert cache.get("k") == [{"name": "rich"}]
+        assert (cache_dir / "test" / "k.json").exists()
+    
+    def test_fresh_hit_skips_compute(self, cache_dir):
+        """Test a fresh entry is returned without recomputing"""
+        cache = DiskCache("test", ttl=60)
+        calls = []
+        compute = lambda: calls.append(1) or len(calls)
+        assert cache.get_or_compute("k", compute) == 1
+        assert cache.get_or_compute("k", compute) == 1
+        assert len(calls) == 1
+    
+    def test_expired_entry_is_recomputed(self, cache_dir):
+        """Test entries past ttl + stale_ttl are recomputed inline"""
+        cache = DiskCache("test", ttl=0, stale_ttl=0)
+        cache.set("k", "old")
+        assert cache.get_or_compute("k", lambda: "new") == "new"
+    
+    def test_stale_while_revalidate(self, cache_dir):
+        """Test a stale entry is served while a background refresh runs"""
+        cache = DiskCache("test", ttl=0, stale_ttl=60)
+        cache.set("k", "old")
+        assert cache.get_or_compute("k", lambda: "new") == "old"
+        deadline = time.time() + 5
+        while cache.is_refreshing("k") and time.time() < deadline:
+            time.sleep(0.01)
+        assert cache.get("k", ttl=60) == "new"
+    
+    def test_corrupt_entry_is_ignored(self, cache_dir):
+        """Test unreadable entries behave like a miss"""
+        cache = DiskCache("test")
+        (cache_dir / "test").mkdir(parents=True)
+        (cache_dir / "test" / "k.json").write_text("{not json")
+        assert cache.get("k") is None
+
+
+class TestPackageInfo:
+    """Test PackageInfo class"""
+    
+    def test_detect_project_type(self, tmp_path):
+        """Test project type detection"""
+        assert PackageInfo.detect_project_type(str(tmp_path)) is None
+        (tmp_path / "requirements.txt").write_text("rich\n")
+        assert PackageInfo.detect_project_type(str(tmp_path)) == "python-pip"
+    
+    def test_manifest_hash_tracks_lockfile(self, tmp_path):
+        """Test the manifest hash changes with lockfile contents"""
+        (tmp_path / "package.json").write_text("{}")
+        first = PackageInfo.get_manifest_hash(str(tmp_path), "node")
+        (tmp_path / "package-lock.json").write_text('{"lockfileVersion": 3}')
+        second = PackageInfo.get_manifest_hash(str(tmp_path), "node")
+        assert first != second
+    
+    def test_outdated_packages_are_cached(self, tmp_path, cache_dir, monkeypatch):
+        """Test repeat checks read the cache until the lockfile changes"""
+        (tmp_path / "requirements.txt").write_text("rich\n")
+        calls = []
+        monkeypatch.setattr(
+            PackageInfo, "get_python_outdated",
+            staticmethod(lambda path=".": calls.append(path) or [{"name": "rich"}])
+        )
+        
+        expected = [{"name": "rich", "project": ".", "update": "other"}]
+        assert PackageInfo.get_outdated_packages(str(tmp_path)) == expected
+        assert PackageInfo.get_outdated_packages(str(tmp_path)) == expected
+        assert len(calls) == 1
+        
+        (tmp_path / "requirements.txt").write_text("rich\ntyper\n")
+        PackageInfo.get_outdated_packages(str(tmp_path))
+        assert len(calls) == 2
+        
+        PackageInfo.get_outdated_packages(str(tmp_path), use_cache=False)
+        assert len(calls) == 3
+    
+    def test_project_list_is_cached(self, tmp_path, monkeypatch):
+        """Test the repository is walked again only when a project or manifest changes"""
+        from devdash.workspace_utils import WorkspaceScanner
+        
+        (tmp_path / "svc").mkdir()
+        (tmp_path / "svc" / "go.mod").write_text("module svc\n")
+        walks = []
+        walk = WorkspaceScanner.walk
+        monkeypatch.setattr(WorkspaceScanner, "walk", lambda self: walks.append(1) or walk(self))
+        
+        first = PackageInfo.find_projects(str(tmp_path))
+        assert PackageInfo.find_projects(str(tmp_path)) is first
+        assert len(walks) == 1
+        
+        (tmp_path / "svc" / "package.json").write_text("{}")
+        assert [p["ecosystem"] for p in PackageInfo.find_projects(str(tmp_path))] == ["node", "go"]
+        assert len(walks) == 2
+    
+    def test_failed_check_is_not_cached(self, tmp_path, cache_dir, monkeypatch):
+        """Test a check that could not run is retried instead of cached as up to date"""
+        (tmp_path / "requirements.txt").write_text("rich\n")
+        results = iter([PackageCheckError("index unreachable"), [{"name": "rich"}]])
+        
+        def check(path="."):
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        
+        monkeypatch.setattr(PackageInfo, "get_python_outdated", staticmethod(check))
+        assert PackageInfo.get_outdated_report(str(tmp_path)) == {
+            "outdated": [], "errors": [{"project": ".", "error": "index unreachable"}],
+        }
+        assert [p["name"] for p in PackageInfo.get_outdated_packages(str(tmp_path))] == ["rich"]
+    
+    def test_run_check_failures(self, tmp_path):
+        """Test a missing tool or a failure without output is a PackageCheckError"""
+        with pytest.raises(PackageCheckError):
+            run_check(["devdash-no-such-tool", "outdated"], str(tmp_path), timeout=5)
+        with pytest.raises(PackageCheckError, match="boom"):
+            run_check(["sh", "-c", "echo boom >&2; exit 1"], str(tmp_path), timeout=5)
+        # npm/bundler exit 1 when they find updates
+        assert run_check(["sh", "-c", "echo '{}'; exit 1"], str(tmp_path), timeout=5).stdout == "{}\n"
+    
+    def test_env_number(self, monkeypatch):
+        """Test malformed settings fall back to the default instead of failing at import"""
+        monkeypatch.setenv("DEVDASH_TEST_NUMBER", "soon")
+        assert env_number("DEVDASH_TEST_NUMBER", 6.0) == 6.0
+        monkeypatch.setenv("DEVDASH_TEST_NUMBER", "8")
+        assert env_number("DEVDASH_TEST_NUMBER", 4, int) == 8
+    
+    def test_update_kind(self):
+        """Test updates are classified by the first release segment that changes"""
+        assert PackageInfo.get_update_kind("1.2.3", "2.0.0") == "major"
+        assert PackageInfo.get_update_kind("v1.2.3", "v1.3.0") == "minor"
+        assert PackageInfo.get_update_kind("1.2", "1.2.1") == "patch"
+        assert PackageInfo.get_update_kind("?", "1.0") == "other"
+    
+    def test_ecosystem_parsers(self, monkeypatch):
+        """Test go, bundler and composer output parsing"""
+        outputs = {
+            "go": '{"Path": "app", "Main": true}\n{"Path": "golang.org/x/net", "Version": "v0.1.0",'
+                  ' "Update": {"Version": "v0.2.0"}}\n{"Path": "x/y", "Version": "v1.0.0", "Indirect": true,'
+                  ' "Update": {"Version": "v2.0.0"}}\n',
+            "bundle": "rack (newest 3.0.10, installed 2.2.8, requested ~> 2.2)\nnoise\n",
+            "composer": '{"installed": [{"name": "monolog/monolog", "version": "2.9.1",'
+                        ' "latest": "3.5.0", "latest-status": "update-possible"}]}',
+        }
+        monkeypatch.setattr(
+            subprocess, "run",
+            lambda command, **kwargs: subprocess.CompletedProcess(command, 0, outputs[command[0]], "")
+        )
+        
+        assert PackageInfo.get_go_outdated() == [{
+            "name": "golang.org/x/net", "current": "v0.1.0", "wanted": "v0.2.0",
+            "latest": "v0.2.0", "type": "go",
+        }]
+        assert [(p["name"], p["current"], p["latest"]) for p in PackageInfo.get_bundle_outdated()] == [
+            ("rack", "2.2.8", "3.0.10")
+        ]
+        assert PackageInfo.get_composer_outdated()[0]["latest"] == "3.5.0"
+    
+    def test_monorepo_checks_are_merged_and_ranked(self, tmp_path, cache_dir, monkeypatch):
+        """Test every project is checked once and results are ranked by update size"""
+        (tmp_path / "package.json").write_text('{"workspaces": ["packages/*"]}')
+        (tmp_path / "packages" / "ui").mkdir(parents=True)
+        (tmp_path / "packages" / "ui" / "package.json").write_text("{}")
+        (tmp_path / "svc").mkdir()
+        (tmp_path / "svc" / "go.mod").write_text("module svc\n")
+        
+        calls = []
+        monkeypatch.setattr(PackageInfo, "get_node_outdated", staticmethod(
+            lambda path=".", workspaces=False: calls.append(("node", workspaces))
+            or [{"name": "react", "current": "18.2.0", "latest": "18.3.1"}]
+        ))
+        monkeypatch.setattr(PackageInfo, "get_go_outdated", staticmethod(
+            lambda path=".": calls.append(("go", path))
+            or [{"name": "golang.org/x/net", "current": "v0.1.0", "latest": "v1.0.0"}]
+        ))
+        
+        outdated = PackageInfo.get_outdated_packages(str(tmp_path))
+        assert sorted(calls, key=str) == [("go", str(tmp_path / "svc")), ("node", True)]
+        assert [(p["name"], p["project"], p["update"]) for p in outdated] == [
+            ("golang.org/x/net", "svc", "major"),
+            ("react", ".", "minor"),
+        ]
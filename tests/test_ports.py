@@ -2,8 +2,11 @@
 Tests for port utilities
 """
 
+import json
+import os
+
 import pytest
-from devdash.port_utils import PortScanner
+from devdash.port_utils import PortScanner, PortWatcher
 
 
 class TestPortScanner:
@@ -49,3 +52,198 @@ class TestPortScanner:
         assert 443 in PortScanner.COMMON_PORTS
         assert 5432 in PortScanner.COMMON_PORTS
         assert PortScanner.COMMON_PORTS[80] == "HTTP"
+
+
+class TestSocketTable:
+    """Test /proc/net socket table parsing"""
+    
+    def test_read_socket_table(self, tmp_path, monkeypatch):
+        """Test hex addresses, states and queues are decoded"""
+        header = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+        (tmp_path / "tcp").write_text(
+            header
+            + "   0: 0100007F:1F90 00000000:0000 0A 00000000:00000003 00:00000000 00000000  1000        0 4242 1\n"
+            + "   1: 0100007F:1F90 0100007F:C350 01 00000010:00000000 00:00000000 00000000  1000        0 4243 1\n"
+        )
+        (tmp_path / "tcp6").write_text(
+            header
+            + "   0: 00000000000000000000000001000000:1538 00000000000000000000000000000000:0000 0A 00000000:00000000 00:00000000 00000000  0  0 99 1\n"
+        )
+        monkeypatch.setattr(PortScanner, "PROC_NET", str(tmp_path))
+        
+        table = PortScanner.read_socket_table()
+        assert len(table) == 3
+        listen = table[0]
+        assert listen["address"] == "127.0.0.1"
+        assert listen["port"] == 8080
+        assert listen["state"] == "LISTEN"
+        assert listen["rx_queue"] == 3
+        assert listen["inode"] == 4242
+        assert table[1]["state"] == "ESTABLISHED"
+        assert table[1]["remote_port"] == 50000
+        assert table[1]["tx_queue"] == 16
+        assert table[2]["address"] == "::1"
+        assert table[2]["port"] == 5432
+    
+    def test_listening_sockets_load(self, tmp_path, monkeypatch):
+        """Test connection counts, queues and owners come from one table pass"""
+        net = tmp_path / "net"
+        net.mkdir()
+        header = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+        (net / "tcp").write_text(
+            header
+            + "   0: 00000000:1F40 00000000:0000 0A 00000080:00000002 00:00000000 00000000  0  0 501 1\n"
+            + "   1: 0100007F:1F40 0100007F:C350 01 00000000:00000000 00:00000000 00000000  0  0 502 1\n"
+            + "   2: 0100007F:1F40 0100007F:C351 01 00000000:00000000 00:00000000 00000000  0  0 503 1\n"
+            + "   3: 0100007F:C352 0100007F:1F40 01 00000000:00000000 00:00000000 00000000  0  0 504 1\n"
+        )
+        fd_dir = tmp_path / "4321" / "fd"
+        fd_dir.mkdir(parents=True)
+        os.symlink("socket:[501]", fd_dir / "3")
+        monkeypatch.setattr(PortScanner, "PROC_ROOT", str(tmp_path))
+        monkeypatch.setattr(PortScanner, "PROC_NET", str(net))
+        monkeypatch.setattr(PortScanner, "_socket_owners", {})
+        monkeypatch.setattr(PortScanner, "get_process_usage",
+                            classmethod(lambda cls, pid: {"name": "node", "cpu": 12.0, "rss": 2048}))
+        
+        sockets = PortScanner.get_listening_sockets()
+        assert len(sockets) == 1
+        record = sockets[0]
+        assert record["port"] == 8000
+        assert record["established"] == 2
+        assert record["rx_queue"] == 2
+        assert record["tx_queue"] == 128
+        assert record["pid"] == 4321
+        assert record["process"] == "node"
+        assert record["cpu"] == 12.0
+    
+    def test_unowned_sockets_are_not_rescanned(self, tmp_path, monkeypatch):
+        """Test an inode without a visible owner is looked for once, until it goes away"""
+        net = tmp_path / "net"
+        net.mkdir()
+        header = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+        row = "   0: 00000000:0016 00000000:0000 0A 00000000:00000000 00:00000000 00000000  0  0 {} 1\n"
+        (net / "tcp").write_text(header + row.format(700))
+        scans = []
+        monkeypatch.setattr(PortScanner, "PROC_NET", str(net))
+        monkeypatch.setattr(PortScanner, "_socket_owners", {})
+        monkeypatch.setattr(PortScanner, "_resolve_socket_owners", classmethod(lambda cls, inodes: scans.append(inodes) or {}))
+        
+        PortScanner.get_listening_sockets()
+        PortScanner.get_listening_sockets()
+        assert scans == [{700}]
+        (net / "tcp").write_text(header + row.format(701))
+        assert PortScanner.get_listening_sockets()[0]["pid"] is None
+        assert scans == [{700}, {701}]
+        assert PortScanner._socket_owners == {701: None}
+    
+    def test_empty_socket_table_does_not_fall_back(self, tmp_path, monkeypatch):
+        """Test an empty /proc/net table is the answer, not a reason to ask psutil"""
+        header = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+        (tmp_path / "tcp").write_text(header)
+        monkeypatch.setattr(PortScanner, "PROC_NET", str(tmp_path))
+        monkeypatch.setattr(PortScanner, "_get_sockets_fallback", classmethod(lambda cls: pytest.fail("fell back")))
+        assert PortScanner.get_listening_sockets() == []
+    
+    def test_process_usage_handle_is_cached(self):
+        """Test the same process handle is reused between calls"""
+        pid = os.getpid()
+        first = PortScanner.get_process_usage(pid)
+        handle = PortScanner._processes.get(pid)
+        second = PortScanner.get_process_usage(pid)
+        assert first["rss"] > 0
+        assert second["cpu"] is not None
+        assert PortScanner._processes.get(pid) is handle
+    
+    def test_missing_proc_net(self, tmp_path, monkeypatch):
+        """Test a missing /proc/net yields an empty table"""
+        monkeypatch.setattr(PortScanner, "PROC_NET", str(tmp_path / "missing"))
+        assert PortScanner.read_socket_table() == []
+
+
+class TestPortWatcher:
+    """Test PortWatcher class"""
+    
+    @staticmethod
+    def sock(port, pid=1, inode=None, address="127.0.0.1"):
+        return {"proto": "tcp", "address": address, "port": port, "inode": inode or port,
+                "pid": pid, "process": f"proc{pid}", "service": "x", "icon": "●"}
+    
+    def test_first_poll_primes(self):
+        """Test the first snapshot emits no events"""
+        watcher = PortWatcher(source=lambda: [self.sock(3000)])
+        assert watcher.poll() == []
+        assert [p["port"] for p in watcher.ports] == [3000]
+    
+    def test_opened_closed_owner_changed(self):
+        """Test events for socket set changes"""
+        snapshots = iter([
+            [self.sock(3000), self.sock(8000)],
+            [self.sock(8000, pid=2), self.sock(5173)],
+        ])
+        watcher = PortWatcher(source=lambda: next(snapshots))
+        watcher.poll()
+        events = {(e["event"], e["port"]) for e in watcher.poll()}
+        assert events == {("closed", 3000), ("opened", 5173), ("owner-changed", 8000)}
+        assert [p["port"] for p in watcher.ports] == [5173, 8000]
+        assert watcher.ports[1]["pid"] == 2
+    
+    def test_new_inode_is_reopen(self):
+        """Test a rebound socket with a new inode is a close plus an open"""
+        snapshots = iter([[self.sock(3000, inode=1)], [self.sock(3000, inode=2)]])
+        watcher = PortWatcher(source=lambda: next(snapshots))
+        watcher.poll()
+        assert sorted(e["event"] for e in watcher.poll()) == ["closed", "opened"]
+    
+    def test_stable_set_is_not_rebuilt(self):
+        """Test nothing changes when the socket set is stable"""
+        watcher = PortWatcher(source=lambda: [self.sock(8000), self.sock(3000)])
+        watcher.poll()
+        version, ports = watcher.version, watcher.ports
+        assert watcher.poll() == []
+        assert watcher.version == version
+        assert watcher.ports is ports
+    
+    def test_cpu_jitter_is_not_a_change(self):
+        """Test load changes below the shown precision keep the version but update the records"""
+        snapshots = iter([
+            [dict(self.sock(3000), cpu=12.01, rss=5 << 20)],
+            [dict(self.sock(3000), cpu=12.3, rss=(5 << 20) + 100)],
+            [dict(self.sock(3000), cpu=40.0, rss=5 << 20)],
+        ])
+        watcher = PortWatcher(source=lambda: next(snapshots))
+        watcher.poll()
+        version = watcher.version
+        assert watcher.poll() == []
+        assert watcher.version == version
+        assert watcher.ports[0]["cpu"] == 12.3
+        watcher.poll()
+        assert watcher.version == version + 1
+    
+    def test_recent_changes_and_ndjson(self):
+        """Test highlight window and NDJSON output"""
+        snapshots = iter([[], [self.sock(3000)]])
+        watcher = PortWatcher(source=lambda: next(snapshots), highlight_seconds=10)
+        watcher.poll()
+        event = watcher.poll()[0]
+        assert 3000 in watcher.recent_changes(now=event["time"] + 5)
+        assert watcher.recent_changes(now=event["time"] + 20) == {}
+        line = PortWatcher.to_ndjson(event)
+        assert "\n" not in line
+        assert json.loads(line)["event"] == "opened"
+    
+    def test_ndjson_without_rich(self, monkeypatch, capsys):
+        """Test --ndjson streams events even when rich is missing"""
+        from devdash import dashboard, port_utils
+        
+        monkeypatch.setattr(dashboard, "RICH_AVAILABLE", False)
+        dash = dashboard.DevDash(".")
+        dash.port_watcher = PortWatcher(source=lambda: [self.sock(3000)])
+        
+        def interrupt(seconds):
+            raise KeyboardInterrupt
+        
+        monkeypatch.setattr(port_utils.time, "sleep", interrupt)
+        dash.watch_ports(ndjson=True)
+        lines = capsys.readouterr().out.splitlines()
+        assert json.loads(lines[-1])["port"] == 3000
@@ -0,0 +1,154 @@
+"""
+Tests for service probing utilities
+"""
+
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+
+import pytest
+from devdash.port_utils import PortScanner
+from devdash.probe_utils import ServiceProber
+
+
+def start_server(reply: bytes = b"", context: ssl.SSLContext = None):
+    """Start a one-thread TCP server that answers every connection with reply"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            if context is not None:
+                try:
+                    conn = context.wrap_socket(conn, server_side=True)
+                except OSError:
+                    continue
+            with conn:
+                if reply:
+                    try:
+                        conn.recv(1024)
+                        conn.sendall(reply)
+                    except OSError:
+                        pass
+    
+    threading.Thread(target=serve, daemon=True).start()
+    return server, server.getsockname()[1]
+
+
+class TestServiceProber:
+    """Test ServiceProber class"""
+    
+    def test_parse_port_only(self):
+        """Test parsing a bare port uses localhost and the default check"""
+        target = ServiceProber.parse_target("5432")
+        assert target["host"] == "127.0.0.1"
+        assert target["port"] == 5432
+        assert target["check"] == "postgres"
+        assert target["service"] == "PostgreSQL"
+    
+    def test_parse_url_targets(self):
+        """Test parsing scheme URLs"""
+        http = ServiceProber.parse_target("http+get://localhost:8000/health?x=1")
+        assert http["check"] == "http"
+        assert http["method"] == "GET"
+        assert http["path"] == "/health?x=1"
+        https = ServiceProber.parse_target("https://localhost/health")
+        assert (https["check"], https["port"], https["tls"]) == ("http", 443, True)
+        assert ServiceProber.parse_target("http://localhost")["tls"] is False
+        redis = ServiceProber.parse_target("redis://10.0.0.1:6380")
+        assert redis["check"] == "redis"
+        assert redis["key"] == "10.0.0.1:6380"
+    
+    def test_parse_invalid(self):
+        """Test invalid targets raise ValueError"""
+        with pytest.raises(ValueError):
+            ServiceProber.parse_target("localhost:http")
+        with pytest.raises(ValueError):
+            ServiceProber.parse_target("70000")
+        with pytest.raises(ValueError):
+            ServiceProber.parse_target("ftp://localhost:21")
+    
+    def test_probe_open_and_closed(self):
+        """Test a listening port is up with a latency and a closed one is down"""
+        server, port = start_server()
+        closed = PortScanner.find_free_port(41000, 42000)
+        try:
+            prober = ServiceProber([str(port), str(closed)], timeout=1.0)
+            results = {r["port"]: r for r in prober.probe()}
+            assert results[port]["up"] is True
+            assert results[port]["latency"] >= 0
+            assert results[closed]["up"] is False
+            assert results[closed]["latency"] is None
+        finally:
+            server.close()
+    
+    def test_redis_and_http_handshakes(self):
+        """Test protocol checks against stand-in servers"""
+        redis, redis_port = start_server(b"+PONG\r\n")
+        http, http_port = start_server(b"HTTP/1.1 204 No Content\r\n\r\n")
+        try:
+            prober = ServiceProber([f"redis://127.0.0.1:{redis_port}", f"http://127.0.0.1:{http_port}/"])
+            results = {r["check"]: r for r in prober.probe()}
+            assert results["redis"]["up"] is True
+            assert results["redis"]["detail"] == "PONG"
+            assert results["http"]["up"] is True
+            assert results["http"]["detail"] == "HTTP 204"
+            assert results["http"]["check_latency"] is not None
+        finally:
+            redis.close()
+            http.close()
+    
+    @pytest.mark.skipif(shutil.which("openssl") is None, reason="needs openssl to make a certificate")
+    def test_https_handshake(self, tmp_path):
+        """Test https targets speak HTTP over TLS, self-signed certificates included"""
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=localhost",
+             "-keyout", str(tmp_path / "key.pem"), "-out", str(tmp_path / "cert.pem")],
+            check=True, capture_output=True
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(tmp_path / "cert.pem", tmp_path / "key.pem")
+        server, port = start_server(b"HTTP/1.1 200 OK\r\n\r\n", context)
+        try:
+            secure, plain = ServiceProber([f"https://127.0.0.1:{port}/", f"http://127.0.0.1:{port}/"]).probe()
+            assert (secure["up"], secure["detail"]) == (True, "HTTP 200")
+            assert plain["up"] is False
+        finally:
+            server.close()
+    
+    def test_rolling_window_stats(self):
+        """Test percentiles are computed over a bounded window"""
+        server, port = start_server()
+        try:
+            prober = ServiceProber([str(port)], window=3)
+            for _ in range(5):
+                prober.probe()
+            stats = prober.get_stats(f"127.0.0.1:{port}")
+            assert stats["samples"] == 3
+            assert stats["availability"] == 100.0
+            assert stats["p50"] <= stats["p99"]
+        finally:
+            server.close()
+    
+    def test_percentile(self):
+        """Test nearest-rank percentile"""
+        values = [float(v) for v in range(1, 101)]
+        assert ServiceProber.percentile(values, 50) == 50.0
+        assert ServiceProber.percentile(values, 99) == 99.0
+        assert ServiceProber.percentile([], 50) is None
+    
+    def test_measure_port(self):
+        """Test measure_port returns latency for an open port"""
+        server, port = start_server()
+        try:
+            assert PortScanner.measure_port(port, timeout=0.5) is not None
+            assert PortScanner.check_port(port, timeout=0.5) is True
+        finally:
+            server.close()
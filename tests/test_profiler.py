@@ -0,0 +1,114 @@
+"""
+Tests for the self-profiler and the dashboard's --profile mode
+"""
+
+import json
+import subprocess
+
+from devdash.dashboard import DevDash
+from devdash.profiler import Profiler, describe_command, percentile
+
+
+def test_percentile():
+    """Test nearest-rank percentiles"""
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile([7.0], 0.95) == 7.0
+    assert percentile([], 0.5) is None
+
+
+def test_describe_command():
+    """Test subprocess spans are named by program and subcommand"""
+    assert describe_command(["/usr/bin/git", "--no-pager", "status", "--porcelain"]) == "git status"
+    assert describe_command("npm outdated --json") == "npm outdated"
+    assert describe_command(["uname", "-a"]) == "uname"
+
+
+class TestProfiler:
+    """Test Profiler class"""
+    
+    def test_spans_and_wrap(self):
+        """Test spans are recorded per name and summarized slowest first"""
+        profiler = Profiler()
+        fast = profiler.wrap(lambda: 1, "fast", "collect")
+        lookup = profiler.wrap(lambda name: name, "get", "collect", detail=lambda name: name)
+        assert fast() == 1
+        assert lookup("git") == "git"
+        with profiler.span("slow", "render"):
+            sum(range(200_000))
+        
+        summary = profiler.get_summary()
+        names = [s["name"] for s in summary["spans"]]
+        assert set(names) == {"fast", "get git", "slow"}
+        assert names[0] == "slow"
+        assert summary["spans"][0]["category"] == "render"
+        assert summary["spans"][0]["count"] == 1
+    
+    def test_subprocesses(self):
+        """Test subprocesses are timed and counted per frame, and hooks are removed"""
+        original_run = subprocess.run
+        profiler = Profiler()
+        profiler.install()
+        try:
+            with profiler.frame():
+                subprocess.run(["git", "--version"], capture_output=True)
+                subprocess.run(["git", "--version"], capture_output=True)
+            with profiler.frame():
+                pass
+        finally:
+            profiler.uninstall()
+        assert subprocess.run is original_run
+        
+        summary = profiler.get_summary()
+        assert summary["subprocesses"] == 2
+        assert summary["frames"] == 2
+        assert summary["subprocesses_per_frame"] == 1.0
+        assert summary["frame_p95"] is not None
+        assert [s["count"] for s in summary["spans"] if s["name"] == "git"] == [2]
+        
+        subprocess.run(["git", "--version"], capture_output=True)
+        assert profiler.get_summary()["subprocesses"] == 2
+    
+    def test_chrome_trace(self, tmp_path):
+        """Test the export is trace-event JSON with complete events and thread names"""
+        profiler = Profiler()
+        with profiler.span("collect_git", "collect"):
+            pass
+        path = tmp_path / "trace.json"
+        assert profiler.export_chrome_trace(str(path)) == 1
+        
+        trace = json.loads(path.read_text())
+        events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert events[0]["name"] == "collect_git"
+        assert events[0]["cat"] == "collect"
+        assert {"ts", "dur", "pid", "tid"} <= set(events[0])
+        assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in trace["traceEvents"])
+
+
+def test_dashboard_profile_panel(tmp_path):
+    """Test --profile wraps collectors and renderers and adds the debug panel"""
+    dash = DevDash(str(tmp_path))
+    dash.daemon = None
+    profiler = dash.enable_profiling()
+    try:
+        assert dash.enable_profiling() is profiler
+        layout = dash.create_layout()
+        assert layout.get("profile") is not None
+        with dash.profile_frame():
+            dash.update_layout(layout)
+        with dash.profile_frame():
+            dash.update_layout(layout)
+    finally:
+        profiler.uninstall()
+    
+    names = {s["name"] for s in profiler.get_summary()["spans"]}
+    assert {"collect_git", "collect_system", "render_git"} <= names
+    assert not {"collect_profile", "render_profile", "create_profile_panel"} & names
+    assert profiler.frames == 2
+    
+    model = dash.collect_profile()
+    assert model["frames"] == 2
+    assert len(model["spans"]) <= DevDash.PROFILE_ROWS
+    assert dash.create_layout("git").get("profile") is not None
+    assert DevDash(str(tmp_path)).create_layout().get("profile") is None
@@ -0,0 +1,144 @@
+"""
+Tests for the project index and finder
+"""
+
+import os
+import subprocess
+
+import pytest
+from devdash import project_utils
+from devdash.cache_utils import DiskCache
+from devdash.project_utils import ProjectIndex, frecency, trigrams
+
+
+def git(repo, *args):
+    """Run git in repo"""
+    subprocess.run(
+        ["git", "-c", "user.name=Ann", "-c", "user.email=ann@example.com", *args],
+        cwd=repo, check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """A git repository, a node project, a nested project and a plain directory"""
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    root = tmp_path / "code"
+    (root / "api-server").mkdir(parents=True)
+    git(root / "api-server", "init", "-q")
+    (root / "api-server" / "go.mod").write_text("module api\n")
+    git(root / "api-server", "add", ".")
+    git(root / "api-server", "commit", "-q", "-m", "init")
+    (root / "clients" / "web-app").mkdir(parents=True)
+    (root / "clients" / "web-app" / "package.json").write_text("{}")
+    (root / "clients" / "web-app" / "lib").mkdir()
+    (root / "clients" / "web-app" / "lib" / "setup.py").write_text("")
+    (root / "notes").mkdir()
+    return root
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Project index in a temporary cache directory"""
+    return ProjectIndex(DiskCache("projects", ttl=float("inf"), cache_dir=tmp_path / "cache"))
+
+
+def make_index(index, paths, **fields):
+    """Fill an index with entries for paths, without touching the disk"""
+    index._projects = {
+        path: {"name": os.path.basename(path), "type": None, "commit": None, "dirty": None,
+               "rank": 0, "visited": 0, **fields}
+        for path in paths
+    }
+    index._build()
+    return index
+
+
+def test_trigrams():
+    """Test every run of three characters"""
+    assert trigrams("abcd") == {"abc", "bcd"}
+    assert trigrams("ab") == set()
+
+
+def test_frecency():
+    """Test recent visits count more"""
+    assert frecency({"rank": 2, "visited": 1000}, now=1000 + 60) == 8
+    assert frecency({"rank": 2, "visited": 1000}, now=1000 + 30 * 86400) == 0.5
+    assert frecency({"rank": 0, "visited": 1000}, now=1000) == 0
+
+
+class TestProjectIndex:
+    """Tests for ProjectIndex"""
+    
+    def test_scan_and_metadata(self, workspace, index):
+        """Test discovery stops at project roots and reads type, commit and state"""
+        assert index.scan([str(workspace)]) == 2
+        projects = {p["name"]: p for p in index.search("")}
+        assert set(projects) == {"api-server", "web-app"}
+        assert projects["api-server"]["type"] == "go"
+        assert projects["api-server"]["commit"] > 0
+        assert projects["api-server"]["dirty"] is False
+        assert projects["web-app"]["type"] == "node"
+        assert projects["web-app"]["dirty"] is None
+        
+        (workspace / "api-server" / "go.mod").write_text("module api2\n")
+        index.refresh([str(workspace / "api-server")])
+        assert index.search("api")[0]["dirty"] is True
+    
+    def test_persisted_and_rescanned(self, workspace, index):
+        """Test the index survives a new instance and a rescan drops removed projects"""
+        index.scan([str(workspace)])
+        (workspace / "clients" / "web-app" / "package.json").unlink()
+        (workspace / "clients" / "web-app" / "lib" / "setup.py").unlink()
+        
+        reloaded = ProjectIndex(index.cache)
+        assert len(reloaded) == 2
+        assert reloaded.roots == [str(workspace)]
+        reloaded.scan(reloaded.roots)
+        assert [p["name"] for p in reloaded.search("")] == ["api-server"]
+    
+    def test_search_ranking(self, index):
+        """Test name matches beat path matches, which beat fuzzy ones"""
+        make_index(index, ["/src/web/api", "/src/api-tools/cli", "/src/apps/pi", "/src/other"])
+        assert [p["path"] for p in index.search("api")] == ["/src/web/api", "/src/api-tools/cli", "/src/apps/pi"]
+        assert [p["path"] for p in index.search("api cli")] == ["/src/api-tools/cli"]
+        assert index.search("zzz") == []
+    
+    def test_fuzzy_only_when_exact_runs_short(self, index):
+        """Test subsequence matches fill in when substring matches are fewer than the limit"""
+        make_index(index, ["/src/devdash", "/src/dxaxsxh"])
+        assert [p["path"] for p in index.search("ddsh")] == ["/src/devdash"]
+        assert [p["path"] for p in index.search("dash")] == ["/src/devdash", "/src/dxaxsxh"]
+        assert [p["path"] for p in index.search("dash", limit=1)] == ["/src/devdash"]
+    
+    def test_frecency_breaks_ties(self, index):
+        """Test visited projects come first among equal matches"""
+        make_index(index, ["/a/app-one", "/a/app-two"])
+        index.visit("/a/app-two", now=1000)
+        assert index.search("app", now=1060)[0]["path"] == "/a/app-two"
+        assert index.search("", now=1060)[0]["frecency"] == 4
+    
+    def test_visit_adds_and_ages(self, workspace, index, monkeypatch):
+        """Test visiting an unknown project adds it, and counts fade past MAX_RANK"""
+        monkeypatch.setattr(project_utils, "MAX_RANK", 2)
+        assert index.visit(str(workspace / "notes")) is None
+        entry = index.visit(str(workspace / "api-server"))
+        assert entry["type"] == "go" and entry["rank"] == 1
+        index.visit(str(workspace / "api-server"))
+        assert index.visit(str(workspace / "api-server"))["rank"] == pytest.approx(2.7)
+
+
+def test_dashboard_projects_panel(workspace, index):
+    """Test the panel visits the dashboard's project and renders the index"""
+    from devdash.dashboard import DevDash
+    
+    dash = DevDash(str(workspace / "api-server"))
+    dash.daemon = None
+    dash.project_index = index
+    index.scan([str(workspace)])
+    model = dash.collect_projects()
+    assert model["total"] == 2
+    assert model["rows"][0]["name"] == "api-server"
+    assert model["rows"][0]["current"] is True
+    assert "PROJECTS (2)" in str(dash.render_projects(model).title)
+    assert "❯ web" in str(dash.render_projects({**model, "query": "web", "selected": 1}).title)
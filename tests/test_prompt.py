@@ -0,0 +1,143 @@
+"""
+Tests for the shell prompt segment
+"""
+
+import os
+import subprocess
+import time
+
+import pytest
+from devdash import prompt
+from devdash.prompt import format_segment, get_async_state, get_git_state, main, refresh_cache
+
+
+def git(repo, *args):
+    """Run git in repo"""
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A repository with one commit, on branch main"""
+    monkeypatch.setenv("DEVDASH_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    (path / "a.txt").write_text("a\n")
+    git(path, "add", "a.txt")
+    git(path, "commit", "-q", "-m", "init")
+    return path
+
+
+class TestFormatSegment:
+    """Test rendering for each shell"""
+    
+    STATE = {"branch": "main", "ahead": 1, "unstaged": 2, "untracked": 0, "operation": "MERGING"}
+    
+    def test_plain(self):
+        """Test symbols and counters without colors"""
+        assert format_segment(self.STATE, color=False) == "main|MERGING ↑1!2"
+    
+    def test_shell_escapes(self):
+        """Test colors are wrapped as zero-width for bash and zsh"""
+        bash = format_segment({"branch": "main"}, shell="bash")
+        assert bash == "\001\x1b[32m\002main\001\x1b[0m\002"
+        zsh = format_segment({"branch": "50%"}, shell="zsh")
+        assert zsh == "%{\x1b[32m%}50%%%{\x1b[0m%}"
+        assert format_segment({"branch": "main"}, shell="fish") == "\x1b[32mmain\x1b[0m"
+    
+    def test_detached_and_system(self):
+        """Test a detached HEAD and the system part"""
+        segment = format_segment({"oid": "0123456789"}, color=False, system={"cpu": 12.3, "ram": 40.4})
+        assert segment == ":0123456 CPU 12% RAM 40%"
+        assert format_segment(None, color=False, system={"load": 0.5}) == "load 0.50"
+
+
+class TestGitState:
+    """Test collecting the git state"""
+    
+    def test_clean_and_dirty(self, repo):
+        """Test a clean tree, then unstaged, staged and untracked changes"""
+        state = get_git_state(str(repo))
+        assert state["branch"] == "main"
+        assert (state["staged"], state["unstaged"], state["untracked"]) == (0, 0, 0)
+        
+        (repo / "a.txt").write_text("changed\n")
+        (repo / "b.txt").write_text("b\n")
+        (repo / "c.txt").write_text("c\n")
+        git(repo, "add", "c.txt")
+        state = get_git_state(str(repo))
+        assert (state["staged"], state["unstaged"], state["untracked"]) == (1, 1, 1)
+        assert get_git_state(str(repo), untracked=False)["untracked"] == 0
+    
+    def test_not_a_repo(self, tmp_path, monkeypatch):
+        """Test nothing is printed outside a repository"""
+        monkeypatch.delenv("GIT_DIR", raising=False)
+        assert get_git_state(str(tmp_path)) is None
+    
+    def test_timeout_falls_back_to_head(self, repo, monkeypatch):
+        """Test a slow git still shows the branch"""
+        def slow(*args, **kwargs):
+            raise subprocess.TimeoutExpired("git", 1.0)
+        monkeypatch.setattr(prompt.subprocess, "run", slow)
+        state = get_git_state(str(repo))
+        assert state["branch"] == "main"
+        assert state["partial"] is True
+
+
+class TestAsync:
+    """Test stale-while-revalidate mode"""
+    
+    def test_serves_cache_and_refreshes_in_background(self, repo, monkeypatch):
+        """Test the cached state is shown while a refresh is spawned"""
+        spawned = []
+        monkeypatch.setattr(prompt, "spawn_refresh", lambda *args: spawned.append(args) or True)
+        
+        assert get_async_state(str(repo))["untracked"] == 0
+        assert spawned == []
+        
+        (repo / "new.txt").write_text("x\n")
+        assert get_async_state(str(repo), ttl=60)["untracked"] == 0
+        assert spawned == []
+        
+        # Past the TTL: still the stale state, but a refresh is started
+        assert get_async_state(str(repo), ttl=0)["untracked"] == 0
+        assert len(spawned) == 1
+        
+        refresh_cache(str(repo))
+        assert get_async_state(str(repo), ttl=60)["untracked"] == 1
+    
+    def test_refresh_lock(self, repo, monkeypatch, tmp_path):
+        """Test only one background refresh runs at a time"""
+        started = []
+        monkeypatch.setattr(prompt.subprocess, "Popen", lambda *args, **kwargs: started.append(args))
+        cache_path = str(tmp_path / "cache" / "prompt" / "x.json")
+        assert prompt.spawn_refresh(str(repo), cache_path) is True
+        assert prompt.spawn_refresh(str(repo), cache_path) is False
+        
+        # A lock left by a crashed refresh expires
+        old = time.time() - prompt.REFRESH_LOCK_TIMEOUT - 1
+        os.utime(cache_path + ".lock", (old, old))
+        assert prompt.spawn_refresh(str(repo), cache_path) is True
+        assert len(started) == 2
+
+
+class TestMain:
+    """Test option parsing"""
+    
+    def test_prints_segment(self, repo, monkeypatch, capsys):
+        """Test the segment is printed for the given path"""
+        assert main(["--path", str(repo), "--no-color", "--shell=plain"]) == 0
+        assert capsys.readouterr().out == "main\n"
+    
+    def test_bad_options(self, capsys):
+        """Test unknown options, shells and values are usage errors"""
+        assert main(["--bogus"]) == 2
+        assert main(["--shell", "tcsh"]) == 2
+        assert main(["--ttl", "soon"]) == 2
+        assert main(["--path"]) == 2
+        assert "Usage" in capsys.readouterr().err
@@ -0,0 +1,187 @@
+"""
+Tests for Python environment utilities
+"""
+
+import os
+import base64
+import hashlib
+from pathlib import Path
+
+import pytest
+from devdash.package_utils import PackageInfo
+from devdash.pyenv_utils import PythonEnvScanner, evaluate_marker, parse_requirement
+from devdash.version_utils import version_matches
+
+
+def make_venv(env, dists, python="3.11"):
+    """Create a fake virtualenv with the given {name: (version, requires, size)}"""
+    site = env / "lib" / f"python{python}" / "site-packages"
+    site.mkdir(parents=True)
+    (env / "pyvenv.cfg").write_text(f"home = /usr/bin\nversion_info = {python}.4.final.0\n")
+    for name, (version, requires, size) in dists.items():
+        info = site / f"{name.replace('-', '_')}-{version}.dist-info"
+        info.mkdir()
+        headers = ["Metadata-Version: 2.1", f"Name: {name}", f"Version: {version}"]
+        headers += [f"Requires-Dist: {r}" for r in requires]
+        (info / "METADATA").write_text("\n".join(headers) + "\n\nRequires-Dist: not-a-header\n")
+        (info / "RECORD").write_text(f"{name}/__init__.py,sha256=x,{size}\n{info.name}/RECORD,,\n")
+    return site
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(monkeypatch, tmp_path):
+    """Keep the developer's own environment out of the lookup"""
+    monkeypatch.delenv("VIRTUAL_ENV", raising=False)
+    monkeypatch.delenv("UV_PROJECT_ENVIRONMENT", raising=False)
+    monkeypatch.setenv("POETRY_VIRTUALENVS_PATH", str(tmp_path / "poetry-envs"))
+    monkeypatch.setenv("WORKON_HOME", str(tmp_path / "pipenv-envs"))
+    PythonEnvScanner._cache.clear()
+
+
+class TestSpecifiers:
+    """Test PEP 440 specifier matching"""
+    
+    @pytest.mark.parametrize("version,specifier,expected", [
+        ("1.5", ">=1.0,<2", True),
+        ("2.0a1", "<2.0", False),
+        ("2.0a1", "<2.0a2", True),
+        ("1.3.2", "!=1.3.*", False),
+        ("1.4", "~=1.3", True),
+        ("2.0", "~=1.3", False),
+        ("1.4", "~=1.3.2", False),
+        ("1.0+cpu", "==1.0", True),
+        ("1.7.post1", ">1.7", False),
+        ("1.7+local", ">1.7", False),
+        ("1.7.1+local", ">1.7", True),
+        ("1.0", "==1.0.0", True),
+        ("1.0", "", True),
+    ])
+    def test_version_matches(self, version, specifier, expected):
+        """Test specifier clauses against versions"""
+        assert version_matches(version, specifier) is expected
+
+
+class TestMarkers:
+    """Test requirement and marker parsing"""
+    
+    def test_parse_requirement(self):
+        """Test names, extras, parenthesised specifiers and URLs"""
+        assert parse_requirement("requests (>=2.0, <3) ; python_version >= '3'") == {
+            "name": "requests", "specifier": ">=2.0,<3", "marker": "python_version >= '3'",
+        }
+        assert parse_requirement("foo[bar]>=1")["specifier"] == ">=1"
+        assert parse_requirement("pkg @ https://example.com/pkg.whl")["specifier"] == ""
+    
+    def test_evaluate_marker(self):
+        """Test version comparison, boolean operators and extras"""
+        env = {"python_version": "3.11", "sys_platform": "linux", "os_name": "posix"}
+        assert evaluate_marker('python_version >= "3.8"', env)
+        assert not evaluate_marker('python_version < "3.10"', env)
+        assert evaluate_marker('python_version > "3.9" and (sys_platform == "win32" or os_name == "posix")', env)
+        assert not evaluate_marker('extra == "dev"', env)
+        assert evaluate_marker("'lin' in sys_platform", env)
+        with pytest.raises(ValueError):
+            evaluate_marker("python_version >=", env)
+
+
+class TestPythonEnvScanner:
+    """Test PythonEnvScanner class"""
+    
+    def test_in_project_venv(self, tmp_path):
+        """Test .venv is found and dist-info metadata is read"""
+        make_venv(tmp_path / ".venv", {
+            "rich": ("13.7.1", ["pygments>=2.13", "ipywidgets>=7; extra == 'jupyter'"], 1000),
+            "Pygments": ("2.17.2", [], 4000),
+        })
+        scanner = PythonEnvScanner(str(tmp_path))
+        assert scanner.find_environment() == str(tmp_path / ".venv")
+        assert scanner.get_python_version() == "3.11.4"
+        assert scanner.get_installed() == {"Pygments": "2.17.2", "rich": "13.7.1"}
+        summary = scanner.get_summary()
+        assert summary["size"] == 5000
+        assert summary["largest"][0]["name"] == "Pygments"
+        assert summary["conflicts"] == []
+    
+    def test_conflicts(self, tmp_path):
+        """Test unsatisfied and missing requirements are reported"""
+        make_venv(tmp_path / "venv", {
+            "app": ("1.0", ["rich<13", "missing-dep", "win-only; sys_platform == 'nonexistent'"], 1),
+            "rich": ("13.7.1", [], 1),
+        })
+        conflicts = PythonEnvScanner(str(tmp_path)).find_conflicts()
+        assert conflicts == [
+            {"package": "app", "requires": "rich<13", "installed": "13.7.1"},
+            {"package": "app", "requires": "missing-dep", "installed": None},
+        ]
+    
+    def test_scan_cache(self, tmp_path, monkeypatch):
+        """Test conflicts are cached with the scan and only the latest scan is kept"""
+        site = make_venv(tmp_path / ".venv", {"app": ("1.0", ["missing-dep"], 1)})
+        scanner = PythonEnvScanner(str(tmp_path))
+        conflicts = scanner.find_conflicts()
+        monkeypatch.setattr("devdash.pyenv_utils.parse_requirement", lambda text: 1 / 0)
+        assert scanner.find_conflicts() is conflicts
+        
+        (site / "new-1.0.dist-info").mkdir()
+        os.utime(site, ns=(0, 0))
+        assert scanner.scan() is not conflicts
+        assert len(PythonEnvScanner._cache) == 1
+    
+    def test_poetry_env(self, tmp_path):
+        """Test poetry's hashed out-of-project env is found"""
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "pyproject.toml").write_text("[tool.poetry]\nname = 'app'\n")
+        digest = hashlib.sha256(str(project.resolve()).encode()).digest()
+        env_name = f"app-{base64.urlsafe_b64encode(digest).decode()[:8]}-py3.12"
+        make_venv(tmp_path / "poetry-envs" / env_name, {"rich": ("13.0.0", [], 1)}, python="3.12")
+        make_venv(tmp_path / "poetry-envs" / "app-otherhash-py3.12", {"typer": ("0.9.0", [], 1)})
+        
+        scanner = PythonEnvScanner(str(project))
+        assert Path(scanner.find_environment()).name == env_name
+        assert scanner.get_installed() == {"rich": "13.0.0"}
+    
+    def test_virtual_env_fallback(self, tmp_path, monkeypatch):
+        """Test VIRTUAL_ENV is used when the project has no env of its own"""
+        make_venv(tmp_path / "active", {"rich": ("13.0.0", [], 1)})
+        monkeypatch.setenv("VIRTUAL_ENV", str(tmp_path / "active"))
+        project = tmp_path / "project"
+        project.mkdir()
+        assert PythonEnvScanner(str(project)).find_environment() == str(tmp_path / "active")
+    
+    def test_scan_cached_until_site_packages_changes(self, tmp_path):
+        """Test the scan is reused until a package is installed"""
+        site = make_venv(tmp_path / ".venv", {"rich": ("13.0.0", [], 1)})
+        scanner = PythonEnvScanner(str(tmp_path))
+        first = scanner.scan()
+        assert scanner.scan() is first
+        
+        (site / "typer-0.9.0.dist-info").mkdir()
+        (site / "typer-0.9.0.dist-info" / "METADATA").write_text("Name: typer\nVersion: 0.9.0\n")
+        stat = site.stat()
+        os.utime(site, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert [d["name"] for d in scanner.scan()] == ["rich", "typer"]
+    
+    def test_no_environment(self, tmp_path):
+        """Test a project without a virtualenv is not given devdash's own interpreter"""
+        from devdash.dashboard import DevDash
+        from devdash.package_utils import PackageCheckError
+        
+        (tmp_path / "requirements.txt").write_text("rich\n")
+        scanner = PythonEnvScanner(str(tmp_path))
+        assert scanner.get_site_packages() == []
+        assert scanner.get_summary()["packages"] == 0
+        with pytest.raises(PackageCheckError, match="no virtualenv"):
+            PackageInfo.get_python_outdated(str(tmp_path))
+        
+        dash = DevDash(str(tmp_path))
+        dash.package_outdated = False
+        model = dash.collect_packages()
+        assert model["environment"] is False
+        assert "no virtualenv found" in dash.render_packages(model).renderable.caption
+    
+    def test_package_info_uses_project_env(self, tmp_path):
+        """Test PackageInfo reads the project's env rather than the running one"""
+        make_venv(tmp_path / ".venv", {"rich": ("13.0.0", [], 1)})
+        assert PackageInfo.get_python_installed(str(tmp_path)) == {"rich": "13.0.0"}
+        assert PackageInfo.get_python_environment(str(tmp_path))["packages"] == 1
@@ -0,0 +1,95 @@
+"""
+Tests for adaptive refresh scheduling
+"""
+
+import time
+
+from devdash.dashboard import DevDash
+from devdash.scheduler import AdaptiveScheduler, plan_intervals
+from devdash.worker_utils import CollectorPool
+
+
+class TestAdaptiveScheduler:
+    """Test interval planning, pool retuning and the dashboard's CPU budget"""
+    
+    def test_cheap_volatile_panels_stay_fast(self):
+        """Test collectors well within budget keep their base interval"""
+        intervals = plan_intervals(
+            {"system": 0.001, "git": 0.002},
+            {"system": 1.0, "git": 1.0},
+            {"system": 2.0, "git": 2.0},
+            budget=0.01
+        )
+        assert intervals == {"system": 2.0, "git": 2.0}
+    
+    def test_stable_panels_are_stretched(self):
+        """Test a collector whose data never changes runs up to max_stretch times slower"""
+        intervals = plan_intervals(
+            {"system": 0.0, "packages": 0.0},
+            {"system": 1.0, "packages": 0.0},
+            {"system": 5.0, "packages": 30.0},
+            budget=0.01,
+            max_stretch=4.0
+        )
+        assert intervals == {"system": 5.0, "packages": 120.0}
+    
+    def test_budget_slows_expensive_panels_first(self):
+        """Test the expensive collector absorbs the budget cut and the total fits"""
+        costs = {"system": 0.002, "git": 0.2}
+        intervals = plan_intervals(costs, {"system": 1.0, "git": 1.0}, {"system": 1.0, "git": 1.0}, budget=0.03)
+        assert intervals["system"] == 1.0
+        assert intervals["git"] > 5.0
+        assert sum(costs[name] / intervals[name] for name in costs) <= 0.03 + 1e-9
+    
+    def test_intervals_are_bounded(self):
+        """Test unmeasured collectors run at their base and none exceed max_stretch"""
+        intervals = plan_intervals(
+            {"git": None, "packages": 10.0},
+            {},
+            {"git": 5.0, "packages": 30.0},
+            budget=0.001,
+            max_stretch=12.0
+        )
+        assert intervals == {"git": 5.0, "packages": 360.0}
+    
+    def test_scheduler_retunes_pool(self):
+        """Test measured runs of an unchanging collector stretch its pool interval"""
+        pool = CollectorPool(max_workers=1)
+        pool.register("packages", lambda: {"outdated": []}, interval=1.0)
+        pool.start()
+        try:
+            scheduler = AdaptiveScheduler(pool, lambda name: 1.0, budget=0.01, max_stretch=8.0)
+            for runs in range(1, 11):
+                pool.refresh_all()
+                deadline = time.time() + 5
+                while pool.get("packages").get("runs") != runs and time.time() < deadline:
+                    time.sleep(0.01)
+                scheduler.update(["packages"])
+            
+            # One change (the first value) in ten runs
+            assert scheduler.change_rates["packages"] < 0.3
+            assert scheduler.costs["packages"] is not None
+            assert pool.get("packages")["interval"] > 3.0
+            assert pool.get("packages")["interval"] <= 8.0
+        finally:
+            pool.stop()
+    
+    def test_dashboard_budget(self, tmp_path):
+        """Test the dashboard schedules adaptively unless the budget is disabled"""
+        dash = DevDash(str(tmp_path))
+        dash.daemon = None
+        pool = dash.create_collector_pool(5.0)
+        try:
+            assert dash.scheduler is not None
+            assert dash.get_cpu_usage() is None
+            dash.scheduler.usage = 0.004
+            assert dash.get_cpu_usage() == "0.4%/1%"
+        finally:
+            pool.stop()
+        
+        dash.cpu_budget = None
+        pool = dash.create_collector_pool(5.0)
+        pool.stop()
+        assert dash.scheduler is None
+
+
@@ -0,0 +1,91 @@
+"""
+Startup regression tests: quick commands must not import heavy modules
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Imported only by the commands that need them
+HEAVY_MODULES = {"rich", "typer", "click", "devdash.dashboard", "devdash.package_utils"}
+
+
+def imported_modules(*args):
+    """Run python -X importtime with args; return {module: cumulative µs}"""
+    env = dict(os.environ, NO_COLOR="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    assert result.returncode == 0, result.stderr
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestStartup:
+    """Test what each entry point imports"""
+    
+    def test_import_package_is_light(self):
+        """Test 'import devdash' defers every submodule"""
+        modules = imported_modules("-c", "import devdash")
+        assert "devdash" in modules
+        assert not {m for m in modules if m.startswith("devdash.")}
+        assert not HEAVY_MODULES & set(modules)
+    
+    @pytest.mark.parametrize("command", ["version", "info", "prompt"])
+    def test_fast_commands(self, command):
+        """Test version/info/prompt skip typer, rich and the dashboard"""
+        modules = imported_modules("-m", "devdash", command)
+        heavy = {m for m in modules if m.split(".")[0] in {"rich", "typer", "click"}}
+        assert not heavy
+        assert not HEAVY_MODULES & set(modules)
+    
+    def test_hidden_panels_import_nothing(self, tmp_path, monkeypatch):
+        """Test a system-and-ports dashboard never imports the other panels' backends"""
+        config = tmp_path / "config.toml"
+        config.write_text('[layout]\ncolumns = [["system", "ports"]]\n')
+        monkeypatch.setenv("DEVDASH_CONFIG", str(config))
+        monkeypatch.setenv("DEVDASH_NO_DAEMON", "1")
+        modules = imported_modules("-c", (
+            "from devdash.config import load_config\n"
+            "from devdash.dashboard import DevDash\n"
+            "dash = DevDash('.', load_config('.'))\n"
+            "dash.update_layout(dash.create_layout())\n"
+        ))
+        assert "devdash.system_utils" in modules
+        assert "devdash.port_utils" in modules
+        assert not {
+            "devdash.git_utils", "devdash.package_utils", "devdash.probe_utils", "devdash.workspace_utils",
+            "devdash.todo_utils", "devdash.code_utils", "devdash.project_utils", "devdash.log_utils",
+            "devdash.container_utils",
+        } & set(modules)
+    
+    def test_cli_app_is_built_on_access(self):
+        """Test 'from devdash.cli import app' still works without building it at import"""
+        modules = imported_modules("-c", "import devdash.cli")
+        assert not HEAVY_MODULES & set(modules)
+        from devdash import cli
+        assert cli.app is cli.app
+        assert "version" in [command.callback.__name__ for command in cli.app.registered_commands]
+        with pytest.raises(AttributeError):
+            cli.not_a_thing
+    
+    def test_lazy_attributes(self):
+        """Test the public names still resolve from the package"""
+        import devdash
+        assert devdash.DevDash.__name__ == "DevDash"
+        assert "GitInfo" in dir(devdash)
+        with pytest.raises(AttributeError):
+            devdash.NotAThing
@@ -0,0 +1,99 @@
+"""
+Tests for terminal utilities
+"""
+
+import io
+
+from rich.text import Text
+from devdash.term_utils import CellDiffRenderer, to_ascii
+
+
+def make_renderer(**kwargs):
+    """Renderer writing into a buffer"""
+    return CellDiffRenderer(io.StringIO(), color_system=None, **kwargs)
+
+
+class TestCellDiffRenderer:
+    """Test CellDiffRenderer class"""
+    
+    def test_first_frame_is_full(self):
+        """Test the first frame clears the screen and draws every row"""
+        renderer = make_renderer()
+        assert renderer.draw(Text("hello\nworld"), 10, 2)
+        out = renderer.stream.getvalue()
+        assert "\x1b[2J" in out
+        assert "\x1b[1;1Hhello" in out and "\x1b[2;1Hworld" in out
+    
+    def test_only_changed_cells_are_sent(self):
+        """Test an unchanged frame sends nothing and a one-cell change sends one run"""
+        renderer = make_renderer()
+        renderer.draw(Text("cpu 10%\nram 50%"), 20, 2)
+        before = renderer.stream.getvalue()
+        
+        renderer.draw(Text("cpu 10%\nram 50%"), 20, 2)
+        assert renderer.stream.getvalue() == before
+        
+        renderer.draw(Text("cpu 12%\nram 50%"), 20, 2)
+        delta = renderer.stream.getvalue()[len(before):]
+        assert delta == "\x1b[1;6H2\x1b[0m"
+    
+    def test_wide_characters_are_sent_whole(self):
+        """Test a change next to a wide character resends all of it"""
+        renderer = make_renderer()
+        renderer.draw(Text("📦 a"), 10, 1)
+        before = renderer.stream.getvalue()
+        renderer.draw(Text("🌐 a"), 10, 1)
+        assert renderer.stream.getvalue()[len(before):] == "\x1b[1;1H🌐\x1b[0m"
+    
+    def test_resize_redraws_everything(self):
+        """Test a new terminal size forces a full frame"""
+        renderer = make_renderer()
+        renderer.draw(Text("x"), 10, 2)
+        renderer.draw(Text("x"), 12, 2)
+        assert renderer.stream.getvalue().count("\x1b[2J") == 2
+    
+    def test_ascii_profile(self):
+        """Test emoji and box drawing are replaced keeping column widths"""
+        assert to_ascii("╭", 1) == "+"
+        assert to_ascii("📦", 2) == "  "
+        assert to_ascii("é", 1) == "e"
+        renderer = make_renderer(ascii_only=True)
+        renderer.draw(Text("⚡ ok │ ✔"), 20, 1)
+        out = renderer.stream.getvalue()
+        assert out.isascii()
+        assert "*  ok | v" in out
+    
+    def test_byte_cap_defers_frames(self):
+        """Test frames over budget stay pending and catch up later"""
+        renderer = make_renderer(max_bytes_per_second=10)
+        assert renderer.draw(Text("a" * 40), 40, 1)
+        assert not renderer.draw(Text("b" * 40), 40, 1)
+        assert renderer.pending
+        assert renderer.frames_deferred == 1
+        assert renderer.retry_after() > 0
+        
+        # Once the budget recovers the latest frame is sent in full
+        renderer._budget = 10
+        assert renderer.draw(Text("c" * 40), 40, 1)
+        assert not renderer.pending
+        assert "c" * 40 in renderer.stream.getvalue()
+    
+    def test_status_line(self):
+        """Test the status line is truncated and only rewritten when it changes"""
+        renderer = make_renderer()
+        renderer.status_line("branch main | CPU 5%", 12)
+        renderer.status_line("branch main | CPU 5%", 12)
+        assert renderer.stream.getvalue() == "\rbranch main\x1b[K"
+    
+    def test_status_line_byte_cap(self):
+        """Test status lines spend the same byte budget as frames"""
+        renderer = make_renderer(max_bytes_per_second=10)
+        assert renderer.status_line("a" * 20, 40)
+        assert not renderer.status_line("b" * 20, 40)
+        assert renderer.pending
+        assert renderer.retry_after() > 0
+        assert "b" not in renderer.stream.getvalue()
+        
+        renderer._budget = 10
+        assert renderer.status_line("b" * 20, 40)
+        assert not renderer.pending
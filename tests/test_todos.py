@@ -0,0 +1,141 @@
+"""
+Tests for the TODO/FIXME/HACK index
+"""
+
+import subprocess
+
+import pytest
+from devdash.cache_utils import DiskCache
+from devdash.todo_utils import TodoScanner, parse_blame, parse_marker
+
+
+def git(repo, *args):
+    """Run git in repo"""
+    subprocess.run(
+        ["git", "-c", "user.name=Ann", "-c", "user.email=ann@example.com", *args],
+        cwd=repo, check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A committed repository with markers in two of three files"""
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q")
+    (path / "app.py").write_text("import os\n# TODO: handle errors\nx = 1  # HACK around os bug\n")
+    (path / "lib.js").write_text("// FIXME(bob): leaks memory\n")
+    (path / "notes.txt").write_text("TODOS and todo are not markers\n")
+    git(path, "add", ".")
+    git(path, "commit", "-q", "-m", "init")
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Blob cache in a temporary directory"""
+    return DiskCache("todos", ttl=float("inf"), cache_dir=tmp_path / "cache")
+
+
+class TestParsing:
+    """Test marker and blame parsing"""
+    
+    def test_parse_marker(self):
+        """Test comment markers are found and quoted or embedded words are not"""
+        assert parse_marker("# TODO: handle errors") == ("TODO", "handle errors")
+        assert parse_marker("// FIXME(bob): leaks") == ("FIXME", "leaks")
+        assert parse_marker("/* HACK - later */") == ("HACK", "later")
+        assert parse_marker('MARKERS = ("TODO", "FIXME")') is None
+        assert parse_marker("TODOS") is None
+    
+    def test_parse_blame(self):
+        """Test line porcelain is read into author, time and committed per final line"""
+        output = (
+            "1234567890abcdef1234567890abcdef12345678 2 2 1\n"
+            "author Ann\nauthor-time 1700000000\nfilename app.py\n\t# TODO: x\n"
+            "0000000000000000000000000000000000000000 5 5 1\n"
+            "author Not Committed Yet\nauthor-time 1800000000\nfilename app.py\n\t# FIXME y\n"
+        )
+        assert parse_blame(output) == {
+            2: ("Ann", 1700000000, True),
+            5: ("Not Committed Yet", 1800000000, False),
+        }
+
+
+class TestTodoScanner:
+    """Test TodoScanner class"""
+    
+    def test_counts_and_authors(self, repo, cache):
+        """Test markers are counted per kind and blamed on their author"""
+        index = TodoScanner(str(repo), cache).scan()
+        assert index["total"] == 3
+        assert index["counts"] == {"TODO": 1, "FIXME": 1, "HACK": 1}
+        assert index["authors"] == [["Ann", 3]]
+        assert {item["path"] for item in index["newest"]} == {"app.py", "lib.js"}
+        assert index["rescanned"] == 3
+    
+    def test_only_changed_blobs_are_rescanned(self, repo, cache):
+        """Test a second scan greps only the edited file, and a new scanner reuses the disk cache"""
+        scanner = TodoScanner(str(repo), cache)
+        scanner.scan()
+        assert scanner.scan()["rescanned"] == 0
+        
+        (repo / "lib.js").write_text("// FIXME(bob): leaks memory\n// TODO: add tests\n")
+        writes = []
+        set_entry = cache.set
+        cache.set = lambda key, value: writes.append(value) or set_entry(key, value)
+        index = scanner.scan()
+        assert index["rescanned"] == 1
+        # The new blob's shard, and the old blob's shard it leaves
+        assert 1 <= len(writes) <= 2
+        assert index["counts"]["TODO"] == 2
+        newest = index["newest"][0]
+        assert (newest["path"], newest["line"], newest["author"]) == ("lib.js", 2, "Not Committed Yet")
+        assert index["authors"] == [["Ann", 3]]
+        
+        # Blamed again once committed
+        git(repo, "commit", "-q", "-am", "tests")
+        index = scanner.scan()
+        assert index["rescanned"] == 0
+        assert index["authors"] == [["Ann", 4]]
+        
+        assert TodoScanner(str(repo), cache).scan()["rescanned"] == 0
+    
+    def test_deleted_file(self, repo, cache):
+        """Test markers of a deleted file disappear"""
+        scanner = TodoScanner(str(repo), cache)
+        scanner.scan()
+        (repo / "lib.js").unlink()
+        assert scanner.scan()["counts"]["FIXME"] == 0
+    
+    def test_outside_git(self, tmp_path, cache):
+        """Test plain directories are scanned, skipping ignored ones, and cached by mtime"""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "main.go").write_text("// TODO: parse flags\n")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "dep.js").write_text("// FIXME: not ours\n")
+        
+        scanner = TodoScanner(str(tmp_path / "src"), cache)
+        index = scanner.scan()
+        assert index["counts"] == {"TODO": 1, "FIXME": 0, "HACK": 0}
+        assert index["newest"][0]["path"] == "main.go"
+        assert index["authors"] == []
+        assert scanner.scan()["rescanned"] == 0
+
+
+class TestTodosPanel:
+    """Test the dashboard's TODO panel"""
+    
+    def test_dashboard_todos_panel(self, repo, cache):
+        """Test the todos panel model and render"""
+        from devdash.dashboard import DevDash
+        
+        dash = DevDash(str(repo))
+        dash.daemon = None
+        dash.todo_scanner = TodoScanner(str(repo), cache)
+        model = dash.collect_todos()
+        assert model["total"] == 3
+        assert model["newest"][0]["where"] in ("app.py:2", "app.py:3", "lib.js:1")
+        assert "TODOS (3)" in str(dash.render_todos(model).title)
+        assert dash.create_layout().get("todos") is not None
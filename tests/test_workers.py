@@ -0,0 +1,171 @@
+"""
+Tests for background collector utilities
+"""
+
+import os
+import select
+import threading
+import time
+
+import pytest
+from devdash.worker_utils import CollectorPool
+
+
+def wait_until(predicate, timeout=5.0):
+    """Poll until predicate() is true or timeout expires"""
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestCollectorPool:
+    """Test CollectorPool class"""
+    
+    def test_publishes_latest_result(self):
+        """Test a collector's result becomes available after it runs"""
+        pool = CollectorPool(max_workers=1)
+        pool.register("cpu", lambda: 42, interval=1.0)
+        pool.start()
+        try:
+            assert pool.get("cpu")["value"] is None
+            assert pool.refresh_due() == ["cpu"]
+            assert wait_until(lambda: pool.get("cpu")["value"] == 42)
+            result = pool.get("cpu")
+            assert result["updated"] is not None
+            assert result["refreshing"] is False
+            assert result["duration"] >= 0
+        finally:
+            pool.stop()
+    
+    def test_slow_collector_does_not_block_others(self):
+        """Test a blocked collector leaves the other panels updating"""
+        release = threading.Event()
+        pool = CollectorPool(max_workers=2)
+        pool.register("packages", lambda: release.wait(5) and "done", interval=1.0)
+        pool.register("system", lambda: "ok", interval=1.0)
+        pool.start()
+        try:
+            pool.refresh_due()
+            assert wait_until(lambda: pool.get("system")["value"] == "ok")
+            assert pool.get("packages")["refreshing"] is True
+            assert pool.submit("packages") is False
+        finally:
+            release.set()
+            pool.stop()
+    
+    def test_interval_is_respected(self):
+        """Test collectors are not resubmitted before their interval"""
+        pool = CollectorPool(max_workers=1)
+        pool.register("git", lambda: "x", interval=60.0)
+        pool.start()
+        try:
+            assert pool.refresh_due() == ["git"]
+            assert wait_until(lambda: not pool.get("git")["refreshing"])
+            assert pool.refresh_due() == []
+            assert pool.refresh_all() == ["git"]
+        finally:
+            pool.stop()
+    
+    def test_runs_changes_and_next_due(self):
+        """Test runs, value changes and CPU cost are recorded and deadlines reported"""
+        values = iter(["a", "a", "b"])
+        pool = CollectorPool(max_workers=1)
+        pool.register("git", lambda: next(values), interval=60.0)
+        pool.start()
+        try:
+            assert pool.next_due() == 0.0
+            for runs in (1, 2, 3):
+                pool.refresh_all()
+                assert wait_until(lambda: pool.get("git")["runs"] == runs)
+            result = pool.get("git")
+            assert result["changes"] == 2
+            assert result["cpu"] >= 0
+            assert 59.0 < pool.next_due() <= 60.0
+            assert pool.next_due(now=result["started"] + 90) == 0.0
+        finally:
+            pool.stop()
+    
+    def test_error_keeps_previous_value(self):
+        """Test a failing run keeps the last good value and records the error"""
+        calls = []
+        
+        def flaky():
+            calls.append(1)
+            if len(calls) > 1:
+                raise RuntimeError("boom")
+            return "good"
+        
+        pool = CollectorPool(max_workers=1)
+        pool.register("ports", flaky, interval=0.0)
+        pool.start()
+        try:
+            pool.refresh_all()
+            assert wait_until(lambda: pool.get("ports")["value"] == "good")
+            pool.refresh_all()
+            assert wait_until(lambda: pool.get("ports")["error"] is not None)
+            assert pool.get("ports")["value"] == "good"
+            assert "boom" in pool.get("ports")["error"]
+        finally:
+            pool.stop()
+    
+    def test_is_stale(self):
+        """Test staleness is relative to the collector interval"""
+        pool = CollectorPool(max_workers=1)
+        pool.register("stats", lambda: 1, interval=2.0)
+        pool.start()
+        try:
+            assert pool.is_stale("stats") is True
+            pool.refresh_all()
+            assert wait_until(lambda: pool.get("stats")["value"] == 1)
+            updated = pool.get("stats")["updated"]
+            assert pool.is_stale("stats", now=updated + 1) is False
+            assert pool.is_stale("stats", now=updated + 10) is True
+        finally:
+            pool.stop()
+    
+    def test_wait_for_update(self):
+        """Test the render loop can wake up when a result is published"""
+        pool = CollectorPool(max_workers=1)
+        pool.register("git", lambda: "x", interval=1.0)
+        pool.start()
+        try:
+            pool.refresh_all()
+            assert pool.wait_for_update(timeout=5) is True
+            assert pool.wait_for_update(timeout=0.01) is False
+        finally:
+            pool.stop()
+    
+    def test_update_before_wait_is_not_lost(self):
+        """Test a result published between two waits wakes the next wait at once"""
+        pool = CollectorPool(max_workers=1)
+        pool.register("git", lambda: "x", interval=1.0)
+        pool.start()
+        try:
+            pool.refresh_all()
+            assert pool.wait_for_update(timeout=5) is True
+            pool.refresh_all()
+            deadline = time.time() + 5
+            while pool.get("git")["runs"] < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            assert pool.wait_for_update(timeout=0) is True
+        finally:
+            pool.stop()
+    
+    @pytest.mark.skipif(os.name == "nt", reason="select() needs sockets on Windows")
+    def test_wakeup_fd(self):
+        """Test the wakeup pipe becomes readable when a result is published"""
+        pool = CollectorPool(max_workers=1)
+        pool.register("git", lambda: "x", interval=1.0)
+        fd = pool.get_wakeup_fd()
+        pool.start()
+        try:
+            assert select.select([fd], [], [], 0)[0] == []
+            pool.refresh_all()
+            assert select.select([fd], [], [], 5)[0] == [fd]
+            pool.drain_wakeup()
+            assert select.select([fd], [], [], 0)[0] == []
+        finally:
+            pool.stop()
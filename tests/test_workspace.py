@@ -0,0 +1,58 @@
+"""
+Tests for workspace utilities
+"""
+
+from devdash.workspace_utils import WorkspaceScanner
+
+
+def touch(root, *paths, content=""):
+    """Create files (and their directories) under root"""
+    for relative in paths:
+        target = root / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+
+
+class TestWorkspaceScanner:
+    """Test WorkspaceScanner class"""
+    
+    def test_detect_ecosystems(self, tmp_path):
+        """Test every manifest in a directory is reported"""
+        touch(tmp_path, "package.json", "pyproject.toml", "go.mod")
+        assert WorkspaceScanner.detect_ecosystems(str(tmp_path)) == ["node", "python", "go"]
+    
+    def test_npm_and_cargo_members_fold_into_root(self, tmp_path):
+        """Test workspace members are checked through their workspace root"""
+        (tmp_path / "package.json").write_text('{"workspaces": {"packages": ["apps/*", "!apps/legacy"]}}')
+        touch(tmp_path, "apps/web/package.json", "apps/legacy/package.json")
+        (tmp_path / "Cargo.toml").write_text('[workspace]\nmembers = [\n  "crates/*",\n]\n')
+        touch(tmp_path, "crates/core/Cargo.toml")
+        
+        projects = {(p["name"], p["ecosystem"]): p["members"] for p in WorkspaceScanner(str(tmp_path)).find_projects()}
+        assert projects[(".", "node")] == ["apps/web"]
+        assert projects[(".", "rust")] == ["crates/core"]
+        # Excluded from the workspace, so checked on its own
+        assert ("apps/legacy", "node") in projects
+        assert ("apps/web", "node") not in projects
+    
+    def test_pnpm_workspace(self, tmp_path):
+        """Test pnpm-workspace.yaml package globs"""
+        touch(tmp_path, "package.json", content="{}")
+        (tmp_path / "pnpm-workspace.yaml").write_text("packages:\n  - 'packages/**'\n  - \"!**/test/**\"\n")
+        touch(tmp_path, "packages/a/package.json", "packages/nested/b/package.json", "packages/a/test/x/package.json")
+        
+        root = WorkspaceScanner(str(tmp_path)).find_projects()[0]
+        assert root["members"] == ["packages/a", "packages/nested/b"]
+    
+    def test_go_work_and_nested_python(self, tmp_path):
+        """Test go.work modules and nested Python packages are separate projects"""
+        (tmp_path / "go.work").write_text("go 1.22\n\nuse (\n\t./api\n\t./deep/a/b/c/worker\n)\n")
+        touch(tmp_path, "api/go.mod", "deep/a/b/c/worker/go.mod", "tools/lint/pyproject.toml")
+        touch(tmp_path, "node_modules/x/package.json", ".venv/pyproject.toml")
+        
+        projects = [(p["name"], p["ecosystem"]) for p in WorkspaceScanner(str(tmp_path)).find_projects()]
+        assert sorted(projects) == [
+            ("api", "go"),
+            ("deep/a/b/c/worker", "go"),
+            ("tools/lint", "python"),
+        ]